@@ -0,0 +1,368 @@
+"""
+═══════════════════════════════════════════════════════════════════
+CHARGEMENT PAR PARTITIONS : STAGING + ATTACH PARTITION
+Chaque année est construite dans une table autonome sans index
+(COPY), indexée et contrainte hors de l'arbre partitionné, en
+parallèle, puis échangée avec l'ancienne partition (DETACH / ATTACH)
+dans une transaction courte. Les partitions annuelles manquantes sont
+créées automatiquement.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import re
+import queue
+import threading
+import time
+from sqlalchemy import text
+
+from chargement_copy import charger_dataframe, nom_qualifie
+
+
+SUFFIXE_STAGING = '_stg'
+
+# pg_get_expr(relpartbound) : "FOR VALUES FROM (20050101) TO (20060101)" ou "DEFAULT"
+REGEX_BORNES = re.compile(r"FROM \('?(\d+)'?\) TO \('?(\d+)'?\)")
+
+
+# ════════════════════════════════════════════════════════════════
+# PARTITIONS ANNUELLES
+# ════════════════════════════════════════════════════════════════
+
+def bornes_annee(annee):
+    """
+    Bornes RANGE (date_id AAAAMMJJ) d'une année : [AAAA0101, AAAA+1 0101[.
+    """
+    return annee * 10000 + 101, (annee + 1) * 10000 + 101
+
+
+def est_partitionnee(conn, table_name, schema):
+    """
+    True si la table est partitionnée (relkind 'p'), False pour une
+    table simple (ex: sql_mvp/03_Gold/04_gold_simple.sql).
+    """
+    return conn.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"
+    ), {'table': nom_qualifie(table_name, schema)}).scalar()
+
+
+def lister_partitions(conn, table_name, schema):
+    """
+    {nom_partition: (debut, fin)} ; la partition par défaut a None.
+    """
+    lignes = conn.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:parent AS regclass)
+    """), {'parent': nom_qualifie(table_name, schema)}).fetchall()
+
+    partitions = {}
+    for nom, bornes in lignes:
+        correspondance = REGEX_BORNES.search(bornes)
+        partitions[nom] = tuple(int(b) for b in correspondance.groups()) if correspondance else None
+    return partitions
+
+
+def partition_annee(partitions, annee):
+    """
+    Nom de la partition couvrant exactement l'année, sinon None.
+    """
+    for nom, bornes in partitions.items():
+        if bornes == bornes_annee(annee):
+            return nom
+    return None
+
+
+def partition_defaut(partitions):
+    return next((nom for nom, bornes in partitions.items() if bornes is None), None)
+
+
+def assurer_partitions(engine, table_name, schema, annees, colonne='date_id'):
+    """
+    Crée les partitions annuelles manquantes (ex: nouveau millésime BAAC).
+    Les lignes de ces années déjà tombées dans la partition par défaut y
+    sont déplacées, sinon le CREATE ... PARTITION OF échouerait.
+    Retourne la liste des partitions créées.
+    """
+    creees = []
+    with engine.begin() as conn:
+        partitions = lister_partitions(conn, table_name, schema)
+        defaut = partition_defaut(partitions)
+
+        for annee in sorted(set(annees)):
+            if partition_annee(partitions, annee):
+                continue
+            debut, fin = bornes_annee(annee)
+            nom = f"{table_name}_{annee}"
+
+            a_deplacer = defaut is not None and conn.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {schema}.{defaut} WHERE {colonne} >= {debut} AND {colonne} < {fin})"
+            )).scalar()
+            if a_deplacer:
+                conn.execute(text(
+                    f"CREATE TEMP TABLE tmp_{nom} (LIKE {schema}.{table_name}) ON COMMIT DROP"
+                ))
+                conn.execute(text(f"""
+                    WITH deplacees AS (
+                        DELETE FROM {schema}.{defaut}
+                        WHERE {colonne} >= {debut} AND {colonne} < {fin}
+                        RETURNING *
+                    )
+                    INSERT INTO tmp_{nom} SELECT * FROM deplacees
+                """))
+
+            conn.execute(text(
+                f"CREATE TABLE {schema}.{nom} PARTITION OF {schema}.{table_name} "
+                f"FOR VALUES FROM ({debut}) TO ({fin})"
+            ))
+            if a_deplacer:
+                conn.execute(text(f"INSERT INTO {schema}.{table_name} SELECT * FROM tmp_{nom}"))
+
+            partitions[nom] = (debut, fin)
+            creees.append(nom)
+    return creees
+
+
+# ════════════════════════════════════════════════════════════════
+# DDL DE LA TABLE PARENTE
+# ════════════════════════════════════════════════════════════════
+
+def lire_ddl_parent(conn, table_name, schema):
+    """
+    Contraintes (PK, UNIQUE, FK) et index de la table partitionnée, à
+    reproduire sur chaque staging pour qu'ATTACH PARTITION les rattache
+    au lieu de les reconstruire. Les CHECK et NOT NULL sont copiés par
+    CREATE TABLE ... (LIKE ... INCLUDING CONSTRAINTS).
+    """
+    parent = {'parent': nom_qualifie(table_name, schema)}
+    contraintes = conn.execute(text("""
+        SELECT conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = CAST(:parent AS regclass) AND contype IN ('p', 'u', 'f')
+        ORDER BY contype DESC, conname
+    """), parent).fetchall()
+
+    index = conn.execute(text("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = CAST(:parent AS regclass)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        ORDER BY i.relname
+    """), parent).fetchall()
+
+    return {
+        'contraintes': [(nom, type_, definition) for nom, type_, definition in contraintes],
+        'index': [(nom, definition) for nom, definition in index]
+    }
+
+
+def nom_objet(nom_parent, table_name, partition):
+    """
+    Nom d'un index/contrainte de partition dérivé de celui du parent :
+    fait_accidents_pkey → fait_accidents_2019_pkey,
+    idx_fait_acc_date → idx_fait_acc_date_2019.
+    """
+    if nom_parent.startswith(table_name):
+        return partition + nom_parent[len(table_name):]
+    return f"{nom_parent}{partition[len(table_name):]}"
+
+
+# ════════════════════════════════════════════════════════════════
+# CONSTRUCTION D'UNE PARTITION (STAGING)
+# ════════════════════════════════════════════════════════════════
+
+def construire_staging(engine, df, table_name, schema, annee, ddl, colonne='date_id', chunksize=100000):
+    """
+    Table autonome {table}_{annee}_stg : COPY sans aucun index, puis
+    index et contraintes de la parente, et CHECK de plage qui permet à
+    ATTACH PARTITION de ne pas rescanner la table.
+    Les FK sont ajoutées NOT VALID puis validées dans une transaction
+    séparée : la validation ne verrouille pas les dimensions en écriture
+    et les workers ne se bloquent pas entre eux.
+    Retourne les renommages à appliquer après l'échange.
+    """
+    partition = f"{table_name}_{annee}"
+    staging = f"{schema}.{partition}{SUFFIXE_STAGING}"
+    debut, fin = bornes_annee(annee)
+    renommages = []
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        conn.execute(text(
+            f"CREATE TABLE {staging} (LIKE {schema}.{table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        charger_dataframe(df, f"{partition}{SUFFIXE_STAGING}", engine, schema=schema,
+                          mode='copy', chunksize=chunksize, conn=conn, verbose=False)
+
+        conn.execute(text(
+            f"ALTER TABLE {staging} ADD CONSTRAINT {partition}_plage{SUFFIXE_STAGING} "
+            f"CHECK ({colonne} IS NOT NULL AND {colonne} >= {debut} AND {colonne} < {fin})"
+        ))
+        for nom, type_, definition in ddl['contraintes']:
+            if type_ == 'f':
+                continue
+            final = nom_objet(nom, table_name, partition)
+            conn.execute(text(f"ALTER TABLE {staging} ADD CONSTRAINT {final}{SUFFIXE_STAGING} {definition}"))
+            renommages.append(('contrainte', f"{final}{SUFFIXE_STAGING}", final))
+        for nom, definition in ddl['index']:
+            final = nom_objet(nom, table_name, partition)
+            definition = re.sub(
+                r'^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+ ',
+                lambda m: f"CREATE {m.group(1) or ''}INDEX {final}{SUFFIXE_STAGING} ON {staging} ",
+                definition
+            )
+            conn.execute(text(definition))
+            renommages.append(('index', f"{final}{SUFFIXE_STAGING}", final))
+
+    fks = [(nom, definition) for nom, type_, definition in ddl['contraintes'] if type_ == 'f']
+    with engine.begin() as conn:
+        for nom, definition in fks:
+            conn.execute(text(f"ALTER TABLE {staging} ADD CONSTRAINT {nom} {definition} NOT VALID"))
+    with engine.begin() as conn:
+        for nom, _ in fks:
+            conn.execute(text(f"ALTER TABLE {staging} VALIDATE CONSTRAINT {nom}"))
+        conn.execute(text(f"ANALYZE {staging}"))
+
+    return renommages
+
+
+# ════════════════════════════════════════════════════════════════
+# ÉCHANGE
+# ════════════════════════════════════════════════════════════════
+
+def echanger_partitions(conn, table_name, schema, constructions, colonne='date_id', vider_absentes=False):
+    """
+    Dans la transaction `conn` : pour chaque année construite, DETACH +
+    DROP de l'ancienne partition (ou purge de ses lignes dans la partition
+    par défaut), renommage de la staging puis ATTACH PARTITION (la CHECK
+    de plage évite le scan de validation, supprimée ensuite).
+    vider_absentes : TRUNCATE des partitions des années non rechargées
+    (rechargement complet).
+    """
+    parent = f"{schema}.{table_name}"
+    partitions = lister_partitions(conn, table_name, schema)
+    defaut = partition_defaut(partitions)
+
+    if vider_absentes:
+        annees_chargees = {bornes_annee(annee) for annee in constructions}
+        absentes = [nom for nom, bornes in partitions.items() if bornes not in annees_chargees]
+        if absentes:
+            conn.execute(text(f"TRUNCATE {', '.join(f'{schema}.{nom}' for nom in absentes)}"))
+
+    for annee, renommages in sorted(constructions.items()):
+        partition = f"{table_name}_{annee}"
+        debut, fin = bornes_annee(annee)
+
+        ancienne = partition_annee(partitions, annee)
+        if ancienne:
+            conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {schema}.{ancienne}"))
+            conn.execute(text(f"DROP TABLE {schema}.{ancienne}"))
+        elif defaut and not vider_absentes:
+            conn.execute(text(
+                f"DELETE FROM {schema}.{defaut} WHERE {colonne} >= {debut} AND {colonne} < {fin}"
+            ))
+
+        conn.execute(text(f"ALTER TABLE {schema}.{partition}{SUFFIXE_STAGING} RENAME TO {partition}"))
+        for type_, temporaire, final in renommages:
+            if type_ == 'contrainte':
+                conn.execute(text(f"ALTER TABLE {schema}.{partition} RENAME CONSTRAINT {temporaire} TO {final}"))
+            else:
+                conn.execute(text(f"ALTER INDEX {schema}.{temporaire} RENAME TO {final}"))
+
+        conn.execute(text(
+            f"ALTER TABLE {parent} ATTACH PARTITION {schema}.{partition} "
+            f"FOR VALUES FROM ({debut}) TO ({fin})"
+        ))
+        conn.execute(text(
+            f"ALTER TABLE {schema}.{partition} DROP CONSTRAINT {partition}_plage{SUFFIXE_STAGING}"
+        ))
+
+
+# ════════════════════════════════════════════════════════════════
+# ORDONNANCEUR
+# ════════════════════════════════════════════════════════════════
+
+def supprimer_partitions_staging(engine, table_name, schema, annees):
+    """
+    Stagings restantes (échec, ou sans objet après un échange réussi).
+    """
+    with engine.begin() as conn:
+        for annee in annees:
+            conn.execute(text(f"DROP TABLE IF EXISTS {schema}.{table_name}_{annee}{SUFFIXE_STAGING}"))
+
+
+def construire_partitions(df, table_name, schema, engine, nb_workers=4, colonne='date_id', chunksize=100000):
+    """
+    Une staging par année construite en parallèle (une connexion du pool
+    par worker, années les plus volumineuses en premier), sans toucher à
+    l'arbre partitionné. En cas d'échec d'un worker, les stagings sont
+    supprimées.
+
+    Retourne (constructions à passer à echanger_partitions,
+    {partition: {'lignes': n, 'duree': s}}).
+    """
+    annees = (df[colonne] // 10000).astype('int64')
+    groupes = {int(annee): groupe for annee, groupe in df.groupby(annees.to_numpy(), sort=False)}
+
+    with engine.connect() as conn:
+        ddl = lire_ddl_parent(conn, table_name, schema)
+
+    file_taches = queue.Queue()
+    for annee in sorted(groupes, key=lambda a: len(groupes[a]), reverse=True):
+        file_taches.put(annee)
+
+    constructions = {}
+    stats = {}
+    erreurs = []
+    verrou = threading.Lock()
+
+    def worker():
+        while not erreurs:
+            try:
+                annee = file_taches.get_nowait()
+            except queue.Empty:
+                break
+            start = time.time()
+            try:
+                renommages = construire_staging(engine, groupes[annee], table_name, schema, annee, ddl,
+                                                colonne, chunksize)
+            except Exception as e:
+                erreurs.append(e)
+                break
+            with verrou:
+                constructions[annee] = renommages
+                stats[f"{schema}.{table_name}_{annee}"] = {
+                    'lignes': len(groupes[annee]),
+                    'duree': time.time() - start
+                }
+
+    nb_workers = max(1, min(nb_workers, len(groupes), engine.pool.size()))
+    threads = [threading.Thread(target=worker) for _ in range(nb_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if erreurs:
+        supprimer_partitions_staging(engine, table_name, schema, groupes)
+        raise erreurs[0]
+
+    return constructions, stats
+
+
+def charger_par_partitions(df, table_name, schema, engine, nb_workers=4, colonne='date_id',
+                           chunksize=100000, vider_absentes=True):
+    """
+    Charge df dans la table partitionnée par année : construire_partitions
+    puis échange atomique (echanger_partitions).
+
+    Retourne {partition: {'lignes': n, 'duree': s}}.
+    """
+    constructions, stats = construire_partitions(df, table_name, schema, engine, nb_workers, colonne, chunksize)
+    try:
+        with engine.begin() as conn:
+            echanger_partitions(conn, table_name, schema, constructions, colonne, vider_absentes)
+    finally:
+        supprimer_partitions_staging(engine, table_name, schema, constructions)
+    return stats
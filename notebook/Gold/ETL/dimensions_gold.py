@@ -0,0 +1,477 @@
+"""
+═══════════════════════════════════════════════════════════════════
+DIMENSIONS GOLD : CONSTRUCTION ENSEMBLISTE
+dim_conditions, dim_route, dim_geographie et dim_date construites à
+partir des seules combinaisons distinctes (SELECT DISTINCT sur le
+Bronze, ou drop_duplicates sur les DataFrames Silver), attributs
+dérivés par règles vectorisées, chargement par COPY dans une table
+staging puis upsert sur la clé naturelle de chaque dimension.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from dotenv import load_dotenv
+
+DOSSIER_NOTEBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+DOSSIER_RESSOURCES = os.path.join(DOSSIER_NOTEBOOK, 'resources')
+sys.path.insert(0, os.path.join(DOSSIER_NOTEBOOK, 'Silver', 'ETL'))
+sys.path.insert(0, DOSSIER_RESSOURCES)
+
+from chargement_parallele import creer_engine_pool
+from chargement_incremental import upsert_dataframe
+from refs_routes import get_categorie_route_df, get_profil_route_df, get_trace_plan_df, get_etat_surface_df
+
+try:
+    import holidays
+except ImportError:
+    holidays = None
+
+load_dotenv()
+
+logging.getLogger('sqlalchemy.engine').setLevel(logging.CRITICAL)
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST'),
+    'port': int(os.getenv('DB_PORT', 5432)),
+    'database': os.getenv('DB_NAME'),
+    'user': os.getenv('DB_USER'),
+    'password': os.getenv('DB_PASSWORD')
+}
+
+SCHEMA_GOLD = 'accidents_gold'
+TABLE_BRONZE = 'accidents_bronze.raw_accidents'
+
+# Calendrier complet de dim_date (cf. COMMENT ON TABLE : 2005 à 2025),
+# étendu si des accidents sortent de cette plage
+CALENDRIER = {
+    'debut': '2005-01-01',
+    'fin': '2025-12-31'
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# RÉFÉRENTIELS (notebook/resources)
+# ════════════════════════════════════════════════════════════════
+
+def charger_referentiel_json(fichier, cle):
+    with open(os.path.join(DOSSIER_RESSOURCES, fichier), encoding='utf-8') as f:
+        referentiel = pd.DataFrame(json.load(f)[cle])
+    referentiel['code'] = referentiel['code'].astype('int64')
+    return referentiel
+
+
+REF_LUMINOSITE = charger_referentiel_json('cond_lum.json', 'conditions_luminosite')    # code, libelle, est_nuit
+REF_METEO = charger_referentiel_json('cond_meteo.json', 'conditions_meteo')            # code, libelle, est_intemperie
+
+REFS_ROUTE = {
+    'categorie_route': get_categorie_route_df(),
+    'profil_route': get_profil_route_df(),
+    'trace_plan': get_trace_plan_df(),
+    'etat_surface': get_etat_surface_df()
+}
+
+NOMS_JOURS = np.array(['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche'])
+NOMS_MOIS = np.array(['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet',
+                      'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre'])
+# Indexé par le numéro de mois (indice 0 inutilisé)
+SAISONS = np.array(['', 'Hiver', 'Hiver', 'Printemps', 'Printemps', 'Printemps', 'Été',
+                    'Été', 'Été', 'Automne', 'Automne', 'Automne', 'Hiver'])
+
+
+def normaliser_libelles(series):
+    return series.astype('string').str.replace('\u00A0', ' ').str.strip().str.lower()
+
+
+def codes_depuis_valeurs(valeurs, referentiel):
+    """
+    Conversion tolérante d'une colonne (code numérique ou libellé,
+    comparé sans casse ni espaces) en code du référentiel.
+    Valeur non reconnue ou code absent du référentiel → NULL.
+    """
+    numeriques = pd.to_numeric(valeurs, errors='coerce')
+    par_libelle = normaliser_libelles(valeurs).map(
+        dict(zip(normaliser_libelles(referentiel['libelle']), referentiel['code']))
+    )
+    codes = numeriques.astype('Float64').fillna(par_libelle.astype('Float64')).astype('Int64')
+    return codes.where(codes.isin(referentiel['code']))
+
+
+def lire_distincts(conn, colonnes, non_nulles):
+    """
+    SELECT DISTINCT sur le Bronze : quelques dizaines de combinaisons
+    au lieu de centaines de milliers de lignes.
+    """
+    filtre = ' AND '.join(f"{col} IS NOT NULL" for col in non_nulles)
+    return pd.read_sql(text(f"""
+        SELECT DISTINCT {', '.join(colonnes)}
+        FROM {TABLE_BRONZE}
+        WHERE {filtre}
+    """), conn)
+
+
+# ════════════════════════════════════════════════════════════════
+# DIM_CONDITIONS
+# ════════════════════════════════════════════════════════════════
+
+COLONNES_DIM_CONDITIONS = [
+    'luminosite_code', 'luminosite_libelle', 'est_nuit',
+    'atm_code', 'atm_libelle', 'est_intemperie', 'niveau_risque'
+]
+
+
+def combinaisons_conditions_bronze(conn):
+    distincts = lire_distincts(conn, ['lum', 'atm'], ['lum', 'atm'])
+    return pd.DataFrame({
+        'luminosite_code': codes_depuis_valeurs(distincts['lum'], REF_LUMINOSITE),
+        'atm_code': codes_depuis_valeurs(distincts['atm'], REF_METEO)
+    })
+
+
+def combinaisons_conditions_silver(df_accidents):
+    distincts = df_accidents[['luminosite', 'conditions_atmospheriques']].drop_duplicates()
+    return pd.DataFrame({
+        'luminosite_code': codes_depuis_valeurs(distincts['luminosite'], REF_LUMINOSITE),
+        'atm_code': codes_depuis_valeurs(distincts['conditions_atmospheriques'], REF_METEO)
+    })
+
+
+def construire_dim_conditions(combinaisons):
+    """
+    Une ligne par couple (luminosite_code, atm_code) reconnu.
+    niveau_risque (CHECK 1 à 3) : 1 = ni nuit ni intempérie,
+    2 = l'un des deux, 3 = nuit + intempérie.
+    """
+    dim = combinaisons.dropna().drop_duplicates().astype('int64')
+
+    dim = dim.merge(
+        REF_LUMINOSITE.rename(columns={'code': 'luminosite_code', 'libelle': 'luminosite_libelle'}),
+        on='luminosite_code'
+    ).merge(
+        REF_METEO.rename(columns={'code': 'atm_code', 'libelle': 'atm_libelle'}),
+        on='atm_code'
+    )
+    dim['est_nuit'] = dim['est_nuit'].astype(bool)
+    dim['est_intemperie'] = dim['est_intemperie'].astype(bool)
+    dim['niveau_risque'] = 1 + dim['est_nuit'].astype(int) + dim['est_intemperie'].astype(int)
+
+    return dim.sort_values(['luminosite_code', 'atm_code'])[COLONNES_DIM_CONDITIONS].reset_index(drop=True)
+
+
+# ════════════════════════════════════════════════════════════════
+# DIM_ROUTE
+# ════════════════════════════════════════════════════════════════
+
+# Attribut dim_route → (colonne Bronze, colonne Silver lieux)
+SOURCES_ROUTE = {
+    'categorie_route': ('catr', 'categorie_route'),
+    'profil_route': ('prof', 'profil_route'),
+    'trace_plan': ('plan', 'trace_plan'),
+    'etat_surface': ('surf', 'etat_surface')
+}
+CODES_ROUTE = [f'{attribut}_code' for attribut in SOURCES_ROUTE]
+
+
+def combinaisons_route_bronze(conn):
+    colonnes = [bronze for bronze, _ in SOURCES_ROUTE.values()]
+    distincts = lire_distincts(conn, colonnes, ['catr'])
+    return pd.DataFrame({
+        f'{attribut}_code': codes_depuis_valeurs(distincts[bronze], REFS_ROUTE[attribut])
+        for attribut, (bronze, _) in SOURCES_ROUTE.items()
+    })
+
+
+def combinaisons_route_silver(df_lieux):
+    colonnes = [silver for _, silver in SOURCES_ROUTE.values()]
+    distincts = df_lieux[colonnes].drop_duplicates()
+    distincts = distincts[distincts['categorie_route'].notna()]
+    return pd.DataFrame({
+        f'{attribut}_code': codes_depuis_valeurs(distincts[silver], REFS_ROUTE[attribut])
+        for attribut, (_, silver) in SOURCES_ROUTE.items()
+    })
+
+
+def calculer_niveau_risque_route(dim):
+    """
+    Règles du notebook appliquées aux codes (première règle vérifiée) :
+      5 : surface verglacée
+      4 : sommet de côte + tracé en S
+      3 : surface dégradée (mouillée, flaques, inondée, enneigée, boue)
+      2 : surface normale + pente ou bas de côte
+      1 : sinon
+    """
+    surf = dim['etat_surface_code']
+    prof = dim['profil_route_code']
+    plan = dim['trace_plan_code']
+    conditions = [
+        (surf == 7).fillna(False),
+        ((prof == 3) & (plan == 4)).fillna(False),
+        surf.isin([2, 3, 4, 5, 6]),
+        ((surf == 1) & prof.isin([2, 4])).fillna(False)
+    ]
+    return np.select([c.to_numpy(dtype=bool) for c in conditions], [5, 4, 3, 2], default=1)
+
+
+def construire_dim_route(combinaisons):
+    """
+    Une ligne par combinaison de codes (NULL compris : profil ou tracé
+    non renseigné), libellés issus des référentiels refs_routes.
+    """
+    dim = combinaisons.drop_duplicates().reset_index(drop=True)
+
+    for attribut, referentiel in REFS_ROUTE.items():
+        libelles = referentiel.set_index('code')['libelle']
+        dim[f'{attribut}_libelle'] = dim[f'{attribut}_code'].map(libelles)
+
+    dim['niveau_risque_route'] = calculer_niveau_risque_route(dim)
+
+    colonnes = []
+    for attribut in REFS_ROUTE:
+        colonnes += [f'{attribut}_code', f'{attribut}_libelle']
+    return dim.sort_values(CODES_ROUTE)[colonnes + ['niveau_risque_route']].reset_index(drop=True)
+
+
+# ════════════════════════════════════════════════════════════════
+# DIM_GEOGRAPHIE
+# ════════════════════════════════════════════════════════════════
+
+# Code commune INSEE (Corse : 2A/2B) et code département
+REGEX_COM_CODE = r'[0-9][0-9AB][0-9]{3}'
+REGEX_DEPARTEMENT = r'[0-9][0-9AB][0-9]?'
+
+
+def communes_bronze(conn):
+    distincts = lire_distincts(conn, ['com', 'dep'], ['com', 'dep'])
+    return pd.DataFrame({
+        'com_code': distincts['com'].astype(str).str.zfill(5),
+        'departement_code': distincts['dep'].astype(str).str.strip()
+    })
+
+
+def communes_silver(df_accidents):
+    return df_accidents[['com_code', 'departement_code']].drop_duplicates().astype(str)
+
+
+def construire_dim_geographie(communes):
+    """
+    Une ligne par commune (com_code valide), avec son département ;
+    les noms et enrichissements restent à NULL.
+    """
+    valides = (
+        communes['com_code'].str.fullmatch(REGEX_COM_CODE)
+        & communes['departement_code'].str.fullmatch(REGEX_DEPARTEMENT)
+    ).fillna(False)
+    dim = communes[valides].drop_duplicates(subset=['com_code'])
+    return dim.sort_values('com_code').reset_index(drop=True)
+
+
+# ════════════════════════════════════════════════════════════════
+# DIM_DATE
+# ════════════════════════════════════════════════════════════════
+
+def dates_bronze(conn):
+    distincts = lire_distincts(conn, ['an', 'mois', 'jour'], ['an', 'mois', 'jour'])
+    return dates_depuis_composants(distincts['an'], distincts['mois'], distincts['jour'])
+
+
+def dates_silver(df_accidents):
+    distincts = df_accidents[['annee', 'mois', 'jour']].drop_duplicates()
+    return dates_depuis_composants(distincts['annee'], distincts['mois'], distincts['jour'])
+
+
+def dates_depuis_composants(annee, mois, jour):
+    """
+    Dates distinctes valides (les combinaisons impossibles sont écartées).
+    """
+    dates = pd.to_datetime(pd.DataFrame({
+        'year': pd.to_numeric(annee, errors='coerce'),
+        'month': pd.to_numeric(mois, errors='coerce'),
+        'day': pd.to_numeric(jour, errors='coerce')
+    }).astype('float64'), errors='coerce')
+    return pd.DatetimeIndex(dates.dropna().unique()).sort_values()
+
+
+@lru_cache(maxsize=8)
+def jours_feries(annee_debut, annee_fin):
+    """
+    Jours fériés français de toutes les années de la plage, calculés en
+    une fois (et mis en cache) : Series nom indexée par date.
+    """
+    if holidays is None:
+        print("  ⚠ Module holidays absent : est_jour_ferie = FALSE")
+        return pd.Series(dtype=object)
+    feries = holidays.France(years=range(annee_debut, annee_fin + 1))
+    return pd.Series(list(feries.values()), index=pd.DatetimeIndex(list(feries.keys())), dtype=object).sort_index()
+
+
+def generer_calendrier(debut=None, fin=None, dates_observees=None):
+    """
+    Tous les jours de debut à fin (CALENDRIER par défaut), plage élargie
+    aux années entières des dates observées qui en sortiraient : aucun
+    fait ne peut référencer un date_id absent.
+    """
+    debut = pd.Timestamp(debut or CALENDRIER['debut'])
+    fin = pd.Timestamp(fin or CALENDRIER['fin'])
+    if dates_observees is not None and len(dates_observees):
+        debut = min(debut, pd.Timestamp(year=dates_observees.min().year, month=1, day=1))
+        fin = max(fin, pd.Timestamp(year=dates_observees.max().year, month=12, day=31))
+    return pd.date_range(debut, fin, freq='D')
+
+
+def construire_dim_date(dates):
+    """
+    Une ligne par date, attributs calendaires vectorisés
+    (jour_semaine ISO : 1 = lundi).
+    """
+    dates = pd.DatetimeIndex(dates)
+    iso = dates.isocalendar()
+    feries = jours_feries(int(dates.year.min()), int(dates.year.max())) if len(dates) else pd.Series(dtype=object)
+
+    dim = pd.DataFrame({
+        'date_id': dates.year * 10000 + dates.month * 100 + dates.day,
+        'date_complete': dates.date,
+        'annee': dates.year,
+        'mois': dates.month,
+        'jour': dates.day,
+        'trimestre': dates.quarter,
+        'semestre': np.where(dates.month <= 6, 1, 2),
+        'jour_semaine': dates.dayofweek + 1,
+        'nom_jour': NOMS_JOURS[dates.dayofweek],
+        'nom_mois': NOMS_MOIS[dates.month - 1],
+        'semaine_annee': iso['week'].to_numpy(dtype='int64'),
+        'jour_annee': dates.dayofyear,
+        'est_weekend': dates.dayofweek >= 5,
+        'est_jour_ferie': dates.isin(feries.index),
+        'nom_jour_ferie': feries.reindex(dates).to_numpy(),
+        'saison': SAISONS[dates.month]
+    })
+    return dim
+
+
+# ════════════════════════════════════════════════════════════════
+# CHARGEMENT
+# ════════════════════════════════════════════════════════════════
+
+# Clés naturelles (contraintes UNIQUE) des dimensions à identifiant SERIAL
+CLES_DIMENSIONS = {
+    'dim_conditions': ['luminosite_code', 'atm_code'],
+    'dim_route': CODES_ROUTE
+}
+
+
+def charger_dimension(df, table_name, engine):
+    """
+    Upsert de dim_conditions / dim_route sur leur clé naturelle : les
+    condition_id / route_id existants sont conservés et les faits qui
+    les référencent ne sont pas vidés. Les codes absents (NULL) comptent
+    comme égaux, la contrainte UNIQUE (NULLS DISTINCT) ne les voyant pas.
+    Retourne le nombre de lignes insérées ou mises à jour.
+    """
+    with engine.begin() as conn:
+        _, nb_ecrites = upsert_dataframe(df, table_name, conn, CLES_DIMENSIONS[table_name],
+                                         schema=SCHEMA_GOLD, nulls_egaux=True)
+    return nb_ecrites
+
+
+def charger_dim_date(df, engine):
+    """
+    Chargement idempotent de dim_date : un COPY dans une table staging
+    puis INSERT ... ON CONFLICT (date_id) DO UPDATE des seules lignes
+    modifiées. Relancer avec le même calendrier n'écrit rien et, à la
+    différence d'un TRUNCATE CASCADE, ne vide pas les faits.
+    Retourne le nombre de lignes insérées ou mises à jour.
+    """
+    with engine.begin() as conn:
+        _, nb_ecrites = upsert_dataframe(df, 'dim_date', conn, ['date_id'], schema=SCHEMA_GOLD)
+    return nb_ecrites
+
+
+def charger_dim_geographie(df, engine):
+    """
+    Upsert sur com_code : les geo_id existants (et les enrichissements
+    saisis à la main) sont conservés d'une exécution à l'autre.
+    """
+    with engine.begin() as conn:
+        _, nb_ecrites = upsert_dataframe(df, 'dim_geographie', conn, ['com_code'], schema=SCHEMA_GOLD)
+    return nb_ecrites
+
+
+def construire_dimensions(engine, dataframes_silver=None):
+    """
+    Construit et charge dim_conditions, dim_route, dim_geographie et dim_date.
+    dataframes_silver (sortie de etl_silver) : combinaisons calculées sur
+    les DataFrames en mémoire ; sinon SELECT DISTINCT sur le Bronze.
+    Retourne {table: DataFrame chargé}.
+    """
+    print("\n[DIMENSIONS GOLD]")
+    print("-"*70)
+
+    if dataframes_silver is not None:
+        print("  Source : DataFrames Silver")
+        sources = {
+            'dim_conditions': lambda: combinaisons_conditions_silver(dataframes_silver['accidents']),
+            'dim_route': lambda: combinaisons_route_silver(dataframes_silver['lieux']),
+            'dim_geographie': lambda: communes_silver(dataframes_silver['accidents']),
+            'dim_date': lambda: dates_silver(dataframes_silver['accidents'])
+        }
+    else:
+        print(f"  Source : {TABLE_BRONZE} (SELECT DISTINCT)")
+
+        def distincts(fonction):
+            def lire():
+                with engine.connect() as conn:
+                    return fonction(conn)
+            return lire
+
+        sources = {
+            'dim_conditions': distincts(combinaisons_conditions_bronze),
+            'dim_route': distincts(combinaisons_route_bronze),
+            'dim_geographie': distincts(communes_bronze),
+            'dim_date': distincts(dates_bronze)
+        }
+
+    constructeurs = {
+        'dim_conditions': construire_dim_conditions,
+        'dim_route': construire_dim_route,
+        'dim_geographie': construire_dim_geographie,
+        'dim_date': lambda dates: construire_dim_date(generer_calendrier(dates_observees=dates))
+    }
+    chargeurs = {
+        'dim_conditions': lambda dim: charger_dimension(dim, 'dim_conditions', engine),
+        'dim_route': lambda dim: charger_dimension(dim, 'dim_route', engine),
+        'dim_geographie': lambda dim: charger_dim_geographie(dim, engine),
+        'dim_date': lambda dim: charger_dim_date(dim, engine)
+    }
+
+    dimensions = {}
+    for table_name, constructeur in constructeurs.items():
+        start = time.time()
+        dim = constructeur(sources[table_name]())
+        duree_construction = time.time() - start
+        nb_lignes = chargeurs[table_name](dim)
+        print(f"  ✓ {table_name:<15} : {len(dim):>6,} lignes, {nb_lignes:>6,} écrites "
+              f"(construction {duree_construction*1000:.0f} ms, total {time.time()-start:.2f}s)")
+        dimensions[table_name] = dim
+
+    return dimensions
+
+
+# ════════════════════════════════════════════════════════════════
+# EXÉCUTION
+# ════════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    engine = creer_engine_pool(DB_CONFIG, 1)
+    construire_dimensions(engine)
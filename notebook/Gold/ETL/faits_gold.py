@@ -0,0 +1,574 @@
+"""
+═══════════════════════════════════════════════════════════════════
+FAITS GOLD : fait_accidents, fait_vehicules, fait_usagers
+Métriques par véhicule et par accident en un seul groupby sur les
+usagers Silver, clés de dimensions résolues par tables de hachage en
+mémoire (get_indexer), chargement COPY parallèle des trois faits.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from dimensions_gold import DB_CONFIG, SCHEMA_GOLD, construire_dimensions, normaliser_libelles
+
+from chargement_parallele import (
+    creer_engine_pool, charger_tables_parallele, preparer_remplacement, echanger_tables, supprimer_stagings
+)
+from chargement_partitions import (
+    est_partitionnee, assurer_partitions, construire_partitions, echanger_partitions, supprimer_partitions_staging
+)
+from refresh_vues import rafraichir_vues
+from lac_parquet import ecrire_lac
+from mappings_silver import CATEGORIE_VEHICULE_MAPPING, OBSTACLE_MOBILE_MAPPING
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    # 'partitions' : fait_accidents construit année par année hors de l'arbre
+    # (staging + ATTACH PARTITION) ; 'copy' : COPY direct dans la table parente
+    'mode_chargement_accidents': 'partitions',
+    # Composantes agg_* recalculées pour les seules années chargées
+    # (sql_mvp/04_Vues (Refresh)/02_agregats_incrementaux.sql)
+    'agregats_incrementaux': True,
+    # Vues mv_* rafraîchies après chargement, en parallèle selon leurs
+    # dépendances (refresh_vues.py, historique dans historique_refresh)
+    'refresh_vues_materialisees': True,
+    'nb_workers_chargement': 3,
+    'taille_partition_chargement': 500000,
+    'copy_chunk_size': 100000,
+    # Faits aussi écrits en Parquet partitionné par année / département (lac_parquet.py)
+    'lac_parquet': True,
+    'dossier_lac': os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Lac')
+}
+
+# Pondération du score de gravité (COMMENT ON COLUMN score_gravite_total)
+SCORE_GRAVITE = {1: 0, 2: 100, 3: 10, 4: 1}    # indemne, tué, hospitalisé, blessé léger
+
+# Bornes des CHECK des tables de faits : hors bornes → NULL
+BORNES_VEHICULES = {
+    'obstacle_fixe': (0, 16),
+    'obstacle_mobile': (0, 9),
+    'point_choc': (0, 9),
+    'manoeuvre': (0, 24)
+}
+BORNES_USAGERS = {
+    'motif_deplacement': (0, 9),
+    'localisation_pieton': (0, 8),
+    'action_pieton': (0, 9),
+    'etat_pieton': (0, 3)
+}
+
+TRANCHES_AGE = {
+    'bornes': [-1, 14, 24, 34, 44, 54, 64, 74, 120],
+    'libelles': ['0-14', '15-24', '25-34', '35-44', '45-54', '55-64', '65-74', '75+']
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# OUTILS
+# ════════════════════════════════════════════════════════════════
+
+def entiers(series):
+    """
+    Colonne Silver (Int8/Int16, category...) → float64 NumPy (NaN = NULL),
+    pour les comparaisons vectorisées.
+    """
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def borner(series, minimum, maximum):
+    valeurs = pd.to_numeric(series, errors='coerce').astype('Int64')
+    return valeurs.where((valeurs >= minimum) & (valeurs <= maximum))
+
+
+def cles_hachage(df, colonnes):
+    """
+    Clé de jointure : Index simple ou MultiIndex, dont le get_indexer est
+    une table de hachage. Codes numériques en int64 (NULL → -1), autres
+    colonnes en texte, pour que Silver et dimensions aient le même type.
+    """
+    tableaux = []
+    for col in colonnes:
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            tableaux.append(df[col].fillna(-1).astype('int64').to_numpy())
+        else:
+            tableaux.append(df[col].astype(object).where(df[col].notna(), None).astype(str).to_numpy())
+    if len(tableaux) == 1:
+        return pd.Index(tableaux[0])
+    return pd.MultiIndex.from_arrays(tableaux)
+
+
+def resoudre(df, colonnes_df, dimension, colonnes_dim, colonne_resultat):
+    """
+    Valeur de `colonne_resultat` de la dimension pour chaque ligne de df
+    (jointure sur colonnes_df = colonnes_dim) ; absente → NULL.
+    """
+    positions = cles_hachage(dimension, colonnes_dim).get_indexer(cles_hachage(df, colonnes_df))
+    valeurs = dimension[colonne_resultat].to_numpy()
+    return pd.array(pd.api.extensions.take(valeurs, positions, allow_fill=True))
+
+
+def lire_dimensions(engine):
+    """
+    Dimensions chargées (avec leurs identifiants SERIAL) pour les lookups.
+    """
+    requetes = {
+        'dim_date': "SELECT date_id, est_weekend FROM {schema}.dim_date",
+        'dim_geographie': "SELECT geo_id, com_code FROM {schema}.dim_geographie",
+        'dim_conditions': "SELECT condition_id, luminosite_code, atm_code, est_nuit FROM {schema}.dim_conditions",
+        'dim_route': """SELECT route_id, categorie_route_code, profil_route_code, trace_plan_code,
+                               etat_surface_code FROM {schema}.dim_route""",
+        'dim_vehicule': "SELECT vehicule_id, categorie_code, categorie_libelle FROM {schema}.dim_vehicule"
+    }
+    with engine.connect() as conn:
+        return {
+            table_name: pd.read_sql(text(requete.format(schema=SCHEMA_GOLD)), conn)
+            for table_name, requete in requetes.items()
+        }
+
+
+# ════════════════════════════════════════════════════════════════
+# MÉTRIQUES (un seul groupby sur les usagers)
+# ════════════════════════════════════════════════════════════════
+
+def metriques(df_vehicules, df_usagers):
+    """
+    Indicateurs par usager puis somme par (num_acc, num_veh) en une
+    passe ; les totaux accident sont la somme des totaux véhicule (déjà
+    agrégés, quelques centaines de milliers de lignes), complétée du
+    nombre de véhicules. Retourne (par_vehicule, par_accident).
+    """
+    gravite = entiers(df_usagers['gravite'])
+    indicateurs = pd.DataFrame({
+        'num_acc': df_usagers['num_acc'].to_numpy(),
+        'num_veh': df_usagers['num_veh'].astype(str).to_numpy(),
+        'nb_usagers': np.ones(len(df_usagers), dtype='int32'),
+        'nb_tues': (gravite == 2).astype('int32'),
+        'nb_hosp': (gravite == 3).astype('int32'),
+        'nb_legers': (gravite == 4).astype('int32'),
+        'nb_indemnes': (gravite == 1).astype('int32')
+    })
+
+    par_vehicule = indicateurs.groupby(['num_acc', 'num_veh'], sort=False).sum()
+    par_accident = par_vehicule.groupby(level='num_acc', sort=False).sum()
+
+    vehicules = df_vehicules[['num_acc', 'num_veh']].dropna().astype({'num_acc': object}).drop_duplicates()
+    nb_vehicules = vehicules.groupby('num_acc', sort=False).size().rename('nb_vehicules')
+    par_accident = par_accident.join(nb_vehicules, how='outer').fillna(0).astype('int32')
+
+    return par_vehicule.reset_index(), par_accident
+
+
+# ════════════════════════════════════════════════════════════════
+# FAIT_ACCIDENTS
+# ════════════════════════════════════════════════════════════════
+
+def construire_fait_accidents(df_accidents, df_lieux, par_accident, dimensions):
+    """
+    Grain : 1 accident. Les accidents sans date valide dans dim_date
+    (date_id NOT NULL) sont écartés.
+    """
+    df_accidents = df_accidents.drop_duplicates(subset=['num_acc']).reset_index(drop=True)
+    fait = pd.DataFrame({
+        'num_acc': df_accidents['num_acc'].to_numpy(),
+        'date_id': (
+            pd.to_numeric(df_accidents['annee'], errors='coerce').astype('Int64') * 10000
+            + pd.to_numeric(df_accidents['mois'], errors='coerce').astype('Int64') * 100
+            + pd.to_numeric(df_accidents['jour'], errors='coerce').astype('Int64')
+        ).to_numpy()
+    })
+
+    # Clés de dimensions (tables de hachage)
+    fait['est_weekend'] = resoudre(fait, ['date_id'], dimensions['dim_date'], ['date_id'], 'est_weekend')
+    dates_valides = fait['est_weekend'].notna().to_numpy()
+    if not dates_valides.all():
+        print(f"  ⚠ {(~dates_valides).sum():,} accidents sans date dans dim_date écartés")
+    fait = fait[dates_valides].reset_index(drop=True)
+    accidents = df_accidents[dates_valides].reset_index(drop=True)
+    lieux = df_lieux.drop_duplicates('num_acc').set_index('num_acc').reindex(fait['num_acc']).reset_index()
+
+    fait['geo_id'] = resoudre(accidents, ['com_code'], dimensions['dim_geographie'], ['com_code'], 'geo_id')
+    fait['condition_id'] = resoudre(
+        accidents, ['luminosite', 'conditions_atmospheriques'],
+        dimensions['dim_conditions'], ['luminosite_code', 'atm_code'], 'condition_id'
+    )
+    fait['route_id'] = resoudre(
+        lieux, ['categorie_route', 'profil_route', 'trace_plan', 'etat_surface'],
+        dimensions['dim_route'],
+        ['categorie_route_code', 'profil_route_code', 'trace_plan_code', 'etat_surface_code'],
+        'route_id'
+    )
+
+    # Caractéristiques dénormalisées
+    fait['heure'] = borner(accidents['heure'], 0, 23).to_numpy()
+    fait['est_weekend'] = fait['est_weekend'].astype(bool)
+    fait['est_nuit'] = resoudre(
+        accidents, ['luminosite', 'conditions_atmospheriques'],
+        dimensions['dim_conditions'], ['luminosite_code', 'atm_code'], 'est_nuit'
+    ).fillna(False).astype(bool)
+    fait['en_agglomeration'] = accidents['en_agglomeration'].fillna(False).astype(bool).to_numpy()
+    fait['est_intersection'] = entiers(accidents['type_intersection']) > 1       # 1 = hors intersection
+    fait['type_collision'] = pd.to_numeric(accidents['type_collision'], errors='coerce').astype('Int64').to_numpy()
+
+    # Métriques agrégées
+    metriques = par_accident.reindex(fait['num_acc'].astype(object)).fillna(0).astype('int64')
+    fait['nb_vehicules'] = metriques['nb_vehicules'].to_numpy()
+    fait['nb_usagers_total'] = metriques['nb_usagers'].to_numpy()
+    fait['nb_tues_total'] = metriques['nb_tues'].to_numpy()
+    fait['nb_blesses_hosp_total'] = metriques['nb_hosp'].to_numpy()
+    fait['nb_blesses_legers_total'] = metriques['nb_legers'].to_numpy()
+    fait['nb_indemnes_total'] = metriques['nb_indemnes'].to_numpy()
+    fait['nb_victimes_total'] = fait['nb_tues_total'] + fait['nb_blesses_hosp_total'] + fait['nb_blesses_legers_total']
+    fait['score_gravite_total'] = (
+        SCORE_GRAVITE[2] * fait['nb_tues_total']
+        + SCORE_GRAVITE[3] * fait['nb_blesses_hosp_total']
+        + SCORE_GRAVITE[4] * fait['nb_blesses_legers_total']
+    )
+    fait['est_accident_mortel'] = fait['nb_tues_total'] > 0
+    fait['est_accident_grave'] = (fait['nb_tues_total'] + fait['nb_blesses_hosp_total']) > 0
+
+    fait['latitude'] = accidents['latitude'].to_numpy(dtype='float64', na_value=np.nan)
+    fait['longitude'] = accidents['longitude'].to_numpy(dtype='float64', na_value=np.nan)
+
+    return fait.reset_index(drop=True)
+
+
+# ════════════════════════════════════════════════════════════════
+# FAIT_VEHICULES
+# ════════════════════════════════════════════════════════════════
+
+def types_vehicule(dim_vehicule):
+    """
+    Code catégorie Silver → vehicule_id de dim_vehicule. Les codes Silver
+    (CATEGORIE_VEHICULE_MAPPING) ne sont pas les codes BAAC de la
+    dimension : la correspondance se fait sur le libellé.
+    """
+    libelles_silver = pd.DataFrame({
+        'categorie_vehicule': list(CATEGORIE_VEHICULE_MAPPING.values()),
+        'libelle': normaliser_libelles(pd.Series(list(CATEGORIE_VEHICULE_MAPPING.keys()))).to_numpy()
+    })
+    dimension = pd.DataFrame({
+        'libelle': normaliser_libelles(dim_vehicule['categorie_libelle']).to_numpy(),
+        'vehicule_id': dim_vehicule['vehicule_id'].to_numpy()
+    })
+    return libelles_silver.merge(dimension, on='libelle')[['categorie_vehicule', 'vehicule_id']]
+
+
+def construire_fait_vehicules(df_vehicules, par_vehicule, fait_accidents, dimensions):
+    """
+    Grain : 1 véhicule d'un accident retenu dans fait_accidents (dont
+    les accident_id doivent déjà être attribués).
+    """
+    vehicules = df_vehicules[
+        df_vehicules['num_veh'].notna()
+        & df_vehicules['num_acc'].isin(fait_accidents['num_acc'])
+    ].drop_duplicates(subset=['num_acc', 'num_veh']).reset_index(drop=True)
+
+    fait = pd.DataFrame({
+        'accident_fk': resoudre(vehicules, ['num_acc'], fait_accidents, ['num_acc'], 'accident_id'),
+        'num_acc': vehicules['num_acc'].to_numpy(),
+        'num_veh': vehicules['num_veh'].astype(str).to_numpy()
+    })
+    fait['vehicule_type_id'] = resoudre(
+        vehicules, ['categorie_vehicule'],
+        types_vehicule(dimensions['dim_vehicule']), ['categorie_vehicule'], 'vehicule_id'
+    )
+
+    sens = pd.to_numeric(vehicules['sens_circulation'], errors='coerce').astype('Int64')
+    fait['sens_circulation'] = sens.where(sens.isin([1, 2])).to_numpy()
+    for colonne, (minimum, maximum) in BORNES_VEHICULES.items():
+        fait[colonne] = borner(vehicules[colonne], minimum, maximum).to_numpy()
+
+    # Métriques issues des usagers du véhicule
+    positions = cles_hachage(par_vehicule, ['num_acc', 'num_veh']).get_indexer(
+        cles_hachage(fait, ['num_acc', 'num_veh'])
+    )
+
+    def metrique(colonne):
+        return pd.api.extensions.take(par_vehicule[colonne].to_numpy(), positions, allow_fill=True, fill_value=0)
+
+    fait['nb_occupants'] = metrique('nb_usagers')
+    fait['nb_tues_vehicule'] = metrique('nb_tues')
+    fait['nb_blesses_vehicule'] = metrique('nb_hosp') + metrique('nb_legers')
+    fait['nb_indemnes_vehicule'] = metrique('nb_indemnes')
+
+    fait['est_vehicule_implique_mortel'] = fait['nb_tues_vehicule'] > 0
+    fait['a_heurte_obstacle_fixe'] = (fait['obstacle_fixe'] > 0).fillna(False).astype(bool)
+    fait['a_heurte_pieton'] = (fait['obstacle_mobile'] == OBSTACLE_MOBILE_MAPPING['Piéton']).fillna(False).astype(bool)
+
+    return fait
+
+
+# ════════════════════════════════════════════════════════════════
+# FAIT_USAGERS
+# ════════════════════════════════════════════════════════════════
+
+def construire_fait_usagers(df_usagers, fait_vehicules):
+    """
+    Grain : 1 usager rattaché à un véhicule de fait_vehicules, avec
+    catégorie et gravité renseignées (NOT NULL + CHECK 1 à 4).
+    """
+    positions = cles_hachage(fait_vehicules, ['num_acc', 'num_veh']).get_indexer(
+        cles_hachage(df_usagers, ['num_acc', 'num_veh'])
+    )
+    categorie = borner(df_usagers['categorie_usager'], 1, 4)
+    gravite = borner(df_usagers['gravite'], 1, 4)
+
+    sans_vehicule = positions < 0
+    retenus = ~sans_vehicule & categorie.notna().to_numpy() & gravite.notna().to_numpy()
+    if not retenus.all():
+        print(f"  ⚠ {sans_vehicule.sum():,} usagers sans véhicule, "
+              f"{(~retenus & ~sans_vehicule).sum():,} sans catégorie/gravité écartés")
+    usagers = df_usagers[retenus].reset_index(drop=True)
+    categorie = categorie[retenus].reset_index(drop=True)
+    gravite = gravite[retenus].reset_index(drop=True)
+    positions = positions[retenus]
+
+    fait = pd.DataFrame({
+        'vehicule_fk': fait_vehicules['vehicule_id'].to_numpy()[positions],
+        'accident_fk': fait_vehicules['accident_fk'].to_numpy()[positions],
+        'num_acc': usagers['num_acc'].to_numpy(),
+        'place_vehicule': pd.to_numeric(usagers['place_vehicule'], errors='coerce').astype('Int64').to_numpy(),
+        'categorie_usager': categorie.to_numpy(),
+        'gravite': gravite.to_numpy()
+    })
+
+    sexe = pd.to_numeric(usagers['sexe'], errors='coerce').astype('Int64')
+    fait['sexe'] = sexe.where(sexe.isin([1, 2])).to_numpy()
+    fait['age'] = borner(usagers['age_au_moment_accident'], 0, 120).to_numpy()
+    fait['tranche_age'] = pd.cut(
+        fait['age'].astype('float64'), bins=TRANCHES_AGE['bornes'], labels=TRANCHES_AGE['libelles']
+    ).astype(object)
+    for colonne, (minimum, maximum) in BORNES_USAGERS.items():
+        fait[colonne] = borner(usagers[colonne], minimum, maximum).to_numpy()
+
+    # Code équipement Silver (EQUIPEMENT_SECURITE_MAPPING, 0 = aucun) : le
+    # format BAAC XY n'étant pas conservé, l'utilisation reste inconnue
+    equipement = pd.to_numeric(usagers['equipement_securite'], errors='coerce').astype('Int64')
+    fait['equipement_securite'] = equipement.astype('string').to_numpy()
+    fait['equipement_present'] = (equipement > 0).to_numpy()
+    fait['equipement_utilise'] = pd.array([pd.NA] * len(fait), dtype='boolean')
+
+    fait['score_gravite_usager'] = fait['gravite'].map(SCORE_GRAVITE).astype('int64')
+
+    return fait
+
+
+# ════════════════════════════════════════════════════════════════
+# CONSTRUCTION ET CHARGEMENT
+# ════════════════════════════════════════════════════════════════
+
+def construire_faits(dataframes_silver, dimensions):
+    """
+    Construit les trois faits depuis les DataFrames Silver (dict retourné
+    par etl_silver). Les identifiants (accident_id, vehicule_id) sont
+    attribués ici (1..n) pour relier les faits sans aller-retour en base.
+    """
+    start = time.time()
+    par_vehicule, par_accident = metriques(dataframes_silver['vehicules'], dataframes_silver['usagers'])
+    print(f"  ✓ Métriques : {len(par_vehicule):,} véhicules, {len(par_accident):,} accidents "
+          f"({time.time() - start:.2f}s)")
+
+    start = time.time()
+    fait_accidents = construire_fait_accidents(
+        dataframes_silver['accidents'], dataframes_silver['lieux'], par_accident, dimensions
+    )
+    fait_accidents.insert(0, 'accident_id', np.arange(1, len(fait_accidents) + 1, dtype='int64'))
+    print(f"  ✓ fait_accidents : {len(fait_accidents):,} lignes ({time.time() - start:.2f}s)")
+
+    start = time.time()
+    fait_vehicules = construire_fait_vehicules(dataframes_silver['vehicules'], par_vehicule, fait_accidents, dimensions)
+    fait_vehicules.insert(0, 'vehicule_id', np.arange(1, len(fait_vehicules) + 1, dtype='int64'))
+    print(f"  ✓ fait_vehicules : {len(fait_vehicules):,} lignes ({time.time() - start:.2f}s)")
+
+    start = time.time()
+    fait_usagers = construire_fait_usagers(dataframes_silver['usagers'], fait_vehicules)
+    print(f"  ✓ fait_usagers : {len(fait_usagers):,} lignes ({time.time() - start:.2f}s)")
+
+    return {
+        'fait_accidents': fait_accidents,
+        'fait_vehicules': fait_vehicules,
+        'fait_usagers': fait_usagers
+    }
+
+
+def charger_faits(faits, engine, mode=None):
+    """
+    Rechargement complet des trois faits, séquences recalées sur les
+    identifiants attribués en Python.
+    - mode 'copy' : TRUNCATE puis COPY parallèle dans les tables (FK
+      désactivées par worker), index maintenus ligne à ligne ;
+    - mode 'partitions' : fait_accidents construit par année dans des
+      stagings indexées en parallèle, fait_vehicules et fait_usagers dans
+      des stagings indexées et validées (preparer_remplacement), puis les
+      trois faits échangés dans UNE transaction (ATTACH PARTITION et
+      renommage). accident_id et vehicule_id étant renumérotés à chaque
+      run, aucun lecteur ne voit des véhicules rattachés aux accidents
+      d'un autre chargement ; les anciennes données restent interrogeables
+      jusqu'à l'échange et sont conservées si une construction échoue.
+    Les partitions annuelles manquantes sont créées dans les deux modes ;
+    si fait_accidents n'est pas partitionnée, chargement en mode 'copy'.
+    """
+    mode = mode or CONFIG['mode_chargement_accidents']
+    fait_accidents = faits['fait_accidents']
+    annees = (fait_accidents['date_id'] // 10000).unique()
+
+    with engine.connect() as conn:
+        partitionnee = est_partitionnee(conn, 'fait_accidents', SCHEMA_GOLD)
+
+    if partitionnee:
+        creees = assurer_partitions(engine, 'fait_accidents', SCHEMA_GOLD, annees)
+        if creees:
+            print(f"  ✓ Partitions créées : {', '.join(creees)}")
+    elif mode == 'partitions':
+        print("  ⚠ fait_accidents non partitionnée : chargement en mode 'copy'")
+        mode = 'copy'
+
+    if mode == 'partitions':
+        return charger_faits_partitions(faits, engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"TRUNCATE {SCHEMA_GOLD}.fait_usagers, {SCHEMA_GOLD}.fait_vehicules, {SCHEMA_GOLD}.fait_accidents "
+            f"RESTART IDENTITY"
+        ))
+
+    stats = charger_tables_parallele(
+        [(table_name, faits[table_name], SCHEMA_GOLD) for table_name in ['fait_accidents', 'fait_vehicules', 'fait_usagers']],
+        engine,
+        nb_workers=CONFIG['nb_workers_chargement'],
+        taille_partition=CONFIG['taille_partition_chargement'],
+        chunksize=CONFIG['copy_chunk_size']
+    )
+
+    with engine.begin() as conn:
+        recaler_sequences(conn, faits)
+    return stats
+
+
+def charger_faits_partitions(faits, engine):
+    """
+    Mode 'partitions' de charger_faits : constructions hors ligne, puis
+    échange des trois faits et recalage des séquences en une transaction.
+    """
+    constructions, stats = construire_partitions(
+        faits['fait_accidents'], 'fait_accidents', SCHEMA_GOLD, engine,
+        nb_workers=CONFIG['nb_workers_chargement'],
+        chunksize=CONFIG['copy_chunk_size']
+    )
+    try:
+        remplacement = preparer_remplacement(
+            [(table_name, faits[table_name], SCHEMA_GOLD) for table_name in ['fait_vehicules', 'fait_usagers']],
+            engine,
+            nb_workers=CONFIG['nb_workers_chargement'],
+            taille_partition=CONFIG['taille_partition_chargement'],
+            chunksize=CONFIG['copy_chunk_size']
+        )
+    except Exception:
+        supprimer_partitions_staging(engine, 'fait_accidents', SCHEMA_GOLD, constructions)
+        raise
+
+    try:
+        start = time.time()
+        with engine.begin() as conn:
+            echanger_partitions(conn, 'fait_accidents', SCHEMA_GOLD, constructions, vider_absentes=True)
+            echanger_tables(conn, remplacement)
+            recaler_sequences(conn, faits)
+        print(f"  ✓ Échange des trois faits en une transaction : {time.time() - start:.2f}s")
+    finally:
+        supprimer_partitions_staging(engine, 'fait_accidents', SCHEMA_GOLD, constructions)
+        supprimer_stagings(engine, remplacement)
+
+    stats.update(remplacement['stats'])
+    return stats
+
+
+def recaler_sequences(conn, faits):
+    for table_name, colonne_id in [('fait_accidents', 'accident_id'), ('fait_vehicules', 'vehicule_id')]:
+        if len(faits[table_name]):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{SCHEMA_GOLD}.{table_name}', '{colonne_id}'), "
+                f"{int(faits[table_name][colonne_id].max())})"
+            ))
+
+
+def maj_agregats(engine, annees):
+    """
+    Maintenance incrémentale des agrégats Gold pour les années chargées.
+    Les années encore présentes dans les agrégats mais qui n'ont plus
+    aucun accident (partition vidée) sont recalculées, donc purgées.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text(
+            f"SELECT to_regprocedure('{SCHEMA_GOLD}.maj_agregats_incrementaux(integer[])')"
+        )).scalar() is None:
+            print("  ⚠ maj_agregats_incrementaux() absente : agrégats non maintenus")
+            return None
+
+        annees = set(int(a) for a in annees) | set(conn.execute(text(f"""
+            SELECT DISTINCT a.annee FROM {SCHEMA_GOLD}.agg_stats_hebdomadaires a
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {SCHEMA_GOLD}.fait_accidents f
+                WHERE f.date_id >= a.annee * 10000 + 101 AND f.date_id < (a.annee + 1) * 10000 + 101
+            )
+        """)).scalars())
+        resultats = conn.execute(
+            text(f"SELECT * FROM {SCHEMA_GOLD}.maj_agregats_incrementaux(:annees)"),
+            {'annees': sorted(annees)}
+        ).fetchall()
+
+    for agregat, supprimees, inserees, duree in resultats:
+        print(f"  ✓ {agregat:<30} -{supprimees:>8,} / +{inserees:>8,} lignes ({float(duree):.2f}s)")
+    return resultats
+
+
+def etl_gold(dataframes_silver, engine):
+    """
+    Dimensions puis faits Gold depuis les DataFrames Silver.
+    """
+    print("\n" + "="*70)
+    print("ETL GOLD - DIMENSIONS ET FAITS")
+    print("="*70)
+    start_total = time.time()
+
+    construire_dimensions(engine, dataframes_silver)
+    dimensions = lire_dimensions(engine)
+
+    print("\n[FAITS]")
+    faits = construire_faits(dataframes_silver, dimensions)
+
+    start = time.time()
+    print(f"\n[CHARGEMENT] mode {CONFIG['mode_chargement_accidents']}")
+    stats = charger_faits(faits, engine)
+    for table_name, stat in stats.items():
+        print(f"  ✓ {table_name} : {stat['lignes']:,} lignes chargées ({stat['duree']:.2f}s)")
+    print(f"  ✓ Chargement : {time.time() - start:.2f}s")
+
+    if CONFIG['lac_parquet']:
+        print("\n[LAC PARQUET]")
+        ecrire_lac(faits, CONFIG['dossier_lac'], accidents=dataframes_silver['accidents'])
+
+    if CONFIG['agregats_incrementaux']:
+        print("\n[AGRÉGATS INCRÉMENTAUX]")
+        maj_agregats(engine, faits['fait_accidents']['date_id'] // 10000)
+
+    if CONFIG['refresh_vues_materialisees']:
+        rafraichir_vues(engine)
+
+    print(f"\n⏱ ETL Gold : {time.time() - start_total:.2f}s")
+    return faits
+
+
+if __name__ == "__main__":
+    from silver_ETL_parquet_vectorise import etl_silver
+
+    engine = creer_engine_pool(DB_CONFIG, CONFIG['nb_workers_chargement'])
+    etl_gold(etl_silver(), engine)
@@ -0,0 +1,306 @@
+"""
+═══════════════════════════════════════════════════════════════════
+REFRESH DES VUES MATÉRIALISÉES : ORDONNANCEUR PAR DÉPENDANCES
+Graphe des vues lu dans pg_depend, vues indépendantes rafraîchies en
+parallèle (une connexion du pool par worker), reprises par vue,
+historique par vue (durée, lignes, statut) dans historique_refresh.
+Remplace la fonction plpgsql refresh_all_materialized_views() (série,
+arrêt sur la première erreur).
+═══════════════════════════════════════════════════════════════════
+"""
+
+import sys
+import time
+import queue
+import threading
+import uuid
+from sqlalchemy import text
+
+from dimensions_gold import DB_CONFIG, SCHEMA_GOLD
+
+from chargement_parallele import creer_engine_pool
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'nb_workers': 4,
+    'tentatives': 3,                # par vue, première exécution comprise
+    'delai_reprise': 1.0,           # secondes, doublé à chaque reprise
+    'lock_timeout': '30s'           # une vue verrouillée échoue (puis reprise) au lieu de bloquer le lot
+}
+
+# Même définition que sql_mvp/04_Vues (Refresh)/03_create_historique_refresh.sql
+SQL_CREATE_HISTORIQUE = f"""
+    CREATE TABLE IF NOT EXISTS {SCHEMA_GOLD}.historique_refresh (
+        refresh_id BIGSERIAL PRIMARY KEY,
+        lot_id VARCHAR(36) NOT NULL,
+        vue_name VARCHAR(100) NOT NULL,
+        mode_refresh VARCHAR(20),
+        statut VARCHAR(10) NOT NULL CHECK (statut IN ('ok', 'echec', 'ignoree')),
+        tentatives INTEGER NOT NULL DEFAULT 0,
+        debut TIMESTAMP,
+        fin TIMESTAMP,
+        duree_secondes NUMERIC(10, 3),
+        nb_lignes BIGINT,
+        erreur TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_historique_refresh_vue
+        ON {SCHEMA_GOLD}.historique_refresh(vue_name, debut DESC)
+"""
+
+
+# ════════════════════════════════════════════════════════════════
+# GRAPHE DE DÉPENDANCES
+# ════════════════════════════════════════════════════════════════
+
+def lire_graphe(conn, schema=SCHEMA_GOLD):
+    """
+    {vue_materialisee: {vues matérialisées dont elle dépend}}.
+    Les dépendances passent par la règle _RETURN de chaque vue
+    (pg_rewrite → pg_depend) ; les vues simples intermédiaires sont
+    traversées pour retrouver les vues matérialisées sous-jacentes.
+    """
+    lignes = conn.execute(text("""
+        SELECT v.oid, v.relname, v.relkind, n.nspname, ref.oid, ref.relkind
+        FROM pg_class v
+        JOIN pg_namespace n ON n.oid = v.relnamespace
+        JOIN pg_rewrite r ON r.ev_class = v.oid
+        JOIN pg_depend d ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+        JOIN pg_class ref ON ref.oid = d.refobjid
+        WHERE v.relkind IN ('m', 'v')
+          AND ref.oid <> v.oid
+    """)).fetchall()
+
+    noms = {}
+    types = {}
+    references = {}
+    for oid, nom, relkind, nspname, ref_oid, ref_relkind in lignes:
+        noms[oid] = (nspname, nom)
+        types[oid] = relkind
+        types.setdefault(ref_oid, ref_relkind)
+        references.setdefault(oid, set()).add(ref_oid)
+
+    def vues_materialisees_amont(oid, vues_visitees):
+        amont = set()
+        for ref in references.get(oid, ()):
+            if types.get(ref) == 'm':
+                amont.add(ref)
+            elif types.get(ref) == 'v' and ref not in vues_visitees:
+                vues_visitees.add(ref)
+                amont |= vues_materialisees_amont(ref, vues_visitees)
+        return amont
+
+    vues = conn.execute(text("""
+        SELECT c.oid, c.relname FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'm' AND n.nspname = :schema
+    """), {'schema': schema}).fetchall()
+
+    graphe = {}
+    for oid, nom in vues:
+        graphe[nom] = {
+            noms[ref][1] for ref in vues_materialisees_amont(oid, set())
+            if ref in noms and noms[ref][0] == schema
+        }
+    return graphe
+
+
+def verifier_acyclique(graphe):
+    """
+    Tri topologique (Kahn) : lève ValueError si le graphe a un cycle.
+    """
+    restants = {vue: set(deps) for vue, deps in graphe.items()}
+    ordre = []
+    while restants:
+        prets = sorted(vue for vue, deps in restants.items() if not deps)
+        if not prets:
+            raise ValueError(f"Cycle de dépendances entre vues : {sorted(restants)}")
+        for vue in prets:
+            ordre.append(vue)
+            del restants[vue]
+        for deps in restants.values():
+            deps.difference_update(prets)
+    return ordre
+
+
+# ════════════════════════════════════════════════════════════════
+# REFRESH D'UNE VUE
+# ════════════════════════════════════════════════════════════════
+
+def mode_refresh(conn, vue, schema=SCHEMA_GOLD):
+    """
+    CONCURRENTLY (lectures non bloquées) si la vue est peuplée et a un
+    index unique sans prédicat, sinon REFRESH complet.
+    """
+    peuplee, index_unique = conn.execute(text("""
+        SELECT m.ispopulated,
+               EXISTS (SELECT 1 FROM pg_index i
+                       WHERE i.indrelid = CAST(:vue AS regclass)
+                         AND i.indisunique AND i.indpred IS NULL)
+        FROM pg_matviews m
+        WHERE m.schemaname = :schema AND m.matviewname = :nom
+    """), {'vue': f"{schema}.{vue}", 'schema': schema, 'nom': vue}).one()
+    return 'concurrently' if peuplee and index_unique else 'complet'
+
+
+def rafraichir_vue(engine, vue, schema=SCHEMA_GOLD):
+    """
+    Refresh d'une vue avec reprises. Retourne le résultat (statut, durée,
+    lignes, tentatives, erreur) sans jamais lever.
+    """
+    resultat = {'vue_name': vue, 'statut': 'echec', 'tentatives': 0, 'mode_refresh': None,
+                'nb_lignes': None, 'erreur': None}
+    resultat['debut'] = resultat['fin'] = None
+    debut = time.time()
+
+    for tentative in range(1, CONFIG['tentatives'] + 1):
+        resultat['tentatives'] = tentative
+        try:
+            with engine.begin() as conn:
+                # Horloge serveur, comparable à etl_watermarks.mis_a_jour_le : le
+                # début de transaction précède l'instantané lu par le refresh
+                resultat['debut'] = conn.execute(text("SELECT LOCALTIMESTAMP")).scalar()
+                conn.execute(text(f"SET LOCAL lock_timeout = '{CONFIG['lock_timeout']}'"))
+                mode = mode_refresh(conn, vue, schema)
+                resultat['mode_refresh'] = mode
+                conn.execute(text(
+                    f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if mode == 'concurrently' else ''}{schema}.{vue}"
+                ))
+                resultat['nb_lignes'] = conn.execute(text(f"SELECT COUNT(*) FROM {schema}.{vue}")).scalar()
+                resultat['fin'] = conn.execute(text("SELECT CAST(clock_timestamp() AS TIMESTAMP)")).scalar()
+            resultat['statut'] = 'ok'
+            resultat['erreur'] = None
+            break
+        except Exception as e:
+            resultat['erreur'] = str(getattr(e, 'orig', e)).strip()
+            if tentative < CONFIG['tentatives']:
+                time.sleep(CONFIG['delai_reprise'] * 2 ** (tentative - 1))
+
+    resultat['duree_secondes'] = round(time.time() - debut, 3)
+    return resultat
+
+
+def enregistrer_historique(engine, lot_id, resultats, schema=SCHEMA_GOLD):
+    with engine.begin() as conn:
+        conn.execute(text(SQL_CREATE_HISTORIQUE))
+        for r in resultats:
+            conn.execute(text(f"""
+                INSERT INTO {schema}.historique_refresh
+                    (lot_id, vue_name, mode_refresh, statut, tentatives, debut, fin,
+                     duree_secondes, nb_lignes, erreur)
+                VALUES (:lot_id, :vue_name, :mode_refresh, :statut, :tentatives, :debut, :fin,
+                        :duree_secondes, :nb_lignes, :erreur)
+            """), {'lot_id': lot_id, **{k: r.get(k) for k in [
+                'vue_name', 'mode_refresh', 'statut', 'tentatives', 'debut', 'fin',
+                'duree_secondes', 'nb_lignes', 'erreur'
+            ]}})
+
+
+# ════════════════════════════════════════════════════════════════
+# ORDONNANCEUR
+# ════════════════════════════════════════════════════════════════
+
+def rafraichir_vues(engine, vues=None, schema=SCHEMA_GOLD, nb_workers=None):
+    """
+    Rafraîchit les vues matérialisées du schéma (ou `vues`, avec leurs
+    dépendances déjà à jour supposées) : une vue démarre dès que toutes
+    celles dont elle dépend sont à jour. Une vue en échec après ses
+    reprises n'interrompt pas le lot ; les vues qui en dépendent sont
+    ignorées. Retourne la liste des résultats (aussi écrits dans
+    historique_refresh).
+    """
+    nb_workers = nb_workers or CONFIG['nb_workers']
+    lot_id = str(uuid.uuid4())
+
+    with engine.connect() as conn:
+        graphe = lire_graphe(conn, schema)
+    if vues is not None:
+        graphe = {vue: deps & set(vues) for vue, deps in graphe.items() if vue in vues}
+    verifier_acyclique(graphe)
+
+    print(f"\n[REFRESH VUES MATÉRIALISÉES] {len(graphe)} vue(s), lot {lot_id[:8]}")
+    for vue, deps in sorted(graphe.items()):
+        if deps:
+            print(f"  {vue} ← {', '.join(sorted(deps))}")
+
+    file_taches = queue.Queue()
+    file_resultats = queue.Queue()
+
+    def worker():
+        while True:
+            vue = file_taches.get()
+            if vue is None:
+                break
+            file_resultats.put(rafraichir_vue(engine, vue, schema))
+
+    nb_workers = max(1, min(nb_workers, len(graphe), engine.pool.size()))
+    threads = [threading.Thread(target=worker) for _ in range(nb_workers)]
+    for thread in threads:
+        thread.start()
+
+    start = time.time()
+    statuts = {}
+    attente = {vue: set(deps) for vue, deps in graphe.items()}
+    resultats = []
+    en_cours = 0
+
+    def lancer_prets():
+        nonlocal en_cours
+        for vue in sorted(attente):
+            deps = attente[vue]
+            if any(statuts.get(dep) in ('echec', 'ignoree') for dep in deps):
+                del attente[vue]
+                statuts[vue] = 'ignoree'
+                resultats.append({'vue_name': vue, 'statut': 'ignoree', 'tentatives': 0,
+                                  'erreur': 'dépendance en échec : ' + ', '.join(
+                                      sorted(d for d in deps if statuts.get(d) != 'ok'))})
+                print(f"  ⚠ {vue:<30} ignorée (dépendance en échec)")
+                return True
+            if all(statuts.get(dep) == 'ok' for dep in deps):
+                del attente[vue]
+                statuts[vue] = 'en_cours'
+                file_taches.put(vue)
+                en_cours += 1
+        return False
+
+    try:
+        while attente or en_cours:
+            # Une vue ignorée peut en rendre d'autres ignorables : on relance
+            while lancer_prets():
+                pass
+            if not en_cours:
+                continue
+            resultat = file_resultats.get()
+            en_cours -= 1
+            statuts[resultat['vue_name']] = resultat['statut']
+            resultats.append(resultat)
+            if resultat['statut'] == 'ok':
+                print(f"  ✓ {resultat['vue_name']:<30} {resultat['nb_lignes']:>8,} lignes "
+                      f"{resultat['duree_secondes']:6.2f}s ({resultat['mode_refresh']}"
+                      f"{', ' + str(resultat['tentatives']) + ' tentatives' if resultat['tentatives'] > 1 else ''})")
+            else:
+                print(f"  ❌ {resultat['vue_name']:<30} échec après {resultat['tentatives']} tentative(s) : "
+                      f"{resultat['erreur'].splitlines()[0]}")
+    finally:
+        for _ in threads:
+            file_taches.put(None)
+        for thread in threads:
+            thread.join()
+
+    duree = time.time() - start
+    cumul = sum(r.get('duree_secondes') or 0 for r in resultats)
+    nb_ok = sum(r['statut'] == 'ok' for r in resultats)
+    print(f"  ⏱ Fenêtre de refresh {duree:.2f}s (cumul des vues {cumul:.2f}s) - "
+          f"{nb_ok}/{len(resultats)} vue(s) à jour")
+
+    enregistrer_historique(engine, lot_id, resultats, schema)
+    return resultats
+
+
+if __name__ == "__main__":
+    engine = creer_engine_pool(DB_CONFIG, CONFIG['nb_workers'])
+    resultats = rafraichir_vues(engine, vues=sys.argv[1:] or None)
+    sys.exit(0 if all(r['statut'] == 'ok' for r in resultats) else 1)
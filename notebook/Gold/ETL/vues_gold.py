@@ -0,0 +1,811 @@
+"""
+═══════════════════════════════════════════════════════════════════
+VUES MATÉRIALISÉES GOLD : DÉFINITION UNIQUE
+Source unique des vues mv_* : le SQL de
+sql_mvp/03_Gold/vues_materialisees/ est généré depuis VUES.
+Les comptages sont émis en COUNT(*) FILTER (WHERE ...) (agrégation
+par hachage) lorsque le grain de la table de faits garantit une ligne
+par identifiant compté, au lieu de COUNT(DISTINCT CASE WHEN ...).
+Usage : python vues_gold.py ecrire | creer | parite | explain
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import json
+from sqlalchemy import text
+
+from dimensions_gold import DB_CONFIG, SCHEMA_GOLD
+
+from chargement_parallele import creer_engine_pool
+
+
+DOSSIER_SQL = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'sql_mvp', '03_Gold', 'vues_materialisees'
+)
+
+
+# ════════════════════════════════════════════════════════════════
+# DÉFINITIONS
+# ════════════════════════════════════════════════════════════════
+
+# Chaque vue :
+# - grain : identifiant unique par ligne du FROM (fait × dimensions en
+#   N-1) ; COUNT(DISTINCT grain) ≡ COUNT(*) ;
+# - comptages : {nom: condition ou None} comptés sur le grain, ou
+#   {'distinct': expr} pour un vrai comptage distinct (hors grain) ;
+# - sections : colonnes (nom, expression) ; les expressions référencent
+#   les comptages par {nom} pour que les deux formes restent identiques.
+
+VUES = {
+    'mv_stats_hebdomadaires': {
+        'fichier': '01_mv_stats_hebdomadaires.sql',
+        'titre': 'Statistiques hebdomadaires',
+        'objectif': 'Détecter les semaines anormales (écarts à la moyenne)',
+        'refresh': 'Après chaque chargement ETL',
+        'grain': 'f.accident_id',
+        'comptages': {
+            'nb_accidents': None,
+            'nb_accidents_mortels': 'f.est_accident_mortel',
+            'nb_accidents_graves': 'f.est_accident_grave',
+            'nb_accidents_weekend': 'f.est_weekend',
+            'nb_accidents_nuit': 'f.est_nuit',
+            'nb_accidents_agglomeration': 'f.en_agglomeration',
+            'nb_accidents_hors_agglomeration': 'NOT f.en_agglomeration'
+        },
+        'sections': [
+            ('PÉRIODE', [
+                ('annee', 'd.annee'),
+                ('semaine_annee', 'd.semaine_annee'),
+                ('date_debut_semaine', 'MIN(d.date_complete)'),
+                ('date_fin_semaine', 'MAX(d.date_complete)')
+            ]),
+            ('COMPTAGES ACCIDENTS', [
+                ('nb_accidents', '{nb_accidents}'),
+                ('nb_accidents_mortels', '{nb_accidents_mortels}'),
+                ('nb_accidents_graves', '{nb_accidents_graves}')
+            ]),
+            ('COMPTAGES VICTIMES', [
+                ('nb_tues', 'SUM(f.nb_tues_total)'),
+                ('nb_blesses_hospitalises', 'SUM(f.nb_blesses_hosp_total)'),
+                ('nb_blesses_legers', 'SUM(f.nb_blesses_legers_total)'),
+                ('nb_victimes_total', 'SUM(f.nb_victimes_total)'),
+                ('nb_indemnes', 'SUM(f.nb_indemnes_total)')
+            ]),
+            ('SCORE DE GRAVITÉ', [
+                ('gravite_moyenne', 'AVG(f.score_gravite_total)'),
+                ('ecart_type_gravite', 'STDDEV(f.score_gravite_total)'),
+                ('gravite_min', 'MIN(f.score_gravite_total)'),
+                ('gravite_max', 'MAX(f.score_gravite_total)')
+            ]),
+            ('RÉPARTITION TEMPORELLE', [
+                ('nb_accidents_weekend', '{nb_accidents_weekend}'),
+                ('nb_accidents_nuit', '{nb_accidents_nuit}')
+            ]),
+            ('RÉPARTITION GÉOGRAPHIQUE', [
+                ('nb_accidents_agglomeration', '{nb_accidents_agglomeration}'),
+                ('nb_accidents_hors_agglomeration', '{nb_accidents_hors_agglomeration}')
+            ]),
+            ('MOYENNES PAR ACCIDENT', [
+                ('nb_vehicules_moyen_par_accident', 'AVG(f.nb_vehicules)'),
+                ('nb_victimes_moyen_par_accident', 'AVG(f.nb_victimes_total)')
+            ]),
+            ('RATIO GRAVITÉ', [
+                ('taux_mortalite_par_accident', """CASE
+        WHEN {nb_accidents} > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / {nb_accidents}) * 100
+        ELSE 0
+    END"""),
+                ('taux_mortalite_par_victime', """CASE
+        WHEN SUM(f.nb_victimes_total) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100
+        ELSE 0
+    END""")
+            ])
+        ],
+        'from': """accidents_gold.fait_accidents f
+JOIN accidents_gold.dim_date d ON f.date_id = d.date_id""",
+        'group_by': 'd.annee, d.semaine_annee',
+        'order_by': 'd.annee, d.semaine_annee',
+        'index': [
+            ('idx_mv_stats_hebdo_pk', '(annee, semaine_annee)', True),
+            ('idx_mv_stats_hebdo_nb_accidents', '(nb_accidents)', False),
+            ('idx_mv_stats_hebdo_gravite', '(gravite_moyenne DESC)', False),
+            ('idx_mv_stats_hebdo_tues', '(nb_tues DESC)', False)
+        ],
+        'commentaire': "Statistiques hebdomadaires pré-agrégées pour détection d''anomalies temporelles. Refresh: CONCURRENTLY après chaque ETL.",
+        'commentaires_colonnes': {
+            'gravite_moyenne': 'Score moyen de gravité (tué=100, hosp=10, blessé=1) pour comparaisons',
+            'taux_mortalite_par_accident': 'Pourcentage : (nb_tués / nb_accidents) * 100',
+            'taux_mortalite_par_victime': 'Pourcentage : (nb_tués / nb_victimes) * 100 - Indicateur de gravité'
+        },
+        'validation': """SELECT
+    'Vue matérialisée créée' as statut,
+    COUNT(*) as nb_semaines,
+    MIN(annee) as annee_min,
+    MAX(annee) as annee_max
+FROM accidents_gold.mv_stats_hebdomadaires;"""
+    },
+
+    'mv_zones_a_risque': {
+        'fichier': '02_mv_zones_a_risque.sql',
+        'titre': 'Zones à risque',
+        'objectif': 'Identifier zones géographiques dangereuses',
+        'refresh': 'Hebdomadaire ou après chargement données',
+        'grain': 'f.accident_id',
+        'comptages': {
+            'nb_accidents': None,
+            'nb_accidents_mortels': 'f.est_accident_mortel',
+            'nb_accidents_graves': 'f.est_accident_grave',
+            'nb_accidents_weekend': 'f.est_weekend',
+            'nb_accidents_nuit': 'f.est_nuit',
+            'nb_accidents_agglomeration': 'f.en_agglomeration',
+            'nb_accidents_hors_agglomeration': 'NOT f.en_agglomeration',
+            'nb_annees_observees': {'distinct': 'd.annee'}
+        },
+        'sections': [
+            ('GÉOGRAPHIE', [
+                (col, f'g.{col}') for col in [
+                    'geo_id', 'com_code', 'com_name', 'com_arm_name', 'departement_code', 'departement_name',
+                    'region_code', 'region_name', 'type_zone', 'population', 'densite_population'
+                ]
+            ]),
+            ('COMPTAGES ACCIDENTS', [
+                ('nb_accidents_total', '{nb_accidents}'),
+                ('nb_accidents_mortels', '{nb_accidents_mortels}'),
+                ('nb_accidents_graves', '{nb_accidents_graves}')
+            ]),
+            ('COMPTAGES VICTIMES', [
+                ('nb_tues_total', 'SUM(f.nb_tues_total)'),
+                ('nb_blesses_hosp_total', 'SUM(f.nb_blesses_hosp_total)'),
+                ('nb_blesses_legers_total', 'SUM(f.nb_blesses_legers_total)'),
+                ('nb_victimes_total', 'SUM(f.nb_victimes_total)')
+            ]),
+            ('GRAVITÉ', [
+                ('gravite_moyenne', 'AVG(f.score_gravite_total)'),
+                ('gravite_max', 'MAX(f.score_gravite_total)')
+            ]),
+            ('RÉPARTITION TEMPORELLE', [
+                ('nb_accidents_weekend', '{nb_accidents_weekend}'),
+                ('nb_accidents_nuit', '{nb_accidents_nuit}')
+            ]),
+            ('RÉPARTITION SPATIALE', [
+                ('nb_accidents_agglomeration', '{nb_accidents_agglomeration}'),
+                ('nb_accidents_hors_agglomeration', '{nb_accidents_hors_agglomeration}')
+            ]),
+            ('NORMALISATION PAR POPULATION\n    -- (Indicateurs clés pour comparaison)', [
+                ('taux_accidents_pour_10k_hab', """CASE
+        WHEN g.population > 0
+        THEN ({nb_accidents}::DECIMAL / g.population) * 10000
+        ELSE NULL
+    END"""),
+                ('taux_tues_pour_100k_hab', """CASE
+        WHEN g.population > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / g.population) * 100000
+        ELSE NULL
+    END"""),
+                ('taux_victimes_pour_10k_hab', """CASE
+        WHEN g.population > 0
+        THEN (SUM(f.nb_victimes_total)::DECIMAL / g.population) * 10000
+        ELSE NULL
+    END""")
+            ]),
+            ('RATIO GRAVITÉ', [
+                ('pct_accidents_graves', """CASE
+        WHEN {nb_accidents} > 0
+        THEN ({nb_accidents_graves}::DECIMAL / {nb_accidents}) * 100
+        ELSE 0
+    END"""),
+                ('nb_tues_moyen_par_accident', """CASE
+        WHEN {nb_accidents} > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / {nb_accidents})
+        ELSE 0
+    END""")
+            ]),
+            ("PÉRIODE D'ANALYSE", [
+                ('premiere_date', 'MIN(d.date_complete)'),
+                ('derniere_date', 'MAX(d.date_complete)'),
+                ('nb_annees_observees', '{nb_annees_observees}')
+            ])
+        ],
+        'from': """accidents_gold.fait_accidents f
+JOIN accidents_gold.dim_geographie g ON f.geo_id = g.geo_id
+JOIN accidents_gold.dim_date d ON f.date_id = d.date_id""",
+        'group_by': """
+    g.geo_id, g.com_code, g.com_name, g.com_arm_name,
+    g.departement_code, g.departement_name,
+    g.region_code, g.region_name,
+    g.type_zone, g.population, g.densite_population""",
+        'having': ('{nb_accidents} >= 3', 'Seuil minimum pour significativité statistique'),
+        'index': [
+            ('idx_mv_zones_risque_pk', '(geo_id)', True),
+            ('idx_mv_zones_risque_dept', '(departement_code)', False),
+            ('idx_mv_zones_risque_region', '(region_code)', False),
+            ('idx_mv_zones_risque_nb_accidents', '(nb_accidents_total DESC)', False),
+            ('idx_mv_zones_risque_gravite', '(gravite_moyenne DESC)', False),
+            ('idx_mv_zones_risque_taux_norm', '(taux_accidents_pour_10k_hab DESC NULLS LAST)', False),
+            ('idx_mv_zones_risque_taux_tues', '(taux_tues_pour_100k_hab DESC NULLS LAST)', False),
+            ('idx_mv_zones_risque_pct_graves', '(pct_accidents_graves DESC)', False)
+        ],
+        'commentaire': 'Zones géographiques à risque avec normalisation par population. Seuil: >=3 accidents pour significativité.',
+        'commentaires_colonnes': {
+            'taux_accidents_pour_10k_hab': "Nombre d''accidents pour 10 000 habitants - Permet comparaison entre communes",
+            'taux_tues_pour_100k_hab': 'Nombre de tués pour 100 000 habitants - Indicateur mortalité routière normalisé',
+            'pct_accidents_graves': "Pourcentage d''accidents graves (tués ou hospitalisés) sur total accidents",
+            'nb_tues_moyen_par_accident': 'Indicateur de létalité : moyenne de tués par accident'
+        },
+        'validation': """SELECT
+    'Vue matérialisée créée' as statut,
+    COUNT(*) as nb_communes,
+    COUNT(DISTINCT departement_code) as nb_departements,
+    COUNT(DISTINCT region_code) as nb_regions,
+    SUM(nb_accidents_total) as total_accidents,
+    SUM(nb_tues_total) as total_tues
+FROM accidents_gold.mv_zones_a_risque;"""
+    },
+
+    'mv_profil_risque_conditions': {
+        'fichier': '03_mv_profil_risque_conditions.sql',
+        'titre': 'Profil de risque par conditions',
+        'objectif': 'Identifier combinaisons météo + route à risque',
+        'refresh': 'Hebdomadaire ou après chargement données',
+        'grain': 'f.accident_id',
+        'comptages': {
+            'nb_accidents': None,
+            'nb_accidents_mortels': 'f.est_accident_mortel',
+            'nb_accidents_graves': 'f.est_accident_grave',
+            'nb_accidents_weekend': 'f.est_weekend',
+            'nb_accidents_agglomeration': 'f.en_agglomeration'
+        },
+        'sections': [
+            ('DIMENSIONS CONDITIONS', [
+                ('condition_id', 'c.condition_id'),
+                ('luminosite_code', 'c.luminosite_code'),
+                ('luminosite_libelle', 'c.luminosite_libelle'),
+                ('est_nuit', 'c.est_nuit'),
+                ('atm_code', 'c.atm_code'),
+                ('atm_libelle', 'c.atm_libelle'),
+                ('est_intemperie', 'c.est_intemperie'),
+                ('niveau_risque_conditions', 'c.niveau_risque')
+            ]),
+            ('DIMENSIONS ROUTE', [
+                (col, f'r.{col}') for col in [
+                    'route_id', 'categorie_route_code', 'categorie_route_libelle', 'profil_route_code',
+                    'profil_route_libelle', 'trace_plan_code', 'trace_plan_libelle', 'etat_surface_code',
+                    'etat_surface_libelle', 'niveau_risque_route'
+                ]
+            ]),
+            ('COMPTAGES ACCIDENTS', [
+                ('nb_accidents', '{nb_accidents}'),
+                ('nb_accidents_mortels', '{nb_accidents_mortels}'),
+                ('nb_accidents_graves', '{nb_accidents_graves}')
+            ]),
+            ('COMPTAGES VICTIMES', [
+                ('nb_tues', 'SUM(f.nb_tues_total)'),
+                ('nb_blesses_hosp', 'SUM(f.nb_blesses_hosp_total)'),
+                ('nb_blesses_legers', 'SUM(f.nb_blesses_legers_total)'),
+                ('nb_victimes', 'SUM(f.nb_victimes_total)')
+            ]),
+            ('GRAVITÉ', [
+                ('gravite_moyenne', 'AVG(f.score_gravite_total)'),
+                ('ecart_type_gravite', 'STDDEV(f.score_gravite_total)'),
+                ('gravite_max', 'MAX(f.score_gravite_total)')
+            ]),
+            ('RATIOS DE GRAVITÉ', [
+                ('pct_accidents_graves', """CASE
+        WHEN {nb_accidents} > 0
+        THEN ({nb_accidents_graves}::DECIMAL / {nb_accidents}) * 100
+        ELSE 0
+    END"""),
+                ('pct_accidents_mortels', """CASE
+        WHEN {nb_accidents} > 0
+        THEN ({nb_accidents_mortels}::DECIMAL / {nb_accidents}) * 100
+        ELSE 0
+    END"""),
+                ('taux_mortalite_par_victime', """CASE
+        WHEN SUM(f.nb_victimes_total) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100
+        ELSE 0
+    END"""),
+                ('nb_tues_moyen_par_accident', """CASE
+        WHEN {nb_accidents} > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / {nb_accidents})
+        ELSE 0
+    END""")
+            ]),
+            ('SCORE DE RISQUE COMPOSITE', [
+                ('score_risque_composite', """CASE
+        WHEN {nb_accidents} >= 10 THEN
+            -- Pondération: 50% gravité moyenne + 30% % accidents graves + 20% taux mortalité
+            (AVG(f.score_gravite_total) / 100.0) * 0.5 +
+            ({nb_accidents_graves}::DECIMAL / {nb_accidents}) * 0.3 +
+            (SUM(f.nb_tues_total)::DECIMAL / NULLIF(SUM(f.nb_victimes_total), 0)) * 0.2
+        ELSE NULL
+    END""")
+            ]),
+            ('RÉPARTITION TEMPORELLE', [
+                ('nb_accidents_weekend', '{nb_accidents_weekend}'),
+                ('nb_accidents_agglomeration', '{nb_accidents_agglomeration}')
+            ])
+        ],
+        'from': """accidents_gold.fait_accidents f
+JOIN accidents_gold.dim_conditions c ON f.condition_id = c.condition_id
+JOIN accidents_gold.dim_route r ON f.route_id = r.route_id""",
+        'group_by': """
+    c.condition_id, c.luminosite_code, c.luminosite_libelle, c.est_nuit,
+    c.atm_code, c.atm_libelle, c.est_intemperie, c.niveau_risque,
+    r.route_id, r.categorie_route_code, r.categorie_route_libelle,
+    r.profil_route_code, r.profil_route_libelle,
+    r.trace_plan_code, r.trace_plan_libelle,
+    r.etat_surface_code, r.etat_surface_libelle,
+    r.niveau_risque_route""",
+        'having': ('{nb_accidents} >= 10', 'Seuil minimum pour significativité'),
+        'index': [
+            ('idx_mv_profil_risque_pk', '(condition_id, route_id)', True),
+            ('idx_mv_profil_risque_nb_accidents', '(nb_accidents DESC)', False),
+            ('idx_mv_profil_risque_gravite', '(gravite_moyenne DESC)', False),
+            ('idx_mv_profil_risque_pct_graves', '(pct_accidents_graves DESC)', False),
+            ('idx_mv_profil_risque_score', '(score_risque_composite DESC NULLS LAST)', False),
+            ('idx_mv_profil_risque_conditions', '(est_nuit, est_intemperie)', False),
+            ('idx_mv_profil_risque_surface', '(etat_surface_code)', False)
+        ],
+        'commentaire': 'Profil de risque par combinaison conditions (météo + luminosité) × route. Seuil: >=10 accidents.',
+        'commentaires_colonnes': {
+            'score_risque_composite': 'Score pondéré : 50% gravité + 30% % graves + 20% taux mortalité. NULL si <10 accidents (non significatif)',
+            'pct_accidents_graves': "Pourcentage d''accidents avec >=1 tué ou hospitalisé",
+            'taux_mortalite_par_victime': '(Tués / Total victimes) * 100 - Indicateur de létalité'
+        },
+        'validation': """SELECT
+    'Vue matérialisée créée' as statut,
+    COUNT(*) as nb_combinaisons,
+    SUM(nb_accidents) as total_accidents,
+    SUM(nb_tues) as total_tues,
+    AVG(gravite_moyenne) as gravite_moyenne_globale,
+    MAX(score_risque_composite) as score_risque_max
+FROM accidents_gold.mv_profil_risque_conditions;
+
+-- Top 10 combinaisons les plus dangereuses
+SELECT
+    luminosite_libelle,
+    atm_libelle,
+    categorie_route_libelle,
+    etat_surface_libelle,
+    nb_accidents,
+    pct_accidents_graves,
+    score_risque_composite
+FROM accidents_gold.mv_profil_risque_conditions
+WHERE score_risque_composite IS NOT NULL
+ORDER BY score_risque_composite DESC
+LIMIT 10;"""
+    },
+
+    'mv_analyse_vehicules': {
+        'fichier': '04_mv_analyse_vehicules.sql',
+        'titre': 'Analyse par type de véhicule',
+        'objectif': 'Statistiques de risque par catégorie de véhicule',
+        'refresh': 'Hebdomadaire',
+        'grain': 'fv.vehicule_id',
+        'comptages': {
+            'nb_vehicules': None,
+            'nb_accidents': {'distinct': 'fv.accident_fk'},      # plusieurs véhicules par accident
+            'nb_vehicules_avec_tues': 'fv.est_vehicule_implique_mortel',
+            'nb_avec_obstacle_fixe': 'fv.a_heurte_obstacle_fixe',
+            'nb_ayant_heurte_pieton': 'fv.a_heurte_pieton'
+        },
+        'sections': [
+            ('DIMENSION VÉHICULE', [
+                (col, f'dv.{col}') for col in [
+                    'vehicule_id', 'categorie_code', 'categorie_libelle', 'type_vehicule', 'est_motorise',
+                    'niveau_protection'
+                ]
+            ]),
+            ('COMPTAGES VÉHICULES', [
+                ('nb_vehicules_impliques', '{nb_vehicules}'),
+                ('nb_accidents_impliques', '{nb_accidents}')
+            ]),
+            ('COMPTAGES VICTIMES', [
+                ('nb_occupants_total', 'SUM(fv.nb_occupants)'),
+                ('nb_tues_total', 'SUM(fv.nb_tues_vehicule)'),
+                ('nb_blesses_total', 'SUM(fv.nb_blesses_vehicule)'),
+                ('nb_indemnes_total', 'SUM(fv.nb_indemnes_vehicule)')
+            ]),
+            ('GRAVITÉ', [
+                ('nb_vehicules_avec_tues', '{nb_vehicules_avec_tues}')
+            ]),
+            ('RATIOS DE RISQUE', [
+                ('taux_mortalite_occupants', """CASE
+        WHEN SUM(fv.nb_occupants) > 0
+        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / SUM(fv.nb_occupants)) * 100
+        ELSE 0
+    END"""),
+                ('nb_tues_moyen_par_vehicule', """CASE
+        WHEN {nb_vehicules} > 0
+        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / {nb_vehicules})
+        ELSE 0
+    END"""),
+                ('pct_vehicules_avec_tues', """CASE
+        WHEN {nb_vehicules} > 0
+        THEN ({nb_vehicules_avec_tues}::DECIMAL / {nb_vehicules}) * 100
+        ELSE 0
+    END""")
+            ]),
+            ('OBSTACLES', [
+                ('nb_avec_obstacle_fixe', '{nb_avec_obstacle_fixe}'),
+                ('nb_ayant_heurte_pieton', '{nb_ayant_heurte_pieton}')
+            ]),
+            ('MANŒUVRES FRÉQUENTES', [
+                ('manoeuvre_la_plus_frequente', 'MODE() WITHIN GROUP (ORDER BY fv.manoeuvre)')
+            ])
+        ],
+        'from': """accidents_gold.fait_vehicules fv
+JOIN accidents_gold.dim_vehicule dv ON fv.vehicule_type_id = dv.vehicule_id""",
+        'group_by': """
+    dv.vehicule_id, dv.categorie_code, dv.categorie_libelle,
+    dv.type_vehicule, dv.est_motorise, dv.niveau_protection""",
+        'having': ('{nb_vehicules} >= 5', 'Seuil minimum'),
+        'index': [
+            ('idx_mv_analyse_veh_pk', '(vehicule_id)', True),
+            ('idx_mv_analyse_veh_type', '(type_vehicule)', False),
+            ('idx_mv_analyse_veh_taux_mortalite', '(taux_mortalite_occupants DESC)', False)
+        ],
+        'commentaire': 'Statistiques de risque par type de véhicule. Seuil: >=5 véhicules.',
+        'commentaires_colonnes': {
+            'taux_mortalite_occupants': '(Tués / Total occupants) * 100 - Indicateur vulnérabilité type véhicule'
+        },
+        'validation': None
+    },
+
+# Vues des critères de performance (Silver/Critères de performance/critere_perf_SQL.py) :
+# composantes des CTE des requêtes Silver au grain de chaque critère,
+# sans seuil (appliqué à la lecture), pour une parité exacte avec Silver.
+    'mv_critere_conditions': {
+        'fichier': '05_mv_critere_conditions.sql',
+        'titre': 'Critère 1 - conditions combinées',
+        'objectif': 'Pré-agréger conditions météo × luminosité × route × surface (critère 1)',
+        'refresh': 'Après chaque chargement Silver',
+        'grain': 'u.id_usager',
+        'comptages': {
+            'nb_accidents': {'distinct': 'a.num_acc'},     # plusieurs usagers par accident
+            'nb_usagers': None,
+            'nb_tues': 'u.gravite = 2',
+            'nb_blesses_graves': 'u.gravite = 3'
+        },
+        'sections': [
+            ('CONDITIONS', [
+                ('conditions_atmospheriques', 'a.conditions_atmospheriques'),
+                ('luminosite', 'a.luminosite'),
+                ('categorie_route', 'l.categorie_route'),
+                ('etat_surface', 'l.etat_surface')
+            ]),
+            ('COMPTAGES', [
+                ('nb_accidents', '{nb_accidents}'),
+                ('nb_usagers', '{nb_usagers}'),
+                ('nb_tues', '{nb_tues}'),
+                ('nb_blesses_graves', '{nb_blesses_graves}')
+            ]),
+            ('TAUX', [
+                ('taux_mortalite', 'ROUND(100.0 * {nb_tues} / NULLIF({nb_usagers}, 0), 3)')
+            ])
+        ],
+        'from': """accidents a
+JOIN lieux l ON a.num_acc = l.num_acc
+JOIN usagers u ON a.num_acc = u.num_acc""",
+        'where': """a.conditions_atmospheriques IS NOT NULL
+  AND a.luminosite IS NOT NULL
+  AND l.categorie_route IS NOT NULL
+  AND l.etat_surface IS NOT NULL""",
+        'group_by': 'a.conditions_atmospheriques, a.luminosite, l.categorie_route, l.etat_surface',
+        'index': [
+            ('idx_mv_critere_conditions_pk', '(conditions_atmospheriques, luminosite, categorie_route, etat_surface)', True),
+            ('idx_mv_critere_conditions_nb_accidents', '(nb_accidents DESC)', False)
+        ],
+        'commentaire': 'Critère 1 : comptages par combinaison de conditions (sans seuil, appliqué par critere_perf_SQL.py).',
+        'commentaires_colonnes': {},
+        'validation': None
+    },
+
+    'mv_critere_departements': {
+        'fichier': '06_mv_critere_departements.sql',
+        'titre': 'Critère 2 - départements',
+        'objectif': 'Pré-agréger accidents et usagers par département (critère 2, référence nationale du critère 1)',
+        'refresh': 'Après chaque chargement Silver',
+        'grain': 'u.id_usager',
+        'comptages': {
+            'nb_accidents': {'distinct': 'a.num_acc'},
+            'nb_usagers': None,
+            'nb_tues': 'u.gravite = 2',
+            'nb_blesses_graves': 'u.gravite = 3'
+        },
+        'sections': [
+            ('DÉPARTEMENT', [
+                ('departement_code', 'a.departement_code')
+            ]),
+            ('COMPTAGES', [
+                ('nb_accidents', '{nb_accidents}'),
+                ('nb_usagers', '{nb_usagers}'),
+                ('nb_tues', '{nb_tues}'),
+                ('nb_blesses_graves', '{nb_blesses_graves}')
+            ]),
+            ('TAUX', [
+                ('taux_mortalite', 'ROUND(100.0 * {nb_tues} / NULLIF({nb_usagers}, 0), 3)'),
+                ('taux_gravite', 'ROUND(100.0 * ({nb_tues} + {nb_blesses_graves}) / NULLIF({nb_usagers}, 0), 3)')
+            ])
+        ],
+        'from': """accidents a
+JOIN usagers u ON a.num_acc = u.num_acc""",
+        'group_by': 'a.departement_code',
+        'index': [
+            ('idx_mv_critere_departements_pk', '(departement_code) NULLS NOT DISTINCT', True)
+        ],
+        'commentaire': 'Critère 2 : comptages par département (accidents × usagers Silver). Somme = référence nationale du critère 1.',
+        'commentaires_colonnes': {},
+        'validation': None
+    },
+
+    'mv_critere_usagers': {
+        'fichier': '07_mv_critere_usagers.sql',
+        'titre': "Critère 3 - catégories d'usagers",
+        'objectif': "Pré-agréger la gravité par catégorie d'usager (critère 3)",
+        'refresh': 'Après chaque chargement Silver',
+        'grain': 'u.id_usager',
+        'comptages': {
+            'nb_usagers': None,
+            'nb_tues': 'u.gravite = 2',
+            'nb_blesses_graves': 'u.gravite = 3',
+            'nb_blesses_legers': 'u.gravite = 4',
+            'nb_indemnes': 'u.gravite = 1'
+        },
+        'sections': [
+            ('CATÉGORIE', [
+                ('categorie_usager', 'u.categorie_usager')
+            ]),
+            ('COMPTAGES', [
+                ('nb_usagers', '{nb_usagers}'),
+                ('nb_tues', '{nb_tues}'),
+                ('nb_blesses_graves', '{nb_blesses_graves}'),
+                ('nb_blesses_legers', '{nb_blesses_legers}'),
+                ('nb_indemnes', '{nb_indemnes}')
+            ]),
+            ('TAUX', [
+                ('taux_mortalite', 'ROUND(100.0 * {nb_tues} / NULLIF({nb_usagers}, 0), 3)'),
+                ('taux_gravite', 'ROUND(100.0 * ({nb_tues} + {nb_blesses_graves}) / NULLIF({nb_usagers}, 0), 3)')
+            ])
+        ],
+        'from': 'usagers u',
+        'group_by': 'u.categorie_usager',
+        'index': [
+            ('idx_mv_critere_usagers_pk', '(categorie_usager) NULLS NOT DISTINCT', True)
+        ],
+        'commentaire': "Critère 3 : comptages par catégorie d''usager, catégorie inconnue comprise (référence globale).",
+        'commentaires_colonnes': {},
+        'validation': None
+    }
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# GÉNÉRATION SQL
+# ════════════════════════════════════════════════════════════════
+
+def rendre_comptages(vue, forme='filter'):
+    """
+    Expressions SQL des comptages de la vue.
+    forme 'filter'   : COUNT(*) / COUNT(*) FILTER (WHERE cond) sur le grain ;
+    forme 'distinct' : COUNT(DISTINCT grain) / COUNT(DISTINCT CASE WHEN cond
+                       THEN grain END) (définition historique).
+    Les vrais comptages distincts restent COUNT(DISTINCT expr) dans les deux.
+    """
+    grain = vue['grain']
+    rendus = {}
+    for nom, condition in vue['comptages'].items():
+        if isinstance(condition, dict):
+            rendus[nom] = f"COUNT(DISTINCT {condition['distinct']})"
+        elif forme == 'distinct':
+            rendus[nom] = (f"COUNT(DISTINCT {grain})" if condition is None
+                           else f"COUNT(DISTINCT CASE WHEN {condition} THEN {grain} END)")
+        else:
+            rendus[nom] = "COUNT(*)" if condition is None else f"COUNT(*) FILTER (WHERE {condition})"
+    return rendus
+
+
+def requete_select(nom_vue, forme='filter', terminee=False):
+    """
+    SELECT de la vue (sans CREATE), dans la forme demandée.
+    terminee : ';' final et commentaire du seuil (fichier SQL) ; sinon
+    utilisable comme sous-requête.
+    """
+    vue = VUES[nom_vue]
+    comptages = rendre_comptages(vue, forme)
+
+    blocs = []
+    for section, colonnes in vue['sections']:
+        lignes = [f"    {expression}" if expression.split('.')[-1] == colonne
+                  else f"    {expression.format(**comptages)} as {colonne}" for colonne, expression in colonnes]
+        # Colonnes CASE sur plusieurs lignes séparées par une ligne vide
+        corps = lignes[0]
+        for precedente, ligne in zip(lignes, lignes[1:]):
+            corps += (",\n    \n" if '\n' in precedente or '\n' in ligne else ",\n") + ligne
+        blocs.append(
+            "    -- ================================\n"
+            f"    -- {section}\n"
+            "    -- ================================\n"
+            + corps
+        )
+
+    sql = "SELECT \n" + ",\n    \n".join(blocs) + f"\n\nFROM {vue['from']}"
+    if vue.get('where'):
+        sql += f"\nWHERE {vue['where']}"
+    sql += f"\nGROUP BY {vue['group_by']}"
+    commentaire = ''
+    if vue.get('having'):
+        condition, commentaire = vue['having']
+        sql += f"\nHAVING {condition.format(**comptages)}"
+    if vue.get('order_by'):
+        sql += f"\nORDER BY {vue['order_by']}"
+    if terminee:
+        sql += ";" + (f"  -- {commentaire}" if commentaire else '')
+    return sql
+
+
+def sql_creation(nom_vue, forme='filter'):
+    """
+    DDL complet : DROP, CREATE MATERIALIZED VIEW, index, commentaires, ANALYZE.
+    """
+    vue = VUES[nom_vue]
+    qualifie = f"{SCHEMA_GOLD}.{nom_vue}"
+
+    index = "\n\n".join(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {nom} \nON {qualifie} {colonnes};"
+        for nom, colonnes, unique in vue['index']
+    )
+    commentaires = "\n\n".join(
+        [f"COMMENT ON MATERIALIZED VIEW {qualifie} IS \n'{vue['commentaire']}';"]
+        + [f"COMMENT ON COLUMN {qualifie}.{colonne} IS \n'{commentaire}';"
+           for colonne, commentaire in vue['commentaires_colonnes'].items()]
+    )
+
+    return f"""DROP MATERIALIZED VIEW IF EXISTS {qualifie} CASCADE;
+
+CREATE MATERIALIZED VIEW {qualifie} AS
+{requete_select(nom_vue, forme, terminee=True)}
+
+-- ================================
+-- INDEX POUR PERFORMANCES
+-- ================================
+
+{index}
+
+-- ================================
+-- COMMENTAIRES
+-- ================================
+
+{commentaires}
+
+-- ================================
+-- STATISTIQUES
+-- ================================
+
+ANALYZE {qualifie};"""
+
+
+def fichier_sql(nom_vue):
+    vue = VUES[nom_vue]
+    contenu = f"""-- ========================================
+-- VUE MATÉRIALISÉE : {vue['titre']}
+-- Objectif: {vue['objectif']}
+-- Refresh: {vue['refresh']}
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
+-- ========================================
+
+{sql_creation(nom_vue)}"""
+    if vue['validation']:
+        contenu += f"""
+
+-- ================================
+-- VALIDATION
+-- ================================
+
+{vue['validation']}"""
+    return contenu + "\n"
+
+
+def ecrire_fichiers(dossier=DOSSIER_SQL):
+    for nom_vue, vue in VUES.items():
+        chemin = os.path.join(dossier, vue['fichier'])
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write(fichier_sql(nom_vue))
+        print(f"  ✓ {os.path.normpath(chemin)}")
+
+
+def creer_vues(engine, forme='filter'):
+    for nom_vue in VUES:
+        with engine.begin() as conn:
+            conn.execute(text(sql_creation(nom_vue, forme)))
+        print(f"  ✓ {nom_vue} créée (forme {forme})")
+
+
+# ════════════════════════════════════════════════════════════════
+# PARITÉ ET PLANS
+# ════════════════════════════════════════════════════════════════
+
+def definition_actuelle(conn, nom_vue):
+    """
+    SELECT de la vue matérialisée telle qu'elle existe en base.
+    """
+    return conn.execute(
+        text("SELECT pg_get_viewdef(CAST(:vue AS regclass))"), {'vue': f"{SCHEMA_GOLD}.{nom_vue}"}
+    ).scalar().rstrip().rstrip(';')
+
+
+def verifier_parite(engine):
+    """
+    Écarts (multiset, dans les deux sens) entre la définition actuelle
+    en base et la forme FILTER générée. Retourne {vue: nb_ecarts}.
+    """
+    ecarts = {}
+    with engine.connect() as conn:
+        for nom_vue in VUES:
+            actuelle = definition_actuelle(conn, nom_vue)
+            nouvelle = requete_select(nom_vue)
+            nb = conn.execute(text(f"""
+                SELECT COUNT(*) FROM (
+                    (SELECT * FROM ({actuelle}) a EXCEPT ALL SELECT * FROM ({nouvelle}) n)
+                    UNION ALL
+                    (SELECT * FROM ({nouvelle}) n EXCEPT ALL SELECT * FROM ({actuelle}) a)
+                ) e
+            """)).scalar()
+            ecarts[nom_vue] = nb
+            print(f"  {'✓' if nb == 0 else '❌'} {nom_vue:<30} {nb} ligne(s) d'écart")
+    return ecarts
+
+
+def mesurer_plan(conn, requete):
+    """
+    EXPLAIN (ANALYZE, BUFFERS) : durée d'exécution (ms) et blocs lus.
+    """
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {requete}")).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    racine = plan[0]['Plan']
+    return {
+        'duree_ms': plan[0]['Execution Time'],
+        'blocs_caches': racine.get('Shared Hit Blocks', 0),
+        'blocs_lus': racine.get('Shared Read Blocks', 0),
+        'blocs_temp': racine.get('Temp Written Blocks', 0)
+    }
+
+
+def comparer_plans(engine, repetitions=3):
+    """
+    Avant (définition actuelle) / après (forme FILTER), meilleure de
+    `repetitions` exécutions.
+    """
+    resultats = {}
+    with engine.connect() as conn:
+        for nom_vue in VUES:
+            avant = definition_actuelle(conn, nom_vue)
+            apres = requete_select(nom_vue)
+            mesures = {
+                forme: min((mesurer_plan(conn, requete) for _ in range(repetitions)), key=lambda m: m['duree_ms'])
+                for forme, requete in [('avant', avant), ('apres', apres)]
+            }
+            resultats[nom_vue] = mesures
+            print(f"  {nom_vue:<30} avant {mesures['avant']['duree_ms']:8.1f} ms "
+                  f"(temp {mesures['avant']['blocs_temp']:>6}) → après {mesures['apres']['duree_ms']:8.1f} ms "
+                  f"(temp {mesures['apres']['blocs_temp']:>6}) "
+                  f"x{mesures['avant']['duree_ms'] / max(mesures['apres']['duree_ms'], 1e-9):.1f}")
+    return resultats
+
+
+if __name__ == "__main__":
+    action = sys.argv[1] if len(sys.argv) > 1 else 'ecrire'
+
+    if action == 'ecrire':
+        ecrire_fichiers()
+    else:
+        engine = creer_engine_pool(DB_CONFIG, 1)
+        if action == 'creer':
+            creer_vues(engine)
+        elif action == 'parite':
+            verifier_parite(engine)
+        elif action == 'explain':
+            comparer_plans(engine)
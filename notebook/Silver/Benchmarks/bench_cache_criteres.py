@@ -0,0 +1,112 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - CACHE DES RÉSULTATS DES CRITÈRES
+Cache vide → miss puis hit pour chaque critère (sources Silver et
+Gold) : parité stricte hit / requête, temps. Puis chargement simulé
+d'une seule table Silver (nouvelle version de la table) : seules les
+entrées qui lisent cette table sont invalidées.
+Usage : python bench_cache_criteres.py [table_rechargee]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Critères de performance'))
+
+import cache_requetes
+from critere_perf_SQL import (
+    CONFIG, critere_1_conditions_risque, critere_2_zones_frequentees_vs_dangereuses,
+    critere_3_analyse_usagers
+)
+
+
+CRITERES = {
+    'critere_1': critere_1_conditions_risque,
+    'critere_2': critere_2_zones_frequentees_vs_dangereuses,
+    'critere_3': critere_3_analyse_usagers
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def executer(fonction, source, cache=True):
+    """
+    (durée, DataFrame, statut du cache) sans les affichages du critère.
+    """
+    CONFIG['cache'] = cache
+    sortie = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sortie):
+        df = fonction(source)
+    duree = time.perf_counter() - start
+    statut = next((s for s in ('hit', 'miss', 'hors_cache') if f"(cache : {s})" in sortie.getvalue()), None)
+    return duree, df, statut
+
+
+def bench_hits(source):
+    resultats = {}
+    for critere, fonction in CRITERES.items():
+        t_miss, df_miss, statut_miss = executer(fonction, source)
+        t_hit, df_hit, statut_hit = executer(fonction, source)
+        _, df_ref, _ = executer(fonction, source, cache=False)
+
+        assert (statut_miss, statut_hit) == ('miss', 'hit'), f"{critere} : {statut_miss} puis {statut_hit}"
+        pd.testing.assert_frame_equal(df_ref, df_hit)
+
+        resultats[critere] = (t_miss, t_hit)
+        print(f"  {source:<6} {critere:<12} miss {t_miss*1000:8.1f} ms / hit {t_hit*1000:6.1f} ms "
+              f"(x{t_miss / max(t_hit, 1e-9):.0f}) - résultat identique")
+    return resultats
+
+
+def bench_invalidation(table):
+    """
+    Version de `table` changée (chargement simulé, la base n'est pas
+    modifiée) puis critères Silver relancés : seules les entrées du cache
+    qui lisent cette table doivent disparaître.
+    """
+    index_avant = cache_requetes.lire_index()
+    attendues = {cle for cle, entree in index_avant.items() if f"public.{table}" in entree['versions']}
+
+    versions_reelles = cache_requetes.versions_donnees
+    def versions_apres_chargement(conn):
+        versions = versions_reelles(conn)
+        versions[f"public.{table}"] = 'chargement simulé'
+        return versions
+
+    cache_requetes.versions_donnees = versions_apres_chargement
+    try:
+        statuts = {critere: executer(fonction, 'silver')[2] for critere, fonction in CRITERES.items()}
+    finally:
+        cache_requetes.versions_donnees = versions_reelles
+
+    supprimees = set(index_avant) - set(cache_requetes.lire_index())
+    for critere, statut in statuts.items():
+        print(f"  {critere:<12} (Silver) → {statut}")
+    assert supprimees == attendues, f"{len(supprimees)} entrée(s) supprimée(s), {len(attendues)} attendue(s)"
+    print(f"  ✓ Chargement de {table} : {len(supprimees)}/{len(index_avant)} entrée(s) invalidée(s), "
+          f"les autres restent en cache")
+
+
+if __name__ == "__main__":
+    table = sys.argv[1] if len(sys.argv) > 1 else 'lieux'
+
+    with tempfile.TemporaryDirectory() as dossier:
+        cache_requetes.CONFIG['dossier'] = dossier
+
+        print("\n[CACHE : MISS / HIT]")
+        print("-"*70)
+        bench_hits('silver')
+        bench_hits('gold')
+
+        print(f"\n[INVALIDATION : CHARGEMENT DE {table.upper()}]")
+        print("-"*70)
+        bench_invalidation(table)
@@ -0,0 +1,95 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - CRITÈRES POSTGRESQL / DUCKDB
+Exporte les tables Silver de la base dans un lac Parquet temporaire
+(lac_parquet.exporter_lac), puis exécute chaque critère de
+critere_perf_SQL.py sur PostgreSQL et sur DuckDB (même SQL, source
+Silver, cache désactivé) : parité des DataFrames + meilleur temps de
+N exécutions.
+Usage : python bench_criteres_duckdb.py [repetitions]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Critères de performance'))
+
+import moteur_duckdb
+from lac_parquet import exporter_lac
+from critere_perf_SQL import (
+    CONFIG, engine, critere_1_conditions_risque, critere_2_zones_frequentees_vs_dangereuses,
+    critere_3_analyse_usagers
+)
+
+# Requêtes réellement exécutées à chaque répétition
+CONFIG['cache'] = False
+
+
+CRITERES = {
+    'critere_1': critere_1_conditions_risque,
+    'critere_2': critere_2_zones_frequentees_vs_dangereuses,
+    'critere_3': critere_3_analyse_usagers
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def executer(fonction, moteur, repetitions):
+    """
+    Meilleur temps (affichages du critère compris) et DataFrame produit.
+    """
+    CONFIG['moteur'] = moteur
+    meilleur = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = fonction('silver')
+        duree = time.perf_counter() - start
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, df
+
+
+def bench(critere, repetitions):
+    # Première exécution DuckDB hors mesure : création des vues sur le lac
+    executer(CRITERES[critere], 'duckdb', 1)
+
+    t_pg, df_pg = executer(CRITERES[critere], 'postgresql', repetitions)
+    t_duck, df_duck = executer(CRITERES[critere], 'duckdb', repetitions)
+
+    pd.testing.assert_frame_equal(df_pg, df_duck)
+
+    print(f"  {critere:<12} {len(df_pg):>4} lignes identiques : "
+          f"PostgreSQL {t_pg*1000:8.1f} ms / DuckDB {t_duck*1000:7.1f} ms (x{t_pg / max(t_duck, 1e-9):.1f})")
+    return t_pg, t_duck
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as dossier:
+        print("\n[EXPORT DU LAC PARQUET]")
+        print("-"*70)
+        exporter_lac(engine, dossier)
+        moteur_duckdb.CONFIG['dossier'] = dossier
+
+        print("\n[PARITÉ CRITÈRES POSTGRESQL / DUCKDB]")
+        print("-"*70)
+        total_pg = total_duck = 0
+        try:
+            for critere in CRITERES:
+                t_pg, t_duck = bench(critere, repetitions)
+                total_pg += t_pg
+                total_duck += t_duck
+        finally:
+            moteur_duckdb.fermer()
+
+        print(f"\n  ✓ {len(CRITERES)} critères identiques - total PostgreSQL {total_pg*1000:.0f} ms / "
+              f"DuckDB {total_duck*1000:.0f} ms (x{total_pg / max(total_duck, 1e-9):.1f})")
@@ -0,0 +1,82 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - CRITÈRES DE PERFORMANCE SILVER / GOLD
+Exécute chaque critère de critere_perf_SQL.py sur Silver (jointures
+accidents × lieux × usagers) puis sur les vues Gold mv_critere_* :
+parité stricte des DataFrames + meilleur temps de N exécutions.
+Les vues doivent être à jour (python refresh_vues.py).
+Usage : python bench_criteres_gold.py [repetitions]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Critères de performance'))
+
+from critere_perf_SQL import (
+    CONFIG, critere_1_conditions_risque, critere_2_zones_frequentees_vs_dangereuses, critere_3_analyse_usagers,
+    etat_gold
+)
+
+# Requêtes réellement exécutées à chaque répétition
+CONFIG['cache'] = False
+
+
+CRITERES = {
+    'critere_1': critere_1_conditions_risque,
+    'critere_2': critere_2_zones_frequentees_vs_dangereuses,
+    'critere_3': critere_3_analyse_usagers
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def executer(fonction, source, repetitions):
+    """
+    Meilleur temps (affichages du critère compris) et DataFrame produit.
+    """
+    meilleur = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = fonction(source)
+        duree = time.perf_counter() - start
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, df
+
+
+def bench(critere, repetitions):
+    raison = etat_gold(critere)
+    if raison:
+        print(f"  ⚠ {critere} : Gold non à jour ({raison}), comparaison quand même")
+
+    t_silver, df_silver = executer(CRITERES[critere], 'silver', repetitions)
+    t_gold, df_gold = executer(CRITERES[critere], 'gold', repetitions)
+
+    pd.testing.assert_frame_equal(df_silver, df_gold)
+
+    print(f"  {critere:<12} {len(df_silver):>4} lignes identiques : "
+          f"Silver {t_silver*1000:8.1f} ms / Gold {t_gold*1000:6.1f} ms (x{t_silver / max(t_gold, 1e-9):.0f})")
+    return t_silver, t_gold
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("\n[PARITÉ CRITÈRES SILVER / GOLD]")
+    print("-"*70)
+    total_silver = total_gold = 0
+    for critere in CRITERES:
+        t_silver, t_gold = bench(critere, repetitions)
+        total_silver += t_silver
+        total_gold += t_gold
+
+    print(f"\n  ✓ {len(CRITERES)} critères identiques - total Silver {total_silver*1000:.0f} ms / "
+          f"Gold {total_gold*1000:.0f} ms (x{total_silver / max(total_gold, 1e-9):.0f})")
@@ -0,0 +1,63 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - CRITÈRES SÉQUENTIELS / PARALLÈLES
+Exécute les critères de critere_perf_SQL.py l'un après l'autre puis
+simultanément (cache désactivé) : rapport identique à l'octet près
+hors durées, DataFrames identiques, temps total comparé au critère le
+plus lent et à la somme.
+Usage : python bench_criteres_paralleles.py [silver|gold|auto]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Critères de performance'))
+
+from critere_perf_SQL import CONFIG, CRITERES, executer_criteres
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def executer(parallele):
+    """
+    (durée totale, DataFrames, rapport sans les durées).
+    """
+    sortie = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sortie):
+        dfs = executer_criteres(parallele)
+    duree = time.perf_counter() - start
+    rapport = re.sub(r' *[\d.]+ ms', ' <ms>', sortie.getvalue())
+    durees = [float(m) for m in re.findall(r'CRITÈRE \d : +([\d.]+) ms', sortie.getvalue())]
+    return duree, dfs, rapport.replace('(séquentiel)', '(<mode>)').replace('(parallèle)', '(<mode>)'), durees
+
+
+if __name__ == "__main__":
+    CONFIG['source'] = sys.argv[1] if len(sys.argv) > 1 else 'silver'
+    CONFIG['cache'] = False
+
+    # Connexions du pool ouvertes avant la mesure
+    executer(True)
+
+    t_seq, dfs_seq, rapport_seq, durees_seq = executer(False)
+    t_par, dfs_par, rapport_par, durees_par = executer(True)
+
+    assert rapport_seq == rapport_par, "Rapports différents entre les deux modes"
+    for df_seq, df_par in zip(dfs_seq, dfs_par):
+        pd.testing.assert_frame_equal(df_seq, df_par)
+
+    print(f"\n[CRITÈRES SÉQUENTIELS / PARALLÈLES] source {CONFIG['source']}")
+    print("-"*70)
+    for (titre, _), d_seq, d_par in zip(CRITERES, durees_seq, durees_par):
+        print(f"  {titre.split(' :')[0]:<11} séquentiel {d_seq:8.1f} ms / parallèle {d_par:8.1f} ms")
+    print(f"  ✓ Rapports et DataFrames identiques - total séquentiel {t_seq*1000:.0f} ms / "
+          f"parallèle {t_par*1000:.0f} ms (x{t_seq / max(t_par, 1e-9):.2f}), "
+          f"critère le plus lent {max(durees_par):.0f} ms")
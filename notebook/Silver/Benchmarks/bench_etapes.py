@@ -0,0 +1,368 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - ÉTAPES DE L'ETL SILVER
+Rejoue l'ETL Silver en streaming sur un fichier Bronze synthétique
+(generateur_baac.py, échelles 1x / 10x / 100x) et mesure chaque étape
+séparément, cumulée sur les batchs : lecture Parquet, transformations
+accidents / lieux, explosion véhicules, explosion usagers, mappings,
+transformations véhicules / usagers et, avec --chargement, le
+chargement PostgreSQL (charger_tables_parallele, dans un schéma jetable
+bench_silver copié des tables Silver).
+Par étape : lignes traitées (Bronze pour la lecture et les
+transformations, produites pour les explosions, valeurs pour les
+mappings, insérées pour le chargement), débit (lignes/s) et pic de RSS pendant
+l'étape. Le résultat est écrit en JSON dans Resultats/ et comparé au
+précédent run de la même échelle (ou à --reference) : une baisse de
+débit ou une hausse du pic mémoire au-delà du seuil est signalée
+(code de sortie 1).
+Usage : python bench_etapes.py [1x|10x|100x] [--chargement] [--reference fichier.json]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import platform
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import psutil
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from generateur_baac import CONFIG as CONFIG_GENERATEUR, ECHELLES, fichier_bronze
+from silver_ETL_parquet_vectorise import (
+    CONFIG as CONFIG_ETL, DB_CONFIG, COLS_USAGERS_MULTI, COLS_VEHICULES_MULTI, COLONNES_NECESSAIRES,
+    RegistreCles, explode_multivalue_vectorized, compter_valeurs_multivalue,
+    transformer_accidents, transformer_lieux, transformer_vehicules, transformer_usagers
+)
+from mappings_silver import MAPPINGS, rapport_non_mappes
+from types_silver import table_arrow_vers_pandas
+from chargement_parallele import creer_engine_pool, charger_tables_parallele
+from telemetrie import CONFIG as CONFIG_TELEMETRIE, PicMemoire
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier_resultats': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Resultats'),
+    'lignes_par_batch': CONFIG_ETL['chunk_size'],
+    'seuil_regression': 0.15,        # Écart toléré sur le débit et le pic mémoire
+    'schema_source': 'public',       # Tables Silver dont la structure est copiée
+    'schema_chargement': 'bench_silver'
+}
+
+TABLES_SILVER = ['accidents', 'lieux', 'vehicules', 'usagers']
+
+# Étapes mesurées ici : pas de second échantillonnage par la télémétrie de l'ETL
+CONFIG_TELEMETRIE['actif'] = False
+
+
+# ════════════════════════════════════════════════════════════════
+# MESURES
+# ════════════════════════════════════════════════════════════════
+
+class Mesures:
+    """
+    Durée, lignes et pic de RSS cumulés par étape sur tous les batchs.
+    """
+    def __init__(self):
+        self.etapes = {}
+
+    def mesurer(self, etape, fonction, lignes=len):
+        """
+        Exécute fonction() ; `lignes` compte les lignes traitées à partir
+        du résultat (entier fixe ou fonction du résultat).
+        """
+        with PicMemoire() as memoire:
+            start = time.perf_counter()
+            resultat = fonction()
+            duree = time.perf_counter() - start
+        mesure = self.etapes.setdefault(etape, {'lignes': 0, 'secondes': 0.0, 'rss_pic': 0})
+        mesure['lignes'] += lignes(resultat) if callable(lignes) else lignes
+        mesure['secondes'] += duree
+        mesure['rss_pic'] = max(mesure['rss_pic'], memoire.pic)
+        return resultat
+
+    def resultats(self):
+        return {
+            etape: {
+                'lignes': int(m['lignes']),
+                'secondes': round(m['secondes'], 4),
+                'lignes_par_seconde': round(m['lignes'] / max(m['secondes'], 1e-9), 1),
+                'rss_pic_mo': round(m['rss_pic'] / 1024**2, 1)
+            }
+            for etape, m in self.etapes.items()
+        }
+
+
+# ════════════════════════════════════════════════════════════════
+# ÉTAPES
+# ════════════════════════════════════════════════════════════════
+
+def appliquer_mappings(df_bronze, df_vehicules, df_usagers):
+    """
+    Tous les mappings, sur les lignes explosées pour les colonnes
+    multi-valeurs (comme dans l'ETL) ; retourne le nombre de valeurs.
+    """
+    nb_valeurs = 0
+    for colonne, mapping in MAPPINGS.items():
+        if colonne in COLS_VEHICULES_MULTI:
+            series = df_vehicules[colonne]
+        elif colonne in COLS_USAGERS_MULTI:
+            series = df_usagers[colonne]
+        else:
+            series = df_bronze[colonne]
+        mapping.appliquer(series)
+        nb_valeurs += len(series)
+    return nb_valeurs
+
+
+def preparer_schema(engine):
+    """
+    Schéma jetable aux tables Silver vides (contraintes et index compris),
+    id_usager en identité à la place du BIGSERIAL du schéma source.
+    """
+    schema, source = CONFIG['schema_chargement'], CONFIG['schema_source']
+    if schema == source:
+        raise ValueError(f"schema_chargement ({schema}) doit différer de schema_source : il est supprimé")
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        for table_name in TABLES_SILVER:
+            conn.execute(text(
+                f"CREATE TABLE {schema}.{table_name} "
+                f"(LIKE {source}.{table_name} INCLUDING ALL EXCLUDING DEFAULTS)"
+            ))
+        sequences = conn.execute(text("""
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = :source AND table_name = ANY(:tables)
+              AND column_default LIKE 'nextval(%'
+        """), {'source': source, 'tables': TABLES_SILVER}).fetchall()
+        for table_name, column_name in sequences:
+            conn.execute(text(
+                f"ALTER TABLE {schema}.{table_name} ALTER COLUMN {column_name} "
+                f"ADD GENERATED BY DEFAULT AS IDENTITY"
+            ))
+
+
+def supprimer_schema(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {CONFIG['schema_chargement']} CASCADE"))
+
+
+def bench(chemin, chargement=False):
+    """
+    Parcourt le fichier batch par batch comme etl_silver_streaming, en
+    isolant chaque étape. Retourne (mesures, lignes Bronze).
+    """
+    mesures = Mesures()
+    fichier = pq.ParquetFile(chemin)
+    batchs = fichier.iter_batches(batch_size=CONFIG['lignes_par_batch'], columns=COLONNES_NECESSAIRES)
+
+    engine = None
+    if chargement:
+        engine = creer_engine_pool(DB_CONFIG, CONFIG_ETL['nb_workers_chargement'])
+        preparer_schema(engine)
+    registre_accidents = RegistreCles(['num_acc'])
+    registre_vehicules = RegistreCles(['num_acc', 'num_veh'])
+    explosions_vehicules = RegistreCles(['num_acc'])
+    explosions_usagers = RegistreCles(['num_acc'])
+
+    nb_bronze = 0
+    try:
+        while True:
+            df_bronze = mesures.mesurer(
+                'lecture_parquet',
+                lambda: next((table_arrow_vers_pandas(pa.Table.from_batches([b])) for b in batchs), None),
+                lignes=lambda df: 0 if df is None else len(df)
+            )
+            if df_bronze is None:
+                break
+            nb_bronze += len(df_bronze)
+
+            df_accidents = mesures.mesurer('transformation_accidents', lambda: transformer_accidents(df_bronze),
+                                           lignes=len(df_bronze))
+            df_lieux = mesures.mesurer('transformation_lieux', lambda: transformer_lieux(df_bronze),
+                                       lignes=len(df_bronze))
+
+            # Explosions seules (lignes produites), puis mappings sur leur sortie
+            explose_vehicules = mesures.mesurer('explosion_vehicules', lambda: explode_multivalue_vectorized(
+                df_bronze[['num_acc'] + COLS_VEHICULES_MULTI], COLS_VEHICULES_MULTI, verbose=False
+            ))
+            explose_usagers = mesures.mesurer('explosion_usagers', lambda: explode_multivalue_vectorized(
+                df_bronze[['num_acc', 'an'] + COLS_USAGERS_MULTI + ['num_veh']],
+                COLS_USAGERS_MULTI + ['num_veh'], verbose=False
+            ))
+            mesures.mesurer('mapping', lambda: appliquer_mappings(df_bronze, explose_vehicules, explose_usagers),
+                            lignes=lambda nb_valeurs: nb_valeurs)
+            del explose_vehicules, explose_usagers
+
+            # Transformations complètes (explosion + mappings + types), positions
+            # continuées d'un batch à l'autre comme en streaming
+            df_vehicules = mesures.mesurer('transformation_vehicules', lambda: transformer_vehicules(
+                df_bronze, verbose=False, decalage_positions=explosions_vehicules.decalages(df_bronze)
+            ), lignes=len(df_bronze))
+            df_usagers = mesures.mesurer('transformation_usagers', lambda: transformer_usagers(
+                df_bronze, verbose=False, decalage_positions=explosions_usagers.decalages(df_bronze)
+            ), lignes=len(df_bronze))
+            hashes_batch = explosions_vehicules.hacher(df_bronze)
+            explosions_vehicules.ajouter(hashes_batch, compter_valeurs_multivalue(df_bronze[COLS_VEHICULES_MULTI[0]]))
+            explosions_usagers.ajouter(hashes_batch, compter_valeurs_multivalue(df_bronze[COLS_USAGERS_MULTI[0]]))
+
+            if chargement:
+                df_accidents = registre_accidents.filtrer_nouveaux(df_accidents)
+                df_lieux = df_lieux[df_lieux['num_acc'].isin(df_accidents['num_acc'])]
+                df_vehicules = registre_vehicules.filtrer_nouveaux(df_vehicules)
+                tables = [
+                    (table_name, df, CONFIG['schema_chargement'])
+                    for table_name, df in zip(TABLES_SILVER, [df_accidents, df_lieux, df_vehicules, df_usagers])
+                ]
+                mesures.mesurer('chargement', lambda: charger_tables_parallele(
+                    tables,
+                    engine,
+                    nb_workers=CONFIG_ETL['nb_workers_chargement'],
+                    taille_partition=CONFIG_ETL['taille_partition_chargement'],
+                    modes=CONFIG_ETL['mode_chargement'],
+                    chunksize=CONFIG_ETL['copy_chunk_size']
+                ), lignes=sum(len(df) for _, df, _ in tables))
+    finally:
+        if engine is not None:
+            supprimer_schema(engine)
+            engine.dispose()
+
+    return mesures, nb_bronze
+
+
+# ════════════════════════════════════════════════════════════════
+# RÉSULTATS JSON
+# ════════════════════════════════════════════════════════════════
+
+def commit_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ecrire_resultat(resultat):
+    os.makedirs(CONFIG['dossier_resultats'], exist_ok=True)
+    chemin = os.path.join(CONFIG['dossier_resultats'],
+                          f"etapes_{resultat['echelle']}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(resultat, f, ensure_ascii=False, indent=2)
+    return chemin
+
+
+def derniere_reference(echelle, exclure):
+    """
+    Résultat précédent de la même échelle (le plus récent), None sinon.
+    """
+    fichiers = sorted(f for f in glob.glob(os.path.join(CONFIG['dossier_resultats'], f"etapes_{echelle}_*.json"))
+                      if os.path.abspath(f) != os.path.abspath(exclure))
+    return fichiers[-1] if fichiers else None
+
+
+def comparer(resultat, reference):
+    """
+    Compare étape par étape au run de référence ; retourne les régressions.
+    """
+    seuil = CONFIG['seuil_regression']
+    regressions = []
+    print(f"\n  {'étape':<26} {'lignes/s':>12} {'réf.':>12} {'Δ':>7}   {'pic MB':>7} {'réf.':>7} {'Δ':>7}")
+    for etape, mesure in resultat['etapes'].items():
+        ref = reference['etapes'].get(etape)
+        if ref is None:
+            print(f"  {etape:<26} {mesure['lignes_par_seconde']:>12,.0f} {'-':>12}")
+            continue
+        delta_debit = mesure['lignes_par_seconde'] / max(ref['lignes_par_seconde'], 1e-9) - 1
+        delta_memoire = mesure['rss_pic_mo'] / max(ref['rss_pic_mo'], 1e-9) - 1
+        alertes = []
+        if delta_debit < -seuil:
+            alertes.append('débit')
+        if delta_memoire > seuil:
+            alertes.append('mémoire')
+        if alertes:
+            regressions.append((etape, alertes))
+        print(f"  {etape:<26} {mesure['lignes_par_seconde']:>12,.0f} {ref['lignes_par_seconde']:>12,.0f} "
+              f"{delta_debit:>+7.1%}   {mesure['rss_pic_mo']:>7.0f} {ref['rss_pic_mo']:>7.0f} {delta_memoire:>+7.1%}"
+              f"{'   ⚠ ' + ', '.join(alertes) if alertes else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    chargement = '--chargement' in arguments
+    reference = None
+    if '--reference' in arguments:
+        reference = arguments[arguments.index('--reference') + 1]
+        arguments.remove(reference)
+    positionnels = [a for a in arguments if not a.startswith('--')]
+    echelle = positionnels[0] if positionnels else '1x'
+    if echelle not in ECHELLES:
+        sys.exit(f"❌ Échelle inconnue : {echelle} ({', '.join(ECHELLES)})")
+
+    print("\n[FICHIER BRONZE]")
+    print("-"*70)
+    chemin = fichier_bronze(echelle)
+    print(f"✓ {chemin} ({pq.ParquetFile(chemin).metadata.num_rows:,} lignes)")
+
+    print(f"\n[ÉTAPES] batchs de {CONFIG['lignes_par_batch']:,} lignes"
+          f"{', chargement dans ' + CONFIG['schema_chargement'] if chargement else ''}")
+    print("-"*70)
+    start = time.perf_counter()
+    mesures, nb_bronze = bench(chemin, chargement)
+    duree = time.perf_counter() - start
+    rapport_non_mappes()
+
+    resultat = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit_git(),
+        'echelle': echelle,
+        'graine': CONFIG_GENERATEUR['graine'],
+        'lignes_bronze': nb_bronze,
+        'lignes_par_batch': CONFIG['lignes_par_batch'],
+        'chargement': chargement,
+        'secondes_total': round(duree, 2),
+        'environnement': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'pyarrow': pa.__version__,
+            'cpu': psutil.cpu_count(),
+            'memoire_mo': round(psutil.virtual_memory().total / 1024**2)
+        },
+        'etapes': mesures.resultats()
+    }
+    for etape, mesure in resultat['etapes'].items():
+        print(f"  {etape:<26} {mesure['lignes']:>11,} lignes {mesure['secondes']:>8.2f}s "
+              f"{mesure['lignes_par_seconde']:>12,.0f} lignes/s   pic {mesure['rss_pic_mo']:>6.0f} MB")
+    print(f"\n⏱ Total : {duree:.1f}s pour {nb_bronze:,} lignes Bronze")
+
+    chemin_resultat = ecrire_resultat(resultat)
+    print(f"✓ Résultat → {chemin_resultat}")
+
+    reference = reference or derniere_reference(echelle, chemin_resultat)
+    if reference is None:
+        print("  (aucun run de référence pour cette échelle)")
+        sys.exit(0)
+
+    print(f"\n[COMPARAISON] référence {os.path.basename(reference)} (seuil {CONFIG['seuil_regression']:.0%})")
+    print("-"*70)
+    with open(reference, encoding='utf-8') as f:
+        regressions = comparer(resultat, json.load(f))
+    if regressions:
+        details = ', '.join(f"{etape} ({'/'.join(alertes)})" for etape, alertes in regressions)
+        print(f"\n⚠ {len(regressions)} régression(s) : {details}")
+        sys.exit(1)
+    print("\n✓ Aucune régression")
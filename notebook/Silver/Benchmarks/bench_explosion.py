@@ -0,0 +1,96 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - EXPLOSION DES COLONNES MULTI-VALEURS
+Compare l'ancienne explosion (list comprehension par ligne) au moteur
+Arrow de silver_ETL_parquet_vectorise.py : parité stricte + temps.
+Usage : python bench_explosion.py [fichier.parquet]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from silver_ETL_parquet_vectorise import (
+    CONFIG, COLS_USAGERS_MULTI, COLS_VEHICULES_MULTI, explode_multivalue_vectorized
+)
+
+
+# ════════════════════════════════════════════════════════════════
+# VERSION DE RÉFÉRENCE (avant moteur Arrow)
+# ════════════════════════════════════════════════════════════════
+
+def explode_multivalue_reference(df, multi_cols, id_col='num_acc'):
+    nb_values = None
+    for col in multi_cols:
+        if col in df.columns:
+            nb_values = df[col].fillna('').astype(str).str.count(',') + 1
+            nb_values = nb_values.where(df[col].notna() & (df[col].astype(str) != ''), 1)
+            break
+
+    if nb_values is None:
+        return df
+
+    df_repeated = df.loc[df.index.repeat(nb_values)].copy()
+    df_repeated['_position'] = df_repeated.groupby(id_col).cumcount()
+
+    for col in multi_cols:
+        if col not in df_repeated.columns:
+            continue
+
+        splits = df_repeated[col].fillna('').astype(str).str.split(',')
+
+        def extract_at_pos(split_list, pos):
+            try:
+                val = split_list[pos].strip()
+                return val if val != '' else None
+            except (IndexError, AttributeError):
+                return None
+
+        df_repeated[col] = [
+            extract_at_pos(split_list, pos)
+            for split_list, pos in zip(splits, df_repeated['_position'])
+        ]
+
+    return df_repeated.drop(columns=['_position'])
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def bench(nom, df, multi_cols):
+    print(f"\n[{nom.upper()}]")
+    print("-"*70)
+
+    start = time.perf_counter()
+    df_ref = explode_multivalue_reference(df, multi_cols)
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df_new = explode_multivalue_vectorized(df, multi_cols)
+    t_new = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(df_ref, df_new)
+
+    print(f"  Référence (list comprehension) : {t_ref:6.2f}s")
+    print(f"  Moteur Arrow                   : {t_new:6.2f}s")
+    print(f"  ✓ Sorties identiques ({len(df_new):,} lignes) - gain x{t_ref / max(t_new, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    fichier = sys.argv[1] if len(sys.argv) > 1 else CONFIG['fichier_source']
+
+    df_bronze = pd.read_parquet(
+        fichier,
+        engine='pyarrow',
+        columns=['num_acc', 'an'] + COLS_USAGERS_MULTI + COLS_VEHICULES_MULTI
+    )
+    print(f"✓ {len(df_bronze):,} lignes bronze chargées depuis {fichier}")
+
+    bench('vehicules', df_bronze[['num_acc'] + COLS_VEHICULES_MULTI].copy(), COLS_VEHICULES_MULTI)
+    bench('usagers', df_bronze[['num_acc', 'an'] + COLS_USAGERS_MULTI + ['num_veh']].copy(),
+          COLS_USAGERS_MULTI + ['num_veh'])
@@ -0,0 +1,126 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - CONVERSION GPS
+Compare l'ancien convert_lat_long (Series.apply ligne à ligne) au
+convertisseur vectorisé de conversion_gps.py : parité stricte sur
+tout le fichier + temps, puis bilan de la validation ck_coords_valides.
+Usage : python bench_gps.py [fichier.parquet]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from silver_ETL_parquet_vectorise import CONFIG
+from conversion_gps import convertir_coordonnees, valider_coordonnees
+
+
+# ════════════════════════════════════════════════════════════════
+# VERSION DE RÉFÉRENCE (avant vectorisation)
+# ════════════════════════════════════════════════════════════════
+
+def convert_lat_long(coord):
+    """
+    Gère les deux formats : 7 chiffres sans séparateur ET format décimal normal
+    """
+    if pd.isna(coord):
+        return None
+
+    coord_str = str(coord).strip()
+
+    # Gestion des valeurs vides
+    if coord_str == '' or coord_str.lower() == 'nan':
+        return None
+
+    # Remplacement virgule par point
+    coord_str = coord_str.replace(',', '.')
+
+    # Cas format décimal standard
+    if '.' in coord_str:
+        try:
+            return float(coord_str)
+        except ValueError:
+            return None
+
+    # Format 7 chiffres sans séparateur
+    elif len(coord_str) == 7 and coord_str.replace('-', '').isdigit():
+        try:
+            # Latitude positive : 4872760 → 48.72760
+            if not coord_str.startswith('-'):
+                return float(coord_str[:2] + '.' + coord_str[2:])
+            # Longitude négative : -2478760 → -2.478760
+            else:
+                return float('-' + coord_str[1:2] + '.' + coord_str[2:])
+        except ValueError:
+            return None
+
+    # Format 8 chiffres sans séparateur (cas longitude positive)
+    elif len(coord_str) == 8 and coord_str.replace('-', '').isdigit():
+        try:
+            if not coord_str.startswith('-'):
+                return float(coord_str[:1] + '.' + coord_str[1:])
+            else:
+                return float('-' + coord_str[1:2] + '.' + coord_str[2:])
+        except ValueError:
+            return None
+
+    # Autres formats non gérés, on tente la conversion brute
+    else:
+        try:
+            return float(coord_str)
+        except ValueError:
+            return None
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def bench(nom, series):
+    print(f"\n[{nom.upper()}]")
+    print("-"*70)
+
+    start = time.perf_counter()
+    ref = series.apply(convert_lat_long).astype('float64')
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = convertir_coordonnees(series)
+    t_new = time.perf_counter() - start
+
+    identiques = (ref.to_numpy() == new.to_numpy()) | (ref.isna().to_numpy() & new.isna().to_numpy())
+    if not identiques.all():
+        ecarts = pd.DataFrame({'brut': series, 'reference': ref, 'vectorise': new})[~identiques]
+        print(f"  ❌ {len(ecarts):,} écarts :")
+        print(ecarts.head(20).to_string())
+        raise AssertionError(f"Conversion {nom} : sorties différentes")
+
+    print(f"  Référence (apply)  : {t_ref:6.2f}s")
+    print(f"  Vectorisé          : {t_new:6.2f}s")
+    print(f"  ✓ Sorties identiques ({len(new):,} valeurs, {new.notna().sum():,} non nulles) "
+          f"- gain x{t_ref / max(t_new, 1e-9):.1f}")
+    return new
+
+
+if __name__ == "__main__":
+    fichier = sys.argv[1] if len(sys.argv) > 1 else CONFIG['fichier_source']
+
+    df_bronze = pd.read_parquet(fichier, engine='pyarrow', columns=['num_acc', 'lat', 'long'])
+    df_bronze = df_bronze.drop_duplicates(subset=['num_acc'])
+    print(f"✓ {len(df_bronze):,} accidents chargés depuis {fichier}")
+
+    latitude = bench('latitude', df_bronze['lat'])
+    longitude = bench('longitude', df_bronze['long'])
+
+    print("\n[VALIDATION ck_coords_valides]")
+    print("-"*70)
+    _, _, nb_annules = valider_coordonnees(latitude, longitude)
+    un_seul_nul = (latitude.isna() ^ longitude.isna()).sum()
+    print(f"  ✓ {nb_annules:,} couples annulés "
+          f"(dont {un_seul_nul:,} avec une seule coordonnée renseignée)")
+    print(f"  ✓ {np.isfinite(latitude).sum():,} latitudes / {np.isfinite(longitude).sum():,} longitudes converties")
@@ -0,0 +1,133 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - LAC PARQUET PARTITIONNÉ
+Écrit les tables Silver de la base dans trois lacs temporaires (un
+fichier par table, partitions annee, partitions annee/departement_code)
+et compare pour chacun : écriture, nombre de fichiers et taille, lecture
+d'une année puis d'un département (fichiers et row groups réellement
+lus, parité avec le filtre pandas) et critères DuckDB complets.
+Usage : python bench_lac_partitionne.py [repetitions] [lignes_par_row_group]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import glob
+import time
+import tempfile
+import contextlib
+import pandas as pd
+import pyarrow.dataset as ds
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Critères de performance'))
+
+import lac_parquet
+import moteur_duckdb
+from lac_parquet import TABLES_SILVER, ecrire_lac, lire_lac, partitionnement
+from types_silver import compacter_dataframe
+from critere_perf_SQL import CONFIG, CRITERES, engine
+
+CONFIG['moteur'] = 'duckdb'
+
+DISPOSITIONS = {
+    'monolithe': [],
+    'annee': ['annee'],
+    'annee/departement': ['annee', 'departement_code']
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# MESURES
+# ════════════════════════════════════════════════════════════════
+
+def meilleur_temps(fonction, repetitions):
+    meilleur = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        resultat = fonction()
+        duree = time.perf_counter() - start
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, resultat
+
+
+def lus(dossier, table_name, filtre):
+    """
+    (fichiers, row groups) ouverts pour ce filtre : partitions élaguées
+    par les chemins, row groups par leurs statistiques.
+    """
+    dataset = ds.dataset(os.path.join(dossier, table_name), format='parquet', partitioning=partitionnement())
+    fragments = list(dataset.get_fragments(filter=filtre))
+    row_groups = sum(len(f.split_by_row_group(filter=filtre, schema=dataset.schema)) for f in fragments)
+    return len(fragments), row_groups
+
+
+def normaliser(df, colonnes):
+    """
+    Catégories Silver relues en texte : comparaison sur les valeurs.
+    """
+    df = df[colonnes].sort_values('id_usager').reset_index(drop=True)
+    return df.apply(lambda s: s if pd.api.types.is_numeric_dtype(s) else s.astype('string'))
+
+
+def bench(nom, dataframes, dossier, annee, departement, repetitions):
+    lac_parquet.CONFIG['partitions'] = DISPOSITIONS[nom]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        ecrire_lac(dataframes, dossier)
+        t_ecriture = time.perf_counter() - start
+    fichiers = glob.glob(os.path.join(dossier, '**', '*.parquet'), recursive=True)
+    taille = sum(os.path.getsize(f) for f in fichiers)
+
+    # Référence : filtre pandas sur les usagers rattachés à leur accident
+    usagers = dataframes['usagers'].merge(
+        dataframes['accidents'][['num_acc', 'annee', 'departement_code']], on='num_acc', how='left'
+    )
+    colonnes = list(usagers.columns)
+
+    lectures = []
+    for libelle, filtre, kwargs, masque in [
+        (f"annee = {annee}", ds.field('annee') == annee, {'annees': [annee]}, usagers['annee'] == annee),
+        (f"departement = {departement}", ds.field('departement_code') == departement,
+         {'departements': [departement]}, usagers['departement_code'] == departement)
+    ]:
+        t_lecture, df = meilleur_temps(lambda: lire_lac('usagers', dossier=dossier, **kwargs), repetitions)
+        pd.testing.assert_frame_equal(normaliser(df, colonnes), normaliser(usagers[masque], colonnes),
+                                      check_dtype=False)
+        lectures.append((libelle, t_lecture, len(df)) + lus(dossier, 'usagers', filtre))
+
+    moteur_duckdb.fermer()
+    moteur_duckdb.CONFIG['dossier'] = dossier
+    with contextlib.redirect_stdout(io.StringIO()):
+        meilleur_temps(lambda: [fonction() for _, fonction in CRITERES], 1)
+        t_criteres, _ = meilleur_temps(lambda: [fonction() for _, fonction in CRITERES], repetitions)
+    moteur_duckdb.fermer()
+
+    print(f"\n  {nom} : écriture {t_ecriture:.1f}s, {len(fichiers):,} fichiers, {taille / 1024**2:.1f} MB")
+    for libelle, t_lecture, nb_lignes, nb_fichiers, nb_row_groups in lectures:
+        print(f"    usagers {libelle:<20} {nb_lignes:>7,} lignes identiques en {t_lecture*1000:7.1f} ms "
+              f"({nb_fichiers:,} fichiers, {nb_row_groups:,} row groups lus)")
+    print(f"    3 critères DuckDB : {t_criteres*1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    if len(sys.argv) > 2:
+        lac_parquet.CONFIG['lignes_par_row_group'] = int(sys.argv[2])
+
+    print("\n[LECTURE SILVER]")
+    print("-"*70)
+    with engine.connect() as conn:
+        dataframes = {t: compacter_dataframe(pd.read_sql(f"SELECT * FROM {t}", conn), t) for t in TABLES_SILVER}
+    print(f"  ✓ {', '.join(f'{t} {len(df):,}' for t, df in dataframes.items())} lignes")
+
+    accidents = dataframes['accidents']
+    annee = int(accidents['annee'].max())
+    departement = str(accidents['departement_code'].value_counts().index[0])
+
+    print(f"\n[DISPOSITIONS DU LAC] lignes par row group {lac_parquet.CONFIG['lignes_par_row_group']:,}")
+    print("-"*70)
+    with tempfile.TemporaryDirectory() as racine:
+        for nom in DISPOSITIONS:
+            bench(nom, dataframes, os.path.join(racine, nom.replace('/', '_')), annee, departement, repetitions)
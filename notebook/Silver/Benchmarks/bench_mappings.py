@@ -0,0 +1,82 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - MAPPINGS COMPILÉS
+Compare Series.map(dictionnaire) ligne à ligne aux mappings compilés de
+mappings_silver.py (factorisation des distincts + take) : parité stricte
+par colonne Bronze + temps, puis bilan des libellés non mappés.
+Usage : python bench_mappings.py [fichier.parquet]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import time
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from silver_ETL_parquet_vectorise import CONFIG, COLS_USAGERS_MULTI, COLS_VEHICULES_MULTI, explode_multivalue_vectorized
+from mappings_silver import MAPPINGS, rapport_non_mappes
+from types_silver import table_arrow_vers_pandas
+
+
+# ════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ════════════════════════════════════════════════════════════════
+
+def bench(colonne, series):
+    mapping = MAPPINGS[colonne]
+
+    start = time.perf_counter()
+    source = series.str.lower() if mapping.minuscules else series
+    ref = source.map(mapping.correspondances)
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = mapping.appliquer(series)
+    t_new = time.perf_counter() - start
+
+    if not ref.equals(new) or ref.dtype != new.dtype:
+        ecarts = pd.DataFrame({'brut': series, 'reference': ref, 'compile': new})
+        ecarts = ecarts[~((ecarts['reference'] == ecarts['compile']) | (ecarts['reference'].isna() & ecarts['compile'].isna()))]
+        print(ecarts.head(20).to_string())
+        raise AssertionError(f"Mapping {mapping.nom} : sorties différentes ({ref.dtype} / {new.dtype})")
+
+    print(f"  {mapping.nom:<28} {len(series):>10,} lignes {series.nunique():>4} distincts : "
+          f"map {t_ref*1000:7.1f} ms / compilé {t_new*1000:7.1f} ms (x{t_ref / max(t_new, 1e-9):.1f})")
+    return t_ref, t_new
+
+
+if __name__ == "__main__":
+    fichier = sys.argv[1] if len(sys.argv) > 1 else CONFIG['fichier_source']
+
+    df_bronze = table_arrow_vers_pandas(pq.read_table(fichier, columns=['num_acc'] + [
+        c for c in MAPPINGS if c not in COLS_USAGERS_MULTI + COLS_VEHICULES_MULTI
+    ] + COLS_USAGERS_MULTI + COLS_VEHICULES_MULTI))
+    print(f"✓ {len(df_bronze):,} lignes chargées depuis {fichier}")
+
+    # Colonnes multi-valeurs : mapping sur les lignes explosées, comme dans l'ETL
+    df_vehicules = explode_multivalue_vectorized(df_bronze[['num_acc'] + COLS_VEHICULES_MULTI], COLS_VEHICULES_MULTI, verbose=False)
+    df_usagers = explode_multivalue_vectorized(df_bronze[['num_acc'] + COLS_USAGERS_MULTI], COLS_USAGERS_MULTI, verbose=False)
+
+    print("\n[PARITÉ Series.map / MAPPING COMPILÉ]")
+    print("-"*70)
+    total_ref = total_new = 0
+    for colonne in MAPPINGS:
+        if colonne in COLS_VEHICULES_MULTI:
+            series = df_vehicules[colonne]
+        elif colonne in COLS_USAGERS_MULTI:
+            series = df_usagers[colonne]
+        else:
+            series = df_bronze[colonne]
+        t_ref, t_new = bench(colonne, series)
+        total_ref += t_ref
+        total_new += t_new
+
+    print(f"\n  ✓ {len(MAPPINGS)} mappings identiques - total map {total_ref:.2f}s / "
+          f"compilé {total_new:.2f}s (x{total_ref / max(total_new, 1e-9):.1f})")
+
+    print("\n[LIBELLÉS NON MAPPÉS]")
+    print("-"*70)
+    rapport_non_mappes()
@@ -0,0 +1,170 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - PAGINATION CONCURRENTE DE L'API RECORDS
+Sert les premières lignes d'un fichier Bronze synthétique
+(generateur_baac.py) par l'API records/1.0/search du serveur local
+serveur_opendatasoft.py (latence simulée) et vérifie pagination_api.py :
+  1. sans quota : Parquet identique à la source, requêtes en vol
+  2. quota serveur dépassé : 429 + Retry-After respecté, rien de perdu
+  3. débit client sous le quota : aucun 429
+  4. erreurs 503 / 429 injectées : backoff puis reprise
+  5. champ nul sur toute la première page : type lu dans les métadonnées
+puis compare durée et pic RSS avec la boucle d'origine
+(fetch_accidents_paginated : séquentielle, sleep(1), liste de DataFrames).
+Usage : python bench_pagination.py [1x|10x|100x] [lignes] [rows]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import requests
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+import pagination_api
+from pagination_api import extraire_vers_parquet
+from telemetrie import PicMemoire
+from generateur_baac import fichier_bronze
+from serveur_opendatasoft import ServeurOpendatasoft
+
+pagination_api.CONFIG['attente_initiale'] = 0.1
+# Le serveur local ne borne pas start (l'API réelle s'arrête à 10000)
+pagination_api.CONFIG['offset_max'] = None
+
+
+def pagination_sequentielle(url, limit):
+    """
+    Boucle d'origine du notebook (sans les print) : une page à la fois,
+    sleep(1) entre les pages, 10s sur 429, chunks gardés en mémoire.
+    """
+    offset = 0
+    all_chunks = []
+    while True:
+        params = {"dataset": "accidents", "rows": limit, "start": offset, "timezone": "Europe/Paris"}
+        response = requests.get(url, params=params, timeout=30)
+        if response.status_code == 429:
+            time.sleep(10)
+            continue
+        data = response.json().get("records", [])
+        if not data:
+            break
+        df_chunk = pd.json_normalize(data)
+        all_chunks.append(df_chunk)
+        time.sleep(1)
+        offset += len(df_chunk)
+    return all_chunks
+
+
+def verifier(chemin, source):
+    table = pq.read_table(chemin)
+    # Schéma tiré des métadonnées : colonnes et types de la source
+    assert table.schema.equals(source.schema, check_metadata=False), table.schema
+    assert table.equals(source), "Contenu différent de la source"
+
+
+def requetes_records(serveur, depuis):
+    return [r for r in serveur.journal[depuis:] if r['chemin'].endswith('/search/')]
+
+
+if __name__ == "__main__":
+    echelle = sys.argv[1] if len(sys.argv) > 1 else '1x'
+    nb_lignes = int(sys.argv[2]) if len(sys.argv) > 2 else 60000
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+
+    dossier = tempfile.mkdtemp(prefix='pagination_')
+    try:
+        source = pq.read_table(fichier_bronze(echelle)).slice(0, nb_lignes)
+        chemin_source = os.path.join(dossier, 'source.parquet')
+        pq.write_table(source, chemin_source)
+        sortie = os.path.join(dossier, 'pages.parquet')
+        nb_pages = -(-nb_lignes // rows)
+        print(f"✓ {source.num_rows:,} lignes servies en {nb_pages} pages de {rows:,}")
+
+        with ServeurOpendatasoft(chemin_source, latence=0.2) as serveur:
+            url = serveur.url_records
+
+            print("\n[1] SANS QUOTA")
+            print("-"*70)
+            n = len(serveur.journal)
+            stats = extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=50, rafale=4)
+            verifier(sortie, source)
+            en_vol = max(r['en_vol'] for r in requetes_records(serveur, n))
+            # Une requête de métadonnées puis une par page
+            assert stats['requetes'] == nb_pages + 1 and stats['erreurs_429'] == 0, stats
+            assert en_vol > 1, "Aucune requête concurrente"
+            print(f"  ✓ Parquet identique, jusqu'à {en_vol} requêtes en vol")
+
+            print("\n[2] QUOTA DÉPASSÉ (2 req/s serveur, 20 req/s client)")
+            print("-"*70)
+            serveur.limiter(2, 1.0)
+            stats = extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=20, rafale=8)
+            verifier(sortie, source)
+            assert stats['erreurs_429'] > 0, stats
+            # Seules les requêtes déjà en vol au moment du 429 arrivent pendant le Retry-After
+            assert serveur.httpd.violations <= stats['erreurs_429'] * 4, serveur.httpd.violations
+            print(f"  ✓ Parquet identique après {stats['erreurs_429']} × 429 "
+                  f"({serveur.httpd.violations} requête(s) déjà en vol pendant un Retry-After)")
+
+            print("\n[3] DÉBIT CLIENT SOUS LE QUOTA (1.5 req/s)")
+            print("-"*70)
+            serveur.limiter(2, 1.0)
+            stats = extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=1.5, rafale=1)
+            verifier(sortie, source)
+            assert stats['erreurs_429'] == 0 and serveur.httpd.violations == 0, stats
+            print(f"  ✓ Aucun 429 en {stats['duree']:.1f}s")
+
+            print("\n[4] ERREURS INJECTÉES (503, 503, 429 Retry-After 1)")
+            print("-"*70)
+            serveur.limiter(None)
+            serveur.echouer((503, None), (503, None), (429, 1))
+            stats = extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=50, rafale=4)
+            verifier(sortie, source)
+            assert stats['reprises'] == 3 and stats['erreurs_429'] == 1, stats
+            assert stats['attente_retry_after'] == 1.0, stats
+            print(f"  ✓ Parquet identique après {stats['reprises']} reprises")
+
+            print("\n[5] CHAMP ABSENT DE LA PREMIÈRE PAGE")
+            print("-"*70)
+            colonne = source.column_names[-1]
+            indice = source.schema.get_field_index(colonne)
+            derivee = source.set_column(indice, colonne, pa.concat_arrays([
+                pa.nulls(rows, source.schema.field(colonne).type),
+                source[colonne].combine_chunks().slice(rows)
+            ]))
+            chemin_derivee = os.path.join(dossier, 'derivee.parquet')
+            pq.write_table(derivee, chemin_derivee)
+            serveur.publier(chemin_derivee)
+            stats = extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=50, rafale=4)
+            verifier(sortie, derivee)
+            assert stats['requetes'] == nb_pages + 1, stats
+            serveur.publier(chemin_source)
+            print(f"  ✓ Parquet identique, {colonne} typé d'après les métadonnées sans réécriture")
+
+            print("\n[COMPARAISON]")
+            print("-"*70)
+            resultats = {}
+            # Paginateur d'abord : la mémoire libérée par un run reste au processus
+            with PicMemoire() as pic:
+                start = time.perf_counter()
+                extraire_vers_parquet(sortie, url=url, rows=rows, concurrence=4, debit=4, rafale=4)
+                resultats['extraire_pages (4 en vol)'] = (time.perf_counter() - start, pic)
+
+            with PicMemoire() as pic:
+                start = time.perf_counter()
+                chunks = pagination_sequentielle(url, rows)
+                resultats['fetch_accidents_paginated'] = (time.perf_counter() - start, pic)
+            assert sum(len(chunk) for chunk in chunks) == nb_lignes
+            del chunks
+
+            for mode, (duree, pic) in resultats.items():
+                print(f"  {mode:<28} {duree:>6.1f}s   pic RSS +{(pic.pic - pic.debut) / 1024**2:>6.0f} MB")
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    print("\n✓ Pagination vérifiée")
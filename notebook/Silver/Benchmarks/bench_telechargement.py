@@ -0,0 +1,133 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - TÉLÉCHARGEMENT REPRENABLE DE L'EXPORT
+Sert un fichier Bronze synthétique (generateur_baac.py) par le serveur
+local serveur_opendatasoft.py et vérifie telechargement.py :
+  1. téléchargement à froid (contenu identique, SHA-256)
+  2. second appel : 304, aucun octet transféré
+  3. coupures injectées : reprise par Range, au plus un bloc
+     retransféré par coupure
+  4. nouvelle publication : nouvel objet du cache, ancien supprimé
+  5. lecture pq.read_table(memory_map=True) du fichier en cache
+puis compare durée et pic RSS du transfert avec l'approche d'origine
+(requests.get().content + BytesIO).
+Usage : python bench_telechargement.py [1x|10x|100x]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import tempfile
+import requests
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+import telechargement
+from telechargement import telecharger, hacher_fichier, lire_index
+from telemetrie import PicMemoire
+from generateur_baac import fichier_bronze
+from serveur_opendatasoft import ServeurOpendatasoft
+
+telechargement.CONFIG['attente_initiale'] = 0.01
+
+
+def octets_envoyes(serveur, depuis):
+    return sum(r['octets'] for r in serveur.journal[depuis:])
+
+
+def objets_en_cache():
+    dossier = os.path.join(telechargement.CONFIG['dossier'], 'objets')
+    return sorted(f for _, _, fichiers in os.walk(dossier) for f in fichiers)
+
+
+if __name__ == "__main__":
+    echelle = sys.argv[1] if len(sys.argv) > 1 else '1x'
+    source = fichier_bronze(echelle)
+    taille = os.path.getsize(source)
+    sha_source = hacher_fichier(source)
+    print(f"✓ Export servi : {source} ({taille / 1024**2:.1f} MB)")
+
+    dossier = tempfile.mkdtemp(prefix='sources_')
+    telechargement.CONFIG['dossier'] = dossier
+    try:
+        with ServeurOpendatasoft(source) as serveur:
+            url = serveur.url_export
+
+            print("\n[1] TÉLÉCHARGEMENT À FROID")
+            print("-"*70)
+            chemin = telecharger(url)
+            assert hacher_fichier(chemin) == sha_source
+            assert os.path.basename(chemin) == f"{sha_source}.parquet"
+            assert octets_envoyes(serveur, 0) == taille
+
+            print("\n[2] REQUÊTE CONDITIONNELLE")
+            print("-"*70)
+            n = len(serveur.journal)
+            assert telecharger(url) == chemin
+            assert [r['statut'] for r in serveur.journal[n:]] == [304]
+            assert octets_envoyes(serveur, n) == 0
+
+            print("\n[3] REPRISE APRÈS COUPURES")
+            print("-"*70)
+            n = len(serveur.journal)
+            serveur.couper(taille // 3, taille // 3)
+            assert telecharger(url, forcer=True) == chemin
+            statuts = [r['statut'] for r in serveur.journal[n:]]
+            assert statuts == [200, 206, 206], statuts
+            # Seul le bloc en cours de lecture à chaque coupure est retransféré
+            surplus = octets_envoyes(serveur, n) - taille
+            assert 0 <= surplus <= 2 * telechargement.CONFIG['taille_bloc'], surplus
+            assert hacher_fichier(chemin) == sha_source
+            print(f"  ✓ {len(statuts)} requêtes, {octets_envoyes(serveur, n):,} octets transférés "
+                  f"pour {taille:,} (+{surplus / 1024**2:.1f} MB retransférés)")
+
+            print("\n[4] NOUVELLE PUBLICATION")
+            print("-"*70)
+            nouvelle = os.path.join(dossier, 'publication.parquet')
+            pq.write_table(pq.read_table(source).slice(0, 100000), nouvelle)
+            serveur.publier(nouvelle)
+            n = len(serveur.journal)
+            # Coupure en cours de transfert puis reprise sur la nouvelle version
+            serveur.couper(os.path.getsize(nouvelle) // 2)
+            chemin_nouveau = telecharger(url)
+            assert [r['statut'] for r in serveur.journal[n:]] == [200, 206]
+            assert hacher_fichier(chemin_nouveau) == hacher_fichier(nouvelle)
+            assert not os.path.exists(chemin), "Ancien objet conservé"
+            assert objets_en_cache() == [os.path.basename(chemin_nouveau)]
+            assert lire_index()[url]['etag'] == serveur.httpd.etag
+            print(f"  ✓ Nouvel objet {os.path.basename(chemin_nouveau)[:12]}…, ancien supprimé")
+
+            print("\n[5] LECTURE PROJETÉE")
+            print("-"*70)
+            table = pq.read_table(chemin_nouveau, memory_map=True)
+            assert table.num_rows == 100000
+            print(f"  ✓ {table.num_rows:,} lignes lues depuis le cache")
+
+            print("\n[COMPARAISON] transfert de l'export complet")
+            print("-"*70)
+            serveur.publier(source)
+            resultats = {}
+
+            # Mode en flux d'abord : la mémoire libérée par un run reste au processus
+            with PicMemoire() as pic:
+                start = time.perf_counter()
+                chemin = telecharger(url, forcer=True)
+                resultats['telecharger (disque)'] = (time.perf_counter() - start, pic)
+
+            with PicMemoire() as pic:
+                start = time.perf_counter()
+                tampon = io.BytesIO(requests.get(url, timeout=60).content)
+                resultats['requests.get + BytesIO'] = (time.perf_counter() - start, pic)
+            assert pq.read_table(tampon).equals(pq.read_table(chemin, memory_map=True))
+            del tampon
+
+            for mode, (duree, pic) in resultats.items():
+                print(f"  {mode:<26} {duree:>6.1f}s   pic RSS +{(pic.pic - pic.debut) / 1024**2:>6.0f} MB")
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    print("\n✓ Téléchargement vérifié")
@@ -0,0 +1,87 @@
+"""
+═══════════════════════════════════════════════════════════════════
+BENCHMARK - TRANSFORMATION PARALLÈLE MULTI-PROCESSUS
+Transforme un fichier Bronze synthétique (generateur_baac.py) en 4
+tables Silver séquentiellement puis avec transformation_parallele.py
+(Bronze partagé en IPC Arrow projeté, usagers en tranches) : parité
+stricte des DataFrames et des libellés non mappés, durée murale de
+chaque mode et durée de la tâche la plus longue (borne basse du mode
+parallèle avec assez de cœurs).
+Usage : python bench_transformation_parallele.py [1x|10x|100x] [processus] [tranches_usagers]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+import telemetrie
+from generateur_baac import fichier_bronze
+from silver_ETL_parquet_vectorise import (
+    COLONNES_NECESSAIRES, transformer_accidents, transformer_lieux, transformer_vehicules, transformer_usagers
+)
+from mappings_silver import MAPPINGS, rapport_non_mappes
+from types_silver import table_arrow_vers_pandas
+from transformation_parallele import transformer_tables_parallele
+
+telemetrie.CONFIG['fichier_jsonl'] = None
+
+
+def sequentiel(table_bronze):
+    df_bronze = table_arrow_vers_pandas(table_bronze)
+    stats = {}
+    return {
+        'accidents': transformer_accidents(df_bronze, stats),
+        'lieux': transformer_lieux(df_bronze),
+        'vehicules': transformer_vehicules(df_bronze, verbose=False),
+        'usagers': transformer_usagers(df_bronze, verbose=False)
+    }, stats
+
+
+def non_mappes():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return rapport_non_mappes(reinitialiser=True)
+
+
+if __name__ == "__main__":
+    echelle = sys.argv[1] if len(sys.argv) > 1 else '1x'
+    processus = int(sys.argv[2]) if len(sys.argv) > 2 else max(os.cpu_count() or 1, 2)
+    tranches = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    table_bronze = pq.read_table(fichier_bronze(echelle), columns=COLONNES_NECESSAIRES)
+    print(f"✓ {table_bronze.num_rows:,} lignes Bronze ({table_bronze.nbytes / 1024**2:.0f} MB Arrow), "
+          f"{os.cpu_count()} cœur(s)")
+
+    print("\n[SÉQUENTIEL]")
+    print("-"*70)
+    start = time.perf_counter()
+    ref, stats_ref = sequentiel(table_bronze)
+    t_seq = time.perf_counter() - start
+    non_mappes_ref = non_mappes()
+    print(f"  ✓ {', '.join(f'{t} {len(df):,}' for t, df in ref.items())} en {t_seq:.1f}s")
+
+    print(f"\n[PARALLÈLE] {processus} processus, {tranches or processus} tranches usagers")
+    print("-"*70)
+    telemetrie.demarrer('bench')
+    start = time.perf_counter()
+    new, stats_new, durees = transformer_tables_parallele(table_bronze, processus, tranches)
+    t_par = time.perf_counter() - start
+    non_mappes_new = non_mappes()
+
+    for table_name in ref:
+        pd.testing.assert_frame_equal(ref[table_name], new[table_name])
+    assert stats_ref == stats_new, (stats_ref, stats_new)
+    assert non_mappes_ref == non_mappes_new, "Libellés non mappés différents"
+
+    tache_max = max(m['duree_s'] for m in telemetrie.collecter() if m['etape'].startswith('transformation_'))
+    for table_name, (nb_taches, duree) in durees.items():
+        print(f"  {table_name:<10} {len(new[table_name]):>10,} lignes identiques, "
+              f"{nb_taches} tâche(s), {duree:.1f}s cumulées")
+    print(f"\n  ✓ 4 tables identiques - séquentiel {t_seq:.1f}s / parallèle {t_par:.1f}s "
+          f"(x{t_seq / max(t_par, 1e-9):.2f}), tâche la plus longue {tache_max:.1f}s")
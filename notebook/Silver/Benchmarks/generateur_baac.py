@@ -0,0 +1,342 @@
+"""
+═══════════════════════════════════════════════════════════════════
+GÉNÉRATEUR DE DONNÉES BAAC SYNTHÉTIQUES
+Fichier Parquet au format Bronze (export accidents-corporels : une
+ligne par accident, colonnes usagers / véhicules multi-valeurs jointes
+par ',') reproductible à partir d'une graine, aux échelles 1x (475 000
+lignes, taille de l'export réel), 10x et 100x. Écriture par batchs
+(mémoire bornée), chaque batch ayant sa propre graine dérivée.
+Libellés tirés des dictionnaires *_MAPPING de mappings_silver.py (plus
+une petite part de libellés inconnus, de vides et de NULL), coordonnées
+GPS dans les encodages rencontrés dans l'export (décimal à virgule ou à
+point, entiers à 7 ou 8 chiffres, 'nan', vides, hors bornes), quelques
+accidents en double.
+Usage : python generateur_baac.py [1x|10x|100x] [graine]
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import argparse
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from mappings_silver import (
+    GRAVITE_MAPPING, LUMINOSITE_MAPPING, CONDITIONS_ATMO_MAPPING, AGG_MAPPING, INT_MAPPING,
+    COL_MAPPING, CATEGORIE_ROUTE_MAPPING, SURF_MAPPING, CATEGORIE_USAGER_MAPPING, SEXE_MAPPING,
+    SITU_MAPPING, INFRA_MAPPING, OBSTACLE_MOBILE_MAPPING, CATEGORIE_VEHICULE_MAPPING,
+    EQUIPEMENT_SECURITE_MAPPING, VOSP_MAPPING, MANOEUVRE_MAPPING, OBSTACLE_FIXE_MAPPING,
+    PROFIL_ROUTE_MAPPING, TRACE_PLAN_MAPPING, POINT_CHOC_MAPPING
+)
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Donnees'),
+    'lignes_1x': 475000,          # Lignes de l'export réel
+    'lignes_par_batch': 250000,   # Un row group par batch
+    'graine': 42,
+    'annees': (2005, 2022),
+    'taux_null': 0.01,            # Libellés NULL par colonne
+    'taux_inconnus': 0.002,       # Libellés absents des mappings
+    'taux_doublons': 0.002        # Lignes reprenant le num_acc d'une autre
+}
+
+ECHELLES = {'1x': 1, '10x': 10, '100x': 100}
+
+# Codes département de l'export (métropole, Corse, outre-mer)
+DEPARTEMENTS = ([f"{d:02d}" for d in range(1, 96) if d != 20] + ['2A', '2B']
+                + ['971', '972', '973', '974', '976'])
+
+# Encodages GPS : (probabilité, nom)
+FORMATS_GPS = [
+    (0.30, 'decimal_virgule'),    # '48,8566'
+    (0.25, 'decimal_point'),      # '48.8566'
+    (0.20, 'entier'),             # latitude '4885660', longitude '-2478760' / '23522190'
+    (0.15, 'null'),
+    (0.05, 'vide'),               # ''
+    (0.03, 'nan'),                # 'nan'
+    (0.02, 'hors_bornes')         # '999.5'
+]
+
+LIBELLE_INCONNU = 'Non renseigné'
+
+
+def chemin_fichier(echelle, graine=None):
+    graine = CONFIG['graine'] if graine is None else graine
+    return os.path.join(CONFIG['dossier'], f"baac_{echelle}_graine{graine}.parquet")
+
+
+# ════════════════════════════════════════════════════════════════
+# TIRAGES VECTORISÉS
+# ════════════════════════════════════════════════════════════════
+
+def vocabulaire(mapping, extras=()):
+    """
+    Libellés Bronze d'un mapping (+ extras) + un libellé inconnu (dernier).
+    """
+    return [cle for cle in mapping if cle not in ('', 'nan')] + list(extras) + [LIBELLE_INCONNU]
+
+
+def tirer_indices(rng, taille_vocabulaire, n):
+    """
+    Indices uniformes, le dernier (libellé inconnu) au taux configuré.
+    """
+    indices = rng.integers(0, taille_vocabulaire - 1, n)
+    inconnus = rng.random(n) < CONFIG['taux_inconnus']
+    indices[inconnus] = taille_vocabulaire - 1
+    return indices
+
+
+def depuis_indices(indices, libelles, nulls=None):
+    """
+    Indices → tableau Arrow de chaînes (dictionnaire décodé, NULL sur masque).
+    """
+    indices = pa.array(indices.astype('int32'), mask=nulls)
+    return pa.DictionaryArray.from_arrays(indices, pa.array(libelles, pa.string())).cast(pa.string())
+
+
+def choix(rng, libelles, n, taux_null=None):
+    taux_null = CONFIG['taux_null'] if taux_null is None else taux_null
+    return depuis_indices(tirer_indices(rng, len(libelles), n), libelles, rng.random(n) < taux_null)
+
+
+def entiers_texte(rng, minimum, maximum, n, taux_null=0.0):
+    valeurs = pa.array(rng.integers(minimum, maximum + 1, n), mask=rng.random(n) < taux_null)
+    return pc.cast(valeurs, pa.string())
+
+
+def joindre(valeurs, comptes, nulls=None):
+    """
+    Valeurs à plat (tableau Arrow de chaînes) regroupées par ligne selon
+    comptes puis jointes par ',' ; un élément NULL devient ''.
+    """
+    offsets = np.zeros(len(comptes) + 1, dtype='int32')
+    np.cumsum(comptes, out=offsets[1:])
+    listes = pa.ListArray.from_arrays(pa.array(offsets), pc.fill_null(valeurs, ''))
+    jointes = pc.binary_join(listes, ',')
+    if nulls is not None:
+        jointes = pc.if_else(pa.array(nulls), pa.scalar(None, pa.string()), jointes)
+    return jointes
+
+
+def multi(rng, libelles, comptes, taux_vide=0.02, taux_null=None):
+    """
+    Colonne multi-valeurs (une valeur par usager) : libellés du mapping,
+    éléments vides ('A,,B') et lignes NULL.
+    """
+    taux_null = CONFIG['taux_null'] if taux_null is None else taux_null
+    total = int(comptes.sum())
+    valeurs = depuis_indices(tirer_indices(rng, len(libelles), total), libelles, rng.random(total) < taux_vide)
+    return joindre(valeurs, comptes, rng.random(len(comptes)) < taux_null)
+
+
+def coordonnees(rng, n):
+    """
+    (lat, long) texte dans les encodages de FORMATS_GPS, un format par ligne.
+    """
+    latitude = rng.uniform(41.4, 51.0, n)
+    longitude = rng.uniform(-4.7, 8.2, n)
+    probabilites, formats = zip(*FORMATS_GPS)
+    format_ligne = rng.choice(len(formats), n, p=probabilites)
+
+    def encoder(valeurs, entiers):
+        decimal = pc.cast(pa.array(np.round(valeurs, 6)), pa.string())
+        textes = {
+            'decimal_virgule': pc.replace_substring(decimal, '.', ','),
+            'decimal_point': decimal,
+            'entier': pc.cast(pa.array(entiers), pa.string()),
+            'null': pa.nulls(n, pa.string()),
+            'vide': pa.array([''] * n, pa.string()) if n else pa.array([], pa.string()),
+            'nan': pa.array(['nan'] * n, pa.string()) if n else pa.array([], pa.string()),
+            'hors_bornes': pc.cast(pa.array(np.round(valeurs + 900, 1)), pa.string())
+        }
+        resultat = textes[formats[0]]
+        for i, nom in enumerate(formats[1:], start=1):
+            resultat = pc.if_else(pa.array(format_ligne == i), textes[nom], resultat)
+        return resultat
+
+    # Entiers : latitude ×10^5 (7 chiffres) ; longitude ×10^6 si négative
+    # (-2478760), ×10^7 au-delà de 1° (8 chiffres), sinon ×10^6
+    entiers_longitude = np.where(
+        longitude < 0, np.round(longitude * 1e6),
+        np.where(longitude >= 1, np.round(longitude * 1e7), np.round(longitude * 1e6))
+    ).astype('int64')
+    return (encoder(latitude, np.round(latitude * 1e5).astype('int64')),
+            encoder(longitude, entiers_longitude))
+
+
+# ════════════════════════════════════════════════════════════════
+# BATCH BRONZE
+# ════════════════════════════════════════════════════════════════
+
+def generer_batch(rng, debut, n):
+    """
+    n accidents à partir du rang `debut` (num_acc uniques sur le fichier).
+    """
+    annee_min, annee_max = CONFIG['annees']
+    annees = rng.integers(annee_min, annee_max + 1, n)
+    rangs = np.arange(debut, debut + n)
+
+    # num_acc : année + rang (12 chiffres), quelques lignes en double
+    num_acc = annees.astype('int64') * 10**8 + rangs % 10**8
+    doublons = np.flatnonzero(rng.random(n) < CONFIG['taux_doublons'])
+    num_acc[doublons] = num_acc[rng.integers(0, n, len(doublons))]
+
+    # Usagers et véhicules par accident (moyennes ~2,2 et ~1,7 comme l'export)
+    nb_usagers = np.minimum(1 + rng.poisson(1.2, n), 20)
+    nb_vehicules = np.minimum(np.minimum(1 + rng.poisson(0.7, n), nb_usagers), 10)
+    total_usagers = int(nb_usagers.sum())
+
+    # Véhicule de chaque usager : rang local (lettre) et rang global
+    vehicule_local = (rng.random(total_usagers) * np.repeat(nb_vehicules, nb_usagers)).astype('int64')
+    debut_vehicules = np.repeat(np.cumsum(nb_vehicules) - nb_vehicules, nb_usagers)
+    vehicule_global = debut_vehicules + vehicule_local
+    total_vehicules = int(nb_vehicules.sum())
+
+    def par_vehicule(libelles, taux_vide=0.02):
+        """
+        Attribut tiré par véhicule, répété pour chacun de ses usagers.
+        """
+        valeurs = depuis_indices(tirer_indices(rng, len(libelles), total_vehicules), libelles,
+                                 rng.random(total_vehicules) < taux_vide)
+        return joindre(valeurs.take(pa.array(vehicule_global)), nb_usagers,
+                       rng.random(n) < CONFIG['taux_null'])
+
+    def codes(libelles, taux_vide=0.02):
+        return multi(rng, libelles, nb_usagers, taux_vide=taux_vide, taux_null=0.0)
+
+    lettres = [f"{chr(65 + i)}01" for i in range(10)]
+    num_veh = joindre(depuis_indices(vehicule_local, lettres), nb_usagers)
+    annees_naissance = annees.repeat(nb_usagers) - rng.integers(0, 90, total_usagers)
+    latitude, longitude = coordonnees(rng, n)
+    surfaces = [libelle.capitalize() for libelle in vocabulaire(SURF_MAPPING)]   # Casse de l'export
+
+    colonnes = {
+        'num_acc': pc.cast(pa.array(num_acc), pa.string()),
+        'an': pc.cast(pa.array(annees), pa.string()),
+        'mois': entiers_texte(rng, 1, 12, n),
+        'jour': entiers_texte(rng, 1, 28, n),
+        'hrmn': pc.binary_join_element_wise(
+            pc.utf8_lpad(pc.cast(pa.array(rng.integers(0, 24, n)), pa.string()), 2, '0'),
+            pc.utf8_lpad(pc.cast(pa.array(rng.integers(0, 60, n)), pa.string()), 2, '0'),
+            ':'
+        ),
+        'lum': choix(rng, vocabulaire(LUMINOSITE_MAPPING), n),
+        'agg': choix(rng, vocabulaire(AGG_MAPPING), n),
+        'int': choix(rng, vocabulaire(INT_MAPPING), n),
+        'atm': choix(rng, vocabulaire(CONDITIONS_ATMO_MAPPING), n),
+        'col': choix(rng, vocabulaire(COL_MAPPING), n),
+        'com': pc.cast(pa.array(rng.integers(1000, 98000, n)), pa.string()),   # 4 chiffres : zfill
+        'dep': depuis_indices(rng.integers(0, len(DEPARTEMENTS), n), DEPARTEMENTS),
+        'lat': latitude,
+        'long': longitude,
+        'adr': pc.if_else(
+            pa.array(rng.random(n) < 0.15), pa.scalar(None, pa.string()),
+            pc.binary_join_element_wise(
+                entiers_texte(rng, 1, 200, n),
+                depuis_indices(rng.integers(0, 4, n), ['RUE', 'AVENUE', 'ROUTE', 'CHEMIN']),
+                depuis_indices(rng.integers(0, len(DEPARTEMENTS), n), [f"DU {d}" for d in DEPARTEMENTS]),
+                ' '
+            )
+        ),
+        'catr': choix(rng, vocabulaire(CATEGORIE_ROUTE_MAPPING), n),
+        'voie': entiers_texte(rng, 1, 999, n, taux_null=0.1),
+        'circ': choix(rng, ['1', '2', '3', '4', '-1'], n),
+        'nbv': entiers_texte(rng, 0, 6, n, taux_null=0.02),
+        'prof': choix(rng, vocabulaire(PROFIL_ROUTE_MAPPING, ['']), n),
+        'plan': choix(rng, vocabulaire(TRACE_PLAN_MAPPING, ['']), n),
+        'lartpc': entiers_texte(rng, 0, 500, n, taux_null=0.9),
+        'larrout': entiers_texte(rng, 0, 2000, n, taux_null=0.1),
+        'surf': choix(rng, surfaces, n),
+        'infra': choix(rng, vocabulaire(INFRA_MAPPING), n),
+        # 'Autre' (code 9) absent de l'export : refusé par lieux_situation_check
+        'situ': choix(rng, [libelle for libelle in vocabulaire(SITU_MAPPING) if libelle != 'Autre'], n),
+        'env1': choix(rng, ['0', '99', '3'], n, taux_null=0.3),
+        'vosp': choix(rng, vocabulaire(VOSP_MAPPING, ['', 'nan']), n),
+        # Usagers (une valeur par usager)
+        'an_nais': joindre(pc.cast(pa.array(annees_naissance), pa.string()), nb_usagers,
+                           rng.random(n) < CONFIG['taux_null']),
+        'sexe': multi(rng, vocabulaire(SEXE_MAPPING), nb_usagers),
+        'actp': codes(['0', '1', '2', '3', '4', '5', '9', 'A', 'B', ' ', '-1']),
+        'grav': multi(rng, vocabulaire(GRAVITE_MAPPING), nb_usagers),
+        'secu': multi(rng, vocabulaire(EQUIPEMENT_SECURITE_MAPPING), nb_usagers),
+        'secu_utl': choix(rng, ['1', '2', '3'], n, taux_null=0.95),
+        'locp': codes(['0', '1', '2', '3', '4', '5', '6', '-1']),
+        'place': codes(['1', '2', '3', '4', '5', '6', '7', '8', '9', ''], taux_vide=0.1),
+        'catu': multi(rng, vocabulaire(CATEGORIE_USAGER_MAPPING), nb_usagers),
+        'etatp': codes(['0', '1', '2', '3', '-1']),
+        'trajet': codes(['0', '1', '2', '3', '4', '5', '9', '-1']),
+        # Véhicules (valeur du véhicule de chaque usager)
+        'num_veh': num_veh,
+        'choc': par_vehicule(vocabulaire(POINT_CHOC_MAPPING)),
+        'manv': par_vehicule(vocabulaire(MANOEUVRE_MAPPING)),
+        'senc': par_vehicule(['0', '1', '2', '3', '-1']),
+        'obsm': par_vehicule(vocabulaire(OBSTACLE_MOBILE_MAPPING)),
+        'obs': par_vehicule(vocabulaire(OBSTACLE_FIXE_MAPPING)),
+        'catv': par_vehicule(vocabulaire(CATEGORIE_VEHICULE_MAPPING)),
+        'occutc': par_vehicule(['0', '1', '2', '10', '25'], taux_vide=0.9)
+    }
+    return pa.table(colonnes)
+
+
+# ════════════════════════════════════════════════════════════════
+# FICHIER
+# ════════════════════════════════════════════════════════════════
+
+def generer_bronze(echelle='1x', chemin=None, graine=None):
+    """
+    Écrit le fichier Bronze synthétique de l'échelle demandée (réécrit
+    s'il existe) et retourne son chemin. Même graine → même fichier.
+    """
+    graine = CONFIG['graine'] if graine is None else graine
+    chemin = chemin or chemin_fichier(echelle, graine)
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    nb_lignes = CONFIG['lignes_1x'] * ECHELLES[echelle]
+    taille_batch = CONFIG['lignes_par_batch']
+
+    start = time.time()
+    writer = None
+    try:
+        for num_batch, debut in enumerate(range(0, nb_lignes, taille_batch)):
+            rng = np.random.default_rng(np.random.SeedSequence([graine, num_batch]))
+            table = generer_batch(rng, debut, min(taille_batch, nb_lignes - debut))
+            if writer is None:
+                writer = pq.ParquetWriter(chemin + '.tmp', table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(chemin + '.tmp', chemin)
+
+    print(f"✓ Bronze synthétique {echelle} (graine {graine}) : {nb_lignes:,} lignes, "
+          f"{os.path.getsize(chemin) / 1024**2:.0f} MB → {chemin} ({time.time()-start:.1f}s)")
+    return chemin
+
+
+def fichier_bronze(echelle='1x', graine=None):
+    """
+    Chemin du fichier de l'échelle, généré au premier appel.
+    """
+    chemin = chemin_fichier(echelle, graine)
+    if not os.path.exists(chemin):
+        generer_bronze(echelle, chemin, graine)
+    return chemin
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fichier Bronze BAAC synthétique (Parquet)")
+    parser.add_argument('echelle', nargs='?', default='1x', choices=list(ECHELLES),
+                        help=f"taille (1x = {CONFIG['lignes_1x']:,} lignes ; défaut : 1x)")
+    parser.add_argument('graine', nargs='?', type=int, default=None,
+                        help=f"graine du tirage (défaut : {CONFIG['graine']})")
+    args = parser.parse_args()
+    generer_bronze(args.echelle, graine=args.graine)
@@ -0,0 +1,326 @@
+"""
+═══════════════════════════════════════════════════════════════════
+SERVEUR LOCAL SIMULANT L'API OPENDATASOFT
+Serveur HTTP de test (thread, 127.0.0.1, port libre) qui sert un
+fichier Parquet à la place de l'export du jeu accidents-corporels :
+    /api/explore/v2.1/catalog/datasets/<id>/exports/parquet
+avec ETag / Last-Modified, requêtes conditionnelles (304), Range et
+If-Range (206 / 416), et des coupures injectées après N octets pour
+éprouver les reprises ; et les mêmes lignes par l'API paginée
+    /api/records/1.0/search/?dataset=…&rows=…&start=…
+(champs nuls omis comme l'API réelle) et ses métadonnées
+    /api/datasets/1.0/<id>/   (nom et type ODS de chaque champ)
+avec latence simulée, quota de requêtes par fenêtre glissante (429 +
+Retry-After) et erreurs injectées. Chaque requête est journalisée (statut, Range, start,
+octets envoyés, requêtes en vol).
+Usage :
+    with ServeurOpendatasoft(chemin_parquet) as serveur:
+        telecharger(serveur.url_export)
+        serveur.limiter(5, 1.0)
+        extraire_vers_parquet(chemin, url=serveur.url_records)
+═══════════════════════════════════════════════════════════════════
+"""
+
+import re
+import json
+import math
+import time
+import hashlib
+import threading
+from collections import deque
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATASET_ID = "accidents-corporels-de-la-circulation-millesime"
+CHEMIN_EXPORT = f"/api/explore/v2.1/catalog/datasets/{DATASET_ID}/exports/parquet"
+CHEMIN_RECORDS = "/api/records/1.0/search/"
+PREFIXE_METADONNEES = "/api/datasets/1.0/"
+
+TAILLE_ENVOI = 64 * 1024
+
+
+class GestionnaireRequetes(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def journaliser(self, statut, octets=0, **details):
+        with self.server.verrou:
+            self.server.journal.append({
+                'chemin': self.path.split('?')[0],
+                'statut': statut,
+                'range': self.headers.get('Range'),
+                'octets': octets,
+                'horodatage': time.monotonic(),
+                **details
+            })
+
+    def envoyer_entetes(self, statut, entetes):
+        self.send_response(statut)
+        for nom, valeur in entetes.items():
+            self.send_header(nom, valeur)
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.split('?')[0] == CHEMIN_EXPORT:
+            return self.servir_export()
+        if self.path.split('?')[0] == CHEMIN_RECORDS:
+            return self.servir_records()
+        if self.path.split('?')[0].startswith(PREFIXE_METADONNEES):
+            return self.servir_metadonnees()
+        self.envoyer_entetes(404, {'Content-Length': '0'})
+        self.journaliser(404)
+
+    # ────────────────────────────────────────────────────────────
+    # Export Parquet
+    # ────────────────────────────────────────────────────────────
+
+    def servir_export(self):
+        serveur = self.server
+        contenu, etag, last_modified = serveur.contenu, serveur.etag, serveur.last_modified
+        taille = len(contenu)
+        version = {'ETag': etag, 'Last-Modified': last_modified, 'Accept-Ranges': 'bytes'}
+
+        if self.non_modifie(etag, last_modified):
+            self.envoyer_entetes(304, version)
+            return self.journaliser(304)
+
+        debut = 0
+        plage = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        si_plage = self.headers.get('If-Range')
+        if plage and (si_plage is None or si_plage in (etag, last_modified)):
+            debut = int(plage.group(1))
+            if debut >= taille:
+                self.envoyer_entetes(416, {**version, 'Content-Range': f"bytes */{taille}", 'Content-Length': '0'})
+                return self.journaliser(416)
+            statut = 206
+            entetes = {**version, 'Content-Range': f"bytes {debut}-{taille - 1}/{taille}"}
+        else:
+            statut = 200
+            entetes = dict(version)
+        entetes.update({'Content-Type': 'application/octet-stream', 'Content-Length': str(taille - debut)})
+
+        # Coupure injectée : la connexion est fermée après `coupure` octets du corps
+        with serveur.verrou:
+            coupure = serveur.coupures.pop(0) if serveur.coupures else None
+        fin = taille if coupure is None else min(taille, debut + coupure)
+
+        self.envoyer_entetes(statut, entetes)
+        envoyes = 0
+        try:
+            for position in range(debut, fin, TAILLE_ENVOI):
+                bloc = contenu[position:min(position + TAILLE_ENVOI, fin)]
+                self.wfile.write(bloc)
+                envoyes += len(bloc)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        if fin < taille:
+            self.close_connection = True
+        self.journaliser(statut, envoyes)
+
+    def non_modifie(self, etag, last_modified):
+        if 'If-None-Match' in self.headers:
+            return self.headers['If-None-Match'] == etag
+        if 'If-Modified-Since' in self.headers:
+            try:
+                return parsedate_to_datetime(self.headers['If-Modified-Since']) >= parsedate_to_datetime(last_modified)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    # ────────────────────────────────────────────────────────────
+    # API records paginée
+    # ────────────────────────────────────────────────────────────
+
+    def servir_records(self):
+        serveur = self.server
+        params = parse_qs(urlsplit(self.path).query)
+        start = int(params.get('start', ['0'])[0])
+        rows = int(params.get('rows', ['10'])[0])
+
+        statut, retry_after = serveur.controler_quota()
+        if statut != 200:
+            entetes = {'Content-Length': '0'}
+            if retry_after is not None:
+                entetes['Retry-After'] = str(retry_after)
+            self.envoyer_entetes(statut, entetes)
+            return self.journaliser(statut, start=start)
+
+        with serveur.verrou:
+            serveur.en_vol += 1
+            en_vol = serveur.en_vol
+        try:
+            time.sleep(serveur.latence)
+            table = serveur.table_records()
+            lignes = table.slice(start, max(rows, 0)).to_pylist() if start < table.num_rows else []
+            corps = json.dumps({
+                'nhits': table.num_rows,
+                'parameters': {'dataset': params.get('dataset', [DATASET_ID])[0], 'rows': rows, 'start': start},
+                'records': [{
+                    'datasetid': DATASET_ID,
+                    'recordid': hashlib.sha1(str(start + i).encode()).hexdigest(),
+                    'fields': {champ: valeur for champ, valeur in ligne.items() if valeur is not None},
+                    'record_timestamp': serveur.last_modified
+                } for i, ligne in enumerate(lignes)]
+            }).encode('utf-8')
+        finally:
+            with serveur.verrou:
+                serveur.en_vol -= 1
+        self.envoyer_entetes(200, {'Content-Type': 'application/json', 'Content-Length': str(len(corps))})
+        self.wfile.write(corps)
+        self.journaliser(200, len(corps), start=start, en_vol=en_vol)
+
+
+    def servir_metadonnees(self):
+        serveur = self.server
+        statut, retry_after = serveur.controler_quota()
+        if statut != 200:
+            entetes = {'Content-Length': '0'}
+            if retry_after is not None:
+                entetes['Retry-After'] = str(retry_after)
+            self.envoyer_entetes(statut, entetes)
+            return self.journaliser(statut)
+
+        corps = json.dumps({
+            'datasetid': DATASET_ID,
+            'fields': [{'name': champ.name, 'label': champ.name, 'type': type_ods(champ.type)}
+                       for champ in serveur.table_records().schema]
+        }).encode('utf-8')
+        self.envoyer_entetes(200, {'Content-Type': 'application/json', 'Content-Length': str(len(corps))})
+        self.wfile.write(corps)
+        self.journaliser(200, len(corps))
+
+
+def type_ods(type_arrow):
+    """
+    Type OpenDataSoft annoncé pour une colonne du fichier servi.
+    """
+    if pa.types.is_integer(type_arrow):
+        return 'int'
+    if pa.types.is_floating(type_arrow):
+        return 'double'
+    if pa.types.is_boolean(type_arrow):
+        return 'boolean'
+    return 'text'
+
+
+class ServeurHTTP(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def table_records(self):
+        with self.verrou:
+            if self.table is None:
+                self.table = pq.read_table(self.chemin)
+            return self.table
+
+    def controler_quota(self):
+        """
+        (statut, Retry-After) de la prochaine requête records : erreur
+        injectée, sinon 429 si le quota de la fenêtre glissante est
+        atteint ou si la requête arrive avant le Retry-After annoncé
+        (comptée en violation).
+        """
+        with self.verrou:
+            if self.erreurs:
+                return self.erreurs.pop(0)
+            if self.quota is None:
+                return 200, None
+            maintenant = time.monotonic()
+            if maintenant < self.reprise_annoncee:
+                self.violations += 1
+                return 429, math.ceil(self.reprise_annoncee - maintenant)
+            while self.requetes and self.requetes[0] <= maintenant - self.fenetre_quota:
+                self.requetes.popleft()
+            if len(self.requetes) >= self.quota:
+                retry_after = max(1, math.ceil(self.requetes[0] + self.fenetre_quota - maintenant))
+                self.reprise_annoncee = maintenant + retry_after
+                return 429, retry_after
+            self.requetes.append(maintenant)
+            return 200, None
+
+
+class ServeurOpendatasoft:
+    """
+    Serveur de test démarré dans un thread (context manager).
+    publier() remplace le fichier servi (nouvel ETag / Last-Modified) ;
+    couper(n, ...) fait échouer les prochaines réponses export après n
+    octets de corps ; limiter(n, s) n'accepte que n requêtes records par
+    fenêtre glissante de s secondes ; echouer((statut, retry_after), ...)
+    impose le statut des prochaines requêtes records.
+    """
+    def __init__(self, chemin_parquet=None, latence=0.0):
+        self.httpd = ServeurHTTP(('127.0.0.1', 0), GestionnaireRequetes)
+        self.httpd.verrou = threading.Lock()
+        self.httpd.journal = []
+        self.httpd.coupures = []
+        self.httpd.contenu = b''
+        self.httpd.etag = self.httpd.last_modified = None
+        self.httpd.chemin = self.httpd.table = None
+        self.httpd.latence = latence
+        self.httpd.en_vol = 0
+        self.httpd.erreurs = []
+        self.httpd.quota = None
+        self.httpd.fenetre_quota = 1.0
+        self.httpd.requetes = deque()
+        self.httpd.reprise_annoncee = 0.0
+        self.httpd.violations = 0
+        self.nb_publications = 0
+        if chemin_parquet:
+            self.publier(chemin_parquet)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def url_export(self):
+        return self.url + CHEMIN_EXPORT
+
+    @property
+    def url_records(self):
+        return self.url + CHEMIN_RECORDS
+
+    @property
+    def journal(self):
+        return self.httpd.journal
+
+    def publier(self, chemin_parquet):
+        with open(chemin_parquet, 'rb') as f:
+            contenu = f.read()
+        self.nb_publications += 1
+        with self.httpd.verrou:
+            self.httpd.contenu = contenu
+            self.httpd.chemin, self.httpd.table = chemin_parquet, None
+            self.httpd.etag = f'"{hashlib.sha256(contenu).hexdigest()[:16]}"'
+            # Date HTTP à la seconde : une publication = une seconde plus tard
+            self.httpd.last_modified = formatdate(1.7e9 + self.nb_publications, usegmt=True)
+
+    def couper(self, *octets):
+        with self.httpd.verrou:
+            self.httpd.coupures.extend(octets)
+
+    def limiter(self, quota, fenetre=1.0):
+        with self.httpd.verrou:
+            self.httpd.quota, self.httpd.fenetre_quota = quota, fenetre
+            self.httpd.requetes.clear()
+            self.httpd.reprise_annoncee = 0.0
+            self.httpd.violations = 0
+
+    def echouer(self, *erreurs):
+        with self.httpd.verrou:
+            self.httpd.erreurs.extend(erreurs)
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
@@ -0,0 +1,236 @@
+"""
+═══════════════════════════════════════════════════════════════════
+CACHE DES RÉSULTATS DE REQUÊTES D'ANALYSE
+pd.read_sql mis en cache sur disque (Parquet) : clé = SQL normalisé +
+version des données de chaque relation lue. Les relations lues sont
+tirées du plan (EXPLAIN VERBOSE) ; leur version est le dernier
+chargement Silver (etl_watermarks) ou le dernier refresh réussi d'une
+vue Gold (historique_refresh). Un chargement ETL invalide donc les
+seules entrées qui lisent les tables rechargées. Taille bornée,
+éviction LRU.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import pandas as pd
+from sqlalchemy import text
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Cache'),
+    'taille_max_octets': 256 * 1024 * 1024
+}
+
+SCHEMA_GOLD = 'accidents_gold'
+
+# Index et fichiers partagés entre threads (critères exécutés en parallèle)
+_verrou = threading.Lock()
+
+# Relations lues par requête (hash du SQL normalisé), stables pour un même SQL
+_dependances = {}
+
+
+# ════════════════════════════════════════════════════════════════
+# CLÉS ET VERSIONS
+# ════════════════════════════════════════════════════════════════
+
+def normaliser_sql(query_sql):
+    """
+    SQL sans commentaires '--' ni différences d'espacement (les
+    littéraux ne sont pas modifiés : pas de passage en minuscules).
+    """
+    sans_commentaires = re.sub(r'--[^\n]*', ' ', query_sql)
+    return re.sub(r'\s+', ' ', sans_commentaires).strip().rstrip(';').strip()
+
+
+def empreinte(*parties):
+    return hashlib.sha256('\x1f'.join(parties).encode('utf-8')).hexdigest()
+
+
+def relations_lues(conn, query_sql):
+    """
+    Relations (schema.table) parcourues par le plan de la requête ; une
+    partition est ramenée à sa table partitionnée.
+    """
+    plan = conn.execute(text(f"EXPLAIN (VERBOSE, FORMAT JSON) {query_sql.strip().rstrip(';')}")).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+
+    relations = set()
+    noeuds = [plan[0]['Plan']]
+    while noeuds:
+        noeud = noeuds.pop()
+        if 'Relation Name' in noeud:
+            relations.add(f"{noeud['Schema']}.{noeud['Relation Name']}")
+        noeuds.extend(noeud.get('Plans', []))
+
+    if not relations:
+        return []
+    return sorted(conn.execute(text("""
+        SELECT DISTINCT n.nspname || '.' || c.relname
+        FROM unnest(CAST(:relations AS TEXT[])) AS r(nom)
+        JOIN pg_class c ON c.oid = COALESCE(pg_partition_root(to_regclass(r.nom)), to_regclass(r.nom))
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+    """), {'relations': sorted(relations)}).scalars())
+
+
+def versions_donnees(conn):
+    """
+    {schema.relation: version} : mis_a_jour_le des tables Silver
+    (etl_watermarks, avancé par chaque transaction d'écriture de l'ETL,
+    y compris celles d'un run interrompu), début du dernier refresh
+    réussi des vues Gold.
+    """
+    requetes = []
+    if conn.execute(text("SELECT to_regclass('etl_watermarks') IS NOT NULL")).scalar():
+        requetes.append("""
+            SELECT n.nspname || '.' || c.relname AS relation, CAST(w.mis_a_jour_le AS TEXT) AS version
+            FROM etl_watermarks w
+            JOIN pg_class c ON c.oid = to_regclass(w.table_name)
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+        """)
+    if conn.execute(text("SELECT to_regclass(:table) IS NOT NULL"),
+                    {'table': f"{SCHEMA_GOLD}.historique_refresh"}).scalar():
+        requetes.append(f"""
+            SELECT '{SCHEMA_GOLD}.' || vue_name AS relation, CAST(MAX(debut) AS TEXT) AS version
+            FROM {SCHEMA_GOLD}.historique_refresh
+            WHERE statut = 'ok'
+            GROUP BY vue_name
+        """)
+    if not requetes:
+        return {}
+    return dict(conn.execute(text(" UNION ALL ".join(requetes))).fetchall())
+
+
+# ════════════════════════════════════════════════════════════════
+# INDEX SUR DISQUE
+# ════════════════════════════════════════════════════════════════
+
+def chemin_index():
+    return os.path.join(CONFIG['dossier'], 'index.json')
+
+
+def lire_index():
+    try:
+        with open(chemin_index(), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def ecrire_index(index):
+    temporaire = chemin_index() + '.tmp'
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(temporaire, chemin_index())
+
+
+def supprimer_entree(index, cle):
+    entree = index.pop(cle, None)
+    if entree:
+        try:
+            os.remove(os.path.join(CONFIG['dossier'], entree['fichier']))
+        except FileNotFoundError:
+            pass
+
+
+def purger_perimees(index, versions):
+    """
+    Supprime les entrées dont une relation lue a changé de version.
+    """
+    perimees = [cle for cle, entree in index.items()
+                if any(versions.get(relation) != version for relation, version in entree['versions'].items())]
+    for cle in perimees:
+        supprimer_entree(index, cle)
+    return len(perimees)
+
+
+def evincer(index):
+    """
+    Éviction LRU jusqu'à repasser sous la taille maximale.
+    """
+    taille = sum(entree['taille'] for entree in index.values())
+    for cle in sorted(index, key=lambda c: index[c]['dernier_acces']):
+        if taille <= CONFIG['taille_max_octets']:
+            break
+        taille -= index[cle]['taille']
+        supprimer_entree(index, cle)
+
+
+def vider_cache():
+    with _verrou:
+        index = lire_index()
+        for cle in list(index):
+            supprimer_entree(index, cle)
+        if os.path.isdir(CONFIG['dossier']):
+            ecrire_index(index)
+
+
+# ════════════════════════════════════════════════════════════════
+# LECTURE
+# ════════════════════════════════════════════════════════════════
+
+def read_sql_cache(query_sql, engine):
+    """
+    pd.read_sql avec cache. Retourne (DataFrame, statut) où statut vaut
+    'hit', 'miss' ou 'hors_cache' (une relation lue n'a pas de version
+    connue : résultat non mis en cache).
+    """
+    sql = normaliser_sql(query_sql)
+    hash_sql = empreinte(sql)
+
+    with engine.connect() as conn:
+        if hash_sql not in _dependances:
+            _dependances[hash_sql] = relations_lues(conn, query_sql)
+        versions = versions_donnees(conn)
+    relations = _dependances[hash_sql]
+
+    if not relations or any(relation not in versions for relation in relations):
+        return pd.read_sql(query_sql, engine), 'hors_cache'
+
+    versions_lues = {relation: versions[relation] for relation in relations}
+    cle = empreinte(hash_sql, json.dumps(versions_lues, sort_keys=True))
+
+    with _verrou:
+        os.makedirs(CONFIG['dossier'], exist_ok=True)
+        index = lire_index()
+        purger_perimees(index, versions)
+        entree = index.get(cle)
+        if entree is not None:
+            try:
+                df = pd.read_parquet(os.path.join(CONFIG['dossier'], entree['fichier']))
+                entree['dernier_acces'] = time.time()
+                ecrire_index(index)
+                return df, 'hit'
+            except (FileNotFoundError, OSError):
+                supprimer_entree(index, cle)
+        ecrire_index(index)
+
+    df = pd.read_sql(query_sql, engine)
+
+    fichier = f"{cle}.parquet"
+    chemin = os.path.join(CONFIG['dossier'], fichier)
+    df.to_parquet(chemin + '.tmp', index=False)
+    os.replace(chemin + '.tmp', chemin)
+
+    with _verrou:
+        index = lire_index()
+        index[cle] = {
+            'fichier': fichier,
+            'sql': sql[:200],
+            'versions': versions_lues,
+            'taille': os.path.getsize(chemin),
+            'cree_le': time.time(),
+            'dernier_acces': time.time()
+        }
+        evincer(index)
+        ecrire_index(index)
+    return df, 'miss'
@@ -2,7 +2,11 @@
 ANALYSES MÉTIER - CRITÈRES DE PERFORMANCE
 """
 
+import io
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from sqlalchemy import create_engine, text
 import sys
@@ -18,16 +22,42 @@ load_dotenv()
 
 DB_CONFIG = {
     'host': os.getenv('DB_HOST'),                   
-    'port': int(os.getenv('DB_PORT')),            
+    'port': int(os.getenv('DB_PORT', 5432)),      
     'database': os.getenv('DB_NAME'),              
     'user': os.getenv('DB_USER'),                  
     'password': os.getenv('DB_PASSWORD')           
 }
 
+SCHEMA_GOLD = 'accidents_gold'
+
+CONFIG = {
+    # 'postgresql' : requêtes sur la base ; 'duckdb' : mêmes requêtes sur le
+    # lac Parquet Silver, sans serveur (moteur_duckdb.py)
+    'moteur': 'postgresql',
+    # 'auto' : vues Gold pré-agrégées si elles sont à jour, sinon Silver ;
+    # 'gold' / 'silver' : source imposée
+    'source': 'auto',
+    # Résultats mis en cache sur disque, invalidés par chargement ETL (cache_requetes.py)
+    'cache': True,
+    # Critères exécutés simultanément, une connexion du pool chacun
+    'parallele': True,
+    'nb_workers': 3
+}
+
 engine = create_engine(
-    f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+    f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}",
+    pool_size=CONFIG['nb_workers'],
+    max_overflow=0
 )
 
+# Vues Gold (notebook/Gold/ETL/vues_gold.py) et tables Silver lues par chaque critère
+SOURCES_CRITERES = {
+    'critere_1': {'vues': ['mv_critere_conditions', 'mv_critere_departements'],
+                  'tables': ['accidents', 'lieux', 'usagers']},
+    'critere_2': {'vues': ['mv_critere_departements'], 'tables': ['accidents', 'usagers']},
+    'critere_3': {'vues': ['mv_critere_usagers'], 'tables': ['usagers']}
+}
+
 # Configuration du logging
 class Logger:
     def __init__(self, filename=None):
@@ -47,86 +77,36 @@ class Logger:
         if self.log_file:
             self.log_file.flush()
 
+class SortieParThread:
+    """
+    Sortie standard dont les écritures d'un thread peuvent être dirigées
+    vers un tampon : les critères exécutés en parallèle écrivent chacun
+    dans le leur, restitués ensuite dans l'ordre du rapport.
+    """
+    def __init__(self, sortie):
+        self.sortie = sortie
+        self.local = threading.local()
+    
+    def write(self, message):
+        tampon = getattr(self.local, 'tampon', None)
+        (tampon if tampon is not None else self.sortie).write(message)
+    
+    def flush(self):
+        self.sortie.flush()
+
 # ════════════════════════════════════════════════════════════════
 # DICTIONNAIRES POUR LA CORRESPONDANCE DES CODES
 # ════════════════════════════════════════════════════════════════
 
-DICT_CONDITIONS_ATMOS = {
-    1: "Normale",
-    2: "Pluie légère",
-    3: "Pluie forte",
-    4: "Neige - grêle",
-    5: "Brouillard - fumée",
-    6: "Vent fort - tempête",
-    7: "Temps éblouissant",
-    8: "Temps couvert",
-    9: "Autre"
-}
-
-DICT_LUMINOSITE = {
-    1: "Plein jour",
-    2: "Crépuscule ou aube",
-    3: "Nuit sans éclairage",
-    4: "Nuit avec éclairage allumé",
-    5: "Nuit avec éclairage non allumé"
-}
-
-DICT_CATEGORIE_ROUTE = {
-    1: "Autoroute",
-    2: "Route nationale",
-    3: "Route Départementale",
-    4: "Voie Communale",
-    5: "Hors réseau public",
-    6: "Parc de stationnement ouvert à la circulation publique",
-    7: "Routes de métropole urbaine",
-    9: "Autre"
-}
+# Partagés avec l'ETL Silver (registre des mappings compilés)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
 
-DICT_ETAT_SURFACE = {
-    1: "Normale",
-    2: "Mouillée",
-    3: "Flaques",
-    4: "Inondée",
-    5: "Enneigée",
-    6: "Boue",
-    7: "Verglacée",
-    8: "Corps gras - huile",
-    9: "Autre"
-}
-
-DICT_CATEGORIE_USAGER = {
-    1: "Voiture",
-    2: "Cyclomoteur <50cm3",
-    3: "Moto >50cm3 et <=125cm3",
-    4: "Moto >125cm3",
-    5: "Utilitaire",
-    6: "Poids lourd",
-    7: "Autocar",
-    8: "Matériel agricole",
-    9: "Tramway",
-    10: "Vélo",
-    11: "Quad",
-    12: "Autre",
-    13: "Camionnette",
-    14: "Moto >50cm3 et <=125cm3",
-    15: "Moto >125cm3",
-    16: "Quad lourd >50cm3",
-    17: "Bus",
-    18: "Train",
-    19: "Tramway",
-    20: "3 roues",
-    21: "EDP à moteur",
-    22: "EDP sans moteur",
-    30: "Trottinette électrique",
-    31: "Nouvelles mobilités"
-}
-
-DICT_GRAVITE = {
-    1: "Indemne",
-    2: "Tué",
-    3: "Blessé hospitalisé",
-    4: "Blessé léger"
-}
+from mappings_silver import (
+    DICT_CONDITIONS_ATMOS, DICT_LUMINOSITE, DICT_CATEGORIE_ROUTE,
+    DICT_ETAT_SURFACE, DICT_CATEGORIE_USAGER, DICT_GRAVITE, LIBELLES, libelles
+)
+from cache_requetes import read_sql_cache
+from moteur_duckdb import read_sql_duckdb
 
 # ════════════════════════════════════════════════════════════════
 # FONCTIONS UTILITAIRES POUR LA TRANSFORMATION
@@ -136,23 +116,9 @@ def transformer_dataframe_conditions(df):
     """
     Transforme les codes numériques en libellés pour les conditions
     """
-    if 'conditions_atmospheriques' in df.columns:
-        df['conditions_atmospheriques_lib'] = df['conditions_atmospheriques'].map(DICT_CONDITIONS_ATMOS).fillna('Non renseigné')
-    
-    if 'luminosite' in df.columns:
-        df['luminosite_lib'] = df['luminosite'].map(DICT_LUMINOSITE).fillna('Non renseigné')
-    
-    if 'categorie_route' in df.columns:
-        df['categorie_route_lib'] = df['categorie_route'].map(DICT_CATEGORIE_ROUTE).fillna('Non renseigné')
-    
-    if 'etat_surface' in df.columns:
-        df['etat_surface_lib'] = df['etat_surface'].map(DICT_ETAT_SURFACE).fillna('Non renseigné')
-    
-    if 'categorie_usager' in df.columns:
-        df['categorie_usager_lib'] = df['categorie_usager'].map(DICT_CATEGORIE_USAGER).fillna('Non renseigné')
-    
-    if 'gravite' in df.columns:
-        df['gravite_lib'] = df['gravite'].map(DICT_GRAVITE).fillna('Non renseigné')
+    for colonne in LIBELLES:
+        if colonne in df.columns:
+            df[f'{colonne}_lib'] = libelles(colonne, df[colonne])
     
     return df
 
@@ -174,11 +140,93 @@ def afficher_top_conditions(df, top_n=5):
               f"Niveau: {row['niveau_risque']}")
         print()
 
+# ════════════════════════════════════════════════════════════════
+# SOURCE DES REQUÊTES : GOLD OU SILVER
+# ════════════════════════════════════════════════════════════════
+
+def etat_gold(critere):
+    """
+    Raison pour laquelle les vues Gold du critère ne sont pas utilisables,
+    None si elles sont à jour : vue absente ou non peuplée, aucun refresh
+    réussi (historique_refresh), table Silver sans chargement enregistré
+    (etl_watermarks), ou dernier refresh réussi antérieur au dernier
+    chargement Silver.
+    """
+    sources = SOURCES_CRITERES[critere]
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass(:table) IS NULL"),
+                        {'table': f"{SCHEMA_GOLD}.historique_refresh"}).scalar():
+            return "historique des refresh absent"
+        if conn.execute(text("SELECT to_regclass('etl_watermarks') IS NULL")).scalar():
+            return "watermarks Silver absents"
+        lignes = conn.execute(text(f"""
+            SELECT v.vue, COALESCE(m.ispopulated, FALSE), h.dernier_refresh, w.dernier_chargement, w.non_enregistrees
+            FROM unnest(CAST(:vues AS TEXT[])) AS v(vue)
+            LEFT JOIN pg_matviews m ON m.schemaname = :schema AND m.matviewname = v.vue
+            LEFT JOIN LATERAL (
+                SELECT MAX(debut) AS dernier_refresh
+                FROM {SCHEMA_GOLD}.historique_refresh
+                WHERE vue_name = v.vue AND statut = 'ok'
+            ) h ON TRUE
+            CROSS JOIN (
+                SELECT MAX(w.mis_a_jour_le) AS dernier_chargement,
+                       array_agg(t.table_name) FILTER (WHERE w.table_name IS NULL) AS non_enregistrees
+                FROM unnest(CAST(:tables AS TEXT[])) AS t(table_name)
+                LEFT JOIN etl_watermarks w ON w.table_name = t.table_name
+            ) w
+        """), {'vues': sources['vues'], 'schema': SCHEMA_GOLD, 'tables': sources['tables']}).fetchall()
+
+    for vue, peuplee, dernier_refresh, dernier_chargement, non_enregistrees in lignes:
+        if not peuplee:
+            return f"{vue} absente ou non peuplée"
+        if dernier_refresh is None:
+            return f"aucun refresh réussi de {vue}"
+        # Chargement inconnu : fraîcheur de la vue impossible à établir
+        if non_enregistrees:
+            return f"chargement de {', '.join(non_enregistrees)} absent de etl_watermarks"
+        if dernier_refresh < dernier_chargement:
+            return (f"{vue} rafraîchie le {dernier_refresh:%Y-%m-%d %H:%M:%S}, "
+                    f"Silver chargé le {dernier_chargement:%Y-%m-%d %H:%M:%S}")
+    return None
+
+def choisir_source(critere, source=None):
+    """
+    'gold' ou 'silver' : source imposée, sinon Gold s'il est à jour.
+    Le lac Parquet (moteur 'duckdb') ne contient que Silver.
+    """
+    if CONFIG['moteur'] == 'duckdb':
+        return 'silver'
+    source = source or CONFIG['source']
+    if source != 'auto':
+        return source
+    raison = etat_gold(critere)
+    if raison:
+        print(f"⚠ Gold non à jour ({raison}) : requête sur Silver")
+        return 'silver'
+    return 'gold'
+
+def executer_requete(query_sql, source):
+    """
+    pd.read_sql (via le cache de résultats si activé) ou DuckDB sur le lac
+    Parquet, avec la durée de la requête.
+    """
+    print(f"Exécution requête (source {source}, moteur {CONFIG['moteur']})...")
+    start = time.perf_counter()
+    if CONFIG['moteur'] == 'duckdb':
+        df_sql, statut = read_sql_duckdb(query_sql), None
+    elif CONFIG['cache']:
+        df_sql, statut = read_sql_cache(query_sql, engine)
+    else:
+        df_sql, statut = pd.read_sql(query_sql, engine), None
+    print(f"Requête exécutée en {(time.perf_counter() - start) * 1000:.1f} ms"
+          + (f" (cache : {statut})" if statut else ""))
+    return df_sql
+
 # ════════════════════════════════════════════════════════════════
 # CRITÈRE 1 : CONDITIONS À RISQUE ÉLEVÉ
 # ════════════════════════════════════════════════════════════════
 
-def critere_1_conditions_risque():
+def critere_1_conditions_risque(source=None):
     """
     Y a-t-il des conditions (météo + luminosité + type de route) qui 
     présentent un risque significativement supérieur à la moyenne nationale ?
@@ -187,9 +235,11 @@ def critere_1_conditions_risque():
     print("\n" + "="*60)
     print("CRITÈRE 1 : CONDITIONS À RISQUE ÉLEVÉ")
     print("="*60)
+    source = choisir_source('critere_1', source)
     
-    query_sql = """
-    WITH stats_nationales AS (
+    ctes = {
+        'silver': """
+    stats_nationales AS (
         -- Calcul moyenne nationale
         SELECT 
             COUNT(DISTINCT a.num_acc) as total_accidents,
@@ -222,7 +272,29 @@ def critere_1_conditions_risque():
           AND l.etat_surface IS NOT NULL
         GROUP BY a.conditions_atmospheriques, a.luminosite, l.categorie_route, l.etat_surface
         HAVING COUNT(DISTINCT a.num_acc) >= 50  -- Seuil significativité
-    )
+    )""",
+        'gold': f"""
+    stats_nationales AS (
+        -- Moyenne nationale : somme des départements (accidents × usagers)
+        SELECT 
+            SUM(nb_accidents) as total_accidents,
+            SUM(nb_usagers) as total_usagers,
+            SUM(nb_tues) as total_tues,
+            ROUND(100.0 * SUM(nb_tues) / NULLIF(SUM(nb_usagers), 0), 3) as taux_mortalite_national
+        FROM {SCHEMA_GOLD}.mv_critere_departements
+    ),
+    conditions_combinees AS (
+        -- Combinaisons pré-agrégées (mêmes comptages que la requête Silver)
+        SELECT 
+            conditions_atmospheriques, luminosite, categorie_route, etat_surface,
+            nb_accidents, nb_usagers, nb_tues, nb_blesses_graves, taux_mortalite
+        FROM {SCHEMA_GOLD}.mv_critere_conditions
+        WHERE nb_accidents >= 50  -- Seuil significativité
+    )"""
+    }
+    
+    query_sql = f"""
+    WITH {ctes[source]}
     SELECT 
         c.conditions_atmospheriques,
         c.luminosite,
@@ -243,12 +315,12 @@ def critere_1_conditions_risque():
         END as niveau_risque
     FROM conditions_combinees c, stats_nationales n
     WHERE c.taux_mortalite > n.taux_mortalite_national  -- Uniquement au-dessus moyenne
-    ORDER BY c.taux_mortalite DESC
+    ORDER BY c.taux_mortalite DESC, c.nb_accidents DESC,
+             c.conditions_atmospheriques, c.luminosite, c.categorie_route, c.etat_surface
     LIMIT 20;
     """
     
-    print("Exécution requête...")
-    df_sql = pd.read_sql(query_sql, engine)
+    df_sql = executer_requete(query_sql, source)
     
     # Transformation des codes en libellés
     df_sql = transformer_dataframe_conditions(df_sql)
@@ -269,7 +341,7 @@ def critere_1_conditions_risque():
 # CRITÈRE 2 : ZONES FRÉQUENTÉES VS ZONES DANGEREUSES
 # ════════════════════════════════════════════════════════════════
 
-def critere_2_zones_frequentees_vs_dangereuses():
+def critere_2_zones_frequentees_vs_dangereuses(source=None):
     """
     Les zones les plus fréquentées ont-elles plus d'accidents graves 
     ou simplement plus d'accidents tout court ?
@@ -278,9 +350,11 @@ def critere_2_zones_frequentees_vs_dangereuses():
     print("\n" + "="*60)
     print("CRITÈRE 2 : ZONES FRÉQUENTÉES VS DANGEREUSES")
     print("="*60)
+    source = choisir_source('critere_2', source)
     
-    query_sql = """
-    WITH stats_departements AS (
+    ctes = {
+        'silver': """
+    stats_departements AS (
         -- Statistiques par département
         SELECT 
             a.departement_code,
@@ -295,7 +369,19 @@ def critere_2_zones_frequentees_vs_dangereuses():
         FROM accidents a
         JOIN usagers u ON a.num_acc = u.num_acc
         GROUP BY a.departement_code
-    ),
+    )""",
+        'gold': f"""
+    stats_departements AS (
+        -- Statistiques par département pré-agrégées
+        SELECT 
+            departement_code, nb_accidents, nb_usagers, nb_tues, nb_blesses_graves,
+            taux_mortalite, taux_gravite
+        FROM {SCHEMA_GOLD}.mv_critere_departements
+    )"""
+    }
+    
+    query_sql = f"""
+    WITH {ctes[source]},
     quartiles AS (
         -- Calcul quartiles pour segmentation
         SELECT 
@@ -325,11 +411,10 @@ def critere_2_zones_frequentees_vs_dangereuses():
         RANK() OVER (ORDER BY s.nb_accidents DESC) as rang_volume,
         RANK() OVER (ORDER BY s.taux_gravite DESC) as rang_gravite
     FROM stats_departements s, quartiles q
-    ORDER BY s.nb_accidents DESC;
+    ORDER BY s.nb_accidents DESC, s.departement_code;
     """
     
-    print("Exécution requête...")
-    df_sql = pd.read_sql(query_sql, engine)
+    df_sql = executer_requete(query_sql, source)
     
     print(f"{len(df_sql)} départements analysés")
     
@@ -361,7 +446,7 @@ def critere_2_zones_frequentees_vs_dangereuses():
 # CRITÈRE 3 : ANALYSE PAR CATÉGORIE D'USAGERS
 # ════════════════════════════════════════════════════════════════
 
-def critere_3_analyse_usagers():
+def critere_3_analyse_usagers(source=None):
     """
     Analyse spécifique par catégorie d'usagers (piétons, cyclistes, etc.)
     pour identifier les populations les plus vulnérables
@@ -370,9 +455,11 @@ def critere_3_analyse_usagers():
     print("\n" + "="*60)
     print("CRITÈRE 3 : ANALYSE PAR CATÉGORIE D'USAGERS")
     print("="*60)
+    source = choisir_source('critere_3', source)
     
-    query_sql = """
-    WITH stats_usagers AS (
+    ctes = {
+        'silver': """
+    stats_usagers AS (
         -- Statistiques par catégorie d'usager
         SELECT 
             u.categorie_usager,
@@ -397,7 +484,28 @@ def critere_3_analyse_usagers():
             ROUND(100.0 * SUM(CASE WHEN u.gravite = 2 THEN 1 ELSE 0 END) / 
                   NULLIF(COUNT(u.id_usager), 0), 3) as taux_mortalite_global
         FROM usagers u
-    )
+    )""",
+        'gold': f"""
+    stats_usagers AS (
+        -- Statistiques par catégorie d'usager pré-agrégées
+        SELECT 
+            categorie_usager, nb_usagers, nb_tues, nb_blesses_graves, nb_blesses_legers,
+            nb_indemnes, taux_mortalite, taux_gravite
+        FROM {SCHEMA_GOLD}.mv_critere_usagers
+        WHERE categorie_usager IS NOT NULL
+          AND nb_usagers >= 100  -- Seuil de significativité
+    ),
+    stats_globales AS (
+        -- Référence globale : toutes catégories, inconnue comprise
+        SELECT 
+            SUM(nb_usagers) as total_usagers,
+            ROUND(100.0 * SUM(nb_tues) / NULLIF(SUM(nb_usagers), 0), 3) as taux_mortalite_global
+        FROM {SCHEMA_GOLD}.mv_critere_usagers
+    )"""
+    }
+    
+    query_sql = f"""
+    WITH {ctes[source]}
     SELECT 
         s.categorie_usager,
         s.nb_usagers,
@@ -416,11 +524,10 @@ def critere_3_analyse_usagers():
             ELSE 'RISQUE NORMAL'
         END as niveau_vulnerabilite
     FROM stats_usagers s, stats_globales g
-    ORDER BY s.taux_mortalite DESC;
+    ORDER BY s.taux_mortalite DESC, s.categorie_usager;
     """
     
-    print("Exécution requête analyse usagers...")
-    df_sql = pd.read_sql(query_sql, engine)
+    df_sql = executer_requete(query_sql, source)
     
     # Transformation des codes en libellés
     df_sql = transformer_dataframe_conditions(df_sql)
@@ -452,6 +559,75 @@ def critere_3_analyse_usagers():
     
     return df_sql
 
+# ════════════════════════════════════════════════════════════════
+# EXÉCUTION DES CRITÈRES
+# ════════════════════════════════════════════════════════════════
+
+# Ordre du rapport
+CRITERES = [
+    ("CRITÈRE 1 : CONDITIONS À RISQUE ÉLEVÉ", critere_1_conditions_risque),
+    ("CRITÈRE 2 : ZONES FRÉQUENTÉES VS DANGEREUSES", critere_2_zones_frequentees_vs_dangereuses),
+    ("CRITÈRE 3 : ANALYSE PAR CATÉGORIE D'USAGERS", critere_3_analyse_usagers)
+]
+
+def executer_critere(titre, fonction, sortie=None):
+    """
+    Exécute un critère (avec son en-tête). Si `sortie` est une
+    SortieParThread, l'affichage du thread courant est capturé.
+    Retourne (DataFrame, durée en secondes, affichage capturé).
+    """
+    if sortie is not None:
+        sortie.local.tampon = io.StringIO()
+    try:
+        print("\n" + "-"*40)
+        print(titre)
+        print("-"*40)
+        start = time.perf_counter()
+        df_sql = fonction()
+        duree = time.perf_counter() - start
+        return df_sql, duree, sortie.local.tampon.getvalue() if sortie is not None else ''
+    finally:
+        if sortie is not None:
+            sortie.local.tampon = None
+
+def executer_criteres(parallele=None):
+    """
+    Exécute les critères de CRITERES, simultanément (pool de threads,
+    une connexion du pool d'engine chacun) ou l'un après l'autre. Le
+    rapport est identique dans les deux modes : en parallèle, l'affichage
+    de chaque critère est restitué dans l'ordre de CRITERES.
+    Retourne la liste des DataFrames dans cet ordre.
+    """
+    parallele = CONFIG['parallele'] if parallele is None else parallele
+    start = time.perf_counter()
+    
+    if parallele:
+        sortie = SortieParThread(sys.stdout)
+        sys.stdout = sortie
+        try:
+            with ThreadPoolExecutor(max_workers=min(CONFIG['nb_workers'], len(CRITERES))) as pool:
+                futures = [pool.submit(executer_critere, titre, fonction, sortie) for titre, fonction in CRITERES]
+                # Restitution dans l'ordre du rapport, dès que le critère suivant est prêt
+                resultats = []
+                for future in futures:
+                    df_sql, duree, affichage = future.result()
+                    sortie.sortie.write(affichage)
+                    resultats.append((df_sql, duree))
+        finally:
+            sys.stdout = sortie.sortie
+    else:
+        resultats = [executer_critere(titre, fonction)[:2] for titre, fonction in CRITERES]
+    
+    duree_totale = time.perf_counter() - start
+    print("\n" + "-"*40)
+    print(f"DURÉE DES CRITÈRES ({'parallèle' if parallele else 'séquentiel'})")
+    print("-"*40)
+    for (titre, _), (_, duree) in zip(CRITERES, resultats):
+        print(f"  {titre.split(' :')[0]} : {duree * 1000:8.1f} ms")
+    print(f"  Total : {duree_totale * 1000:8.1f} ms (somme des critères {sum(d for _, d in resultats) * 1000:.1f} ms)")
+    
+    return [df_sql for df_sql, _ in resultats]
+
 # ════════════════════════════════════════════════════════════════
 # MAIN EXECUTION
 # ════════════════════════════════════════════════════════════════
@@ -470,34 +646,21 @@ def main():
     print("=" * 60)
     
     try:
-        # Test connexion base de données
-        print("Test de connexion à la base de données...")
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT COUNT(*) FROM accidents"))
-            nb_accidents = result.scalar()
+        # Test connexion base de données (ou lac Parquet)
+        print(f"Test de connexion (moteur {CONFIG['moteur']})...")
+        if CONFIG['moteur'] == 'duckdb':
+            nb_accidents = read_sql_duckdb("SELECT COUNT(*) AS nb FROM accidents")['nb'].iloc[0]
+        else:
+            with engine.connect() as conn:
+                result = conn.execute(text("SELECT COUNT(*) FROM accidents"))
+                nb_accidents = result.scalar()
         print(f"Connexion réussie - {nb_accidents} accidents dans la base")
         
         # ═══════════════════════════════════════════════════════════
         # EXÉCUTION DES 3 CRITÈRES
         # ═══════════════════════════════════════════════════════════
         
-        # Critère 1 : Conditions à risque élevé
-        print("\n" + "-"*40)
-        print("CRITÈRE 1 : CONDITIONS À RISQUE ÉLEVÉ")
-        print("-"*40)
-        df_critere1_sql = critere_1_conditions_risque()
-        
-        # Critère 2 : Zones fréquentées vs dangereuses
-        print("\n" + "-"*40)
-        print("CRITÈRE 2 : ZONES FRÉQUENTÉES VS DANGEREUSES")
-        print("-"*40)
-        df_critere2_sql = critere_2_zones_frequentees_vs_dangereuses()
-        
-        # Critère 3 : Analyse par catégorie d'usagers
-        print("\n" + "-"*40)
-        print("CRITÈRE 3 : ANALYSE PAR CATÉGORIE D'USAGERS")
-        print("-"*40)
-        df_critere3_sql = critere_3_analyse_usagers()
+        df_critere1_sql, df_critere2_sql, df_critere3_sql = executer_criteres()
         
         # ═══════════════════════════════════════════════════════════
         # SYNTHÈSE DES RÉSULTATS
@@ -550,8 +713,6 @@ def main():
 # ════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
-    import time
-    
     debut = time.time()
     main()
     duree = time.time() - debut
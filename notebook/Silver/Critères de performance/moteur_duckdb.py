@@ -0,0 +1,111 @@
+"""
+═══════════════════════════════════════════════════════════════════
+MOTEUR COLONNAIRE EMBARQUÉ (DUCKDB)
+Exécute le SQL des critères sur le lac Parquet Silver (lac_parquet.py)
+sans serveur : une vue DuckDB par table Silver, du même nom, sur ses
+partitions Parquet (annee / departement_code élagués par les filtres).
+Dépendance optionnelle (pip install duckdb), importée au premier usage.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+
+from lac_parquet import CONFIG as CONFIG_LAC, TABLES_SILVER
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier': CONFIG_LAC['dossier'],
+    'nb_threads': None        # None : un thread DuckDB par cœur
+}
+
+# Types des clés de partition lues dans les chemins (sinon '01' serait un entier)
+TYPES_PARTITIONS = {'annee': 'SMALLINT', 'departement_code': 'VARCHAR'}
+
+# Entiers DuckDB ramenés en int64, comme les entiers renvoyés par psycopg2
+# (SUM d'entiers en HUGEINT, codes Silver en TINYINT/SMALLINT)
+TYPES_ENTIERS = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT'}
+
+_verrou = threading.Lock()
+_connexion = None
+
+
+# ════════════════════════════════════════════════════════════════
+# CONNEXION
+# ════════════════════════════════════════════════════════════════
+
+def connexion():
+    """
+    Base DuckDB en mémoire partagée par les threads (un curseur chacun),
+    créée au premier appel avec les vues accidents, lieux, vehicules,
+    usagers sur le lac.
+    """
+    global _connexion
+    with _verrou:
+        if _connexion is None:
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError("Moteur 'duckdb' : installer le paquet duckdb (pip install duckdb)") from e
+
+            dossier = os.path.abspath(CONFIG['dossier'])
+            absents = [t for t in TABLES_SILVER if not os.path.isdir(os.path.join(dossier, t))]
+            if absents:
+                raise FileNotFoundError(f"Lac Parquet incomplet dans {dossier} ({', '.join(absents)}) : "
+                                        f"lancer l'ETL Silver avec CONFIG['lac_parquet'] = True")
+
+            conn = duckdb.connect(':memory:')
+            if CONFIG['nb_threads']:
+                conn.execute(f"SET threads = {int(CONFIG['nb_threads'])}")
+            options = "hive_partitioning = false"
+            if CONFIG_LAC['partitions']:
+                hive_types = ', '.join(f"'{nom}': {TYPES_PARTITIONS[nom]}" for nom in CONFIG_LAC['partitions'])
+                options = f"hive_partitioning = true, hive_types = {{{hive_types}}}"
+            for table_name in TABLES_SILVER:
+                chemin = os.path.join(dossier, table_name, '**', '*.parquet').replace("'", "''")
+                conn.execute(f"CREATE VIEW {table_name} AS SELECT * FROM read_parquet('{chemin}', {options})")
+            _connexion = conn
+        return _connexion
+
+
+def fermer():
+    """
+    Ferme la base (le lac a été réécrit ou CONFIG['dossier'] a changé).
+    """
+    global _connexion
+    with _verrou:
+        if _connexion is not None:
+            _connexion.close()
+            _connexion = None
+
+
+# ════════════════════════════════════════════════════════════════
+# LECTURE
+# ════════════════════════════════════════════════════════════════
+
+def read_sql_duckdb(query_sql):
+    """
+    Équivalent de pd.read_sql sur le lac : même SQL, DataFrame aux types
+    alignés sur ceux de PostgreSQL pour les entiers. Résultat vide :
+    colonnes object, comme pd.read_sql (aucune valeur d'où inférer).
+    """
+    curseur = connexion().cursor()
+    try:
+        resultat = curseur.sql(query_sql.strip().rstrip(';'))
+        df = resultat.df()
+        if df.empty:
+            return df.astype(object)
+        for colonne, type_duckdb in zip(resultat.columns, resultat.types):
+            if str(type_duckdb) in TYPES_ENTIERS:
+                df[colonne] = df[colonne].astype('int64' if df[colonne].notna().all() else 'Int64')
+        return df
+    finally:
+        curseur.close()
@@ -0,0 +1,152 @@
+"""
+═══════════════════════════════════════════════════════════════════
+CHARGEMENT INCRÉMENTAL : WATERMARKS + UPSERT (INSERT ... ON CONFLICT)
+Table de high-water marks et upsert d'un DataFrame via table
+temporaire alimentée par COPY.
+═══════════════════════════════════════════════════════════════════
+"""
+
+from sqlalchemy import text
+
+from chargement_copy import copy_dataframe, get_types_colonnes, nom_qualifie, preparer_pour_copy
+
+
+# ════════════════════════════════════════════════════════════════
+# WATERMARKS
+# ════════════════════════════════════════════════════════════════
+
+# Même définition que sql_mvp/02_Silver/4_Incrémental (watermarks)
+SQL_CREATE_WATERMARKS = """
+    CREATE TABLE IF NOT EXISTS etl_watermarks (
+        table_name VARCHAR(50) PRIMARY KEY,
+        derniere_valeur TIMESTAMP,
+        nb_lignes_derniere_execution BIGINT,
+        mode_derniere_execution VARCHAR(20)
+            CHECK (mode_derniere_execution IN ('incremental', 'reconstruction')),
+        mis_a_jour_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def lire_watermarks(conn, tables):
+    """
+    {table: derniere_valeur} ; None pour une table jamais chargée.
+    """
+    conn.execute(text(SQL_CREATE_WATERMARKS))
+    result = conn.execute(text("""
+        SELECT table_name, derniere_valeur
+        FROM etl_watermarks
+        WHERE table_name = ANY(:tables)
+    """), {'tables': list(tables)})
+    watermarks = dict.fromkeys(tables)
+    watermarks.update({row.table_name: row.derniere_valeur for row in result})
+    return watermarks
+
+
+def ecrire_watermarks(conn, valeur, nb_lignes, mode):
+    """
+    nb_lignes : {table: lignes écrites}. Une ligne par table Silver.
+    valeur None : contenu Silver qui ne dérive pas du Bronze (chargement
+    depuis le Parquet) ; le prochain run incrémental reconstruit. Dans
+    tous les cas mis_a_jour_le avance, ce qui invalide le cache de
+    requêtes et les vues Gold rafraîchies avant le chargement.
+    """
+    conn.execute(text(SQL_CREATE_WATERMARKS))
+    for table_name, nb in nb_lignes.items():
+        conn.execute(text("""
+            INSERT INTO etl_watermarks
+                (table_name, derniere_valeur, nb_lignes_derniere_execution, mode_derniere_execution, mis_a_jour_le)
+            VALUES (:table, :valeur, :nb, :mode, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                derniere_valeur = EXCLUDED.derniere_valeur,
+                nb_lignes_derniere_execution = EXCLUDED.nb_lignes_derniere_execution,
+                mode_derniere_execution = EXCLUDED.mode_derniere_execution,
+                mis_a_jour_le = EXCLUDED.mis_a_jour_le
+        """), {'table': table_name, 'valeur': valeur, 'nb': int(nb), 'mode': mode})
+
+
+def marquer_versions(conn, tables):
+    """
+    Avance mis_a_jour_le (version des tables pour le cache de requêtes et
+    etat_gold) sans toucher au watermark. Appelé dans la transaction de
+    chaque écriture Silver, ou juste après son COMMIT : un run interrompu
+    invalide les résultats calculés avant les lignes déjà validées.
+    """
+    conn.execute(text("""
+        UPDATE etl_watermarks SET mis_a_jour_le = clock_timestamp()
+        WHERE table_name = ANY(:tables)
+    """), {'tables': list(tables)})
+
+
+# ════════════════════════════════════════════════════════════════
+# UPSERT
+# ════════════════════════════════════════════════════════════════
+
+def creer_table_staging(conn, table_name, schema=None):
+    """
+    Table temporaire de même structure que la cible, supprimée au COMMIT.
+    """
+    staging = f"staging_{table_name}"
+    conn.execute(text(
+        f"CREATE TEMP TABLE {staging} (LIKE {nom_qualifie(table_name, schema)} INCLUDING DEFAULTS) "
+        f"ON COMMIT DROP"
+    ))
+    return staging
+
+
+def upsert_dataframe(df, table_name, conn, cles, schema=None, chunksize=100000, nulls_egaux=False):
+    """
+    INSERT ... ON CONFLICT (cles) DO UPDATE depuis une table staging
+    alimentée par COPY. Les lignes identiques à l'existant ne sont pas
+    réécrites (IS DISTINCT FROM) : pas de version morte inutile.
+    nulls_egaux=True : clé dont une composante peut être NULL (UNIQUE
+    NULLS DISTINCT, ON CONFLICT ne la voit jamais) ; rapprochement par
+    IS NOT DISTINCT FROM (UPDATE puis INSERT ... WHERE NOT EXISTS).
+    La table staging reste disponible jusqu'au COMMIT (ex: suppression
+    des lignes filles obsolètes). Retourne (staging, lignes écrites).
+    """
+    staging = creer_table_staging(conn, table_name, schema)
+
+    # Conversions calées sur la table cible (la table temporaire n'est pas
+    # visible dans information_schema du schéma courant)
+    df = preparer_pour_copy(df, get_types_colonnes(conn, table_name, schema))
+    copy_dataframe(df, staging, None, chunksize=chunksize, conn=conn)
+
+    colonnes = list(df.columns)
+    autres = [col for col in colonnes if col not in cles]
+    liste_colonnes = ', '.join(f'"{col}"' for col in colonnes)
+    cible = nom_qualifie(table_name, schema)
+
+    if nulls_egaux:
+        egalite = ' AND '.join(f'c."{col}" IS NOT DISTINCT FROM s."{col}"' for col in cles)
+        nb_ecrites = 0
+        if autres:
+            maj = ', '.join(f'"{col}" = s."{col}"' for col in autres)
+            anciennes = ', '.join(f'c."{col}"' for col in autres)
+            nouvelles = ', '.join(f's."{col}"' for col in autres)
+            nb_ecrites += conn.execute(text(f"""
+                UPDATE {cible} c SET {maj}
+                FROM {staging} s
+                WHERE {egalite} AND ({anciennes}) IS DISTINCT FROM ({nouvelles})
+            """)).rowcount
+        nb_ecrites += conn.execute(text(f"""
+            INSERT INTO {cible} ({liste_colonnes})
+            SELECT {liste_colonnes} FROM {staging} s
+            WHERE NOT EXISTS (SELECT 1 FROM {cible} c WHERE {egalite})
+        """)).rowcount
+        return staging, nb_ecrites
+
+    if autres:
+        maj = ', '.join(f'"{col}" = EXCLUDED."{col}"' for col in autres)
+        anciennes = ', '.join(f'{table_name}."{col}"' for col in autres)
+        nouvelles = ', '.join(f'EXCLUDED."{col}"' for col in autres)
+        conflit = f"DO UPDATE SET {maj} WHERE ({anciennes}) IS DISTINCT FROM ({nouvelles})"
+    else:
+        conflit = "DO NOTHING"
+
+    result = conn.execute(text(f"""
+        INSERT INTO {cible} ({liste_colonnes})
+        SELECT {liste_colonnes} FROM {staging}
+        ON CONFLICT ({', '.join(cles)}) {conflit}
+    """))
+    return staging, result.rowcount
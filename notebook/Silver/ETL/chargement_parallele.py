@@ -0,0 +1,565 @@
+"""
+═══════════════════════════════════════════════════════════════════
+CHARGEMENT PARALLÈLE POSTGRESQL : ORDONNANCEUR MULTI-CONNEXIONS
+Tables indépendantes (et partitions des grosses tables) chargées en
+parallèle à travers un pool SQLAlchemy/psycopg2 dimensionné.
+Utilisable pour les tables Silver comme pour les tables Gold.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import re
+import queue
+import threading
+import time
+import uuid
+from sqlalchemy import create_engine, text
+
+from chargement_copy import charger_dataframe, nom_qualifie
+
+
+# ════════════════════════════════════════════════════════════════
+# POOL DE CONNEXIONS
+# ════════════════════════════════════════════════════════════════
+
+def creer_engine_pool(db_config, nb_workers):
+    """
+    Engine dont le pool contient exactement une connexion par worker
+    (pas d'overflow : le parallélisme côté base reste maîtrisé).
+    """
+    return create_engine(
+        f"postgresql+psycopg2://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}",
+        echo=False,
+        pool_size=nb_workers,
+        max_overflow=0,
+        pool_pre_ping=True
+    )
+
+
+# ════════════════════════════════════════════════════════════════
+# DÉCOUPAGE EN TÂCHES
+# ════════════════════════════════════════════════════════════════
+
+def decouper_en_taches(tables, taille_partition):
+    """
+    tables : liste de (table_name, df) ou (table_name, df, schema).
+    Les tables de plus de `taille_partition` lignes sont découpées en
+    partitions contiguës chargées indépendamment (ex: usagers).
+    Les tâches sont triées par taille décroissante : les plus longues
+    démarrent en premier, les petites comblent les workers libres.
+    """
+    taches = []
+    for entree in tables:
+        table_name, df = entree[0], entree[1]
+        schema = entree[2] if len(entree) > 2 else None
+        for start in range(0, max(len(df), 1), taille_partition):
+            taches.append({
+                'table': table_name,
+                'schema': schema,
+                'df': df.iloc[start:start + taille_partition]
+            })
+    return sorted(taches, key=lambda t: len(t['df']), reverse=True)
+
+
+# ════════════════════════════════════════════════════════════════
+# ORDONNANCEUR
+# ════════════════════════════════════════════════════════════════
+
+def charger_tables_parallele(tables, engine, nb_workers=4, taille_partition=500000,
+                             modes=None, chunksize=100000, replica=True):
+    """
+    Charge plusieurs DataFrames dans des tables existantes en parallèle.
+
+    Chaque worker ouvre UNE connexion du pool et UNE transaction, dans
+    laquelle il enchaîne les tâches de la file. Si `replica`, la
+    transaction démarre par SET LOCAL session_replication_role = 'replica'
+    (FK désactivées pour cette connexion seulement, rétabli au COMMIT /
+    ROLLBACK). Les workers ne valident qu'une fois toutes les tâches
+    terminées : si un seul échoue, toutes les transactions sont annulées
+    et l'exception est relancée.
+    Les COMMIT restent ceux de transactions distinctes : un COMMIT qui
+    échoue après ceux des autres workers laisse un chargement partiel.
+    Pour remplacer le contenu de tables de façon atomique, passer par
+    remplacer_tables_parallele (staging puis échange par renommage).
+
+    Retourne {nom_qualifie: {'lignes': n, 'duree': s}} (durée cumulée
+    des partitions de la table).
+    """
+    modes = modes or {}
+    taches = decouper_en_taches(tables, taille_partition)
+    nb_workers = max(1, min(nb_workers, len(taches), engine.pool.size()))
+
+    file_taches = queue.Queue()
+    for tache in taches:
+        file_taches.put(tache)
+
+    echec = threading.Event()
+    erreurs = []
+    barriere = threading.Barrier(nb_workers)
+    stats = {}
+    verrou_stats = threading.Lock()
+
+    def worker():
+        conn = None
+        trans = None
+        try:
+            conn = engine.connect()
+            trans = conn.begin()
+            if replica:
+                conn.execute(text("SET LOCAL session_replication_role = 'replica'"))
+
+            while not echec.is_set():
+                try:
+                    tache = file_taches.get_nowait()
+                except queue.Empty:
+                    break
+
+                start = time.time()
+                nb_lignes = charger_dataframe(
+                    tache['df'],
+                    tache['table'],
+                    engine,
+                    schema=tache['schema'],
+                    mode=modes.get(tache['table'], 'copy'),
+                    chunksize=chunksize,
+                    conn=conn,
+                    verbose=False
+                )
+                duree = time.time() - start
+
+                with verrou_stats:
+                    cle = nom_qualifie(tache['table'], tache['schema'])
+                    stat = stats.setdefault(cle, {'lignes': 0, 'duree': 0.0})
+                    stat['lignes'] += nb_lignes
+                    stat['duree'] += duree
+
+        except Exception as e:
+            erreurs.append(e)
+            echec.set()
+
+        finally:
+            # Attendre les autres workers avant de valider / annuler
+            barriere.wait()
+            if trans is not None:
+                if echec.is_set():
+                    trans.rollback()
+                else:
+                    trans.commit()
+            if conn is not None:
+                conn.close()
+
+    threads = [threading.Thread(target=worker, name=f"chargement-{i}") for i in range(nb_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if erreurs:
+        print(f"  ❌ Échec d'un worker, {nb_workers} transactions annulées")
+        raise erreurs[0]
+
+    return stats
+
+
+# ════════════════════════════════════════════════════════════════
+# REMPLACEMENT ATOMIQUE (STAGING + ÉCHANGE PAR RENOMMAGE)
+# ════════════════════════════════════════════════════════════════
+
+SUFFIXE_STAGING = '_stg'
+
+# pg_get_constraintdef : "FOREIGN KEY (num_acc) REFERENCES accidents(num_acc) ON DELETE CASCADE"
+REGEX_REFERENCES = re.compile(r'REFERENCES \S+?\(')
+
+# Vues et vues matérialisées qui lisent les cibles (directement ou via
+# une autre vue), avec leur profondeur dans le graphe de dépendances
+SQL_VUES_DEPENDANTES = """
+    WITH RECURSIVE dependantes AS (
+        SELECT r.ev_class AS oid, 1 AS profondeur
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        WHERE d.classid = 'pg_rewrite'::regclass
+          AND d.refobjid IN (SELECT CAST(t AS regclass) FROM unnest(CAST(:cibles AS TEXT[])) t)
+          AND r.ev_class <> d.refobjid
+        UNION ALL
+        SELECT r.ev_class, p.profondeur + 1
+        FROM dependantes p
+        JOIN pg_depend d ON d.refobjid = p.oid AND d.classid = 'pg_rewrite'::regclass
+        JOIN pg_rewrite r ON r.oid = d.objid
+        WHERE r.ev_class <> p.oid
+    )
+    SELECT c.oid, quote_ident(n.nspname) || '.' || quote_ident(c.relname) AS nom, c.relkind,
+           MAX(p.profondeur) AS profondeur, pg_get_viewdef(c.oid) AS definition,
+           array_to_string(c.reloptions, ', ') AS options,
+           obj_description(c.oid, 'pg_class') AS commentaire
+    FROM dependantes p
+    JOIN pg_class c ON c.oid = p.oid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    GROUP BY c.oid, n.nspname, c.relname, c.relkind
+    ORDER BY profondeur, nom
+"""
+
+
+def suffixe_unique():
+    """
+    Suffixe propre à un run (_stg_3f9a1c2e) : deux remplacements
+    concurrents ne partagent ni staging ni nom de contrainte / index.
+    """
+    return f"{SUFFIXE_STAGING}_{uuid.uuid4().hex[:8]}"
+
+
+def nom_temporaire(nom, suffixe):
+    # Identifiants PostgreSQL limités à 63 caractères
+    return f"{nom[:63 - len(suffixe)]}{suffixe}"
+
+
+def lire_droits(conn, relation):
+    """
+    Propriétaire et GRANT d'une relation, rejoués sur celle qui la
+    remplace : [instruction SQL avec {objet} à substituer].
+    """
+    proprietaire = conn.execute(text(
+        "SELECT quote_ident(pg_get_userbyid(relowner)) FROM pg_class WHERE oid = CAST(:rel AS regclass)"
+    ), {'rel': relation}).scalar()
+    grants = conn.execute(text("""
+        SELECT a.privilege_type,
+               CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+               a.is_grantable
+        FROM pg_class c, aclexplode(c.relacl) a
+        WHERE c.oid = CAST(:rel AS regclass) AND a.grantee <> c.relowner
+    """), {'rel': relation}).fetchall()
+    return [f"OWNER TO {proprietaire}"] + [
+        f"GRANT {privilege} ON {{objet}} TO {beneficiaire}{' WITH GRANT OPTION' if option else ''}"
+        for privilege, beneficiaire, option in grants
+    ]
+
+
+def appliquer_droits(conn, droits, type_objet, objet):
+    for droit in droits:
+        if droit.startswith('OWNER TO'):
+            conn.execute(text(f"ALTER {type_objet} {objet} {droit}"))
+        else:
+            conn.execute(text(droit.format(objet=objet)))
+
+
+def lire_ddl_table(conn, table):
+    """
+    Ce que CREATE TABLE ... (LIKE ... INCLUDING DEFAULTS INCLUDING
+    CONSTRAINTS ...) ne recopie pas : PK / UNIQUE et FK (avec l'oid de
+    la table référencée), index hors contrainte, droits.
+    Refuse les tables qu'un renommage ne remplacerait pas fidèlement :
+    triggers utilisateur, FK entrantes depuis une table non remplacée
+    (contrôlé par l'appelant).
+    """
+    parametres = {'table': table}
+    contraintes = conn.execute(text("""
+        SELECT conname, contype, pg_get_constraintdef(oid), confrelid
+        FROM pg_constraint
+        WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u', 'f')
+        ORDER BY contype DESC, conname
+    """), parametres).fetchall()
+
+    index = conn.execute(text("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = CAST(:table AS regclass)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        ORDER BY i.relname
+    """), parametres).fetchall()
+
+    triggers = conn.execute(text("""
+        SELECT tgname FROM pg_trigger
+        WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal
+    """), parametres).scalars().all()
+    if triggers:
+        raise RuntimeError(f"{table} : triggers {', '.join(triggers)} non repris par l'échange, table conservée")
+
+    entrantes = conn.execute(text("""
+        SELECT conrelid, conrelid::regclass::text || '.' || conname
+        FROM pg_constraint
+        WHERE confrelid = CAST(:table AS regclass) AND contype = 'f'
+    """), parametres).fetchall()
+
+    return {
+        'oid': conn.execute(text("SELECT CAST(:table AS regclass)::oid"), parametres).scalar(),
+        'contraintes': [(nom, type_, definition, reference) for nom, type_, definition, reference in contraintes],
+        'index': [(nom, definition) for nom, definition in index],
+        'entrantes': entrantes,
+        'droits': lire_droits(conn, table)
+    }
+
+
+def executer_en_parallele(taches, nb_workers):
+    """
+    taches : liste de (cle, fonction sans argument), chaque fonction
+    ouvrant sa propre connexion / transaction. Un worker par connexion
+    du pool ; la première erreur arrête la distribution et est relancée.
+    Retourne {cle: durée}.
+    """
+    file_taches = queue.Queue()
+    for tache in taches:
+        file_taches.put(tache)
+
+    durees = {}
+    erreurs = []
+
+    def worker():
+        while not erreurs:
+            try:
+                cle, fonction = file_taches.get_nowait()
+            except queue.Empty:
+                break
+            start = time.time()
+            try:
+                fonction()
+            except Exception as e:
+                erreurs.append(e)
+                break
+            durees[cle] = time.time() - start
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, min(nb_workers, len(taches))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if erreurs:
+        raise erreurs[0]
+    return durees
+
+
+def remplacer_tables_parallele(tables, engine, nb_workers=4, taille_partition=500000,
+                               modes=None, chunksize=100000):
+    """
+    Remplace le contenu de tables existantes, tout ou rien, en
+    construisant les nouvelles tables hors ligne puis en les échangeant
+    par renommage (même schéma que chargement_partitions côté Gold) :
+    preparer_remplacement, puis echanger_tables dans une transaction
+    courte. Chaque ligne n'est écrite qu'une fois. Tant que l'échange
+    n'est pas validé, les tables cibles gardent leur ancien contenu ; en
+    cas d'échec les stagings du run sont supprimées.
+
+    Retourne {nom_qualifie: {'lignes', 'duree', 'duree_index',
+    'duree_validation', 'duree_echange'}} (duree : chargement de la
+    staging, duree_echange : transaction d'échange, commune aux tables).
+    """
+    remplacement = preparer_remplacement(tables, engine, nb_workers, taille_partition, modes, chunksize)
+    try:
+        start = time.time()
+        with engine.begin() as conn:
+            echanger_tables(conn, remplacement)
+        duree_echange = time.time() - start
+        print(f"  ✓ Échange par renommage en une transaction : {duree_echange:.2f}s")
+    finally:
+        supprimer_stagings(engine, remplacement)
+
+    return {cible: {**stat, 'duree_echange': duree_echange} for cible, stat in remplacement['stats'].items()}
+
+
+def preparer_remplacement(tables, engine, nb_workers=4, taille_partition=500000,
+                          modes=None, chunksize=100000):
+    """
+    Construit les tables de remplacement, sans toucher aux cibles :
+      1. une staging par table, nom propre au run ({table}_stg_xxxxxxxx),
+         CREATE TABLE ... (LIKE cible INCLUDING DEFAULTS INCLUDING
+         CONSTRAINTS ...) : colonnes, défauts (séquences serial de la
+         cible), CHECK et NOT NULL, sans index
+      2. COPY en parallèle (charger_tables_parallele), contrôle des comptes
+      3. en parallèle, table par table : PK / UNIQUE et index sous des
+         noms temporaires
+      4. FK ajoutées NOT VALID vers les stagings des tables référencées,
+         puis VALIDATE et ANALYZE en parallèle : les FK restent contrôlées
+         (pas de session_replication_role)
+    Les cibles référencées par une FK depuis une table non remplacée, ou
+    portant des triggers, sont refusées avant tout chargement. En cas
+    d'échec les stagings sont supprimées.
+
+    Retourne le remplacement à passer à echanger_tables (transaction de
+    l'appelant, qui peut y échanger d'autres objets), puis dans tous les
+    cas à supprimer_stagings.
+    """
+    modes = modes or {}
+    suffixe = suffixe_unique()
+    cibles = []
+    for entree in tables:
+        table_name, df = entree[0], entree[1]
+        schema = entree[2] if len(entree) > 2 else None
+        staging = f"{table_name}{suffixe}"
+        cibles.append({
+            'table': table_name,
+            'df': df,
+            'schema': schema,
+            'cible': nom_qualifie(table_name, schema),
+            'staging': staging,
+            'staging_qualifie': nom_qualifie(staging, schema)
+        })
+    remplacement = {'cibles': cibles, 'suffixe': suffixe, 'stats': {}}
+
+    with engine.connect() as conn:
+        for c in cibles:
+            c['ddl'] = lire_ddl_table(conn, c['cible'])
+    stagings_par_oid = {c['ddl']['oid']: c['staging_qualifie'] for c in cibles}
+
+    externes = [nom for c in cibles for source, nom in c['ddl']['entrantes'] if source not in stagings_par_oid]
+    if externes:
+        raise RuntimeError(f"FK {', '.join(externes)} vers des tables remplacées, tables conservées")
+
+    def construire_index(c):
+        def construire():
+            with engine.begin() as conn:
+                for nom, type_, definition, _ in c['ddl']['contraintes']:
+                    if type_ != 'f':
+                        conn.execute(text(
+                            f"ALTER TABLE {c['staging_qualifie']} ADD CONSTRAINT {nom_temporaire(nom, suffixe)} {definition}"
+                        ))
+                for nom, definition in c['ddl']['index']:
+                    conn.execute(text(re.sub(
+                        r'^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+ ',
+                        lambda m: f"CREATE {m.group(1) or ''}INDEX {nom_temporaire(nom, suffixe)} ON {c['staging_qualifie']} ",
+                        definition
+                    )))
+        return construire
+
+    def valider(c):
+        def validation():
+            with engine.begin() as conn:
+                for nom, type_, _, _ in c['ddl']['contraintes']:
+                    if type_ == 'f':
+                        conn.execute(text(f"ALTER TABLE {c['staging_qualifie']} VALIDATE CONSTRAINT {nom}"))
+            with engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {c['staging_qualifie']}"))
+        return validation
+
+    try:
+        with engine.begin() as conn:
+            for c in cibles:
+                conn.execute(text(
+                    f"CREATE TABLE {c['staging_qualifie']} (LIKE {c['cible']} INCLUDING DEFAULTS "
+                    f"INCLUDING CONSTRAINTS INCLUDING IDENTITY INCLUDING GENERATED INCLUDING STORAGE "
+                    f"INCLUDING COMMENTS)"
+                ))
+                appliquer_droits(conn, c['ddl']['droits'], 'TABLE', c['staging_qualifie'])
+
+        stats_staging = charger_tables_parallele(
+            [(c['staging'], c['df'], c['schema']) for c in cibles],
+            engine,
+            nb_workers=nb_workers,
+            taille_partition=taille_partition,
+            modes={c['staging']: modes.get(c['table'], 'copy') for c in cibles},
+            chunksize=chunksize,
+            replica=False
+        )
+
+        with engine.connect() as conn:
+            for c in cibles:
+                count = conn.execute(text(f"SELECT COUNT(*) FROM {c['staging_qualifie']}")).scalar()
+                if count != len(c['df']):
+                    raise RuntimeError(f"Staging {c['staging']} : {count:,} lignes pour {len(c['df']):,} envoyées, "
+                                       f"{c['table']} conservée")
+
+        nb_workers = min(nb_workers, engine.pool.size())
+        durees_index = executer_en_parallele([(c['cible'], construire_index(c)) for c in cibles], nb_workers)
+
+        with engine.begin() as conn:
+            for c in cibles:
+                for nom, type_, definition, reference in c['ddl']['contraintes']:
+                    if type_ != 'f':
+                        continue
+                    if reference in stagings_par_oid:
+                        definition = REGEX_REFERENCES.sub(f"REFERENCES {stagings_par_oid[reference]}(", definition, count=1)
+                    conn.execute(text(f"ALTER TABLE {c['staging_qualifie']} ADD CONSTRAINT {nom} {definition} NOT VALID"))
+        durees_validation = executer_en_parallele([(c['cible'], valider(c)) for c in cibles], nb_workers)
+    except Exception:
+        supprimer_stagings(engine, remplacement)
+        raise
+
+    for c in cibles:
+        remplacement['stats'][c['cible']] = {
+            **stats_staging.get(c['staging_qualifie'], {'lignes': 0, 'duree': 0.0}),
+            'duree_index': durees_index.get(c['cible'], 0.0),
+            'duree_validation': durees_validation.get(c['cible'], 0.0)
+        }
+    return remplacement
+
+
+def supprimer_stagings(engine, remplacement):
+    """
+    Stagings restantes d'un remplacement (échec, ou sans objet après un
+    échange réussi : elles portent alors le nom des cibles).
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"DROP TABLE IF EXISTS {', '.join(c['staging_qualifie'] for c in remplacement['cibles'])}"
+        ))
+
+
+def echanger_tables(conn, remplacement):
+    """
+    Échange d'un remplacement préparé, dans la transaction `conn` :
+    suppression des vues dépendantes, transfert des séquences serial,
+    DROP des anciennes tables, renommage des stagings, de leurs
+    contraintes et index, puis recréation des vues (les vues
+    matérialisées WITH NO DATA, à rafraîchir : etat_gold lit Silver en
+    attendant). Les vues dépendantes et les séquences sont lues sous
+    verrou ACCESS EXCLUSIVE des cibles : un autre run qui échange
+    entre-temps est vu tel quel.
+    Retourne les vues recréées.
+    """
+    cibles, suffixe = remplacement['cibles'], remplacement['suffixe']
+    noms_cibles = [c['cible'] for c in cibles]
+    conn.execute(text(f"LOCK TABLE {', '.join(noms_cibles)} IN ACCESS EXCLUSIVE MODE"))
+
+    vues = [dict(ligne._mapping) for ligne in conn.execute(text(SQL_VUES_DEPENDANTES), {'cibles': noms_cibles})]
+    for vue in vues:
+        vue['type'] = 'MATERIALIZED VIEW' if vue['relkind'] == 'm' else 'VIEW'
+        vue['droits'] = lire_droits(conn, vue['nom'])
+        vue['index'] = conn.execute(text("""
+            SELECT pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = :oid
+        """), {'oid': vue['oid']}).scalars().all()
+    for vue in reversed(vues):
+        conn.execute(text(f"DROP {vue['type']} {vue['nom']}"))
+
+    # Séquences : serial (défaut nextval déjà recopié, la séquence suit la
+    # staging), identité (séquence neuve reprenant l'ancien nom)
+    sequences = []
+    for c in cibles:
+        for colonne, identite, ancienne, nouvelle in conn.execute(text("""
+            SELECT quote_ident(attname), attidentity <> '',
+                   pg_get_serial_sequence(:table, attname), pg_get_serial_sequence(:staging, attname)
+            FROM pg_attribute
+            WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped
+              AND pg_get_serial_sequence(:table, attname) IS NOT NULL
+        """), {'table': c['cible'], 'staging': c['staging_qualifie']}).fetchall():
+            if identite:
+                sequences.append((nouvelle, ancienne.split('.')[-1]))
+            else:
+                conn.execute(text(f"ALTER SEQUENCE {ancienne} OWNED BY {c['staging_qualifie']}.{colonne}"))
+
+    conn.execute(text(f"DROP TABLE {', '.join(noms_cibles)}"))
+
+    for nouvelle, nom in sequences:
+        conn.execute(text(f"ALTER SEQUENCE {nouvelle} RENAME TO {nom}"))
+    for c in cibles:
+        conn.execute(text(f"ALTER TABLE {c['staging_qualifie']} RENAME TO {c['table']}"))
+        for nom, type_, _, _ in c['ddl']['contraintes']:
+            if type_ != 'f':
+                conn.execute(text(f"ALTER TABLE {c['cible']} RENAME CONSTRAINT {nom_temporaire(nom, suffixe)} TO {nom}"))
+        for nom, _ in c['ddl']['index']:
+            conn.execute(text(f"ALTER INDEX {nom_qualifie(nom_temporaire(nom, suffixe), c['schema'])} RENAME TO {nom}"))
+
+    for vue in vues:
+        options = f" WITH ({vue['options']})" if vue['options'] else ''
+        fin = ' WITH NO DATA' if vue['relkind'] == 'm' else ''
+        conn.execute(text(
+            f"CREATE {vue['type']} {vue['nom']}{options} AS {vue['definition'].rstrip().rstrip(';')}{fin}"
+        ))
+        for definition in vue['index']:
+            conn.execute(text(definition))
+        appliquer_droits(conn, vue['droits'], vue['type'], vue['nom'])
+        if vue['commentaire'] is not None:
+            conn.execute(text(f"COMMENT ON {vue['type']} {vue['nom']} IS :commentaire"),
+                         {'commentaire': vue['commentaire']})
+
+    matviews = [vue['nom'] for vue in vues if vue['relkind'] == 'm']
+    if matviews:
+        print(f"  ⚠ Vues matérialisées recréées vides, à rafraîchir : {', '.join(matviews)}")
+    return vues
@@ -0,0 +1,142 @@
+"""
+═══════════════════════════════════════════════════════════════════
+CONVERSION GPS VECTORISÉE
+Normalisation lat/long (décimal, 7 chiffres, 8 chiffres) par masques
+texte/NumPy + validation de la contrainte ck_coords_valides
+═══════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Bornes de ck_coords_valides (accidents_silver.accidents)
+LATITUDE_MIN, LATITUDE_MAX = -90, 90
+LONGITUDE_MIN, LONGITUDE_MAX = -180, 180
+
+
+# ════════════════════════════════════════════════════════════════
+# CONVERSION
+# ════════════════════════════════════════════════════════════════
+
+# Nombre décimal accepté par float() (hors séparateurs '_' et chiffres non ASCII)
+REGEX_NOMBRE = r'(?i)^[+-]?((\d+\.?\d*|\.\d+)(e[+-]?\d+)?|inf|infinity|nan)$'
+
+
+def vers_arrow_texte(series):
+    """
+    Colonne brute → tableau Arrow de chaînes (NULL conservés). Les valeurs
+    non textuelles (float, int) passent par str() comme dans l'ancien code.
+    """
+    try:
+        return pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    except (pa.ArrowException, TypeError):
+        texte = series.astype(str).where(series.notna())
+        return pa.array(texte.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+
+
+def masque_numpy(masque_arrow):
+    return pc.fill_null(masque_arrow, False).to_numpy(zero_copy_only=False)
+
+
+def convertir_coordonnees(series):
+    """
+    Équivalent vectorisé (kernels Arrow + NumPy, aucune boucle Python) de
+    l'ancien convert_lat_long appliqué ligne à ligne :
+      - NULL, '' ou 'nan'          → NaN
+      - ',' remplacée par '.'
+      - contient '.'               → conversion décimale directe
+      - 7 chiffres  (4872760)      → 48.72760   / -2478760 → -2.478760
+      - 8 chiffres  (12345678)     → 1.2345678  / -1234567 → -1.234567
+      - autre                      → conversion brute
+    Les formats sans séparateur sont calculés en entier / 10^k (division
+    IEEE exacte : même float que float("48.72760")) au lieu de réécrire
+    les chaînes. Toute valeur non convertible donne NaN.
+    Retourne une Series float64.
+    """
+    coord = pc.utf8_trim_whitespace(vers_arrow_texte(series))
+    coord = pc.replace_substring(coord, ',', '.')
+    vide = pc.or_(pc.equal(coord, ''), pc.equal(pc.utf8_lower(coord), 'nan'))
+    coord = pc.if_else(vide, pa.scalar(None, type=pa.string()), coord)
+
+    longueur = pc.fill_null(pc.utf8_length(coord), 0).to_numpy().astype(np.int64)
+    negatif = masque_numpy(pc.starts_with(coord, '-'))
+    sans_point = ~masque_numpy(pc.match_substring(coord, '.')) & masque_numpy(pc.is_valid(coord))
+
+    # Aiguillage identique à l'ancien code : tous les '-' retirés, que des chiffres
+    chiffres = masque_numpy(pc.ascii_is_decimal(pc.replace_substring(coord, '-', '')))
+    format_7 = sans_point & chiffres & (longueur == 7)
+    format_8 = sans_point & chiffres & (longueur == 8)
+
+    # Valeurs réellement convertibles : au plus un '-' en tête
+    corps_negatif = pc.utf8_slice_codeunits(coord, 1)
+    entier_positif = ~negatif & masque_numpy(pc.ascii_is_decimal(coord))
+    entier_negatif = negatif & masque_numpy(pc.ascii_is_decimal(corps_negatif))
+
+    resultat = np.full(len(series), np.nan)
+
+    def entiers(valeurs, masque):
+        indices = np.flatnonzero(masque)
+        return indices, pc.cast(pc.take(valeurs, pa.array(indices)), pa.int64()).to_numpy().astype(np.float64)
+
+    indices, valeurs = entiers(coord, format_7 & entier_positif)           # 4872760  → 48.72760
+    resultat[indices] = valeurs / 1e5
+
+    indices, valeurs = entiers(coord, format_8 & entier_positif)           # 12345678 → 1.2345678
+    resultat[indices] = valeurs / 1e7
+
+    indices, valeurs = entiers(corps_negatif, (format_7 | format_8) & entier_negatif)
+    resultat[indices] = -valeurs / 10.0 ** (longueur[indices] - 2)       # -2478760 → -2.478760
+
+    # Décimal standard et autres formats : conversion directe, filtrage
+    # par regex seulement si une valeur du lot n'est pas numérique
+    indices = np.flatnonzero(masque_numpy(pc.is_valid(coord)) & ~(format_7 | format_8))
+    autres = pc.take(coord, pa.array(indices))
+    try:
+        resultat[indices] = pc.cast(autres, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        numerique = masque_numpy(pc.match_substring_regex(autres, REGEX_NOMBRE))
+        valeurs = pc.cast(pc.filter(autres, pa.array(numerique)), pa.float64())
+        resultat[indices[numerique]] = valeurs.to_numpy(zero_copy_only=False)
+
+    return pd.Series(resultat, index=series.index, dtype='float64')
+
+
+# ════════════════════════════════════════════════════════════════
+# VALIDATION
+# ════════════════════════════════════════════════════════════════
+
+def valider_coordonnees(latitude, longitude):
+    """
+    Applique ck_coords_valides avant chargement : un couple est conservé
+    s'il est entièrement NULL ou entièrement dans les bornes, sinon les
+    deux valeurs sont mises à NULL (plutôt qu'un échec du COPY/INSERT).
+    Retourne (latitude, longitude, nb_couples_annules).
+    """
+    lat = latitude.to_numpy(dtype='float64')
+    lon = longitude.to_numpy(dtype='float64')
+
+    tous_nuls = np.isnan(lat) & np.isnan(lon)
+    dans_bornes = (
+        (lat >= LATITUDE_MIN) & (lat <= LATITUDE_MAX)
+        & (lon >= LONGITUDE_MIN) & (lon <= LONGITUDE_MAX)
+    )
+    invalides = ~(tous_nuls | dans_bornes)
+
+    lat = np.where(invalides, np.nan, lat)
+    lon = np.where(invalides, np.nan, lon)
+
+    return (
+        pd.Series(lat, index=latitude.index),
+        pd.Series(lon, index=longitude.index),
+        int(invalides.sum())
+    )
+
+
+def normaliser_coordonnees(lat_brute, long_brute):
+    """
+    Conversion + validation en une passe. Retourne (latitude, longitude, nb_annules).
+    """
+    return valider_coordonnees(convertir_coordonnees(lat_brute), convertir_coordonnees(long_brute))
@@ -0,0 +1,327 @@
+"""
+═══════════════════════════════════════════════════════════════════
+LAC PARQUET
+Copie des tables Silver (et des faits Gold) en Parquet local,
+partitionnée par année (répertoires Hive) et département (fichiers
+triés par departement_code, row groups courts) :
+    <dossier>/<table>/annee=2019/part-0.parquet
+Les tables sans ces colonnes (lieux, vehicules, usagers, faits) les
+reçoivent de l'accident (num_acc) : un lecteur filtrant sur une année
+n'ouvre que ses fichiers, sur un département que ses row groups
+(statistiques min/max). Les deux clés peuvent aussi être des
+répertoires (CONFIG['partitions']) : autant de petits fichiers que de
+couples année × département, coûteux pour les lectures complètes
+(Benchmarks/bench_lac_partitionne.py).
+Écriture par batchs dans un staging, puis à la publication chaque
+partition est compactée en un fichier trié (zstd, dictionnaire sur les
+colonnes répétitives, statistiques et page index) ; les tables sont
+ensuite échangées par renommage : un run interrompu laisse le lac
+précédent.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import glob
+import time
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+from types_silver import compacter_dataframe
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier': os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Lac'),
+    'chunk_size': 200000,           # Lignes lues par requête lors de l'export depuis PostgreSQL
+    'compression': 'zstd',
+    'niveau_compression': 3,
+    # Row groups courts : un département n'occupe qu'un ou deux row groups par année
+    'lignes_par_row_group': 16 * 1024,
+    # Dictionnaire seulement si la colonne a moins de distincts que cette
+    # part des lignes de la partition (num_acc, coordonnées : encodage plain)
+    'seuil_dictionnaire': 0.5,
+    # Clés en répertoires (sous-ensemble ordonné de CLES_PARTITION) ; une
+    # clé non retenue reste une colonne triée, filtrée par les statistiques
+    'partitions': ['annee']
+}
+
+TABLES_SILVER = ['accidents', 'lieux', 'vehicules', 'usagers']
+
+# Clés de partition (portées par accidents, propagées aux autres tables)
+CLES_PARTITION = pa.schema([('annee', pa.int16()), ('departement_code', pa.string())])
+
+
+def partitionnement():
+    """
+    Partitionnement Hive de CONFIG['partitions'], None si aucune clé.
+    """
+    if not CONFIG['partitions']:
+        return None
+    return ds.partitioning(pa.schema([CLES_PARTITION.field(c) for c in CONFIG['partitions']]), flavor='hive')
+
+
+# ════════════════════════════════════════════════════════════════
+# CONVERSION ARROW
+# ════════════════════════════════════════════════════════════════
+
+def table_arrow_lac(df):
+    """
+    DataFrame → table Arrow au schéma stable d'un batch à l'autre :
+    catégories en texte (le type d'index du dictionnaire dépend du
+    nombre de modalités du batch), colonnes vides en texte, clés de
+    partition aux types de CLES_PARTITION.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, champ in enumerate(table.schema):
+        if champ.name in CLES_PARTITION.names:
+            type_cible = CLES_PARTITION.field(champ.name).type
+        elif pa.types.is_dictionary(champ.type) or pa.types.is_null(champ.type):
+            type_cible = pa.string()
+        else:
+            continue
+        if champ.type != type_cible:
+            table = table.set_column(i, champ.name, table.column(i).cast(type_cible))
+    return table
+
+
+def options_ecriture(table):
+    """
+    Options pq.write_table d'une partition compactée.
+    """
+    seuil = CONFIG['seuil_dictionnaire'] * max(table.num_rows, 1)
+    dictionnaire = [
+        champ.name for champ in table.schema
+        if not (pa.types.is_floating(champ.type) or pa.types.is_boolean(champ.type))
+        and len(pc.unique(table.column(champ.name))) <= seuil
+    ]
+    return {
+        'compression': CONFIG['compression'],
+        'compression_level': CONFIG['niveau_compression'],
+        'row_group_size': CONFIG['lignes_par_row_group'],
+        'use_dictionary': dictionnaire,
+        'write_statistics': True,
+        'write_page_index': True
+    }
+
+
+# ════════════════════════════════════════════════════════════════
+# ÉCRITURE
+# ════════════════════════════════════════════════════════════════
+
+def partitionner(df, accidents):
+    """
+    Ajoute annee / departement_code de l'accident de chaque ligne, pris
+    dans `accidents` (NULL si absent ou si accidents est None).
+    """
+    if accidents is None:
+        accidents = pd.DataFrame(columns=['num_acc'] + CLES_PARTITION.names)
+    cles = accidents[['num_acc'] + CLES_PARTITION.names].drop_duplicates('num_acc')
+    positions = pd.Index(cles['num_acc'].astype(object)).get_indexer(df['num_acc'].astype(object))
+    return df.assign(**{
+        colonne: cles[colonne].reset_index(drop=True).reindex(positions).array
+        for colonne in CLES_PARTITION.names
+    })
+
+
+class CodesPartition:
+    """
+    Clés de partition (annee, departement_code) ↔ entier int64, pour les
+    retenir par accident dans un registre numérique (compteurs de
+    RegistreCles en streaming, 8 octets par accident) plutôt que dans un
+    index d'objets Python : annee * 1024 + rang du département, 0 pour
+    une valeur inconnue.
+    """
+    def __init__(self):
+        self.departements = pd.Index([], dtype=object)
+
+    def coder(self, df):
+        departements = df['departement_code'].astype(object)
+        self.departements = self.departements.append(
+            pd.Index(departements.dropna().unique()).difference(self.departements)
+        )
+        annees = pd.to_numeric(df['annee']).fillna(0).to_numpy(dtype=np.int64)
+        return annees * 1024 + self.departements.get_indexer(departements) + 1
+
+    def decoder(self, num_acc, codes):
+        """DataFrame num_acc + clés de partition (NULL pour 0)."""
+        annees = pd.array(codes // 1024, dtype='Int16')
+        annees[annees == 0] = pd.NA
+        departements = np.concatenate([[None], self.departements.to_numpy(dtype=object)])
+        return pd.DataFrame({
+            'num_acc': np.asarray(num_acc),
+            'annee': annees,
+            'departement_code': departements[codes % 1024]
+        })
+
+
+class EcrivainLac:
+    """
+    Écriture d'un lac table par table, batch par batch. Les tables sans
+    clés de partition les reçoivent des accidents passés avec le batch
+    (en streaming, ceux du même batch Bronze, avant dédoublonnage) :
+    aucun index des accidents n'est conservé d'un batch à l'autre. Les
+    usagers Silver reçoivent un id_usager séquentiel s'il est absent
+    (attribué par BIGSERIAL en base) : les requêtes d'analyse comptent
+    COUNT(u.id_usager).
+    """
+    def __init__(self, dossier=None):
+        self.dossier = os.path.abspath(dossier or CONFIG['dossier'])
+        os.makedirs(self.dossier, exist_ok=True)
+        self.schemas = {}
+        self.nb_lots = {}
+        self.nb_lignes = {}
+
+    def chemin(self, table_name, etape=''):
+        return os.path.join(self.dossier, f".{table_name}.{etape}" if etape else table_name)
+
+    def ecrire(self, table_name, df, accidents=None):
+        """
+        accidents : accidents couvrant les num_acc de df, pour les tables
+        sans clés de partition.
+        """
+        if table_name == 'usagers' and 'id_usager' not in df.columns:
+            debut = self.nb_lignes.get(table_name, 0)
+            df = df.assign(id_usager=pd.RangeIndex(debut + 1, debut + len(df) + 1))
+        if any(colonne not in df.columns for colonne in CLES_PARTITION.names):
+            df = partitionner(df, accidents)
+
+        table = table_arrow_lac(df)
+        if table_name in self.schemas:
+            table = table.cast(self.schemas[table_name])
+        else:
+            self.schemas[table_name] = table.schema
+            shutil.rmtree(self.chemin(table_name, 'staging'), ignore_errors=True)
+
+        lot = self.nb_lots.get(table_name, 0)
+        ds.write_dataset(
+            table, self.chemin(table_name, 'staging'), format='parquet',
+            partitioning=partitionnement(), basename_template=f"lot-{lot}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        self.nb_lots[table_name] = lot + 1
+        self.nb_lignes[table_name] = self.nb_lignes.get(table_name, 0) + len(df)
+
+    def compacter(self, table_name):
+        """
+        Staging → un fichier par partition, trié par clés restantes et num_acc.
+        """
+        staging = self.chemin(table_name, 'staging')
+        nouveau = self.chemin(table_name, 'nouveau')
+        shutil.rmtree(nouveau, ignore_errors=True)
+        os.makedirs(nouveau)
+        schema = pa.schema([champ for champ in self.schemas[table_name] if champ.name not in CONFIG['partitions']])
+        tri = [c for c in CLES_PARTITION.names + ['num_acc'] if c in schema.names]
+
+        repertoires = sorted({os.path.dirname(f) for f in glob.glob(os.path.join(staging, '**', '*.parquet'), recursive=True)})
+        for repertoire in repertoires:
+            fichiers = sorted(glob.glob(os.path.join(repertoire, '*.parquet')))
+            table = pa.concat_tables(pq.read_table(f, schema=schema) for f in fichiers)
+            if tri:
+                table = table.sort_by([(c, 'ascending') for c in tri])
+            destination = os.path.join(nouveau, os.path.relpath(repertoire, staging))
+            os.makedirs(destination, exist_ok=True)
+            pq.write_table(table, os.path.join(destination, 'part-0.parquet'), **options_ecriture(table))
+        shutil.rmtree(staging, ignore_errors=True)
+        return len(repertoires)
+
+    def publier(self):
+        """
+        Compacte les tables écrites puis les échange avec celles du lac.
+        """
+        nb_partitions = {table_name: self.compacter(table_name) for table_name in self.schemas}
+        for table_name in self.schemas:
+            ancien = self.chemin(table_name, 'ancien')
+            shutil.rmtree(ancien, ignore_errors=True)
+            if os.path.exists(self.chemin(table_name)):
+                os.replace(self.chemin(table_name), ancien)
+            os.replace(self.chemin(table_name, 'nouveau'), self.chemin(table_name))
+            shutil.rmtree(ancien, ignore_errors=True)
+        self.schemas = {}
+        return nb_partitions
+
+    def annuler(self):
+        for table_name in self.schemas:
+            for etape in ('staging', 'nouveau'):
+                shutil.rmtree(self.chemin(table_name, etape), ignore_errors=True)
+        self.schemas = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.publier()
+        else:
+            self.annuler()
+        return False
+
+
+def ecrire_lac(dataframes, dossier=None, accidents=None):
+    """
+    Écrit les DataFrames {table: df} (Silver : sortie de etl_silver ;
+    Gold : faits, avec les accidents Silver pour les clés de partition).
+    """
+    start = time.time()
+    if accidents is None:
+        accidents = dataframes.get('accidents')
+    with EcrivainLac(dossier) as ecrivain:
+        for table_name, df in dataframes.items():
+            ecrivain.ecrire(table_name, df, accidents)
+    print(f"✓ Lac Parquet : {', '.join(f'{t} {n:,}' for t, n in ecrivain.nb_lignes.items())} lignes "
+          f"→ {ecrivain.dossier} ({time.time()-start:.1f}s)")
+    return ecrivain.nb_lignes
+
+
+def exporter_lac(engine, dossier=None):
+    """
+    Réécrit le lac Silver depuis la base (après un chargement
+    incrémental : les upserts ne peuvent pas être rejoués sur les fichiers).
+    Les clés de partition des tables filles viennent d'une jointure sur
+    accidents.
+    """
+    start = time.time()
+    with EcrivainLac(dossier) as ecrivain:
+        with engine.connect() as conn:
+            for table_name in TABLES_SILVER:
+                requete = f"SELECT * FROM {table_name}" if table_name == 'accidents' else (
+                    f"SELECT t.*, a.annee, a.departement_code FROM {table_name} t "
+                    f"LEFT JOIN accidents a USING (num_acc)"
+                )
+                chunks = pd.read_sql(
+                    text(requete),
+                    conn.execution_options(stream_results=True),
+                    chunksize=CONFIG['chunk_size']
+                )
+                for df in chunks:
+                    ecrivain.ecrire(table_name, compacter_dataframe(df, table_name))
+    print(f"✓ Lac Parquet exporté : {', '.join(f'{t} {n:,}' for t, n in ecrivain.nb_lignes.items())} lignes "
+          f"→ {ecrivain.dossier} ({time.time()-start:.1f}s)")
+    return ecrivain.nb_lignes
+
+
+# ════════════════════════════════════════════════════════════════
+# LECTURE
+# ════════════════════════════════════════════════════════════════
+
+def lire_lac(table_name, annees=None, departements=None, colonnes=None, dossier=None):
+    """
+    Table du lac en DataFrame, restreinte à des années / départements :
+    seules les partitions correspondantes sont ouvertes.
+    """
+    dataset = ds.dataset(os.path.join(os.path.abspath(dossier or CONFIG['dossier']), table_name),
+                         format='parquet', partitioning=partitionnement())
+    filtre = None
+    for colonne, valeurs in (('annee', annees), ('departement_code', departements)):
+        if valeurs is not None:
+            condition = ds.field(colonne).isin(list(valeurs))
+            filtre = condition if filtre is None else filtre & condition
+    return dataset.to_table(columns=colonnes, filter=filtre).to_pandas()
@@ -0,0 +1,347 @@
+"""
+═══════════════════════════════════════════════════════════════════
+REGISTRE DES MAPPINGS (LIBELLÉS BAAC ↔ CODES)
+Dictionnaires Bronze → Silver (*_MAPPING) et Silver → libellés des
+analyses (DICT_*), compilés une seule fois en tables de correspondance :
+factorisation des libellés distincts de la colonne, correspondance sur
+ces seuls distincts puis take par code. Le coût dépend du nombre de
+valeurs distinctes, plus du nombre de lignes.
+═══════════════════════════════════════════════════════════════════
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+
+# ════════════════════════════════════════════════════════════════
+# LIBELLÉS BRONZE → CODES SILVER
+# ════════════════════════════════════════════════════════════════
+
+GRAVITE_MAPPING = {'Indemne': 1, 'Tué': 2, 'Blessé hospitalisé': 3, 'Blessé': 4}
+LUMINOSITE_MAPPING = {'Plein jour': 1, 'Crépuscule ou aube': 2, 'Nuit sans éclairage public': 3, 
+                      'Nuit avec éclairage public non allumé': 4, 'Nuit avec éclairage public allumé': 5}
+CONDITIONS_ATMO_MAPPING = {'Normale': 1, 'Pluie légère': 2, 'Pluie forte': 3, 'Neige - grêle': 4, 
+                           'Brouillard - fumée': 5, 'Vent fort - tempête': 6, 'Temps éblouissant': 7, 
+                           'Temps couvert': 8, 'Autre': 9}
+AGG_MAPPING = {'Hors agglomération': False, 'En agglomération': True}
+INT_MAPPING = {'Hors intersection': 1, 'Intersection en X': 2, 'Intersection en T': 3, 
+               'Intersection en Y': 4, 'Intersection à plus de 4 branches': 5, 'Giratoire': 6, 
+               'Place': 7, 'Passage à niveau': 8, 'Autre intersection': 9}
+COL_MAPPING = {'Deux véhicules - frontale': 1, 'Deux véhicules - par l\'arrière': 2, 
+               'Deux véhicules - par le coté': 3, 'Trois véhicules et plus - en chaîne': 4, 
+               'Trois véhicules et plus - collisions multiples': 5, 'Autre collision': 6, 'Sans collision': 7}
+CATEGORIE_ROUTE_MAPPING = {'Autoroute': 1, 'Route Nationale': 2, 'Route Départementale': 3, 
+                           'Voie Communale': 4, 'Hors réseau public': 5, 
+                           'Parc de stationnement ouvert à la circulation publique': 6, 'autre': 9}
+SURF_MAPPING = {'normale': 1, 'mouillée': 2, 'flaques': 3, 'inondée': 4, 'enneigée': 5, 
+                'boue': 6, 'verglacée': 7, 'corps gras - huile': 8, 'autre': 9}
+CATEGORIE_USAGER_MAPPING = {'Conducteur': 1, 'Passager': 2, 'Piéton': 3, 'Piéton en roller ou en trottinette': 4}
+SEXE_MAPPING = {'Masculin': 1, 'Féminin': 2}
+SITU_MAPPING = {'Sur chaussée': 1, 'Sur accotement': 2, 'Sur trottoir': 3, 'Sur bande d\'arrêt d\'urgence': 4, 
+                'Sur piste cyclable': 5, '8': 8, '6': 6, '-1': 0, 'Autre': 9}
+INFRA_MAPPING = {'Carrefour aménagé': 1, 'Pont - autopont': 2, 'Bretelle d\'échangeur ou de raccordement': 3, 
+                 'Zone piétonne': 4, 'Souterrain - tunnel': 5, 'Voie ferrée': 6, 'Zone de péage': 7, 
+                 '9': 9, '8': 8, '-1': 0, '0': 0, 'Aucune': 0, 'Autre': 9}
+OBSTACLE_MOBILE_MAPPING = {'Véhicule': 1, 'Piéton': 2, 'Autre': 3, 'Animal sauvage': 4, 
+                           'Animal domestique': 5, 'Véhicule sur rail': 6, '-1': 0, '0': 0, 'Aucun': 0}
+CATEGORIE_VEHICULE_MAPPING = {
+    'VL seul': 1,
+    'VL + caravane': 2,
+    'VL + remorque': 3,
+    'VU seul': 4,
+    'VU + caravane': 5,
+    'VU + remorque': 6,
+    'PL seul': 7,
+    'PL + remorque': 8,
+    'PL train': 9,
+    'PL double': 10,
+    'Cyclo 50cm3': 11,
+    'Cyclo 125cm3': 12,
+    'Moto > 125cm3': 13,
+    'Scooter < 50cm3': 14,
+    'Scooter > 50cm3': 15,
+    'Quad': 16,
+    'Autocar': 17,
+    'Autobus': 18,
+    'Train': 19,
+    'Tramway': 20,
+    'Engin agricole': 21,
+    'Tracteur routier': 22,
+    'Autre': 99
+}
+EQUIPEMENT_SECURITE_MAPPING = {
+    'Ceinture': 1,
+    'Casque': 2,
+    'Gilet réfléchissant': 3,
+    'Airbag': 4,
+    'Gants': 5,
+    'Gants + Casque': 6,
+    'Ceinture + Airbag': 7,
+    'Autre équipement': 99,
+    'Aucun équipement': 0
+}
+
+VOSP_MAPPING = {
+    'Piste cyclable': 1,
+    'Banque cyclable': 2, 
+    'Voie réservée': 3,
+    '-1': -1,
+    '': None,
+    'nan': None
+}
+
+MANOEUVRE_MAPPING = {
+    'manv d’évitement': 1, 'Sans changement de direction': 2, 'manv de stationnement': 3,
+    'Tournant A gauche': 4, 'Déporté A gauche': 5, 'Même senc': 6, 'Arrêté (hors stationnement)': 7,
+    'Dépassant A gauche': 8, 'En s\'insérant': 9, 'Traversant la chaussée': 10,
+    'Tournant A droite': 11, 'Déporté A droite': 12, 'Dépassant A droite': 13,
+    'Changeant de file A gauche': 14, 'Changeant de file A droite': 15,
+    'En faisant demi-tour sur la chaussée': 16, 'En stationnement (avec occupants)': 17,
+    'En marche arrière': 18, 'Ouverture de porte': 19, 'Entre 2 files': 20,
+    'Dans le couloir bus': 21, 'En franchissant le terre-plein central': 22,
+    'A contresenc': 23, '26': 26
+}
+
+OBSTACLE_FIXE_MAPPING = {
+    'Véhicule en stationnement': 1, 'Arbre': 2, 'Glissière métallique': 3,
+    'Glissière béton': 4, 'Autre glissière': 5, 'Mur': 6, 'Poteau': 7,
+    'Mobilier urbain': 8, 'Parapet': 9, 'Support de signalisation': 10,
+    'Gril': 11, 'Fossé': 12, 'Talus': 13, 'Autre obstacle fixe': 99, 'Aucun': 0
+}
+PROFIL_ROUTE_MAPPING = {
+    'Plat': 1,
+    'Pente': 2,
+    'Sommet de côte': 3,
+    'Bas de côte': 4,
+    '-1': None,
+    '': None,
+    'nan': None
+}
+
+TRACE_PLAN_MAPPING = {
+    'Partie rectiligne': 1,
+    'En courbe à gauche': 2,
+    'En courbe à droite': 3, 
+    'En « S »': 4,
+    '-1': None,
+    '': None,
+    'nan': None
+}
+
+REGIME_CIRCULATION_MAPPING = {
+    'Sens unique': 1,
+    'Bidirectionnelle': 2,
+    'À chaussées séparées': 3,
+    'Avec voies d\'affectation variable': 4, 
+    '-1': None,
+    '': None,
+    'nan': None
+}
+
+POINT_CHOC_MAPPING = {
+    'Avant': 1,
+    'Arrière': 2, 
+    'Côté gauche': 3,
+    'Côté droit': 4,
+    '-1': None,
+    '': None,
+    'nan': None
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# CODES SILVER → LIBELLÉS (analyses, critere_perf_SQL.py)
+# ════════════════════════════════════════════════════════════════
+
+DICT_CONDITIONS_ATMOS = {
+    1: "Normale",
+    2: "Pluie légère",
+    3: "Pluie forte",
+    4: "Neige - grêle",
+    5: "Brouillard - fumée",
+    6: "Vent fort - tempête",
+    7: "Temps éblouissant",
+    8: "Temps couvert",
+    9: "Autre"
+}
+
+DICT_LUMINOSITE = {
+    1: "Plein jour",
+    2: "Crépuscule ou aube",
+    3: "Nuit sans éclairage",
+    4: "Nuit avec éclairage allumé",
+    5: "Nuit avec éclairage non allumé"
+}
+
+DICT_CATEGORIE_ROUTE = {
+    1: "Autoroute",
+    2: "Route nationale",
+    3: "Route Départementale",
+    4: "Voie Communale",
+    5: "Hors réseau public",
+    6: "Parc de stationnement ouvert à la circulation publique",
+    7: "Routes de métropole urbaine",
+    9: "Autre"
+}
+
+DICT_ETAT_SURFACE = {
+    1: "Normale",
+    2: "Mouillée",
+    3: "Flaques",
+    4: "Inondée",
+    5: "Enneigée",
+    6: "Boue",
+    7: "Verglacée",
+    8: "Corps gras - huile",
+    9: "Autre"
+}
+
+DICT_CATEGORIE_USAGER = {
+    1: "Voiture",
+    2: "Cyclomoteur <50cm3",
+    3: "Moto >50cm3 et <=125cm3",
+    4: "Moto >125cm3",
+    5: "Utilitaire",
+    6: "Poids lourd",
+    7: "Autocar",
+    8: "Matériel agricole",
+    9: "Tramway",
+    10: "Vélo",
+    11: "Quad",
+    12: "Autre",
+    13: "Camionnette",
+    14: "Moto >50cm3 et <=125cm3",
+    15: "Moto >125cm3",
+    16: "Quad lourd >50cm3",
+    17: "Bus",
+    18: "Train",
+    19: "Tramway",
+    20: "3 roues",
+    21: "EDP à moteur",
+    22: "EDP sans moteur",
+    30: "Trottinette électrique",
+    31: "Nouvelles mobilités"
+}
+
+DICT_GRAVITE = {
+    1: "Indemne",
+    2: "Tué",
+    3: "Blessé hospitalisé",
+    4: "Blessé léger"
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# COMPILATION
+# ════════════════════════════════════════════════════════════════
+
+class MappingCompile:
+    """
+    Dictionnaire compilé une fois : index de hachage des clés + tableau des
+    valeurs (même inférence de type que Series.map). appliquer() donne le
+    même résultat que series.map(dictionnaire) (après .str.lower() si
+    minuscules=True) en ne traitant que les libellés distincts.
+    Les libellés renseignés absents du dictionnaire sont comptés dans
+    non_mappes (cumulé entre les batches).
+    """
+
+    def __init__(self, nom, correspondances, minuscules=False):
+        self.nom = nom
+        self.correspondances = correspondances
+        self.minuscules = minuscules
+        self.cles = pd.Index(list(correspondances.keys()))
+        self.valeurs = pd.Series(correspondances).to_numpy()
+        self.non_mappes = Counter()
+
+    def appliquer(self, series):
+        codes, distincts = pd.factorize(series)
+        if self.minuscules:
+            distincts = distincts.str.lower()
+
+        positions = self.cles.get_indexer(distincts)
+        valeurs_distinctes = pd.api.extensions.take(self.valeurs, positions, allow_fill=True)
+
+        absents = np.flatnonzero(positions == -1)
+        if len(absents):
+            effectifs = np.bincount(codes[codes >= 0], minlength=len(distincts))
+            for i in absents:
+                self.non_mappes[distincts[i]] += int(effectifs[i])
+
+        resultat = pd.api.extensions.take(valeurs_distinctes, codes, allow_fill=True)
+        return pd.Series(resultat, index=series.index, name=series.name)
+
+
+# ════════════════════════════════════════════════════════════════
+# REGISTRE
+# ════════════════════════════════════════════════════════════════
+
+# Colonne Bronze → mapping compilé (transformations Silver)
+MAPPINGS = {
+    'grav': MappingCompile('GRAVITE_MAPPING', GRAVITE_MAPPING),
+    'lum': MappingCompile('LUMINOSITE_MAPPING', LUMINOSITE_MAPPING),
+    'atm': MappingCompile('CONDITIONS_ATMO_MAPPING', CONDITIONS_ATMO_MAPPING),
+    'agg': MappingCompile('AGG_MAPPING', AGG_MAPPING),
+    'int': MappingCompile('INT_MAPPING', INT_MAPPING),
+    'col': MappingCompile('COL_MAPPING', COL_MAPPING),
+    'catr': MappingCompile('CATEGORIE_ROUTE_MAPPING', CATEGORIE_ROUTE_MAPPING),
+    'surf': MappingCompile('SURF_MAPPING', SURF_MAPPING, minuscules=True),
+    'catu': MappingCompile('CATEGORIE_USAGER_MAPPING', CATEGORIE_USAGER_MAPPING),
+    'sexe': MappingCompile('SEXE_MAPPING', SEXE_MAPPING),
+    'situ': MappingCompile('SITU_MAPPING', SITU_MAPPING),
+    'infra': MappingCompile('INFRA_MAPPING', INFRA_MAPPING),
+    'obsm': MappingCompile('OBSTACLE_MOBILE_MAPPING', OBSTACLE_MOBILE_MAPPING),
+    'catv': MappingCompile('CATEGORIE_VEHICULE_MAPPING', CATEGORIE_VEHICULE_MAPPING),
+    'secu': MappingCompile('EQUIPEMENT_SECURITE_MAPPING', EQUIPEMENT_SECURITE_MAPPING),
+    'vosp': MappingCompile('VOSP_MAPPING', VOSP_MAPPING),
+    'manv': MappingCompile('MANOEUVRE_MAPPING', MANOEUVRE_MAPPING),
+    'obs': MappingCompile('OBSTACLE_FIXE_MAPPING', OBSTACLE_FIXE_MAPPING),
+    'prof': MappingCompile('PROFIL_ROUTE_MAPPING', PROFIL_ROUTE_MAPPING),
+    'plan': MappingCompile('TRACE_PLAN_MAPPING', TRACE_PLAN_MAPPING),
+    'choc': MappingCompile('POINT_CHOC_MAPPING', POINT_CHOC_MAPPING)
+}
+
+# Colonne Silver → libellés (analyses)
+LIBELLES = {
+    'conditions_atmospheriques': MappingCompile('DICT_CONDITIONS_ATMOS', DICT_CONDITIONS_ATMOS),
+    'luminosite': MappingCompile('DICT_LUMINOSITE', DICT_LUMINOSITE),
+    'categorie_route': MappingCompile('DICT_CATEGORIE_ROUTE', DICT_CATEGORIE_ROUTE),
+    'etat_surface': MappingCompile('DICT_ETAT_SURFACE', DICT_ETAT_SURFACE),
+    'categorie_usager': MappingCompile('DICT_CATEGORIE_USAGER', DICT_CATEGORIE_USAGER),
+    'gravite': MappingCompile('DICT_GRAVITE', DICT_GRAVITE)
+}
+
+
+def mapper(colonne, series):
+    """
+    Applique le mapping Bronze → Silver enregistré pour `colonne`.
+    """
+    return MAPPINGS[colonne].appliquer(series)
+
+
+def libelles(colonne, series, defaut='Non renseigné'):
+    """
+    Codes Silver → libellés ; code absent ou NULL → `defaut`.
+    """
+    return LIBELLES[colonne].appliquer(series).fillna(defaut)
+
+
+def rapport_non_mappes(max_libelles=5, reinitialiser=True):
+    """
+    Affiche, par mapping, les libellés Bronze renseignés sans
+    correspondance (ils deviennent NULL en Silver) avec leur effectif.
+    Retourne {nom_mapping: Counter}.
+    """
+    rapport = {m.nom: Counter(m.non_mappes) for m in MAPPINGS.values() if m.non_mappes}
+
+    if not rapport:
+        print(f"  ✓ Tous les libellés Bronze sont mappés")
+    for nom, compteur in rapport.items():
+        exemples = ', '.join(f"{libelle!r} ({n:,})" for libelle, n in compteur.most_common(max_libelles))
+        print(f"  ⚠ {nom} : {sum(compteur.values()):,} valeurs non mappées - {exemples}")
+
+    if reinitialiser:
+        for m in MAPPINGS.values():
+            m.non_mappes.clear()
+    return rapport
@@ -0,0 +1,409 @@
+"""
+═══════════════════════════════════════════════════════════════════
+PAGINATION CONCURRENTE DE L'API RECORDS OPENDATASOFT
+Parcourt records/1.0/search (rows / start) avec plusieurs requêtes en
+vol (asyncio, requêtes HTTP dans un pool de threads dédié) :
+  - seau à jetons : débit moyen et rafale bornés pour tout le client
+  - 429 : le seau est suspendu pour TOUTES les requêtes pendant le
+    Retry-After (secondes ou date HTTP), sinon backoff exponentiel
+  - 5xx / coupures : backoff exponentiel de la seule page concernée
+  - chaque page est convertie en table Arrow puis écrite dans l'ordre
+    des offsets par un ParquetWriter ; au plus CONFIG['fenetre_pages']
+    pages attendent leur écriture (mémoire bornée)
+Le schéma du fichier est fixé avant la première page, d'après les
+métadonnées du jeu (api/datasets/1.0/<id>/ : nom et type de chaque
+champ) : un champ nul sur les premières pages (l'API omet les champs
+nuls) garde son type et aucune page écrite n'est jamais relue. Chaque
+page y est conformée (champs absents à NULL) ; une valeur non
+représentable dans le type annoncé lève ValueError.
+Usage (script)   : extraire_vers_parquet('accidents_pagines.parquet')
+Usage (notebook) : await extraire_pages('accidents_pagines.parquet')
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'url': "https://public.opendatasoft.com/api/records/1.0/search/",
+    'dataset': "accidents-corporels-de-la-circulation-millesime@public",
+    'rows': 1000,               # Lignes par page (10 pages sous offset_max)
+    'concurrence': 4,           # Requêtes en vol
+    'debit': 2.0,               # Requêtes par seconde (moyenne du seau)
+    'rafale': 4,                # Capacité du seau
+    'fenetre_pages': 8,         # Pages téléchargées en avance sur l'écriture
+    'offset_max': 10000,        # records/1.0 refuse start + rows > 10000 (400) ; None : pas de borne
+    'nb_tentatives': 6,
+    'attente_initiale': 1.0,    # Backoff exponentiel (s), sans Retry-After
+    'attente_max': 60.0,
+    'timeout': 30
+}
+
+# Types des champs OpenDataSoft → Arrow. Dates et horodatages restent
+# le texte ISO des records ; les autres types (geo_shape, file, json…)
+# sont des objets JSON, écrits sérialisés en texte
+TYPES_ODS = {
+    'text': pa.string(),
+    'int': pa.int64(),
+    'double': pa.float64(),
+    'boolean': pa.bool_(),
+    'date': pa.string(),
+    'datetime': pa.string(),
+    'geo_point_2d': pa.list_(pa.float64())
+}
+
+# Erreurs réessayées (le statut HTTP est traité à part)
+ERREURS_RESEAU = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class ErreurTemporaire(Exception):
+    """
+    Réponse 429 / 5xx : la page est redemandée après `attente` secondes
+    (Retry-After) ou un backoff exponentiel si None.
+    """
+    def __init__(self, message, attente=None, limite_debit=False):
+        super().__init__(message)
+        self.attente = attente
+        self.limite_debit = limite_debit
+
+
+# ════════════════════════════════════════════════════════════════
+# LIMITATION DE DÉBIT
+# ════════════════════════════════════════════════════════════════
+
+class SeauJetons:
+    """
+    Seau à jetons partagé par les requêtes : `debit` jetons par seconde,
+    au plus `capacite` en réserve. suspendre() bloque toutes les
+    acquisitions jusqu'à l'échéance et vide le seau (pas de rafale à la
+    reprise, le quota serveur repart de zéro).
+    """
+    def __init__(self, debit, capacite):
+        self.debit = debit
+        self.capacite = capacite
+        self.jetons = float(capacite)
+        self.horodatage = time.monotonic()
+        self.reprise = 0.0
+        self.verrou = asyncio.Lock()
+
+    async def acquerir(self):
+        # Verrou équitable : les requêtes partent dans l'ordre d'arrivée
+        async with self.verrou:
+            while True:
+                maintenant = time.monotonic()
+                if maintenant < self.reprise:
+                    await asyncio.sleep(self.reprise - maintenant)
+                    continue
+                self.jetons = min(self.capacite, self.jetons + (maintenant - self.horodatage) * self.debit)
+                self.horodatage = maintenant
+                if self.jetons >= 1:
+                    self.jetons -= 1
+                    return
+                await asyncio.sleep((1 - self.jetons) / self.debit)
+
+    def suspendre(self, secondes):
+        self.reprise = max(self.reprise, time.monotonic() + secondes)
+        self.jetons = 0.0
+        self.horodatage = self.reprise
+
+
+def lire_retry_after(valeur):
+    """
+    Retry-After en secondes : entier / décimal ou date HTTP (None si
+    absent ou illisible).
+    """
+    if not valeur:
+        return None
+    try:
+        return max(0.0, float(valeur))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(valeur) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def attente_backoff(tentative):
+    """
+    Backoff exponentiel plafonné, avec gigue (les pages en échec ne
+    repartent pas ensemble).
+    """
+    attente = min(CONFIG['attente_max'], CONFIG['attente_initiale'] * 2 ** (tentative - 1))
+    return attente * (0.5 + random.random() / 2)
+
+
+# ════════════════════════════════════════════════════════════════
+# REQUÊTE D'UNE PAGE (THREAD)
+# ════════════════════════════════════════════════════════════════
+
+_sessions = threading.local()
+
+
+def session_thread():
+    # requests.Session n'est pas garantie thread-safe : une par thread
+    if not hasattr(_sessions, 'session'):
+        _sessions.session = requests.Session()
+    return _sessions.session
+
+
+def demander_page(url, params):
+    """
+    GET d'une page → (nhits, records). Lève ErreurTemporaire sur 429 /
+    5xx, HTTPError sur les autres erreurs (non réessayées).
+    """
+    response = session_thread().get(url, params=params, timeout=CONFIG['timeout'])
+    if response.status_code == 429 or response.status_code >= 500:
+        raise ErreurTemporaire(f"HTTP {response.status_code}",
+                               lire_retry_after(response.headers.get('Retry-After')),
+                               limite_debit=response.status_code == 429)
+    response.raise_for_status()
+    contenu = response.json()
+    return contenu.get('nhits'), contenu.get('records', [])
+
+
+def url_metadonnees(url, dataset):
+    """
+    URL des métadonnées du jeu, à côté de l'API records :
+    …/api/records/1.0/search/ → …/api/datasets/1.0/<dataset>/
+    """
+    return urljoin(url, f"../../../datasets/1.0/{dataset}/")
+
+
+def demander_schema(url, dataset):
+    """
+    Schéma Arrow du jeu d'après ses métadonnées (champs dans l'ordre de
+    l'API, type Arrow selon TYPES_ODS, texte pour les types objet). Lève
+    ErreurTemporaire / HTTPError comme demander_page.
+    """
+    response = session_thread().get(url_metadonnees(url, dataset), timeout=CONFIG['timeout'])
+    if response.status_code == 429 or response.status_code >= 500:
+        raise ErreurTemporaire(f"HTTP {response.status_code}",
+                               lire_retry_after(response.headers.get('Retry-After')),
+                               limite_debit=response.status_code == 429)
+    response.raise_for_status()
+    champs = response.json().get('fields', [])
+    if not champs:
+        raise ValueError(f"Métadonnées sans champs pour le jeu '{dataset}'")
+    return pa.schema([(champ['name'], TYPES_ODS.get(champ.get('type'), pa.string())) for champ in champs])
+
+
+def records_vers_table(records, schema):
+    """
+    Champs `fields` des records → table Arrow au schéma du jeu : champs
+    absents de la page (nuls côté API) à NULL, champs hors schéma
+    ignorés, objets JSON d'un champ texte sérialisés. Chaque champ est
+    typé sur la page puis converti sûrement (safe=True) : une valeur
+    tronquée, hors limites ou d'un autre type lève ValueError au lieu
+    d'être altérée.
+    """
+    lignes = [record.get('fields', {}) for record in records]
+    colonnes = []
+    for champ in schema:
+        valeurs = [ligne.get(champ.name) for ligne in lignes]
+        if pa.types.is_string(champ.type):
+            valeurs = [json.dumps(valeur, ensure_ascii=False) if isinstance(valeur, (dict, list)) else valeur
+                       for valeur in valeurs]
+        try:
+            colonne = pa.array(valeurs)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Champ '{champ.name}' : types incompatibles dans la page ({e})") from e
+        try:
+            colonnes.append(colonne.cast(champ.type, safe=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Champ '{champ.name}' : {colonne.type} non convertible en {champ.type} ({e})") from e
+    return pa.Table.from_arrays(colonnes, schema=schema)
+
+
+# ════════════════════════════════════════════════════════════════
+# PAGINATION
+# ════════════════════════════════════════════════════════════════
+
+class Paginateur:
+    """
+    Parcours d'une recherche records : offsets distribués aux
+    travailleurs dans l'ordre, pages reçues dans le désordre, écrites
+    dans l'ordre. Le schéma (imposé, sinon lu dans les métadonnées du
+    jeu) est fixé avant la première page : chaque page y est conformée.
+    """
+    def __init__(self, chemin, url, params, rows, concurrence, debit, rafale, fenetre, schema):
+        self.chemin = chemin
+        self.url = url
+        self.params = params
+        self.rows = rows
+        self.concurrence = concurrence
+        self.seau = SeauJetons(debit, rafale)
+        self.fenetre = asyncio.Semaphore(max(fenetre, concurrence))
+        self.executor = ThreadPoolExecutor(max_workers=concurrence, thread_name_prefix='pagination')
+        self.schema = schema
+        self.writer = None
+        self.temporaire = chemin + '.tmp'
+
+        self.nhits = None
+        self.prochain_offset = 0
+        self.fin = None                 # Offset de fin (nhits ou première page courte)
+        self.en_attente = {}            # offset → table Arrow pas encore écrite
+        self.offset_ecriture = 0
+        self.stats = {'pages': 0, 'lignes': 0, 'requetes': 0, 'erreurs_429': 0,
+                      'reprises': 0, 'attente_retry_after': 0.0, 'pages_en_attente_max': 0}
+
+    async def recuperer(self, offset):
+        """
+        Page `offset` avec réessais → (nhits, table Arrow).
+        """
+        params = {**self.params, 'rows': self.rows, 'start': offset}
+        nhits, records = await self.appeler(f"Page {offset:,}", demander_page, self.url, params)
+        table = await asyncio.get_running_loop().run_in_executor(
+            self.executor, records_vers_table, records, self.schema
+        )
+        return nhits, table
+
+    async def appeler(self, libelle, requete, *args):
+        """
+        requete(*args) dans le pool de threads, après un jeton du seau,
+        réessayée sur 429 / 5xx / coupure.
+        """
+        boucle = asyncio.get_running_loop()
+        for tentative in range(1, CONFIG['nb_tentatives'] + 1):
+            await self.seau.acquerir()
+            self.stats['requetes'] += 1
+            try:
+                return await boucle.run_in_executor(self.executor, requete, *args)
+            except (ErreurTemporaire, *ERREURS_RESEAU) as e:
+                if tentative == CONFIG['nb_tentatives']:
+                    raise
+                attente = getattr(e, 'attente', None)
+                if getattr(e, 'limite_debit', False):
+                    self.stats['erreurs_429'] += 1
+                    if attente is not None:
+                        self.stats['attente_retry_after'] += attente
+                attente = attente_backoff(tentative) if attente is None else attente
+                self.stats['reprises'] += 1
+                if getattr(e, 'limite_debit', False):
+                    # Quota du client dépassé : toutes les requêtes patientent
+                    self.seau.suspendre(attente)
+                else:
+                    await asyncio.sleep(attente)
+                print(f"  ⏳ {libelle} : {e}, nouvel essai dans {attente:.1f}s "
+                      f"({tentative}/{CONFIG['nb_tentatives']})")
+
+    def ecrire_pages_pretes(self):
+        """
+        Écrit les pages contiguës à partir de offset_ecriture.
+        """
+        while self.offset_ecriture in self.en_attente:
+            table = self.en_attente.pop(self.offset_ecriture)
+            if table.num_rows:
+                self.writer.write_table(table)
+                self.stats['lignes'] += table.num_rows
+                self.stats['pages'] += 1
+            self.offset_ecriture += self.rows
+            self.fenetre.release()
+
+    def recevoir(self, offset, table):
+        if len(table) < self.rows:
+            # Page courte : dernière page (utile si nhits est absent)
+            self.fin = min(self.fin if self.fin is not None else offset + len(table), offset + len(table))
+        self.en_attente[offset] = table
+        self.stats['pages_en_attente_max'] = max(self.stats['pages_en_attente_max'], len(self.en_attente))
+        self.ecrire_pages_pretes()
+
+    async def travailleur(self):
+        while True:
+            await self.fenetre.acquire()
+            offset = self.prochain_offset
+            if self.fin is not None and offset >= self.fin:
+                self.fenetre.release()
+                return
+            self.prochain_offset += self.rows
+            _, table = await self.recuperer(offset)
+            self.recevoir(offset, table)
+
+    async def executer(self):
+        start = time.time()
+        temporaire = self.temporaire
+        try:
+            if self.schema is None:
+                self.schema = await self.appeler("Métadonnées", demander_schema, self.url, self.params['dataset'])
+            await self.fenetre.acquire()
+            self.nhits, premiere = await self.recuperer(0)
+            if self.nhits is not None:
+                self.fin = self.nhits
+            if CONFIG['offset_max'] is not None and (self.fin is None or self.fin > CONFIG['offset_max']):
+                # Au-delà, l'API répond 400 : l'export Parquet (telechargement.py) donne le jeu complet
+                self.fin = CONFIG['offset_max'] - CONFIG['offset_max'] % self.rows
+                print(f"⚠ Pagination limitée aux {self.fin:,} premiers records (offset_max de l'API)")
+            self.prochain_offset = self.rows
+            print(f"🔍 {self.nhits if self.nhits is not None else '?'} records, pages de {self.rows:,}, "
+                  f"{self.concurrence} requêtes en vol, {self.seau.debit:g} req/s")
+
+            self.writer = pq.ParquetWriter(temporaire, self.schema)
+            self.recevoir(0, premiere)
+            travailleurs = [asyncio.create_task(self.travailleur()) for _ in range(self.concurrence)]
+            try:
+                await asyncio.gather(*travailleurs)
+            except BaseException:
+                for tache in travailleurs:
+                    tache.cancel()
+                await asyncio.gather(*travailleurs, return_exceptions=True)
+                raise
+            assert not self.en_attente, f"Pages non écrites : {sorted(self.en_attente)}"
+            self.writer.close()
+            os.replace(temporaire, self.chemin)
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            if os.path.exists(temporaire):
+                if self.writer is not None:
+                    self.writer.close()
+                os.remove(temporaire)
+
+        self.stats['duree'] = time.time() - start
+        print(f"✓ {self.stats['lignes']:,} lignes, {self.stats['pages']} pages en {self.stats['duree']:.1f}s "
+              f"({self.stats['requetes']} requêtes, {self.stats['erreurs_429']} × 429) → {self.chemin}")
+        return self.stats
+
+
+async def extraire_pages(chemin, url=None, dataset=None, rows=None, concurrence=None, debit=None,
+                         rafale=None, fenetre=None, schema=None, params=None):
+    """
+    Pagine l'API records dans le fichier Parquet `chemin` (remplacé à la
+    fin seulement, jamais laissé partiel). Les paramètres None prennent
+    la valeur de CONFIG ; schema None : lu dans les métadonnées du jeu.
+    Retourne les statistiques du parcours.
+    """
+    paginateur = Paginateur(
+        chemin,
+        url or CONFIG['url'],
+        {'dataset': dataset or CONFIG['dataset'], 'timezone': 'Europe/Paris', **(params or {})},
+        rows or CONFIG['rows'],
+        concurrence or CONFIG['concurrence'],
+        debit or CONFIG['debit'],
+        rafale or CONFIG['rafale'],
+        fenetre or CONFIG['fenetre_pages'],
+        schema
+    )
+    return await paginateur.executer()
+
+
+def extraire_vers_parquet(chemin, **options):
+    """
+    Version synchrone (scripts) ; dans un notebook, `await extraire_pages(...)`.
+    """
+    return asyncio.run(extraire_pages(chemin, **options))
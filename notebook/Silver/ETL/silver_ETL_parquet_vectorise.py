@@ -7,12 +7,27 @@ ETL COUCHE SILVER
 import os
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import psutil
+from sqlalchemy import text
 import time
 import sys
 import logging
 from dotenv import load_dotenv
 
+from chargement_copy import copy_dataframe
+from conversion_gps import normaliser_coordonnees
+from mappings_silver import mapper, rapport_non_mappes
+from types_silver import compacter_dataframe, table_arrow_vers_pandas, rapport_memoire
+from chargement_parallele import creer_engine_pool, charger_tables_parallele, remplacer_tables_parallele
+from chargement_incremental import lire_watermarks, ecrire_watermarks, marquer_versions, upsert_dataframe
+from lac_parquet import CodesPartition, EcrivainLac, ecrire_lac, exporter_lac
+from telemetrie import CONFIG as CONFIG_TELEMETRIE, etape, iterer, instrumenter, demarrer, resume, ecrire_prometheus
+from transformation_parallele import nb_processus, transformer_tables_parallele
+from telechargement import telecharger
+
 load_dotenv()
 
 
@@ -27,7 +42,7 @@ logging.getLogger('sqlalchemy.pool').setLevel(logging.CRITICAL)
 
 DB_CONFIG = {
     'host': os.getenv('DB_HOST'),                   
-    'port': int(os.getenv('DB_PORT')),            
+    'port': int(os.getenv('DB_PORT', 5432)),            
     'database': os.getenv('DB_NAME'),              
     'user': os.getenv('DB_USER'),                  
     'password': os.getenv('DB_PASSWORD')           
@@ -36,263 +51,164 @@ DB_CONFIG = {
 
 CONFIG = {
     'fichier_source': 'E:\\SIMPLON\\TD\\TD_4 Analyse sécu routière\\5_Gestion Parquet\\accidents-corporels-de-la-circulation-millesime.parquet',
-    'chunk_size': 50000  # Traiter par batch de 50K
+    # Si renseignée (ex. telechargement.URL_EXPORT_PARQUET) : fichier_source est la
+    # copie locale en cache de l'export, téléchargée ou reprise au besoin
+    'url_source': None,
+    'chunk_size': 50000,  # Traiter par batch de 50K
+    'mode_streaming': True,  # Lecture Parquet par batchs de chunk_size (mémoire bornée)
+    # Lecture Bronze (raw_accidents) au-delà du watermark + upsert Silver
+    'mode_incremental': True,
+    'forcer_reconstruction': False,  # True (ou --reconstruction) : TRUNCATE + rechargement complet
+    # Recul de la borne haute du watermark (s) : load_timestamp est l'heure de DÉBUT
+    # de la transaction Bronze, une transaction encore ouverte peut valider des lignes
+    # plus anciennes que le MAX visible
+    'marge_watermark_s': 300,
+    # Mode de chargement par table : 'copy' (COPY FROM STDIN) ou 'to_sql' (INSERT multi)
+    'mode_chargement': {
+        'accidents': 'copy',
+        'lieux': 'copy',
+        'vehicules': 'copy',
+        'usagers': 'copy'
+    },
+    'copy_chunk_size': 100000,  # Lignes sérialisées par buffer CSV envoyé à COPY
+    'nb_workers_chargement': 4,  # Connexions parallèles (1 = chargement séquentiel)
+    'taille_partition_chargement': 500000,  # Au-delà, une table est chargée par partitions parallèles
+    # Copie des tables Silver en Parquet (lac_parquet.py) pour le moteur DuckDB des critères
+    'lac_parquet': True,
+    # Mode complet : 4 tables transformées dans un pool de processus sur le
+    # Bronze partagé (transformation_parallele.py), si plus d'un cœur
+    'transformation_parallele': True
 }
 
 # ════════════════════════════════════════════════════════════════
-# MAPPINGS 
+# COLONNES MULTI-VALEURS
 # ════════════════════════════════════════════════════════════════
 
-GRAVITE_MAPPING = {'Indemne': 1, 'Tué': 2, 'Blessé hospitalisé': 3, 'Blessé': 4}
-LUMINOSITE_MAPPING = {'Plein jour': 1, 'Crépuscule ou aube': 2, 'Nuit sans éclairage public': 3, 
-                      'Nuit avec éclairage public non allumé': 4, 'Nuit avec éclairage public allumé': 5}
-CONDITIONS_ATMO_MAPPING = {'Normale': 1, 'Pluie légère': 2, 'Pluie forte': 3, 'Neige - grêle': 4, 
-                           'Brouillard - fumée': 5, 'Vent fort - tempête': 6, 'Temps éblouissant': 7, 
-                           'Temps couvert': 8, 'Autre': 9}
-AGG_MAPPING = {'Hors agglomération': False, 'En agglomération': True}
-INT_MAPPING = {'Hors intersection': 1, 'Intersection en X': 2, 'Intersection en T': 3, 
-               'Intersection en Y': 4, 'Intersection à plus de 4 branches': 5, 'Giratoire': 6, 
-               'Place': 7, 'Passage à niveau': 8, 'Autre intersection': 9}
-COL_MAPPING = {'Deux véhicules - frontale': 1, 'Deux véhicules - par l\'arrière': 2, 
-               'Deux véhicules - par le coté': 3, 'Trois véhicules et plus - en chaîne': 4, 
-               'Trois véhicules et plus - collisions multiples': 5, 'Autre collision': 6, 'Sans collision': 7}
-CATEGORIE_ROUTE_MAPPING = {'Autoroute': 1, 'Route Nationale': 2, 'Route Départementale': 3, 
-                           'Voie Communale': 4, 'Hors réseau public': 5, 
-                           'Parc de stationnement ouvert à la circulation publique': 6, 'autre': 9}
-SURF_MAPPING = {'normale': 1, 'mouillée': 2, 'flaques': 3, 'inondée': 4, 'enneigée': 5, 
-                'boue': 6, 'verglacée': 7, 'corps gras - huile': 8, 'autre': 9}
-CATEGORIE_USAGER_MAPPING = {'Conducteur': 1, 'Passager': 2, 'Piéton': 3, 'Piéton en roller ou en trottinette': 4}
-SEXE_MAPPING = {'Masculin': 1, 'Féminin': 2}
-SITU_MAPPING = {'Sur chaussée': 1, 'Sur accotement': 2, 'Sur trottoir': 3, 'Sur bande d\'arrêt d\'urgence': 4, 
-                'Sur piste cyclable': 5, '8': 8, '6': 6, '-1': 0, 'Autre': 9}
-INFRA_MAPPING = {'Carrefour aménagé': 1, 'Pont - autopont': 2, 'Bretelle d\'échangeur ou de raccordement': 3, 
-                 'Zone piétonne': 4, 'Souterrain - tunnel': 5, 'Voie ferrée': 6, 'Zone de péage': 7, 
-                 '9': 9, '8': 8, '-1': 0, '0': 0, 'Aucune': 0, 'Autre': 9}
-OBSTACLE_MOBILE_MAPPING = {'Véhicule': 1, 'Piéton': 2, 'Autre': 3, 'Animal sauvage': 4, 
-                           'Animal domestique': 5, 'Véhicule sur rail': 6, '-1': 0, '0': 0, 'Aucun': 0}
-CATEGORIE_VEHICULE_MAPPING = {
-    'VL seul': 1,
-    'VL + caravane': 2,
-    'VL + remorque': 3,
-    'VU seul': 4,
-    'VU + caravane': 5,
-    'VU + remorque': 6,
-    'PL seul': 7,
-    'PL + remorque': 8,
-    'PL train': 9,
-    'PL double': 10,
-    'Cyclo 50cm3': 11,
-    'Cyclo 125cm3': 12,
-    'Moto > 125cm3': 13,
-    'Scooter < 50cm3': 14,
-    'Scooter > 50cm3': 15,
-    'Quad': 16,
-    'Autocar': 17,
-    'Autobus': 18,
-    'Train': 19,
-    'Tramway': 20,
-    'Engin agricole': 21,
-    'Tracteur routier': 22,
-    'Autre': 99
-}
-EQUIPEMENT_SECURITE_MAPPING = {
-    'Ceinture': 1,
-    'Casque': 2,
-    'Gilet réfléchissant': 3,
-    'Airbag': 4,
-    'Gants': 5,
-    'Gants + Casque': 6,
-    'Ceinture + Airbag': 7,
-    'Autre équipement': 99,
-    'Aucun équipement': 0
-}
+COLS_USAGERS_MULTI = ['an_nais', 'sexe', 'actp', 'grav', 'secu', 'secu_utl', 'locp', 'place', 'catu', 'etatp', 'trajet']
+COLS_VEHICULES_MULTI = ['num_veh', 'choc', 'manv', 'senc', 'obsm', 'obs', 'catv', 'occutc']
 
-VOSP_MAPPING = {
-    'Piste cyclable': 1,
-    'Banque cyclable': 2, 
-    'Voie réservée': 3,
-    '-1': -1,
-    '': None,
-    'nan': None
-}
+# ════════════════════════════════════════════════════════════════
+# ⚡ FONCTION EXPLOSION VECTORISÉE 
+# ════════════════════════════════════════════════════════════════
 
-MANOEUVRE_MAPPING = {
-    'manv d’évitement': 1, 'Sans changement de direction': 2, 'manv de stationnement': 3,
-    'Tournant A gauche': 4, 'Déporté A gauche': 5, 'Même senc': 6, 'Arrêté (hors stationnement)': 7,
-    'Dépassant A gauche': 8, 'En s\'insérant': 9, 'Traversant la chaussée': 10,
-    'Tournant A droite': 11, 'Déporté A droite': 12, 'Dépassant A droite': 13,
-    'Changeant de file A gauche': 14, 'Changeant de file A droite': 15,
-    'En faisant demi-tour sur la chaussée': 16, 'En stationnement (avec occupants)': 17,
-    'En marche arrière': 18, 'Ouverture de porte': 19, 'Entre 2 files': 20,
-    'Dans le couloir bus': 21, 'En franchissant le terre-plein central': 22,
-    'A contresenc': 23, '26': 26
-}
+def split_multivalue_arrow(series):
+    """
+    Découpe une colonne "a,b,c" en une seule passe Arrow.
+    Retourne (offsets, éléments) : les valeurs de la ligne i sont
+    éléments[offsets[i]:offsets[i+1]], déjà débarrassées des espaces.
+    """
+    valeurs_str = series.fillna('').astype(str).to_numpy(dtype=object)
+    listes = pc.split_pattern(pa.array(valeurs_str, type=pa.string()), pattern=',')
+    return listes.offsets.to_numpy(), pc.utf8_trim_whitespace(listes.values)
 
-OBSTACLE_FIXE_MAPPING = {
-    'Véhicule en stationnement': 1, 'Arbre': 2, 'Glissière métallique': 3,
-    'Glissière béton': 4, 'Autre glissière': 5, 'Mur': 6, 'Poteau': 7,
-    'Mobilier urbain': 8, 'Parapet': 9, 'Support de signalisation': 10,
-    'Gril': 11, 'Fossé': 12, 'Talus': 13, 'Autre obstacle fixe': 99, 'Aucun': 0
-}
-PROFIL_ROUTE_MAPPING = {
-    'Plat': 1,
-    'Pente': 2,
-    'Sommet de côte': 3,
-    'Bas de côte': 4,
-    '-1': None,
-    '': None,
-    'nan': None
-}
 
-PROFIL_ROUTE_MAPPING = {
-    'Plat': 1,
-    'Pente': 2, 
-    'Sommet de côte': 3,
-    'Bas de côte': 4,
-    '-1': None,
-    '': None,
-    'nan': None
-}
+def extract_positions_arrow(offsets, elements, source_rows, positions):
+    """
+    Extrait la valeur n°`position` de la ligne source sans boucle Python :
+    lecture directe dans le buffer aplati (offset de la ligne + position).
+    """
+    longueurs = np.diff(offsets)
 
-TRACE_PLAN_MAPPING = {
-    'Partie rectiligne': 1,
-    'En courbe à gauche': 2,
-    'En courbe à droite': 3, 
-    'En « S »': 4,
-    '-1': None,
-    '': None,
-    'nan': None
-}
+    # Position hors liste → NULL (équivalent de l'IndexError de l'ancienne version)
+    hors_liste = positions >= longueurs[source_rows]
+    indices = np.where(hors_liste, 0, offsets[source_rows] + positions)
 
-REGIME_CIRCULATION_MAPPING = {
-    'Sens unique': 1,
-    'Bidirectionnelle': 2,
-    'À chaussées séparées': 3,
-    'Avec voies d\'affectation variable': 4, 
-    '-1': None,
-    '': None,
-    'nan': None
-}
+    if len(elements) == 0:
+        return pd.array([None] * len(positions), dtype=pd.ArrowDtype(pa.string()))
 
-POINT_CHOC_MAPPING = {
-    'Avant': 1,
-    'Arrière': 2, 
-    'Côté gauche': 3,
-    'Côté droit': 4,
-    '-1': None,
-    '': None,
-    'nan': None
-}
-COLS_USAGERS_MULTI = ['an_nais', 'sexe', 'actp', 'grav', 'secu', 'secu_utl', 'locp', 'place', 'catu', 'etatp', 'trajet']
-COLS_VEHICULES_MULTI = ['num_veh', 'choc', 'manv', 'senc', 'obsm', 'obs', 'catv', 'occutc']
+    extraits = elements.take(pa.array(indices, type=pa.int64()))
+    masque_null = pc.or_(pa.array(hors_liste), pc.equal(extraits, ''))
+    extraits = pc.if_else(masque_null, pa.scalar(None, type=pa.string()), extraits)
+
+    # Reste en Arrow comme les autres colonnes Bronze : pas d'objets Python
+    # par valeur, les mappings factorisent par dictionary_encode
+    return pd.arrays.ArrowExtensionArray(extraits)
 
-# ════════════════════════════════════════════════════════════════
-# ⚡ FONCTION EXPLOSION VECTORISÉE 
-# ════════════════════════════════════════════════════════════════
 
-def explode_multivalue_vectorized(df, multi_cols, id_col='num_acc'):
+def compter_valeurs_multivalue(series):
+    """
+    Nombre de lignes produites par l'explosion pour chaque ligne source
+    ('' ou NULL → 1, comme split_multivalue_arrow).
+    """
+    valeurs_str = series.fillna('').astype(str).to_numpy(dtype=object)
+    return pc.count_substring(pa.array(valeurs_str, type=pa.string()), ',').to_numpy() + 1
 
+
+def explode_multivalue_vectorized(df, multi_cols, id_col='num_acc', verbose=True, decalage_positions=None):
+    """
+    decalage_positions (mode streaming) : position de départ par ligne
+    source, pour un id déjà explosé dans un batch précédent.
+    """
     start = time.time()
-    
-    # Étape 1 : Compter le nombre de valeurs (VECTORISÉ)
-    def count_vectorized(series):
-        return series.fillna('').astype(str).str.count(',') + 1
-    
-    # Prendre la première colonne non vide pour compter
-    nb_values = None
-    for col in multi_cols:
-        if col in df.columns:
-            nb_values = count_vectorized(df[col])
-            nb_values = nb_values.where(df[col].notna() & (df[col].astype(str) != ''), 1)
-            break
-    
-    if nb_values is None:
+
+    # Étape 1 : Split Arrow unique par colonne (VECTORISÉ)
+    splits = {col: split_multivalue_arrow(df[col]) for col in multi_cols if col in df.columns}
+
+    if not splits:
         return df
-    
+
+    # Nombre de valeurs = longueur des listes de la première colonne présente
+    # ('' ou NULL → 1 ligne, comme str.count(',') + 1)
+    premier_offsets, _ = next(iter(splits.values()))
+    nb_values = np.diff(premier_offsets)
+
     # Étape 2 : Répéter les lignes (VECTORISÉ)
     df_repeated = df.loc[df.index.repeat(nb_values)].copy()
-    df_repeated['_position'] = df_repeated.groupby(id_col).cumcount()
-    
-    # Étape 3 : Extraire valeurs par position (VECTORISÉ)
-    for col in multi_cols:
-        if col not in df_repeated.columns:
-            continue
-        
-        # Créer une série avec splits
-        splits = df_repeated[col].fillna('').astype(str).str.split(',')
-        
-        # Extraire par position (VECTORISÉ avec list comprehension)
-        def extract_at_pos(split_list, pos):
-            try:
-                val = split_list[pos].strip()
-                return val if val != '' else None
-            except (IndexError, AttributeError):
-                return None
-        
-        # Application vectorisée 
-        df_repeated[col] = [
-            extract_at_pos(split_list, pos) 
-            for split_list, pos in zip(splits, df_repeated['_position'])
-        ]
-    
-    df_repeated = df_repeated.drop(columns=['_position'])
-    
-    print(f"    ✓ Explosion terminée en {time.time()-start:.1f}s ({len(df_repeated):,} lignes)")
+    source_rows = np.repeat(np.arange(len(df)), nb_values)
+    positions = df_repeated.groupby(id_col).cumcount().to_numpy()
+    if decalage_positions is not None:
+        positions = positions + decalage_positions[source_rows]
+
+    # Étape 3 : Extraire valeurs par position (offsets Arrow, aucune boucle Python)
+    for col, (offsets, elements) in splits.items():
+        df_repeated[col] = extract_positions_arrow(offsets, elements, source_rows, positions)
+
+    if verbose:
+        print(f"    ✓ Explosion terminée en {time.time()-start:.1f}s ({len(df_repeated):,} lignes)")
     return df_repeated
 
 
 # ════════════════════════════════════════════════════════════════
-# ETL PRINCIPAL 
+# TRANSFORMATIONS PAR TABLE (communes au mode complet et au streaming)
 # ════════════════════════════════════════════════════════════════
 
-def etl_silver():
-    start_global = time.time()
-    
-    print("═"*70)
-    print("ETL COUCHE SILVER ")
-    print("═"*70)
-    
-    # ═══════════════════════════════════════════════════════════
-    # ÉTAPE 1 : CHARGEMENT PARQUET 
-    # ═══════════════════════════════════════════════════════════
-    
-    print("\n[1/5] CHARGEMENT PARQUET")
-    print("-"*70)
-    start = time.time()
-    
-    # ⚡ OPTIMISATION : Charger uniquement les colonnes nécessaires
-    colonnes_necessaires = [
-        'num_acc', 'an', 'mois', 'jour', 'hrmn',
-        'lum', 'agg', 'int', 'atm', 'col',
-        'com', 'dep', 'lat', 'long', 'adr',
-        'catr', 'voie', 'circ', 'nbv', 'prof', 'plan',
-        'lartpc', 'larrout', 'surf', 'infra', 'situ', 'env1','vosp'
-    ] + COLS_USAGERS_MULTI + COLS_VEHICULES_MULTI
-    
-    df_bronze = pd.read_parquet(
-        CONFIG['fichier_source'],
-        engine='pyarrow',
-        columns=colonnes_necessaires  # ⚡ Charger uniquement colonnes utiles
-    )
-    
-    print(f"✓ {len(df_bronze):,} accidents chargés en {time.time()-start:.1f}s")
-    print(f"  Mémoire : {df_bronze.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
-    
-    # ═══════════════════════════════════════════════════════════
-    # ÉTAPE 2 : TABLE ACCIDENTS (VECTORISÉ)
-    # ═══════════════════════════════════════════════════════════
-    
-    print("\n[2/5] TRANSFORMATION → TABLE ACCIDENTS")
-    print("-"*70)
-    start = time.time()
-    
-    df_accidents = df_bronze[[
+# ⚡ OPTIMISATION : Charger uniquement les colonnes nécessaires
+COLONNES_NECESSAIRES = [
+    'num_acc', 'an', 'mois', 'jour', 'hrmn',
+    'lum', 'agg', 'int', 'atm', 'col',
+    'com', 'dep', 'lat', 'long', 'adr',
+    'catr', 'voie', 'circ', 'nbv', 'prof', 'plan',
+    'lartpc', 'larrout', 'surf', 'infra', 'situ', 'env1','vosp'
+] + COLS_USAGERS_MULTI + COLS_VEHICULES_MULTI
+
+# Colonnes Bronze lues par chaque transformation (le mode parallèle ne
+# convertit en pandas que celles de sa tâche)
+COLONNES_BRONZE = {
+    'accidents': [
         'num_acc', 'an', 'mois', 'jour', 'hrmn',
         'lum', 'agg', 'int', 'atm', 'col',
         'com', 'dep', 'lat', 'long', 'adr'
-    ]].drop_duplicates(subset=['num_acc']).copy()
-    
-    print(f"  ✓ {len(df_accidents):,} accidents uniques")
+    ],
+    'lieux': [
+        'num_acc', 'catr', 'voie', 'circ', 'nbv', 'prof', 'plan',
+        'lartpc', 'larrout', 'surf', 'infra', 'situ', 'env1', 'vosp'
+    ],
+    'vehicules': ['num_acc'] + COLS_VEHICULES_MULTI,
+    'usagers': ['num_acc', 'an'] + COLS_USAGERS_MULTI + ['num_veh']
+}
+
+# Représentations texte d'une valeur manquante après astype(str) :
+# NaN (object), None (object) et pd.NA (colonnes Arrow)
+TEXTES_NULS = ['nan', 'None', '<NA>']
+
+
+@instrumenter('transformation_accidents')
+def transformer_accidents(df_bronze, stats=None):
+    """
+    stats (optionnel) : dict complété avec le nombre de couples GPS annulés
+    par la validation ck_coords_valides.
+    """
+    df_accidents = df_bronze[COLONNES_BRONZE['accidents']].drop_duplicates(subset=['num_acc']).copy()
     
     # Temporel (VECTORISÉ)
     df_accidents[['heure', 'minute']] = df_accidents['hrmn'].str.split(':', expand=True).astype('Int64')
@@ -310,179 +226,107 @@ def etl_silver():
     # Géographie (VECTORISÉ)
     df_accidents['com_code'] = df_accidents['com'].astype(str).str.zfill(5)
     df_accidents['departement_code'] = df_accidents['dep'].astype(str).str.strip()
-        
-    # =============================================================================
-    # CONVERSION GPS 
-    # =============================================================================
-
-    def convert_lat_long(coord):
-        """
-        Gère les deux formats : 7 chiffres sans séparateur ET format décimal normal
-        """
-        if pd.isna(coord):
-            return None
-        
-        coord_str = str(coord).strip()
-        
-        # Gestion des valeurs vides
-        if coord_str == '' or coord_str.lower() == 'nan':
-            return None
-        
-        # Remplacement virgule par point
-        coord_str = coord_str.replace(',', '.')
-        
-        # Cas format décimal standard
-        if '.' in coord_str:
-            try:
-                return float(coord_str)
-            except ValueError:
-                return None
-        
-        # Format 7 chiffres sans séparateur
-        elif len(coord_str) == 7 and coord_str.replace('-', '').isdigit():
-            try:
-                # Latitude positive : 4872760 → 48.72760
-                if not coord_str.startswith('-'):
-                    return float(coord_str[:2] + '.' + coord_str[2:])
-                # Longitude négative : -2478760 → -2.478760
-                else:
-                    return float('-' + coord_str[1:2] + '.' + coord_str[2:])
-            except ValueError:
-                return None
-        
-        # Format 8 chiffres sans séparateur (cas longitude positive)
-        elif len(coord_str) == 8 and coord_str.replace('-', '').isdigit():
-            try:
-                if not coord_str.startswith('-'):
-                    return float(coord_str[:1] + '.' + coord_str[1:])
-                else:
-                    return float('-' + coord_str[1:2] + '.' + coord_str[2:])
-            except ValueError:
-                return None
-        
-        # Autres formats non gérés, on tente la conversion brute
-        else:
-            try:
-                return float(coord_str)
-            except ValueError:
-                return None
-
-    # Application sur le DataFrame
-    print("  [GPS] Conversion des coordonnées...")
-    df_accidents['latitude'] = df_accidents['lat'].apply(convert_lat_long)
-    df_accidents['longitude'] = df_accidents['long'].apply(convert_lat_long)
-
-    # Vérification qualité
-    lat_valides = df_accidents['latitude'].notna().sum()
-    long_valides = df_accidents['longitude'].notna().sum()
-    total = len(df_accidents)
-    print(f"    ✓ Latitude valide : {lat_valides}/{total} ({lat_valides/total*100:.1f}%)")
-    print(f"    ✓ Longitude valide : {long_valides}/{total} ({long_valides/total*100:.1f}%)")
-    # Adresses (VECTORISÉ)
     
-    df_accidents['adresse'] = df_accidents['adr'].astype(str).replace('nan', None)
+    # GPS (VECTORISÉ) : conversion des formats + validation ck_coords_valides
+    df_accidents['latitude'], df_accidents['longitude'], nb_gps_annules = normaliser_coordonnees(
+        df_accidents['lat'], df_accidents['long']
+    )
+    if stats is not None:
+        stats['gps_annules'] = nb_gps_annules
+    
+    # Adresses (VECTORISÉ)
+    df_accidents['adresse'] = df_accidents['adr'].astype(str).replace(TEXTES_NULS, None)
     
     # Conditions (VECTORISÉ avec map)
-    df_accidents['en_agglomeration'] = df_accidents['agg'].map(AGG_MAPPING)
-    df_accidents['luminosite'] = df_accidents['lum'].map(LUMINOSITE_MAPPING)
-    df_accidents['conditions_atmospheriques'] = df_accidents['atm'].map(CONDITIONS_ATMO_MAPPING)
-    df_accidents['type_intersection'] = df_accidents['int'].map(INT_MAPPING)
-    df_accidents['type_collision'] = df_accidents['col'].map(COL_MAPPING)
-    
-    # Sélection finale
-    df_accidents_silver = df_accidents[[
+    df_accidents['en_agglomeration'] = mapper('agg', df_accidents['agg'])
+    df_accidents['luminosite'] = mapper('lum', df_accidents['lum'])
+    df_accidents['conditions_atmospheriques'] = mapper('atm', df_accidents['atm'])
+    df_accidents['type_intersection'] = mapper('int', df_accidents['int'])
+    df_accidents['type_collision'] = mapper('col', df_accidents['col'])
+    
+    # Sélection finale + types compacts
+    return compacter_dataframe(df_accidents[[
         'num_acc', 'heure', 'minute', 'annee', 'mois', 'jour', 'jour_semaine',
         'com_code', 'departement_code', 'en_agglomeration',
         'latitude', 'longitude', 'adresse',
         'luminosite', 'conditions_atmospheriques', 'type_intersection', 'type_collision'
-    ]].copy()
-    
-    print(f"✓ Table accidents : {len(df_accidents_silver):,} lignes en {time.time()-start:.1f}s")
-    
-    # ═══════════════════════════════════════════════════════════
-    # ÉTAPE 3 : TABLE LIEUX (VECTORISÉ)
-    # ═══════════════════════════════════════════════════════════
-    
-    print("\n[3/5] TRANSFORMATION → TABLE LIEUX")
-    print("-"*70)
-    start = time.time()
-    
-    df_lieux = df_bronze[[
-        'num_acc', 'catr', 'voie', 'circ', 'nbv', 'prof', 'plan',
-        'lartpc', 'larrout', 'surf', 'infra', 'situ', 'env1', 'vosp'
-    ]].drop_duplicates(subset=['num_acc']).copy()
+    ]].copy(), 'accidents')
+
+
+@instrumenter('transformation_lieux')
+def transformer_lieux(df_bronze):
+    df_lieux = df_bronze[COLONNES_BRONZE['lieux']].drop_duplicates(subset=['num_acc']).copy()
     
     # Transformations (VECTORISÉ)
-    df_lieux['categorie_route'] = df_lieux['catr'].map(CATEGORIE_ROUTE_MAPPING)
-    df_lieux['numero_route'] = df_lieux['voie'].astype(str).replace('nan', None)
+    df_lieux['categorie_route'] = mapper('catr', df_lieux['catr'])
+    df_lieux['numero_route'] = df_lieux['voie'].astype(str).replace(TEXTES_NULS, None)
     df_lieux['regime_circulation'] = pd.to_numeric(df_lieux['circ'], errors='coerce').astype('Int64')
     df_lieux['nombre_voies'] = pd.to_numeric(df_lieux['nbv'], errors='coerce').astype('Int64')
-    df_lieux['voie_reservee'] = df_lieux['vosp'].map(VOSP_MAPPING)
-    df_lieux['profil_route'] = df_lieux['prof'].map(PROFIL_ROUTE_MAPPING)
-    df_lieux['trace_plan'] = df_lieux['plan'].map(TRACE_PLAN_MAPPING)
+    df_lieux['voie_reservee'] = mapper('vosp', df_lieux['vosp'])
+    df_lieux['profil_route'] = mapper('prof', df_lieux['prof'])
+    df_lieux['trace_plan'] = mapper('plan', df_lieux['plan'])
     df_lieux['largeur_terre_plein'] = pd.to_numeric(df_lieux['lartpc'], errors='coerce') / 100
     df_lieux['largeur_chaussee'] = pd.to_numeric(df_lieux['larrout'], errors='coerce') / 100
-    df_lieux['etat_surface'] = df_lieux['surf'].str.lower().map(SURF_MAPPING)
-    df_lieux['infrastructure'] = df_lieux['infra'].map(INFRA_MAPPING).fillna(0).astype('Int64')
-    df_lieux['situation'] = df_lieux['situ'].map(SITU_MAPPING).fillna(0).astype('Int64')
+    df_lieux['etat_surface'] = mapper('surf', df_lieux['surf'])
+    df_lieux['infrastructure'] = mapper('infra', df_lieux['infra']).fillna(0).astype('Int64')
+    df_lieux['situation'] = mapper('situ', df_lieux['situ']).fillna(0).astype('Int64')
     df_lieux['proximite_ecole'] = pd.to_numeric(df_lieux['env1'], errors='coerce').notna()
     
-    df_lieux_silver = df_lieux[[
+    return compacter_dataframe(df_lieux[[
         'num_acc', 'categorie_route', 'numero_route', 'regime_circulation',
         'nombre_voies', 'voie_reservee', 'profil_route', 'trace_plan',
         'largeur_terre_plein', 'largeur_chaussee', 'etat_surface',
         'infrastructure', 'situation', 'proximite_ecole'
-    ]].copy()
-    
-    print(f"✓ Table lieux : {len(df_lieux_silver):,} lignes en {time.time()-start:.1f}s")
-    
-    # ═══════════════════════════════════════════════════════════
-    # ÉTAPE 4 : TABLE VEHICULES (EXPLOSION VECTORISÉE)
-    # ═══════════════════════════════════════════════════════════
-    
-    print("\n[4/5] TRANSFORMATION → TABLE VEHICULES")
-    print("-"*70)
-    start = time.time()
-    
-    df_for_vehicules = df_bronze[['num_acc'] + COLS_VEHICULES_MULTI].copy()
+    ]].copy(), 'lieux')
+
+
+@instrumenter('transformation_vehicules')
+def transformer_vehicules(df_bronze, verbose=True, decalage_positions=None):
+    df_for_vehicules = df_bronze[COLONNES_BRONZE['vehicules']].copy()
     
     # ⚡ EXPLOSION VECTORISÉE 
-    df_vehicules = explode_multivalue_vectorized(df_for_vehicules, COLS_VEHICULES_MULTI)
+    with etape('explosion_vehicules', len(df_for_vehicules)) as mesure:
+        df_vehicules = explode_multivalue_vectorized(
+            df_for_vehicules, COLS_VEHICULES_MULTI,
+            verbose=verbose, decalage_positions=decalage_positions
+        )
+        mesure.lignes_sortie = len(df_vehicules)
     df_vehicules = df_vehicules.drop_duplicates(subset=['num_acc', 'num_veh']).copy()
     
     # Transformations (VECTORISÉ)
-    df_vehicules['num_veh'] = df_vehicules['num_veh'].astype(str).str.strip()
-    df_vehicules['point_choc'] = df_vehicules['choc'].map(POINT_CHOC_MAPPING)
-    df_vehicules['manoeuvre'] = df_vehicules['manv'].map(MANOEUVRE_MAPPING)
+    # num_veh NULL (position d'explosion au-delà de la liste num_veh) :
+    # aucun véhicule identifiable, ligne écartée (num_veh NOT NULL, clé)
+    df_vehicules['num_veh'] = df_vehicules['num_veh'].astype(str).str.strip().replace(TEXTES_NULS, None)
+    df_vehicules = df_vehicules[df_vehicules['num_veh'].notna()].copy()
+    df_vehicules['point_choc'] = mapper('choc', df_vehicules['choc'])
+    df_vehicules['manoeuvre'] = mapper('manv', df_vehicules['manv'])
     df_vehicules['sens_circulation'] = pd.to_numeric(df_vehicules['senc'], errors='coerce').astype('Int64')
-    df_vehicules['obstacle_mobile'] = df_vehicules['obsm'].map(OBSTACLE_MOBILE_MAPPING).fillna(0).astype('Int64')
-    df_vehicules['obstacle_fixe'] = df_vehicules['obs'].map(OBSTACLE_FIXE_MAPPING)
+    df_vehicules['obstacle_mobile'] = mapper('obsm', df_vehicules['obsm']).fillna(0).astype('Int64')
+    df_vehicules['obstacle_fixe'] = mapper('obs', df_vehicules['obs'])
     df_vehicules['nb_occupants'] = pd.to_numeric(df_vehicules['occutc'], errors='coerce').astype('Int64')
-    df_vehicules['categorie_vehicule'] = df_vehicules['catv'].map(CATEGORIE_VEHICULE_MAPPING)
+    df_vehicules['categorie_vehicule'] = mapper('catv', df_vehicules['catv'])
     
-    df_vehicules_silver = df_vehicules[[
+    return compacter_dataframe(df_vehicules[[
         'num_acc', 'num_veh', 'sens_circulation', 'categorie_vehicule',
         'obstacle_fixe', 'obstacle_mobile', 'point_choc', 'manoeuvre', 'nb_occupants'
-    ]].copy()
-    
-    print(f"✓ Table vehicules : {len(df_vehicules_silver):,} lignes en {time.time()-start:.1f}s")
-    
-    # ═══════════════════════════════════════════════════════════
-    # ÉTAPE 5 : TABLE USAGERS 
-    # ═══════════════════════════════════════════════════════════
-    
-    print("\n[5/5] TRANSFORMATION → TABLE USAGERS")
-    print("-"*70)
-    start = time.time()
-    
-    df_for_usagers = df_bronze[['num_acc', 'an'] + COLS_USAGERS_MULTI + ['num_veh']].copy()
+    ]].copy(), 'vehicules')
+
+
+@instrumenter('transformation_usagers')
+def transformer_usagers(df_bronze, verbose=True, decalage_positions=None):
+    df_for_usagers = df_bronze[COLONNES_BRONZE['usagers']].copy()
     
     # ⚡ EXPLOSION VECTORISÉE
-    df_usagers = explode_multivalue_vectorized(df_for_usagers, COLS_USAGERS_MULTI + ['num_veh'])
+    with etape('explosion_usagers', len(df_for_usagers)) as mesure:
+        df_usagers = explode_multivalue_vectorized(
+            df_for_usagers, COLS_USAGERS_MULTI + ['num_veh'],
+            verbose=verbose, decalage_positions=decalage_positions
+        )
+        mesure.lignes_sortie = len(df_usagers)
     
     # Transformations (VECTORISÉ)
-    df_usagers['gravite'] = df_usagers['grav'].map(GRAVITE_MAPPING)
-    df_usagers['sexe'] = df_usagers['sexe'].map(SEXE_MAPPING)
+    df_usagers['gravite'] = mapper('grav', df_usagers['grav'])
+    df_usagers['sexe'] = mapper('sexe', df_usagers['sexe'])
     df_usagers['annee_naissance'] = pd.to_numeric(df_usagers['an_nais'], errors='coerce').astype('Int64')
     df_usagers['annee_accident'] = pd.to_numeric(df_usagers['an'], errors='coerce').astype('Int64')
     df_usagers['age_au_moment_accident'] = df_usagers['annee_accident'] - df_usagers['annee_naissance']
@@ -494,21 +338,153 @@ def etl_silver():
     ] = None
     
     df_usagers['place_vehicule'] = pd.to_numeric(df_usagers['place'], errors='coerce').astype('Int64')
-    df_usagers['categorie_usager'] = df_usagers['catu'].map(CATEGORIE_USAGER_MAPPING)
+    df_usagers['categorie_usager'] = mapper('catu', df_usagers['catu'])
     df_usagers['motif_deplacement'] = pd.to_numeric(df_usagers['trajet'], errors='coerce').astype('Int64')
-    df_usagers['equipement_securite'] = df_usagers['secu'].map(EQUIPEMENT_SECURITE_MAPPING)    
+    df_usagers['equipement_securite'] = mapper('secu', df_usagers['secu'])    
     df_usagers['localisation_pieton'] = pd.to_numeric(df_usagers['locp'], errors='coerce').astype('Int64')
     df_usagers['action_pieton'] = pd.to_numeric(df_usagers['actp'], errors='coerce').astype('Int64')
     df_usagers['etat_pieton'] = pd.to_numeric(df_usagers['etatp'], errors='coerce').astype('Int64')
-    df_usagers['num_veh'] = df_usagers['num_veh'].astype(str).str.strip().replace('nan', None)
+    df_usagers['num_veh'] = df_usagers['num_veh'].astype(str).str.strip().replace(TEXTES_NULS, None)
     
-    df_usagers_silver = df_usagers[[
+    return compacter_dataframe(df_usagers[[
         'num_acc', 'num_veh', 'place_vehicule', 'categorie_usager', 'gravite',
         'sexe', 'annee_naissance', 'age_au_moment_accident', 'motif_deplacement',
         'equipement_securite', 'localisation_pieton', 'action_pieton', 'etat_pieton'
-    ]].copy()
+    ]].copy(), 'usagers')
+
+
+# ════════════════════════════════════════════════════════════════
+# ETL PRINCIPAL 
+# ════════════════════════════════════════════════════════════════
+
+def fichier_source():
+    """
+    Fichier Parquet Bronze : copie en cache de CONFIG['url_source'] si
+    renseignée, sinon CONFIG['fichier_source'].
+    """
+    if CONFIG['url_source']:
+        CONFIG['fichier_source'] = telecharger(CONFIG['url_source'])
+    return CONFIG['fichier_source']
+
+
+def verifier_gps(df_accidents_silver, stats_accidents):
+    print("  [GPS] Conversion des coordonnées...")
+    print(f"    ✓ Couples hors bornes annulés (ck_coords_valides) : {stats_accidents['gps_annules']}")
+    lat_valides = df_accidents_silver['latitude'].notna().sum()
+    long_valides = df_accidents_silver['longitude'].notna().sum()
+    total = len(df_accidents_silver)
+    print(f"    ✓ Latitude valide : {lat_valides}/{total} ({lat_valides/total*100:.1f}%)")
+    print(f"    ✓ Longitude valide : {long_valides}/{total} ({long_valides/total*100:.1f}%)")
+
+
+def etl_silver():
+    start_global = time.time()
+    
+    print("═"*70)
+    print("ETL COUCHE SILVER ")
+    print("═"*70)
+    
+    # ═══════════════════════════════════════════════════════════
+    # ÉTAPE 1 : CHARGEMENT PARQUET 
+    # ═══════════════════════════════════════════════════════════
+    
+    print("\n[1/5] CHARGEMENT PARQUET")
+    print("-"*70)
+    start = time.time()
+    
+    # ⚡ Colonnes Arrow (dtype_backend='pyarrow') : ~5x moins de mémoire que des str Python
+    with etape('lecture_parquet') as mesure:
+        table_bronze = pq.read_table(
+            fichier_source(),
+            columns=COLONNES_NECESSAIRES,  # ⚡ Charger uniquement colonnes utiles
+            memory_map=True
+        )
+        mesure.lignes_sortie = table_bronze.num_rows
+    
+    print(f"✓ {table_bronze.num_rows:,} accidents chargés en {time.time()-start:.1f}s")
+    print(f"  Mémoire : {table_bronze.nbytes / 1024**2:.1f} MB")
+    
+    if CONFIG['transformation_parallele'] and nb_processus() > 1:
+        
+        # ═══════════════════════════════════════════════════════════
+        # ÉTAPES 2 À 5 : 4 TABLES EN PARALLÈLE (POOL DE PROCESSUS)
+        # ═══════════════════════════════════════════════════════════
+        
+        print(f"\n[2-5/5] TRANSFORMATION PARALLÈLE → 4 TABLES ({nb_processus()} processus)")
+        print("-"*70)
+        start = time.time()
+        
+        with etape('transformation_parallele', table_bronze.num_rows) as mesure:
+            dataframes_paralleles, stats_accidents, durees = transformer_tables_parallele(table_bronze)
+            mesure.lignes_sortie = sum(len(df) for df in dataframes_paralleles.values())
+        df_accidents_silver = dataframes_paralleles['accidents']
+        df_lieux_silver = dataframes_paralleles['lieux']
+        df_vehicules_silver = dataframes_paralleles['vehicules']
+        df_usagers_silver = dataframes_paralleles['usagers']
+        
+        verifier_gps(df_accidents_silver, stats_accidents)
+        for table_name, df in dataframes_paralleles.items():
+            nb_taches, duree = durees[table_name]
+            print(f"✓ Table {table_name} : {len(df):,} lignes ({nb_taches} tâche(s), {duree:.1f}s cumulées)")
+        print(f"✓ 4 tables transformées en {time.time()-start:.1f}s")
+    
+    else:
+        # Les workers lisent la table Arrow partagée : DataFrame pandas
+        # construit pour le seul mode séquentiel
+        with etape('conversion_pandas', table_bronze.num_rows):
+            df_bronze = table_arrow_vers_pandas(table_bronze)
+        
+        # ═══════════════════════════════════════════════════════════
+        # ÉTAPE 2 : TABLE ACCIDENTS (VECTORISÉ)
+        # ═══════════════════════════════════════════════════════════
+    
+        print("\n[2/5] TRANSFORMATION → TABLE ACCIDENTS")
+        print("-"*70)
+        start = time.time()
+    
+        stats_accidents = {}
+        df_accidents_silver = transformer_accidents(df_bronze, stats_accidents)
+    
+        print(f"  ✓ {len(df_accidents_silver):,} accidents uniques")
+        verifier_gps(df_accidents_silver, stats_accidents)
+    
+        print(f"✓ Table accidents : {len(df_accidents_silver):,} lignes en {time.time()-start:.1f}s")
+    
+        # ═══════════════════════════════════════════════════════════
+        # ÉTAPE 3 : TABLE LIEUX (VECTORISÉ)
+        # ═══════════════════════════════════════════════════════════
+    
+        print("\n[3/5] TRANSFORMATION → TABLE LIEUX")
+        print("-"*70)
+        start = time.time()
+    
+        df_lieux_silver = transformer_lieux(df_bronze)
+    
+        print(f"✓ Table lieux : {len(df_lieux_silver):,} lignes en {time.time()-start:.1f}s")
     
-    print(f"✓ Table usagers : {len(df_usagers_silver):,} lignes en {time.time()-start:.1f}s")
+        # ═══════════════════════════════════════════════════════════
+        # ÉTAPE 4 : TABLE VEHICULES (EXPLOSION VECTORISÉE)
+        # ═══════════════════════════════════════════════════════════
+    
+        print("\n[4/5] TRANSFORMATION → TABLE VEHICULES")
+        print("-"*70)
+        start = time.time()
+    
+        df_vehicules_silver = transformer_vehicules(df_bronze)
+    
+        print(f"✓ Table vehicules : {len(df_vehicules_silver):,} lignes en {time.time()-start:.1f}s")
+    
+        # ═══════════════════════════════════════════════════════════
+        # ÉTAPE 5 : TABLE USAGERS 
+        # ═══════════════════════════════════════════════════════════
+    
+        print("\n[5/5] TRANSFORMATION → TABLE USAGERS")
+        print("-"*70)
+        start = time.time()
+    
+        df_usagers_silver = transformer_usagers(df_bronze)
+    
+        print(f"✓ Table usagers : {len(df_usagers_silver):,} lignes en {time.time()-start:.1f}s")
     
     # ═══════════════════════════════════════════════════════════
     # STATISTIQUES
@@ -525,15 +501,23 @@ def etl_silver():
     print(f"  - lieux      : {len(df_lieux_silver):>10,} lignes")
     print(f"  - vehicules  : {len(df_vehicules_silver):>10,} lignes")
     print(f"  - usagers    : {len(df_usagers_silver):>10,} lignes")
-    print(f"\n💾 Gain mémoire : {(df_bronze.memory_usage(deep=True).sum() / 1024**2):.1f} MB → "
-          f"{(df_accidents_silver.memory_usage(deep=True).sum() + df_lieux_silver.memory_usage(deep=True).sum() + df_vehicules_silver.memory_usage(deep=True).sum() + df_usagers_silver.memory_usage(deep=True).sum()) / 1024**2:.1f} MB")
     
-    return {
+    dataframes_silver = {
         'accidents': df_accidents_silver,
         'lieux': df_lieux_silver,
         'vehicules': df_vehicules_silver,
         'usagers': df_usagers_silver
     }
+    rapport_memoire(dataframes_silver, memoire_bronze=table_bronze.nbytes)
+    
+    if CONFIG['lac_parquet']:
+        with etape('ecriture_lac', sum(len(df) for df in dataframes_silver.values())):
+            ecrire_lac(dataframes_silver)
+    
+    print(f"\n🔤 Libellés Bronze sans correspondance :")
+    rapport_non_mappes()
+    
+    return dataframes_silver
 
 
 # ════════════════════════════════════════════════════════════════
@@ -545,11 +529,8 @@ def load_silver_tables(dataframes):
     print("CHARGEMENT TABLES SILVER")
     print("═"*70)
     
-    engine = create_engine(
-        f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}",
-        echo=False,
-        pool_pre_ping=True  # ⚡ Vérifier connexion avant utilisation
-    )
+    # ⚡ Pool dimensionné : une connexion par worker de chargement
+    engine = creer_engine_pool(DB_CONFIG, CONFIG['nb_workers_chargement'])
     
     tables = [
         ('accidents', dataframes['accidents']),
@@ -558,52 +539,489 @@ def load_silver_tables(dataframes):
         ('usagers', dataframes['usagers'])
     ]
     
-
+    start = time.time()
+    
+    # ⚡ Stagings chargées, indexées et validées en parallèle, puis échangées
+    # par renommage dans une transaction courte : en cas d'échec, les tables
+    # gardent leur contenu
+    try:
+        with etape('chargement', sum(len(df) for _, df in tables)) as mesure:
+            stats = remplacer_tables_parallele(
+                tables,
+                engine,
+                nb_workers=CONFIG['nb_workers_chargement'],
+                taille_partition=CONFIG['taille_partition_chargement'],
+                modes=CONFIG['mode_chargement'],
+                chunksize=CONFIG['copy_chunk_size']
+            )
+            mesure.lignes_sortie = sum(stat['lignes'] for stat in stats.values())
+    except Exception as e:
+        print(f"  ❌ Erreur : {e}")
+        raise
+    
+    # Rechargement depuis le Parquet : watermarks sans valeur (le prochain
+    # run incrémental reconstruit depuis le Bronze), versions avancées
+    with engine.begin() as conn:
+        ecrire_watermarks(conn, None, {table_name: len(df) for table_name, df in tables}, 'reconstruction')
+    
     for table_name, df in tables:
         print(f"\n[{table_name.upper()}]")
         print("-"*70)
+        stat = stats.get(table_name, {'lignes': 0, 'duree': 0.0})
+        print(f"  ✓ {stat['lignes']:,} lignes insérées en {stat['duree']:.1f}s cumulées "
+              f"(mode {CONFIG['mode_chargement'].get(table_name, 'copy')}), "
+              f"index {stat.get('duree_index', 0.0):.1f}s, FK {stat.get('duree_validation', 0.0):.1f}s")
+        
+        with engine.connect() as conn:
+            result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
+            count = result.scalar()
+            print(f"  ✓ Vérification : {count:,} lignes")
+        if count != len(df):
+            print(f"  ⚠ Écart : {len(df):,} lignes envoyées / {count:,} en base")
+    
+    print(f"\n✓ {len(tables)} tables chargées en {time.time()-start:.1f}s "
+          f"({CONFIG['nb_workers_chargement']} workers)")
+
+
+# ════════════════════════════════════════════════════════════════
+# ETL STREAMING (MÉMOIRE BORNÉE PAR BATCH PARQUET)
+# ════════════════════════════════════════════════════════════════
+
+class RegistreCles:
+    """
+    Clés déjà chargées par les batchs précédents, pour dédoublonner à
+    travers les frontières de batch. Stockage : hash 64 bits triés
+    (8 octets par clé, + 8 pour un compteur optionnel), recherche par
+    dichotomie, au lieu d'un set Python de chaînes / tuples.
+    Les clés nouvelles d'un batch forment une série triée ; une série
+    n'est fusionnée qu'avec sa voisine de taille comparable (fusion façon
+    LSM) : chaque clé est recopiée O(log n) fois sur tout le run au lieu
+    de réécrire tout le registre à chaque batch, et le nombre de séries
+    interrogées reste logarithmique.
+    """
+
+    def __init__(self, colonnes):
+        self.colonnes = colonnes
+        # [(cles, compteurs)] triées, disjointes, de tailles décroissantes
+        self.series = []
+
+    def hacher(self, df):
+        return pd.util.hash_pandas_object(df[self.colonnes], index=False).to_numpy()
+
+    def rechercher(self, hashes):
+        """(série, position, trouvé) de chaque hash ; série -1 si absent."""
+        series = np.full(len(hashes), -1, dtype=np.int64)
+        positions = np.zeros(len(hashes), dtype=np.int64)
+        if not self.series:
+            return series, positions, series >= 0
+        # Hashes triés une fois : dichotomies à accès croissants dans
+        # chaque série (bien moins de défauts de cache qu'en ordre aléatoire)
+        ordre = np.argsort(hashes)
+        tries = hashes[ordre]
+        for numero, (cles, _) in enumerate(self.series):
+            indices = np.minimum(np.searchsorted(cles, tries), len(cles) - 1)
+            trouves = cles[indices] == tries
+            series[ordre[trouves]] = numero
+            positions[ordre[trouves]] = indices[trouves]
+        return series, positions, series >= 0
+
+    def ajouter(self, hashes, nombres=None):
+        """
+        Enregistre des clés (doublons autorisés) ; `nombres` s'ajoute aux
+        compteurs des clés existantes ou initialise ceux des nouvelles.
+        """
+        if nombres is None:
+            nombres = np.zeros(len(hashes), dtype=np.int64)
+        series, positions, trouves = self.rechercher(hashes)
+        for numero, (_, compteurs) in enumerate(self.series):
+            dans_serie = series == numero
+            np.add.at(compteurs, positions[dans_serie], nombres[dans_serie])
+
+        nouvelles, inverse = np.unique(hashes[~trouves], return_inverse=True)
+        if len(nouvelles) == 0:
+            return
+        nb_nouvelles = np.bincount(inverse, weights=nombres[~trouves], minlength=len(nouvelles))
+        self.series.append((nouvelles, nb_nouvelles.astype(np.int64)))
+
+        while len(self.series) > 1 and 2 * len(self.series[-1][0]) >= len(self.series[-2][0]):
+            (cles_a, compteurs_a), (cles_b, compteurs_b) = self.series[-2], self.series.pop()
+            # Séries disjointes : positions finales de b par dichotomie dans a
+            depuis_b = np.zeros(len(cles_a) + len(cles_b), dtype=bool)
+            depuis_b[np.searchsorted(cles_a, cles_b) + np.arange(len(cles_b))] = True
+            cles = np.empty(len(depuis_b), dtype=np.uint64)
+            compteurs = np.empty(len(depuis_b), dtype=np.int64)
+            cles[depuis_b], cles[~depuis_b] = cles_b, cles_a
+            compteurs[depuis_b], compteurs[~depuis_b] = compteurs_b, compteurs_a
+            self.series[-1] = (cles, compteurs)
+
+    def filtrer_nouveaux(self, df, nombres=None):
+        """
+        Retire les lignes dont la clé a été vue dans un batch précédent
+        (équivalent du drop_duplicates keep='first' global) et enregistre
+        les autres, avec `nombres` comme compteurs initiaux.
+        """
+        hashes = self.hacher(df)
+        _, _, trouves = self.rechercher(hashes)
+        self.ajouter(hashes[~trouves], None if nombres is None else nombres[~trouves])
+        return df[~trouves]
+
+    def decalages(self, df):
+        """Compteur associé à la clé de chaque ligne (0 si jamais vue)."""
+        series, positions, _ = self.rechercher(self.hacher(df))
+        resultat = np.zeros(len(df), dtype=np.int64)
+        for numero, (_, compteurs) in enumerate(self.series):
+            dans_serie = series == numero
+            resultat[dans_serie] = compteurs[positions[dans_serie]]
+        return resultat
+
+
+def etl_silver_streaming():
+    """
+    Variante bornée en mémoire de etl_silver + load_silver_tables : le
+    Parquet est lu par batchs de CONFIG['chunk_size'] lignes
+    (ParquetFile.iter_batches), chaque batch est transformé en 4 tables
+    Silver puis chargé immédiatement (une transaction par batch).
+    Seuls les registres de clés (quelques dizaines de MB) survivent d'un
+    batch à l'autre :
+      - accidents / lieux : num_acc déjà chargés
+      - vehicules         : (num_acc, num_veh) déjà chargés
+      - explosions        : lignes déjà explosées par num_acc (véhicules et
+                            usagers), pour continuer les positions comme
+                            le cumcount du mode complet
+    """
+    start_global = time.time()
+    processus = psutil.Process()
+    rss_max = processus.memory_info().rss
+    
+    print("═"*70)
+    print("ETL COUCHE SILVER - MODE STREAMING")
+    print("═"*70)
+    
+    fichier = pq.ParquetFile(fichier_source(), memory_map=True)
+    nb_lignes_source = fichier.metadata.num_rows
+    nb_batchs = -(-nb_lignes_source // CONFIG['chunk_size'])
+    print(f"✓ {nb_lignes_source:,} lignes bronze, {fichier.metadata.num_row_groups} row groups "
+          f"→ {nb_batchs} batchs de {CONFIG['chunk_size']:,}")
+    
+    engine = creer_engine_pool(DB_CONFIG, CONFIG['nb_workers_chargement'])
+    noms_tables = ['accidents', 'lieux', 'vehicules', 'usagers']
+    
+    # Watermarks avancés avec le TRUNCATE : un run interrompu laisse des
+    # tables partielles qu'aucun cache ni vue Gold ne doit masquer
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE TABLE {', '.join(noms_tables)} CASCADE"))
+        ecrire_watermarks(conn, None, dict.fromkeys(noms_tables, 0), 'reconstruction')
+    print(f"✓ Tables vidées : {', '.join(noms_tables)}")
+    
+    registre_accidents = RegistreCles(['num_acc'])
+    registre_vehicules = RegistreCles(['num_acc', 'num_veh'])
+    explosions_vehicules = RegistreCles(['num_acc'])
+    explosions_usagers = RegistreCles(['num_acc'])
+    totaux = dict.fromkeys(noms_tables, 0)
+    lac = EcrivainLac() if CONFIG['lac_parquet'] else None
+    codes_lac = CodesPartition()
+    
+    print("\n[BATCHS]")
+    print("-"*70)
+    
+    batchs = iterer('lecture_parquet', (
+        table_arrow_vers_pandas(pa.Table.from_batches([batch]))
+        for batch in fichier.iter_batches(batch_size=CONFIG['chunk_size'], columns=COLONNES_NECESSAIRES)
+    ))
+    for num_batch, df_bronze in enumerate(batchs, start=1):
         start = time.time()
         
-    try:
-        # ⚡ DÉSACTIVER TOUTES LES CONTRAINTES FK
-        with engine.begin() as conn:
-            conn.execute(text("SET session_replication_role = 'replica';"))
+        df_accidents_batch = transformer_accidents(df_bronze)
+        df_lieux = transformer_lieux(df_bronze)
         
-        for table_name, df in tables:
-            print(f"\n[{table_name.upper()}]")
-            print("-"*70)
-            start = time.time()
-            
-            with engine.begin() as conn:
-                conn.execute(text(f"TRUNCATE TABLE {table_name} CASCADE"))
-            print(f"  ✓ Table vidée")
-            
-            df.to_sql(
-                table_name,
+        # Dédoublonnage inter-batchs (accidents et lieux partagent la clé) ;
+        # le compteur du registre retient les clés de partition du lac de
+        # la première occurrence de chaque accident
+        df_accidents = registre_accidents.filtrer_nouveaux(
+            df_accidents_batch, codes_lac.coder(df_accidents_batch) if lac is not None else None
+        )
+        df_lieux = df_lieux[df_lieux['num_acc'].isin(df_accidents['num_acc'])]
+        
+        # Explosions : les positions continuent là où le batch précédent
+        # s'est arrêté pour un même num_acc (parité avec le mode complet)
+        df_vehicules = registre_vehicules.filtrer_nouveaux(transformer_vehicules(
+            df_bronze, verbose=False,
+            decalage_positions=explosions_vehicules.decalages(df_bronze)
+        ))
+        df_usagers = transformer_usagers(
+            df_bronze, verbose=False,
+            decalage_positions=explosions_usagers.decalages(df_bronze)
+        )
+        
+        hashes_batch = explosions_vehicules.hacher(df_bronze)
+        explosions_vehicules.ajouter(hashes_batch, compter_valeurs_multivalue(df_bronze[COLS_VEHICULES_MULTI[0]]))
+        explosions_usagers.ajouter(hashes_batch, compter_valeurs_multivalue(df_bronze[COLS_USAGERS_MULTI[0]]))
+        
+        tables = [
+            ('accidents', df_accidents),
+            ('lieux', df_lieux),
+            ('vehicules', df_vehicules),
+            ('usagers', df_usagers)
+        ]
+        with etape('chargement', sum(len(df) for _, df in tables), batch=num_batch) as mesure:
+            stats = charger_tables_parallele(
+                tables,
                 engine,
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=5000
+                nb_workers=CONFIG['nb_workers_chargement'],
+                taille_partition=CONFIG['taille_partition_chargement'],
+                modes=CONFIG['mode_chargement'],
+                chunksize=CONFIG['copy_chunk_size']
             )
-            
-            print(f"  ✓ {len(df):,} lignes insérées en {time.time()-start:.1f}s")
-            
-            with engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                count = result.scalar()
-                print(f"  ✓ Vérification : {count:,} lignes")
+            mesure.lignes_sortie = sum(stat['lignes'] for stat in stats.values())
+        with engine.begin() as conn:
+            marquer_versions(conn, noms_tables)
+        for table_name, df in tables:
+            totaux[table_name] += len(df)
+        if lac is not None:
+            with etape('ecriture_lac', sum(len(df) for _, df in tables), batch=num_batch):
+                # Clés de partition des véhicules / usagers : accidents du
+                # batch Bronze, tels que chargés (première occurrence)
+                accidents_lac = codes_lac.decoder(
+                    df_accidents_batch['num_acc'], registre_accidents.decalages(df_accidents_batch)
+                )
+                for table_name, df in tables:
+                    lac.ecrire(table_name, df, accidents_lac)
         
-        # ⚡ RÉACTIVER LES CONTRAINTES FK
+        rss_max = max(rss_max, processus.memory_info().rss)
+        print(f"  Batch {num_batch}/{nb_batchs} : {len(df_bronze):,} lignes bronze → "
+              f"{len(df_accidents):,} acc. / {len(df_vehicules):,} véh. / {len(df_usagers):,} usa. "
+              f"en {time.time()-start:.1f}s (RSS {processus.memory_info().rss / 1024**2:.0f} MB)")
+    
+    print("\n[VÉRIFICATION]")
+    print("-"*70)
+    with engine.connect() as conn:
+        for table_name in noms_tables:
+            count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+            print(f"  - {table_name:<10} : {count:>10,} lignes")
+            if count != totaux[table_name]:
+                print(f"  ⚠ Écart : {totaux[table_name]:,} lignes envoyées / {count:,} en base")
+    with engine.begin() as conn:
+        ecrire_watermarks(conn, None, totaux, 'reconstruction')
+    
+    if lac is not None:
+        with etape('publication_lac'):
+            nb_partitions = lac.publier()
+        print(f"✓ Lac Parquet publié → {lac.dossier} ({sum(nb_partitions.values()):,} partitions)")
+    
+    elapsed_total = time.time() - start_global
+    print(f"\n⚡ Temps total : {elapsed_total:.1f}s ({elapsed_total/60:.1f} min)")
+    print(f"💾 Pic mémoire (RSS) : {rss_max / 1024**2:.0f} MB")
+    print(f"\n🔤 Libellés Bronze sans correspondance :")
+    rapport_non_mappes()
+    
+    return totaux
+
+
+# ════════════════════════════════════════════════════════════════
+# ETL INCRÉMENTAL (CDC SUR raw_accidents.load_timestamp)
+# ════════════════════════════════════════════════════════════════
+
+def borne_max_bronze(conn):
+    """
+    Borne haute du run : MAX(load_timestamp), sans dépasser
+      - maintenant - CONFIG['marge_watermark_s']
+      - le début de la plus ancienne transaction cliente encore ouverte
+        (pg_stat_activity ; visible pour les autres rôles avec
+        pg_read_all_stats, sinon seule la marge protège)
+    load_timestamp vaut CURRENT_TIMESTAMP, soit le début de la transaction
+    d'insertion : sans ce recul, des lignes validées après le run avec
+    un load_timestamp inférieur au watermark seraient sautées pour
+    toujours. Elles sont lues au run suivant. None si le Bronze est vide.
+    """
+    return conn.execute(text("""
+        SELECT CASE WHEN m.max_ts IS NULL THEN NULL ELSE LEAST(
+            m.max_ts,
+            LOCALTIMESTAMP - make_interval(secs => :marge),
+            (SELECT MIN(xact_start)::timestamp - INTERVAL '1 microsecond'
+             FROM pg_stat_activity
+             WHERE datname = current_database()
+               AND backend_type = 'client backend'
+               AND pid <> pg_backend_pid()
+               AND xact_start IS NOT NULL)
+        ) END
+        FROM (SELECT MAX(load_timestamp) AS max_ts FROM accidents_bronze.raw_accidents) m
+    """), {'marge': CONFIG['marge_watermark_s']}).scalar()
+
+
+def requete_bronze_incrementale(reconstruction):
+    """
+    Lignes Bronze arrivées depuis le watermark (idx_bronze_load_ts),
+    bornées par borne_max_bronze() lue en début de run. DISTINCT ON
+    garde la version la plus récente de chaque accident : chaque num_acc
+    n'apparaît qu'une fois, les chunks sont donc indépendants.
+    """
+    colonnes = ', '.join(
+        'intsect AS "int"' if col == 'int' else f'"{col}"'
+        for col in COLONNES_NECESSAIRES
+    )
+    filtre_min = "" if reconstruction else "AND load_timestamp > :borne_min"
+    return text(f"""
+        SELECT DISTINCT ON (num_acc) {colonnes}
+        FROM accidents_bronze.raw_accidents
+        WHERE num_acc IS NOT NULL
+          AND load_timestamp <= :borne_max
+          {filtre_min}
+        ORDER BY num_acc, load_timestamp DESC, row_id DESC
+    """)
+
+
+def upsert_batch_silver(tables, engine):
+    """
+    Applique un chunk de modifications dans UNE transaction :
+      - accidents, lieux : ON CONFLICT (num_acc) DO UPDATE
+      - vehicules        : ON CONFLICT (num_acc, num_veh) DO UPDATE, puis
+                           suppression des véhicules disparus de ces accidents
+      - usagers          : pas de clé naturelle → remplacement complet des
+                           usagers des accidents modifiés
+    Retourne {table: lignes écrites}.
+    """
+    nb_ecrites = {}
+    with engine.begin() as conn:
+        # FK désactivées pour cette transaction (même règle que le chargement complet)
+        conn.execute(text("SET LOCAL session_replication_role = 'replica'"))
+        
+        staging_accidents, nb_ecrites['accidents'] = upsert_dataframe(
+            tables['accidents'], 'accidents', conn, ['num_acc'], chunksize=CONFIG['copy_chunk_size'])
+        _, nb_ecrites['lieux'] = upsert_dataframe(
+            tables['lieux'], 'lieux', conn, ['num_acc'], chunksize=CONFIG['copy_chunk_size'])
+        staging_vehicules, nb_ecrites['vehicules'] = upsert_dataframe(
+            tables['vehicules'], 'vehicules', conn, ['num_acc', 'num_veh'], chunksize=CONFIG['copy_chunk_size'])
+        
+        conn.execute(text(f"""
+            DELETE FROM vehicules v
+            USING {staging_accidents} s
+            WHERE v.num_acc = s.num_acc
+              AND NOT EXISTS (
+                  SELECT 1 FROM {staging_vehicules} t
+                  WHERE t.num_acc = v.num_acc AND t.num_veh = v.num_veh
+              )
+        """))
+        conn.execute(text(f"""
+            DELETE FROM usagers u
+            USING {staging_accidents} s
+            WHERE u.num_acc = s.num_acc
+        """))
+        # Version avancée avec les lignes : le cache ne sert plus l'ancien état
+        marquer_versions(conn, tables)
+        nb_ecrites['usagers'] = copy_dataframe(
+            tables['usagers'], 'usagers', engine, chunksize=CONFIG['copy_chunk_size'], conn=conn)
+    
+    return nb_ecrites
+
+
+def etl_silver_incremental(forcer_reconstruction=False):
+    """
+    ETL Silver alimenté par la table Bronze au lieu du Parquet :
+    seules les lignes dont load_timestamp dépasse le watermark sont
+    transformées puis upsertées. Sans watermark (premier run) ou avec
+    forcer_reconstruction : TRUNCATE puis chargement COPY de tout le Bronze.
+    Le watermark n'avance qu'après le dernier chunk : un run interrompu
+    est simplement rejoué (upserts idempotents) ; une reconstruction
+    interrompue laisse des watermarks vides, donc une reconstruction.
+    """
+    start_global = time.time()
+    noms_tables = ['accidents', 'lieux', 'vehicules', 'usagers']
+    
+    print("═"*70)
+    print("ETL COUCHE SILVER - MODE INCRÉMENTAL")
+    print("═"*70)
+    
+    # Une connexion de lecture Bronze + une par worker de chargement
+    engine = creer_engine_pool(DB_CONFIG, CONFIG['nb_workers_chargement'] + 1)
+    
+    with engine.begin() as conn:
+        watermarks = lire_watermarks(conn, noms_tables)
+        borne_max = borne_max_bronze(conn)
+    
+    reconstruction = forcer_reconstruction or any(w is None for w in watermarks.values())
+    borne_min = None if reconstruction else min(watermarks.values())
+    mode = 'reconstruction' if reconstruction else 'incremental'
+    
+    print(f"✓ Mode : {mode}" + (" (forcé)" if forcer_reconstruction else ""))
+    print(f"✓ Watermark : {borne_min} → {borne_max}")
+    
+    if borne_max is None or (borne_min is not None and borne_max <= borne_min):
+        print("✓ Aucune nouvelle ligne Bronze, Silver à jour")
+        return dict.fromkeys(noms_tables, 0)
+    
+    if reconstruction:
+        # Watermarks effacés avec le TRUNCATE : une reconstruction interrompue
+        # est reprise en reconstruction, jamais en incrémental sur des tables vides
         with engine.begin() as conn:
-            conn.execute(text("SET session_replication_role = 'origin';"))
+            conn.execute(text(f"TRUNCATE TABLE {', '.join(noms_tables)} CASCADE"))
+            ecrire_watermarks(conn, None, dict.fromkeys(noms_tables, 0), 'reconstruction')
+        print(f"✓ Tables vidées : {', '.join(noms_tables)}")
+    
+    totaux = dict.fromkeys(noms_tables, 0)
+    
+    print("\n[CHUNKS]")
+    print("-"*70)
+    
+    with engine.connect() as conn_lecture:
+        chunks = pd.read_sql(
+            requete_bronze_incrementale(reconstruction),
+            conn_lecture.execution_options(stream_results=True),
+            params={'borne_min': borne_min, 'borne_max': borne_max},
+            chunksize=CONFIG['chunk_size']
+        )
+        for num_chunk, df_bronze in enumerate(iterer('lecture_bronze', chunks), start=1):
+            start = time.time()
             
-    except Exception as e:
-        print(f"  ❌ Erreur : {e}")
-        # Réactiver les FK même en cas d'erreur
-        with engine.begin() as conn:
-            conn.execute(text("SET session_replication_role = 'origin';"))
-        raise
+            tables = {
+                'accidents': transformer_accidents(df_bronze),
+                'lieux': transformer_lieux(df_bronze),
+                'vehicules': transformer_vehicules(df_bronze, verbose=False),
+                'usagers': transformer_usagers(df_bronze, verbose=False)
+            }
+            
+            with etape('chargement' if reconstruction else 'upsert',
+                       sum(len(df) for df in tables.values()), chunk=num_chunk) as mesure:
+                if reconstruction:
+                    stats = charger_tables_parallele(
+                        list(tables.items()),
+                        engine,
+                        nb_workers=CONFIG['nb_workers_chargement'],
+                        taille_partition=CONFIG['taille_partition_chargement'],
+                        modes=CONFIG['mode_chargement'],
+                        chunksize=CONFIG['copy_chunk_size']
+                    )
+                    nb_ecrites = {table_name: stats[table_name]['lignes'] for table_name in tables}
+                    # COPY validés par worker : version avancée après coup
+                    with engine.begin() as conn:
+                        marquer_versions(conn, tables)
+                else:
+                    nb_ecrites = upsert_batch_silver(tables, engine)
+                mesure.lignes_sortie = sum(nb_ecrites.values())
+            
+            for table_name, nb in nb_ecrites.items():
+                totaux[table_name] += nb
+            print(f"  Chunk {num_chunk} : {len(df_bronze):,} accidents Bronze → "
+                  f"{nb_ecrites['accidents']:,} acc. / {nb_ecrites['vehicules']:,} véh. / "
+                  f"{nb_ecrites['usagers']:,} usa. écrits en {time.time()-start:.1f}s")
+    
+    with engine.begin() as conn:
+        ecrire_watermarks(conn, borne_max, totaux, mode)
+    
+    # Lac réécrit depuis la base : il reflète les upserts
+    if CONFIG['lac_parquet']:
+        with etape('export_lac') as mesure:
+            mesure.lignes_sortie = sum(exporter_lac(engine).values())
+    
+    elapsed_total = time.time() - start_global
+    print(f"\n📊 Lignes écrites ({mode}) :")
+    for table_name in noms_tables:
+        print(f"  - {table_name:<10} : {totaux[table_name]:>10,} lignes")
+    print(f"\n✓ Watermark avancé à {borne_max}")
+    print(f"⚡ Temps total : {elapsed_total:.1f}s ({elapsed_total/60:.1f} min)")
+    print(f"\n🔤 Libellés Bronze sans correspondance :")
+    rapport_non_mappes()
+
+    return totaux
 
 
 # ════════════════════════════════════════════════════════════════
@@ -611,6 +1029,7 @@ def load_silver_tables(dataframes):
 # ════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    CONFIG_TELEMETRIE['fichier_jsonl'] = 'Logs/telemetrie.jsonl'
     with open('Logs/etl_logs.txt', 'w', encoding='utf-8') as log_file:
         original_stdout = sys.stdout
         sys.stdout = log_file
@@ -620,8 +1039,16 @@ if __name__ == "__main__":
             print("ETL COUCHE SILVER - VERSION ULTRA-OPTIMISÉE")
             print("═"*70)
             
-            dataframes_silver = etl_silver()
-            load_silver_tables(dataframes_silver)
+            if CONFIG['mode_incremental']:
+                demarrer('silver_incremental')
+                etl_silver_incremental(CONFIG['forcer_reconstruction'] or '--reconstruction' in sys.argv)
+            elif CONFIG['mode_streaming']:
+                demarrer('silver_streaming')
+                etl_silver_streaming()
+            else:
+                demarrer('silver')
+                dataframes_silver = etl_silver()
+                load_silver_tables(dataframes_silver)
             
             print("\n✅ ETL SILVER TERMINÉ AVEC SUCCÈS!")
             
@@ -630,6 +1057,9 @@ if __name__ == "__main__":
             import traceback
             traceback.print_exc()
         finally:
+            # Étapes mesurées jusqu'à l'arrêt (réussi ou non)
+            resume()
+            ecrire_prometheus()
             sys.stdout = original_stdout
     
     print("✅ ETL terminé - voir etl_logs.txt")
\ No newline at end of file
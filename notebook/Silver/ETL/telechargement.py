@@ -0,0 +1,268 @@
+"""
+═══════════════════════════════════════════════════════════════════
+TÉLÉCHARGEMENT REPRENABLE DE L'EXPORT OPENDATASOFT
+L'export Parquet est écrit sur disque par blocs (jamais entier en
+mémoire) dans un fichier partiel ; après une coupure, le transfert
+reprend où il s'est arrêté (en-tête Range + If-Range sur l'ETag ou le
+Last-Modified : une version modifiée entre-temps est retéléchargée
+depuis le début au lieu d'être recollée). Le fichier complet est
+vérifié (taille annoncée) puis rangé dans un cache adressé par contenu :
+    <dossier>/objets/ab/ab12…ef.parquet   (SHA-256 du contenu)
+    <dossier>/index.json                 (URL → empreinte, ETag, Last-Modified, taille)
+Les appels suivants envoient une requête conditionnelle
+(If-None-Match / If-Modified-Since) : 304 → fichier en cache, sans
+transfert ; serveur injoignable → fichier en cache avec un avertissement.
+Le chemin retourné sert de CONFIG['fichier_source'] à l'ETL Silver
+(lecture Parquet projetée en mémoire).
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import time
+import hashlib
+import requests
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'dossier': os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Sources'),
+    'taille_bloc': 1024 * 1024,     # Octets lus / écrits par itération
+    'timeout': (10, 60),            # (connexion, lecture entre deux blocs) en secondes
+    'nb_tentatives': 5,
+    'attente_initiale': 1.0         # Backoff exponentiel entre tentatives (s)
+}
+
+DATASET_ID = "accidents-corporels-de-la-circulation-millesime"
+URL_EXPORT_PARQUET = f"https://public.opendatasoft.com/api/explore/v2.1/catalog/datasets/{DATASET_ID}/exports/parquet"
+
+# Coupures et lenteurs réseau : le transfert est repris
+ERREURS_RESEAU = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+# ════════════════════════════════════════════════════════════════
+# CACHE ADRESSÉ PAR CONTENU
+# ════════════════════════════════════════════════════════════════
+
+def chemin_index():
+    return os.path.join(CONFIG['dossier'], 'index.json')
+
+
+def lire_index():
+    try:
+        with open(chemin_index(), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def ecrire_index(index):
+    temporaire = chemin_index() + '.tmp'
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(temporaire, chemin_index())
+
+
+def fichier_objet(empreinte):
+    return os.path.join('objets', empreinte[:2], f"{empreinte}.parquet")
+
+
+def chemins_partiel(url):
+    """
+    (fichier partiel, métadonnées de la version en cours de transfert).
+    """
+    base = os.path.join(CONFIG['dossier'], 'partiels', hashlib.sha256(url.encode('utf-8')).hexdigest())
+    return base + '.part', base + '.json'
+
+
+def hacher_fichier(chemin):
+    sha = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(CONFIG['taille_bloc']), b''):
+            sha.update(bloc)
+    return sha.hexdigest()
+
+
+def fichier_en_cache(url):
+    """
+    Chemin de la dernière version téléchargée de l'URL (None si absente
+    ou tronquée).
+    """
+    entree = lire_index().get(url)
+    if entree is None:
+        return None
+    chemin = os.path.join(CONFIG['dossier'], entree['fichier'])
+    if not os.path.exists(chemin) or os.path.getsize(chemin) != entree['taille']:
+        return None
+    return os.path.abspath(chemin)
+
+
+def ranger(url, partiel, version):
+    """
+    Fichier partiel complet → objet du cache ; l'objet de la version
+    précédente est supprimé s'il n'est plus référencé.
+    """
+    empreinte = hacher_fichier(partiel)
+    fichier = fichier_objet(empreinte)
+    chemin = os.path.join(CONFIG['dossier'], fichier)
+    if os.path.exists(chemin):
+        os.remove(partiel)
+    else:
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        os.replace(partiel, chemin)
+
+    index = lire_index()
+    ancienne = index.get(url)
+    index[url] = {
+        'fichier': fichier,
+        'sha256': empreinte,
+        'etag': version.get('etag'),
+        'last_modified': version.get('last_modified'),
+        'taille': os.path.getsize(chemin),
+        'telecharge_le': time.time()
+    }
+    ecrire_index(index)
+    if ancienne and ancienne['fichier'] != fichier and all(e['fichier'] != ancienne['fichier'] for e in index.values()):
+        try:
+            os.remove(os.path.join(CONFIG['dossier'], ancienne['fichier']))
+        except FileNotFoundError:
+            pass
+    return os.path.abspath(chemin)
+
+
+# ════════════════════════════════════════════════════════════════
+# TRANSFERT
+# ════════════════════════════════════════════════════════════════
+
+def version_reponse(response):
+    """
+    Identité de la version servie (reprise conditionnelle) et taille
+    totale (Content-Range d'une réponse 206, sinon Content-Length).
+    """
+    taille = response.headers.get('Content-Length')
+    if response.status_code == 206:
+        taille = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'taille': int(taille) if taille and taille.isdigit() else None
+    }
+
+
+def validateur_reprise(version):
+    """
+    Valeur d'If-Range : ETag fort, sinon Last-Modified (un ETag faible
+    W/"…" n'est pas accepté par If-Range).
+    """
+    etag = version.get('etag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return version.get('last_modified')
+
+
+def lire_version_partielle(meta):
+    try:
+        with open(meta, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def transferer(session, url, entetes, partiel, meta):
+    """
+    Une tentative : reprend le fichier partiel si sa version est connue,
+    sinon repart de zéro. Retourne la version complète téléchargée,
+    'a_jour' sur 304, ou lève une erreur réseau (partiel conservé).
+    """
+    version = lire_version_partielle(meta)
+    deja = os.path.getsize(partiel) if version and os.path.exists(partiel) else 0
+    entetes = dict(entetes)
+    if deja and validateur_reprise(version):
+        entetes['Range'] = f"bytes={deja}-"
+        entetes['If-Range'] = validateur_reprise(version)
+
+    with session.get(url, headers=entetes, stream=True, timeout=CONFIG['timeout']) as response:
+        if response.status_code == 304:
+            return 'a_jour'
+        if response.status_code == 416 and 'Range' in entetes:
+            # Partiel déjà complet (coupure après le dernier octet) ou périmé
+            if deja == version.get('taille'):
+                return version
+            os.remove(partiel)
+            raise requests.ConnectionError(f"Reprise refusée (416) à {deja:,} octets : redémarrage")
+        if response.status_code >= 500:
+            raise requests.ConnectionError(f"Erreur serveur {response.status_code}")
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            mode = 'ab'
+            if deja:
+                print(f"  ↻ Reprise à {deja:,} octets")
+        else:
+            mode, deja = 'wb', 0
+            version = version_reponse(response)
+            os.makedirs(os.path.dirname(meta), exist_ok=True)
+            with open(meta, 'w', encoding='utf-8') as f:
+                json.dump(version, f)
+
+        with open(partiel, mode) as f:
+            for bloc in response.iter_content(CONFIG['taille_bloc']):
+                f.write(bloc)
+
+    taille = os.path.getsize(partiel)
+    if version.get('taille') is not None and taille != version['taille']:
+        raise requests.exceptions.ChunkedEncodingError(
+            f"Transfert incomplet : {taille:,} / {version['taille']:,} octets")
+    return version
+
+
+def telecharger(url=URL_EXPORT_PARQUET, forcer=False, session=None):
+    """
+    Chemin local de la version courante de l'URL : en cache si le
+    serveur répond 304, sinon téléchargée (ou reprise) puis rangée.
+    forcer : ignore le cache (le fichier partiel reste repris).
+    """
+    start = time.time()
+    os.makedirs(CONFIG['dossier'], exist_ok=True)
+    session = session or requests.Session()
+    partiel, meta = chemins_partiel(url)
+
+    en_cache = None if forcer else fichier_en_cache(url)
+    entetes = {}
+    if en_cache:
+        entree = lire_index()[url]
+        if entree.get('etag'):
+            entetes['If-None-Match'] = entree['etag']
+        if entree.get('last_modified'):
+            entetes['If-Modified-Since'] = entree['last_modified']
+
+    for tentative in range(1, CONFIG['nb_tentatives'] + 1):
+        try:
+            version = transferer(session, url, entetes, partiel, meta)
+            break
+        except ERREURS_RESEAU as e:
+            if tentative == CONFIG['nb_tentatives']:
+                if en_cache:
+                    print(f"⚠ Serveur injoignable ({e}) : version en cache conservée")
+                    return en_cache
+                raise
+            attente = CONFIG['attente_initiale'] * 2 ** (tentative - 1)
+            print(f"  ⚠ Tentative {tentative}/{CONFIG['nb_tentatives']} interrompue ({e}), "
+                  f"nouvel essai dans {attente:.0f}s")
+            time.sleep(attente)
+
+    if version == 'a_jour':
+        print(f"✓ Export à jour (304) → {en_cache}")
+        return en_cache
+
+    chemin = ranger(url, partiel, version)
+    if os.path.exists(meta):
+        os.remove(meta)
+    taille = os.path.getsize(chemin)
+    duree = time.time() - start
+    print(f"✓ Export téléchargé : {taille / 1024**2:.1f} MB en {duree:.1f}s "
+          f"({taille / 1024**2 / max(duree, 1e-9):.1f} MB/s) → {chemin}")
+    return chemin
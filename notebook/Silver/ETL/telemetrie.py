@@ -0,0 +1,331 @@
+"""
+═══════════════════════════════════════════════════════════════════
+TÉLÉMÉTRIE DES ÉTAPES ETL
+Mesure de chaque étape (lecture, transformation, explosion,
+chargement...) par un context manager ou un décorateur :
+    with etape('chargement', lignes_entree=n) as mesure:
+        ...
+        mesure.lignes_sortie = nb_inserees
+
+    @instrumenter('transformation_accidents')
+    def transformer_accidents(df_bronze): ...
+Par étape : durée, temps CPU du processus (tous threads), lignes en
+entrée / sortie, débit et pic de RSS au-dessus du RSS de départ
+(échantillonné par un thread). Chaque mesure est ajoutée en JSON lines
+à CONFIG['fichier_jsonl'] si renseigné (l'ETL lancé en script écrit
+Logs/telemetrie.jsonl) ; resume() affiche le tableau agrégé du run
+et ecrire_prometheus() exporte les mêmes agrégats au format textfile
+du node_exporter.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import json
+import time
+import uuid
+import functools
+import itertools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import psutil
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'actif': True,
+    # Historique JSON lines des mesures (None : mesures gardées en mémoire seulement)
+    'fichier_jsonl': None,
+    # Fichier .prom lu par le collecteur textfile du node_exporter (None : pas d'export)
+    'fichier_prometheus': None,
+    'intervalle_memoire': 0.01      # Période d'échantillonnage du RSS (s)
+}
+
+_verrou = threading.Lock()
+_run = {'id': None, 'pipeline': None, 'debut': None}
+_mesures = []
+
+
+# ════════════════════════════════════════════════════════════════
+# MESURES
+# ════════════════════════════════════════════════════════════════
+
+class PicMemoire:
+    """
+    Pic de RSS du processus pendant un bloc with, échantillonné par un
+    thread (les pics d'une étape sont transitoires : un relevé avant /
+    après ne les verrait pas).
+    """
+    def __init__(self, intervalle=None):
+        self.intervalle = intervalle or CONFIG['intervalle_memoire']
+        self.processus = psutil.Process()
+        self.debut = 0
+        self.pic = 0
+        self.arret = threading.Event()
+
+    def echantillonner(self):
+        while not self.arret.wait(self.intervalle):
+            self.pic = max(self.pic, self.processus.memory_info().rss)
+
+    def __enter__(self):
+        self.debut = self.pic = self.processus.memory_info().rss
+        self.arret.clear()
+        self.thread = threading.Thread(target=self.echantillonner, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.arret.set()
+        self.thread.join()
+        self.pic = max(self.pic, self.processus.memory_info().rss)
+        return False
+
+
+class Mesure:
+    """
+    Mesure d'une étape ; lignes_sortie (et attributs) se renseignent
+    dans le bloc with.
+    """
+    def __init__(self, nom, lignes_entree=None, **attributs):
+        self.nom = nom
+        self.lignes_entree = lignes_entree
+        self.lignes_sortie = None
+        self.attributs = attributs
+        self.ignoree = False      # True : rien n'est enregistré (ex. fin d'itération)
+
+    def enregistrement(self, debut, duree, cpu, memoire, erreur):
+        lignes = self.lignes_entree if self.lignes_entree is not None else self.lignes_sortie
+        return {
+            'run': _run['id'],
+            'pipeline': _run['pipeline'],
+            'etape': self.nom,
+            'debut': debut.isoformat(timespec='milliseconds'),
+            'duree_s': round(duree, 4),
+            'cpu_s': round(cpu, 4),
+            'lignes_entree': self.lignes_entree,
+            'lignes_sortie': self.lignes_sortie,
+            'lignes_par_seconde': round(lignes / max(duree, 1e-9), 1) if lignes is not None else None,
+            'rss_debut_mo': round(memoire.debut / 1024**2, 1),
+            'rss_pic_mo': round(memoire.pic / 1024**2, 1),
+            'rss_delta_pic_mo': round((memoire.pic - memoire.debut) / 1024**2, 1),
+            'erreur': erreur,
+            **self.attributs
+        }
+
+
+def demarrer(pipeline):
+    """
+    Nouveau run : identifiant commun à ses mesures, agrégats remis à zéro.
+    """
+    with _verrou:
+        _run.update(id=uuid.uuid4().hex[:12], pipeline=pipeline, debut=time.time())
+        _mesures.clear()
+    return _run['id']
+
+
+def run_courant():
+    return dict(_run)
+
+
+def rejoindre(run):
+    """
+    Processus worker : ses mesures portent l'identifiant du run parent.
+    """
+    with _verrou:
+        _run.update(run)
+        _mesures.clear()
+
+
+def collecter():
+    """
+    Mesures accumulées depuis le dernier appel (renvoyées au parent par
+    un worker), retirées des agrégats locaux.
+    """
+    with _verrou:
+        mesures = list(_mesures)
+        _mesures.clear()
+    return mesures
+
+
+def integrer(mesures):
+    """
+    Ajoute aux agrégats du run des mesures déjà écrites par un worker.
+    """
+    with _verrou:
+        _mesures.extend(mesures)
+
+
+def enregistrer(mesure):
+    with _verrou:
+        _mesures.append(mesure)
+        chemin = CONFIG['fichier_jsonl']
+        if chemin:
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+            with open(chemin, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(mesure, ensure_ascii=False, default=str) + '\n')
+
+
+@contextmanager
+def etape(nom, lignes_entree=None, **attributs):
+    """
+    Mesure le bloc with ; une étape en erreur est enregistrée (champ
+    'erreur') puis l'exception est relancée.
+    """
+    mesure = Mesure(nom, lignes_entree, **attributs)
+    if not CONFIG['actif']:
+        yield mesure
+        return
+    if _run['id'] is None:
+        demarrer('etl')
+
+    debut = datetime.now()
+    erreur = None
+    memoire = PicMemoire()
+    try:
+        with memoire:
+            start, start_cpu = time.perf_counter(), time.process_time()
+            try:
+                yield mesure
+            except BaseException as e:
+                erreur = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                duree, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+    finally:
+        if not mesure.ignoree:
+            enregistrer(mesure.enregistrement(debut, duree, cpu, memoire, erreur))
+
+
+def iterer(nom, iterable, **attributs):
+    """
+    Itère en mesurant chaque élément produit (lecture par batchs /
+    chunks) : une étape par next(), lignes en sortie = len de l'élément.
+    """
+    iterateur = iter(iterable)
+    for numero in itertools.count(1):
+        with etape(nom, numero=numero, **attributs) as mesure:
+            element = next(iterateur, None)
+            if element is None:
+                mesure.ignoree = True
+            else:
+                mesure.lignes_sortie = len(element)
+        if element is None:
+            return
+        yield element
+
+
+def instrumenter(nom=None, lignes_entree=None, lignes_sortie=None):
+    """
+    Décorateur : chaque appel est une étape. Par défaut, lignes en
+    entrée = len du premier argument, en sortie = len du résultat ;
+    sinon fonctions (args, kwargs) → n et résultat → n.
+    """
+    def decorateur(fonction):
+        nom_etape = nom or fonction.__name__
+
+        @functools.wraps(fonction)
+        def mesuree(*args, **kwargs):
+            if lignes_entree is not None:
+                entree = lignes_entree(args, kwargs)
+            else:
+                entree = len(args[0]) if args and hasattr(args[0], '__len__') else None
+            with etape(nom_etape, entree) as mesure:
+                resultat = fonction(*args, **kwargs)
+                if lignes_sortie is not None:
+                    mesure.lignes_sortie = lignes_sortie(resultat)
+                elif hasattr(resultat, '__len__'):
+                    mesure.lignes_sortie = len(resultat)
+            return resultat
+        return mesuree
+    return decorateur
+
+
+# ════════════════════════════════════════════════════════════════
+# AGRÉGATS DU RUN
+# ════════════════════════════════════════════════════════════════
+
+def agreger():
+    """
+    Mesures du run regroupées par étape (ordre de première apparition) :
+    durées, CPU et lignes sommés sur les appels, pic de RSS maximal.
+    """
+    agregats = {}
+    with _verrou:
+        mesures = list(_mesures)
+    for m in mesures:
+        a = agregats.setdefault(m['etape'], {
+            'appels': 0, 'duree_s': 0.0, 'cpu_s': 0.0, 'lignes_entree': 0, 'lignes_sortie': 0,
+            'rss_delta_pic_mo': 0.0, 'rss_pic_mo': 0.0, 'erreurs': 0
+        })
+        a['appels'] += 1
+        a['duree_s'] += m['duree_s']
+        a['cpu_s'] += m['cpu_s']
+        a['lignes_entree'] += m['lignes_entree'] or 0
+        a['lignes_sortie'] += m['lignes_sortie'] or 0
+        a['rss_delta_pic_mo'] = max(a['rss_delta_pic_mo'], m['rss_delta_pic_mo'])
+        a['rss_pic_mo'] = max(a['rss_pic_mo'], m['rss_pic_mo'])
+        a['erreurs'] += m['erreur'] is not None
+    for a in agregats.values():
+        lignes = a['lignes_entree'] or a['lignes_sortie']
+        a['lignes_par_seconde'] = lignes / max(a['duree_s'], 1e-9)
+    return agregats
+
+
+def resume():
+    """
+    Tableau récapitulatif du run (les étapes imbriquées, ex. explosion
+    dans transformation, comptent dans les deux lignes).
+    """
+    agregats = agreger()
+    if not agregats:
+        return agregats
+    print(f"\n⏱ Télémétrie du run {_run['id']} ({_run['pipeline']}) :")
+    print(f"  {'étape':<28} {'appels':>6} {'durée s':>9} {'CPU s':>8} {'entrée':>12} {'sortie':>12} "
+          f"{'lignes/s':>12} {'Δ RSS MB':>9}")
+    for nom, a in agregats.items():
+        print(f"  {nom:<28} {a['appels']:>6} {a['duree_s']:>9.2f} {a['cpu_s']:>8.2f} {a['lignes_entree']:>12,} "
+              f"{a['lignes_sortie']:>12,} {a['lignes_par_seconde']:>12,.0f} {a['rss_delta_pic_mo']:>9.0f}"
+              f"{'  ❌' if a['erreurs'] else ''}")
+    if CONFIG['fichier_jsonl']:
+        print(f"  → {CONFIG['fichier_jsonl']}")
+    return agregats
+
+
+def ecrire_prometheus(chemin=None):
+    """
+    Agrégats du run au format texte Prometheus (jauges étiquetées
+    pipeline / etape), écrits puis renommés : le collecteur ne lit
+    jamais un fichier partiel.
+    """
+    chemin = chemin or CONFIG['fichier_prometheus']
+    if not chemin:
+        return None
+    agregats = agreger()
+    metriques = [
+        ('etl_etape_duree_secondes', 'duree_s', "Durée cumulée de l'étape"),
+        ('etl_etape_cpu_secondes', 'cpu_s', "Temps CPU cumulé du processus pendant l'étape"),
+        ('etl_etape_lignes_entree', 'lignes_entree', "Lignes reçues par l'étape"),
+        ('etl_etape_lignes_sortie', 'lignes_sortie', "Lignes produites par l'étape"),
+        ('etl_etape_lignes_par_seconde', 'lignes_par_seconde', "Débit de l'étape"),
+        ('etl_etape_rss_delta_pic_octets', 'rss_delta_pic_mo', "Pic de RSS au-dessus du RSS de départ"),
+        ('etl_etape_appels', 'appels', "Nombre d'appels de l'étape")
+    ]
+    lignes = []
+    for metrique, champ, aide in metriques:
+        lignes += [f"# HELP {metrique} {aide}", f"# TYPE {metrique} gauge"]
+        for nom, a in agregats.items():
+            valeur = a[champ] * 1024**2 if champ == 'rss_delta_pic_mo' else a[champ]
+            lignes.append(f'{metrique}{{pipeline="{_run["pipeline"]}",etape="{nom}"}} {valeur:.6g}')
+    lignes += ["# HELP etl_derniere_execution_timestamp_secondes Fin du dernier run",
+               "# TYPE etl_derniere_execution_timestamp_secondes gauge",
+               f'etl_derniere_execution_timestamp_secondes{{pipeline="{_run["pipeline"]}"}} {time.time():.0f}']
+
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    with open(chemin + '.tmp', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lignes) + '\n')
+    os.replace(chemin + '.tmp', chemin)
+    return chemin
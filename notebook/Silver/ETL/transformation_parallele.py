@@ -0,0 +1,187 @@
+"""
+═══════════════════════════════════════════════════════════════════
+TRANSFORMATION PARALLÈLE MULTI-PROCESSUS
+Les quatre tables Silver ne dépendent que du Bronze : elles sont
+transformées dans un pool de processus. Le Bronze (table Arrow) est
+écrit une fois dans un fichier IPC Arrow non compressé que chaque
+worker projette en mémoire (pa.memory_map) : les buffers sont partagés
+par le cache de pages, rien n'est sérialisé vers les workers.
+Les usagers (explosion la plus longue) sont découpés en tranches de
+lignes Bronze ; les positions d'explosion continuent d'une tranche à
+l'autre comme entre les batchs du streaming (RegistreCles). Seuls les
+DataFrames Silver reviennent au parent (pickle), avec les libellés non
+mappés et les mesures de télémétrie des workers.
+═══════════════════════════════════════════════════════════════════
+"""
+
+import os
+import time
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import telemetrie
+from mappings_silver import MAPPINGS
+from types_silver import compacter_dataframe, table_arrow_vers_pandas
+
+
+# ════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ════════════════════════════════════════════════════════════════
+
+CONFIG = {
+    'nb_processus': None,         # None : un par cœur (1 → transformation séquentielle)
+    'nb_tranches_usagers': None,  # None : une tranche par processus
+    'dossier_ipc': None           # None : dossier temporaire du système
+}
+
+TABLES_SILVER = ['accidents', 'lieux', 'vehicules', 'usagers']
+
+# Cache propre à chaque worker : chemin IPC → table projetée
+_tables_projetees = {}
+
+
+def nb_processus():
+    return CONFIG['nb_processus'] or os.cpu_count() or 1
+
+
+# ════════════════════════════════════════════════════════════════
+# BRONZE PARTAGÉ (IPC ARROW PROJETÉ EN MÉMOIRE)
+# ════════════════════════════════════════════════════════════════
+
+def ecrire_ipc(table, dossier):
+    chemin = os.path.join(dossier, 'bronze.arrow')
+    with pa.OSFile(chemin, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return chemin
+
+
+def table_projetee(chemin):
+    """
+    Table Arrow lue sans copie depuis le fichier projeté (une fois par worker).
+    """
+    if chemin not in _tables_projetees:
+        _tables_projetees[chemin] = pa.ipc.open_file(pa.memory_map(chemin, 'r')).read_all()
+    return _tables_projetees[chemin]
+
+
+# ════════════════════════════════════════════════════════════════
+# TRANCHES USAGERS
+# ════════════════════════════════════════════════════════════════
+
+def tranches(nb_lignes, nb_tranches):
+    bornes = np.linspace(0, nb_lignes, max(1, min(nb_tranches, nb_lignes)) + 1).astype(int)
+    return [(int(debut), int(fin)) for debut, fin in zip(bornes[:-1], bornes[1:]) if fin > debut]
+
+
+def decalages_tranches(table_bronze, bornes):
+    """
+    Position de départ de l'explosion pour chaque ligne de chaque tranche :
+    valeurs déjà explosées pour le même num_acc dans les tranches
+    précédentes (même parcours que les batchs de etl_silver_streaming).
+    """
+    from silver_ETL_parquet_vectorise import COLS_USAGERS_MULTI, RegistreCles, compter_valeurs_multivalue
+
+    df = table_arrow_vers_pandas(table_bronze.select(['num_acc', COLS_USAGERS_MULTI[0]]))
+    registre = RegistreCles(['num_acc'])
+    decalages = []
+    for debut, fin in bornes:
+        tranche = df.iloc[debut:fin]
+        decalages.append(registre.decalages(tranche))
+        registre.ajouter(registre.hacher(tranche), compter_valeurs_multivalue(tranche[COLS_USAGERS_MULTI[0]]))
+    return decalages
+
+
+# ════════════════════════════════════════════════════════════════
+# WORKER
+# ════════════════════════════════════════════════════════════════
+
+def initialiser_worker(run):
+    telemetrie.rejoindre(run)
+
+
+def executer_tache(chemin, table_name, debut, fin, decalage_positions=None):
+    """
+    Transforme les lignes Bronze [debut, fin) en table Silver.
+    Retourne (table, debut, df, stats, non mappés, mesures, durée).
+    """
+    # Import différé : silver_ETL_parquet_vectorise importe ce module
+    from silver_ETL_parquet_vectorise import (
+        COLONNES_BRONZE, transformer_accidents, transformer_lieux, transformer_vehicules, transformer_usagers
+    )
+
+    start = time.time()
+    for mapping in MAPPINGS.values():
+        mapping.non_mappes.clear()
+    telemetrie.collecter()
+
+    # Seules les colonnes de la tâche passent en pandas : le Bronze n'est
+    # pas recopié en entier dans chaque worker
+    df_bronze = table_arrow_vers_pandas(
+        table_projetee(chemin).slice(debut, fin - debut).select(COLONNES_BRONZE[table_name])
+    )
+    df_bronze.index = pd.RangeIndex(debut, fin)
+
+    stats = {}
+    if table_name == 'accidents':
+        df = transformer_accidents(df_bronze, stats)
+    elif table_name == 'lieux':
+        df = transformer_lieux(df_bronze)
+    elif table_name == 'vehicules':
+        df = transformer_vehicules(df_bronze, verbose=False)
+    else:
+        df = transformer_usagers(df_bronze, verbose=False, decalage_positions=decalage_positions)
+
+    non_mappes = {colonne: Counter(m.non_mappes) for colonne, m in MAPPINGS.items() if m.non_mappes}
+    return table_name, debut, df, stats, non_mappes, telemetrie.collecter(), time.time() - start
+
+
+# ════════════════════════════════════════════════════════════════
+# ORDONNANCEMENT
+# ════════════════════════════════════════════════════════════════
+
+def transformer_tables_parallele(table_bronze, processus=None, nb_tranches_usagers=None):
+    """
+    Table Arrow Bronze → ({table: DataFrame Silver}, stats accidents,
+    {table: (tâches, durée cumulée)}). Mêmes DataFrames que les
+    transformations séquentielles.
+    """
+    processus = processus or nb_processus()
+    bornes = tranches(table_bronze.num_rows, nb_tranches_usagers or CONFIG['nb_tranches_usagers'] or processus)
+    decalages = decalages_tranches(table_bronze, bornes)
+
+    # Tâches les plus longues d'abord : véhicules, tranches usagers, accidents, lieux
+    taches = [('vehicules', 0, table_bronze.num_rows, None)]
+    taches += [('usagers', debut, fin, decalage) for (debut, fin), decalage in zip(bornes, decalages)]
+    taches += [('accidents', 0, table_bronze.num_rows, None), ('lieux', 0, table_bronze.num_rows, None)]
+
+    resultats = {table_name: [] for table_name in TABLES_SILVER}
+    stats_accidents = {}
+    durees = {table_name: [0, 0.0] for table_name in TABLES_SILVER}
+
+    with tempfile.TemporaryDirectory(dir=CONFIG['dossier_ipc']) as dossier:
+        chemin = ecrire_ipc(table_bronze, dossier)
+        with ProcessPoolExecutor(max_workers=processus, initializer=initialiser_worker,
+                                 initargs=(telemetrie.run_courant(),)) as pool:
+            futures = [pool.submit(executer_tache, chemin, *tache) for tache in taches]
+            for future in as_completed(futures):
+                table_name, debut, df, stats, non_mappes, mesures, duree = future.result()
+                resultats[table_name].append((debut, df))
+                stats_accidents.update(stats)
+                for colonne, compteur in non_mappes.items():
+                    MAPPINGS[colonne].non_mappes.update(compteur)
+                telemetrie.integrer(mesures)
+                durees[table_name][0] += 1
+                durees[table_name][1] += duree
+
+    dataframes = {}
+    for table_name in TABLES_SILVER:
+        morceaux = [df for _, df in sorted(resultats[table_name], key=lambda r: r[0])]
+        # Catégories propres à chaque tranche : réunies puis recompactées
+        dataframes[table_name] = (morceaux[0] if len(morceaux) == 1
+                                  else compacter_dataframe(pd.concat(morceaux), table_name))
+    return dataframes, stats_accidents, {t: tuple(d) for t, d in durees.items()}
@@ -0,0 +1,159 @@
+"""
+═══════════════════════════════════════════════════════════════════
+TYPES COMPACTS DES DATAFRAMES SILVER
+Plan de dtypes par table (codes en Int8/Int16, chaînes répétées en
+category, identifiants en string[pyarrow], booléens en bool) et
+rapport mémoire par table
+═══════════════════════════════════════════════════════════════════
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+# ════════════════════════════════════════════════════════════════
+# PLAN DE TYPES
+# ════════════════════════════════════════════════════════════════
+
+# Entiers nullables : 1 (Int8) ou 2 (Int16) octets + 1 octet de masque,
+# contre 9 pour Int64 et ~28 pour un int Python dans une colonne object
+PLAN_TYPES = {
+    'accidents': {
+        'num_acc': 'string[pyarrow]',
+        'heure': 'Int8',
+        'minute': 'Int8',
+        'annee': 'Int16',
+        'mois': 'Int8',
+        'jour': 'Int8',
+        'jour_semaine': 'Int8',
+        'com_code': 'category',
+        'departement_code': 'category',
+        'en_agglomeration': 'boolean',
+        'latitude': 'float64',
+        'longitude': 'float64',
+        'adresse': 'string[pyarrow]',
+        'luminosite': 'Int8',
+        'conditions_atmospheriques': 'Int8',
+        'type_intersection': 'Int8',
+        'type_collision': 'Int8'
+    },
+    'lieux': {
+        'num_acc': 'string[pyarrow]',
+        'categorie_route': 'Int8',
+        'numero_route': 'category',
+        'regime_circulation': 'Int8',
+        'nombre_voies': 'Int8',
+        'voie_reservee': 'Int8',
+        'profil_route': 'Int8',
+        'trace_plan': 'Int8',
+        'largeur_terre_plein': 'float64',
+        'largeur_chaussee': 'float64',
+        'etat_surface': 'Int8',
+        'infrastructure': 'Int8',
+        'situation': 'Int8',
+        'proximite_ecole': 'bool'
+    },
+    'vehicules': {
+        'num_acc': 'string[pyarrow]',
+        'num_veh': 'category',
+        'sens_circulation': 'Int8',
+        'categorie_vehicule': 'Int8',
+        'obstacle_fixe': 'Int8',
+        'obstacle_mobile': 'Int8',
+        'point_choc': 'Int8',
+        'manoeuvre': 'Int8',
+        'nb_occupants': 'Int16'
+    },
+    'usagers': {
+        'num_acc': 'string[pyarrow]',
+        'num_veh': 'category',
+        'place_vehicule': 'Int8',
+        'categorie_usager': 'Int8',
+        'gravite': 'Int8',
+        'sexe': 'Int8',
+        'annee_naissance': 'Int16',
+        'age_au_moment_accident': 'Int16',
+        'motif_deplacement': 'Int8',
+        'equipement_securite': 'Int8',
+        'localisation_pieton': 'Int8',
+        'action_pieton': 'Int8',
+        'etat_pieton': 'Int8'
+    }
+}
+
+TYPES_ENTIERS_COMPACTS = ('Int8', 'Int16', 'Int32')
+
+
+# ════════════════════════════════════════════════════════════════
+# CONVERSION
+# ════════════════════════════════════════════════════════════════
+
+def convertir_colonne(serie, dtype):
+    """
+    Conversion tolérante : un entier hors plage du type compact (ex: code
+    inattendu > 127) reste en Int64 au lieu de déborder.
+    """
+    if dtype in TYPES_ENTIERS_COMPACTS:
+        valeurs = pd.to_numeric(serie, errors='coerce')
+        bornes = np.iinfo(dtype.lower())
+        if valeurs.notna().any() and (valeurs.min() < bornes.min or valeurs.max() > bornes.max):
+            return valeurs.astype('Int64')
+        return valeurs.astype(dtype)
+
+    if dtype == 'string[pyarrow]':
+        # Même représentation texte que l'existant (None conservé)
+        return serie.astype(object).where(serie.notna(), None).astype(dtype)
+
+    return serie.astype(dtype)
+
+
+def compacter_dataframe(df, table_name):
+    """
+    Applique PLAN_TYPES[table_name] aux colonnes présentes.
+    """
+    plan = PLAN_TYPES.get(table_name, {})
+    for col, dtype in plan.items():
+        if col in df.columns and str(df[col].dtype) != dtype:
+            df[col] = convertir_colonne(df[col], dtype)
+    return df
+
+
+def table_arrow_vers_pandas(table):
+    """
+    Table Arrow (Parquet Bronze) → DataFrame à colonnes Arrow
+    (équivalent de dtype_backend='pyarrow'). Les colonnes de type null
+    (entièrement vides dans un batch) sont typées texte pour rester
+    compatibles avec les traitements chaîne.
+    """
+    for i, champ in enumerate(table.schema):
+        if pa.types.is_null(champ.type):
+            table = table.set_column(i, champ.name, table.column(i).cast(pa.string()))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+# ════════════════════════════════════════════════════════════════
+# RAPPORT MÉMOIRE
+# ════════════════════════════════════════════════════════════════
+
+def rapport_memoire(dataframes, memoire_bronze=None):
+    """
+    Empreinte mémoire par table : lignes, MB, octets/ligne et colonne la
+    plus coûteuse. memoire_bronze (octets) : ratio global Bronze → Silver.
+    """
+    print(f"\n💾 Mémoire par table :")
+    print(f"  {'table':<10} {'lignes':>10} {'MB':>9} {'o/ligne':>8}  colonne la plus lourde")
+
+    total = 0
+    for table_name, df in dataframes.items():
+        par_colonne = df.memory_usage(deep=True, index=False)
+        memoire = par_colonne.sum()
+        total += memoire
+        colonne_max = par_colonne.idxmax() if len(par_colonne) else '-'
+        print(f"  {table_name:<10} {len(df):>10,} {memoire / 1024**2:>9.1f} "
+              f"{memoire / max(len(df), 1):>8.1f}  {colonne_max} ({par_colonne.max() / 1024**2:.1f} MB)")
+
+    print(f"  {'TOTAL':<10} {'':>10} {total / 1024**2:>9.1f}")
+    if memoire_bronze:
+        print(f"  Bronze {memoire_bronze / 1024**2:.1f} MB → Silver {total / 1024**2:.1f} MB")
+    return total
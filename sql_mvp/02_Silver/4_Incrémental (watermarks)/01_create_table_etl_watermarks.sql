@@ -0,0 +1,31 @@
+-- ========================================
+-- COUCHE SILVER : Table etl_watermarks
+-- Grain: 1 ligne = 1 table Silver alimentée en incrémental
+-- Description: Dernier load_timestamp Bronze intégré (high-water mark)
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS etl_watermarks (
+    -- ================================
+    -- IDENTIFIANT
+    -- ================================
+    table_name VARCHAR(50) PRIMARY KEY,
+
+    -- ================================
+    -- HIGH-WATER MARK
+    -- ================================
+    derniere_valeur TIMESTAMP,                  -- MAX(raw_accidents.load_timestamp) intégré
+    nb_lignes_derniere_execution BIGINT,        -- Lignes Silver écrites lors du dernier run
+    mode_derniere_execution VARCHAR(20)         -- 'incremental' ou 'reconstruction'
+        CHECK (mode_derniere_execution IN ('incremental', 'reconstruction')),
+
+    -- ================================
+    -- MÉTADONNÉES
+    -- ================================
+    mis_a_jour_le TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE etl_watermarks IS 
+'High-water marks de l''ETL Silver incrémental (lecture Bronze WHERE load_timestamp > derniere_valeur)';
+
+-- Forcer une reconstruction complète au prochain run :
+-- DELETE FROM etl_watermarks;
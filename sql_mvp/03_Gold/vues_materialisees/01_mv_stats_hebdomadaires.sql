@@ -2,6 +2,7 @@
 -- VUE MATÉRIALISÉE : Statistiques hebdomadaires
 -- Objectif: Détecter les semaines anormales (écarts à la moyenne)
 -- Refresh: Après chaque chargement ETL
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
 -- ========================================
 
 DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_stats_hebdomadaires CASCADE;
@@ -19,9 +20,9 @@ SELECT
     -- ================================
     -- COMPTAGES ACCIDENTS
     -- ================================
-    COUNT(DISTINCT f.accident_id) as nb_accidents,
-    COUNT(DISTINCT CASE WHEN f.est_accident_mortel THEN f.accident_id END) as nb_accidents_mortels,
-    COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END) as nb_accidents_graves,
+    COUNT(*) as nb_accidents,
+    COUNT(*) FILTER (WHERE f.est_accident_mortel) as nb_accidents_mortels,
+    COUNT(*) FILTER (WHERE f.est_accident_grave) as nb_accidents_graves,
     
     -- ================================
     -- COMPTAGES VICTIMES
@@ -43,14 +44,14 @@ SELECT
     -- ================================
     -- RÉPARTITION TEMPORELLE
     -- ================================
-    COUNT(DISTINCT CASE WHEN f.est_weekend THEN f.accident_id END) as nb_accidents_weekend,
-    COUNT(DISTINCT CASE WHEN f.est_nuit THEN f.accident_id END) as nb_accidents_nuit,
+    COUNT(*) FILTER (WHERE f.est_weekend) as nb_accidents_weekend,
+    COUNT(*) FILTER (WHERE f.est_nuit) as nb_accidents_nuit,
     
     -- ================================
     -- RÉPARTITION GÉOGRAPHIQUE
     -- ================================
-    COUNT(DISTINCT CASE WHEN f.en_agglomeration THEN f.accident_id END) as nb_accidents_agglomeration,
-    COUNT(DISTINCT CASE WHEN NOT f.en_agglomeration THEN f.accident_id END) as nb_accidents_hors_agglomeration,
+    COUNT(*) FILTER (WHERE f.en_agglomeration) as nb_accidents_agglomeration,
+    COUNT(*) FILTER (WHERE NOT f.en_agglomeration) as nb_accidents_hors_agglomeration,
     
     -- ================================
     -- MOYENNES PAR ACCIDENT
@@ -61,16 +62,16 @@ SELECT
     -- ================================
     -- RATIO GRAVITÉ
     -- ================================
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(DISTINCT f.accident_id)) * 100 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(*)) * 100
+        ELSE 0
     END as taux_mortalite_par_accident,
     
-    CASE 
-        WHEN SUM(f.nb_victimes_total) > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100 
-        ELSE 0 
+    CASE
+        WHEN SUM(f.nb_victimes_total) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100
+        ELSE 0
     END as taux_mortalite_par_victime
 
 FROM accidents_gold.fait_accidents f
@@ -120,9 +121,9 @@ ANALYZE accidents_gold.mv_stats_hebdomadaires;
 -- VALIDATION
 -- ================================
 
-SELECT 
+SELECT
     'Vue matérialisée créée' as statut,
     COUNT(*) as nb_semaines,
     MIN(annee) as annee_min,
     MAX(annee) as annee_max
-FROM accidents_gold.mv_stats_hebdomadaires;
\ No newline at end of file
+FROM accidents_gold.mv_stats_hebdomadaires;
@@ -2,6 +2,7 @@
 -- VUE MATÉRIALISÉE : Zones à risque
 -- Objectif: Identifier zones géographiques dangereuses
 -- Refresh: Hebdomadaire ou après chargement données
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
 -- ========================================
 
 DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_zones_a_risque CASCADE;
@@ -26,9 +27,9 @@ SELECT
     -- ================================
     -- COMPTAGES ACCIDENTS
     -- ================================
-    COUNT(DISTINCT f.accident_id) as nb_accidents_total,
-    COUNT(DISTINCT CASE WHEN f.est_accident_mortel THEN f.accident_id END) as nb_accidents_mortels,
-    COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END) as nb_accidents_graves,
+    COUNT(*) as nb_accidents_total,
+    COUNT(*) FILTER (WHERE f.est_accident_mortel) as nb_accidents_mortels,
+    COUNT(*) FILTER (WHERE f.est_accident_grave) as nb_accidents_graves,
     
     -- ================================
     -- COMPTAGES VICTIMES
@@ -47,50 +48,50 @@ SELECT
     -- ================================
     -- RÉPARTITION TEMPORELLE
     -- ================================
-    COUNT(DISTINCT CASE WHEN f.est_weekend THEN f.accident_id END) as nb_accidents_weekend,
-    COUNT(DISTINCT CASE WHEN f.est_nuit THEN f.accident_id END) as nb_accidents_nuit,
+    COUNT(*) FILTER (WHERE f.est_weekend) as nb_accidents_weekend,
+    COUNT(*) FILTER (WHERE f.est_nuit) as nb_accidents_nuit,
     
     -- ================================
     -- RÉPARTITION SPATIALE
     -- ================================
-    COUNT(DISTINCT CASE WHEN f.en_agglomeration THEN f.accident_id END) as nb_accidents_agglomeration,
-    COUNT(DISTINCT CASE WHEN NOT f.en_agglomeration THEN f.accident_id END) as nb_accidents_hors_agglomeration,
+    COUNT(*) FILTER (WHERE f.en_agglomeration) as nb_accidents_agglomeration,
+    COUNT(*) FILTER (WHERE NOT f.en_agglomeration) as nb_accidents_hors_agglomeration,
     
     -- ================================
     -- NORMALISATION PAR POPULATION
     -- (Indicateurs clés pour comparaison)
     -- ================================
-    CASE 
-        WHEN g.population > 0 
-        THEN (COUNT(DISTINCT f.accident_id)::DECIMAL / g.population) * 10000 
-        ELSE NULL 
+    CASE
+        WHEN g.population > 0
+        THEN (COUNT(*)::DECIMAL / g.population) * 10000
+        ELSE NULL
     END as taux_accidents_pour_10k_hab,
     
-    CASE 
-        WHEN g.population > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / g.population) * 100000 
-        ELSE NULL 
+    CASE
+        WHEN g.population > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / g.population) * 100000
+        ELSE NULL
     END as taux_tues_pour_100k_hab,
     
-    CASE 
-        WHEN g.population > 0 
-        THEN (SUM(f.nb_victimes_total)::DECIMAL / g.population) * 10000 
-        ELSE NULL 
+    CASE
+        WHEN g.population > 0
+        THEN (SUM(f.nb_victimes_total)::DECIMAL / g.population) * 10000
+        ELSE NULL
     END as taux_victimes_pour_10k_hab,
     
     -- ================================
     -- RATIO GRAVITÉ
     -- ================================
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END)::DECIMAL / COUNT(DISTINCT f.accident_id)) * 100 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (COUNT(*) FILTER (WHERE f.est_accident_grave)::DECIMAL / COUNT(*)) * 100
+        ELSE 0
     END as pct_accidents_graves,
     
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(DISTINCT f.accident_id)) 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(*))
+        ELSE 0
     END as nb_tues_moyen_par_accident,
     
     -- ================================
@@ -108,7 +109,7 @@ GROUP BY
     g.departement_code, g.departement_name,
     g.region_code, g.region_name,
     g.type_zone, g.population, g.densite_population
-HAVING COUNT(DISTINCT f.accident_id) >= 3;  -- Seuil minimum pour significativité statistique
+HAVING COUNT(*) >= 3;  -- Seuil minimum pour significativité statistique
 
 -- ================================
 -- INDEX POUR PERFORMANCES
@@ -167,11 +168,11 @@ ANALYZE accidents_gold.mv_zones_a_risque;
 -- VALIDATION
 -- ================================
 
-SELECT 
+SELECT
     'Vue matérialisée créée' as statut,
     COUNT(*) as nb_communes,
     COUNT(DISTINCT departement_code) as nb_departements,
     COUNT(DISTINCT region_code) as nb_regions,
     SUM(nb_accidents_total) as total_accidents,
     SUM(nb_tues_total) as total_tues
-FROM accidents_gold.mv_zones_a_risque;
\ No newline at end of file
+FROM accidents_gold.mv_zones_a_risque;
@@ -2,6 +2,7 @@
 -- VUE MATÉRIALISÉE : Profil de risque par conditions
 -- Objectif: Identifier combinaisons météo + route à risque
 -- Refresh: Hebdomadaire ou après chargement données
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
 -- ========================================
 
 DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_profil_risque_conditions CASCADE;
@@ -37,9 +38,9 @@ SELECT
     -- ================================
     -- COMPTAGES ACCIDENTS
     -- ================================
-    COUNT(DISTINCT f.accident_id) as nb_accidents,
-    COUNT(DISTINCT CASE WHEN f.est_accident_mortel THEN f.accident_id END) as nb_accidents_mortels,
-    COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END) as nb_accidents_graves,
+    COUNT(*) as nb_accidents,
+    COUNT(*) FILTER (WHERE f.est_accident_mortel) as nb_accidents_mortels,
+    COUNT(*) FILTER (WHERE f.est_accident_grave) as nb_accidents_graves,
     
     -- ================================
     -- COMPTAGES VICTIMES
@@ -59,38 +60,38 @@ SELECT
     -- ================================
     -- RATIOS DE GRAVITÉ
     -- ================================
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END)::DECIMAL / COUNT(DISTINCT f.accident_id)) * 100 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (COUNT(*) FILTER (WHERE f.est_accident_grave)::DECIMAL / COUNT(*)) * 100
+        ELSE 0
     END as pct_accidents_graves,
     
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (COUNT(DISTINCT CASE WHEN f.est_accident_mortel THEN f.accident_id END)::DECIMAL / COUNT(DISTINCT f.accident_id)) * 100 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (COUNT(*) FILTER (WHERE f.est_accident_mortel)::DECIMAL / COUNT(*)) * 100
+        ELSE 0
     END as pct_accidents_mortels,
     
-    CASE 
-        WHEN SUM(f.nb_victimes_total) > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100 
-        ELSE 0 
+    CASE
+        WHEN SUM(f.nb_victimes_total) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / SUM(f.nb_victimes_total)) * 100
+        ELSE 0
     END as taux_mortalite_par_victime,
     
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) > 0 
-        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(DISTINCT f.accident_id)) 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (SUM(f.nb_tues_total)::DECIMAL / COUNT(*))
+        ELSE 0
     END as nb_tues_moyen_par_accident,
     
     -- ================================
     -- SCORE DE RISQUE COMPOSITE
     -- ================================
-    CASE 
-        WHEN COUNT(DISTINCT f.accident_id) >= 10 THEN
+    CASE
+        WHEN COUNT(*) >= 10 THEN
             -- Pondération: 50% gravité moyenne + 30% % accidents graves + 20% taux mortalité
             (AVG(f.score_gravite_total) / 100.0) * 0.5 +
-            (COUNT(DISTINCT CASE WHEN f.est_accident_grave THEN f.accident_id END)::DECIMAL / COUNT(DISTINCT f.accident_id)) * 0.3 +
+            (COUNT(*) FILTER (WHERE f.est_accident_grave)::DECIMAL / COUNT(*)) * 0.3 +
             (SUM(f.nb_tues_total)::DECIMAL / NULLIF(SUM(f.nb_victimes_total), 0)) * 0.2
         ELSE NULL
     END as score_risque_composite,
@@ -98,8 +99,8 @@ SELECT
     -- ================================
     -- RÉPARTITION TEMPORELLE
     -- ================================
-    COUNT(DISTINCT CASE WHEN f.est_weekend THEN f.accident_id END) as nb_accidents_weekend,
-    COUNT(DISTINCT CASE WHEN f.en_agglomeration THEN f.accident_id END) as nb_accidents_agglomeration
+    COUNT(*) FILTER (WHERE f.est_weekend) as nb_accidents_weekend,
+    COUNT(*) FILTER (WHERE f.en_agglomeration) as nb_accidents_agglomeration
 
 FROM accidents_gold.fait_accidents f
 JOIN accidents_gold.dim_conditions c ON f.condition_id = c.condition_id
@@ -112,7 +113,7 @@ GROUP BY
     r.trace_plan_code, r.trace_plan_libelle,
     r.etat_surface_code, r.etat_surface_libelle,
     r.niveau_risque_route
-HAVING COUNT(DISTINCT f.accident_id) >= 10;  -- Seuil minimum pour significativité
+HAVING COUNT(*) >= 10;  -- Seuil minimum pour significativité
 
 -- ================================
 -- INDEX POUR PERFORMANCES
@@ -165,7 +166,7 @@ ANALYZE accidents_gold.mv_profil_risque_conditions;
 -- VALIDATION
 -- ================================
 
-SELECT 
+SELECT
     'Vue matérialisée créée' as statut,
     COUNT(*) as nb_combinaisons,
     SUM(nb_accidents) as total_accidents,
@@ -175,7 +176,7 @@ SELECT
 FROM accidents_gold.mv_profil_risque_conditions;
 
 -- Top 10 combinaisons les plus dangereuses
-SELECT 
+SELECT
     luminosite_libelle,
     atm_libelle,
     categorie_route_libelle,
@@ -186,4 +187,4 @@ SELECT
 FROM accidents_gold.mv_profil_risque_conditions
 WHERE score_risque_composite IS NOT NULL
 ORDER BY score_risque_composite DESC
-LIMIT 10;
\ No newline at end of file
+LIMIT 10;
@@ -2,6 +2,7 @@
 -- VUE MATÉRIALISÉE : Analyse par type de véhicule
 -- Objectif: Statistiques de risque par catégorie de véhicule
 -- Refresh: Hebdomadaire
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
 -- ========================================
 
 DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_analyse_vehicules CASCADE;
@@ -21,7 +22,7 @@ SELECT
     -- ================================
     -- COMPTAGES VÉHICULES
     -- ================================
-    COUNT(DISTINCT fv.vehicule_id) as nb_vehicules_impliques,
+    COUNT(*) as nb_vehicules_impliques,
     COUNT(DISTINCT fv.accident_fk) as nb_accidents_impliques,
     
     -- ================================
@@ -35,34 +36,34 @@ SELECT
     -- ================================
     -- GRAVITÉ
     -- ================================
-    COUNT(DISTINCT CASE WHEN fv.est_vehicule_implique_mortel THEN fv.vehicule_id END) as nb_vehicules_avec_tues,
+    COUNT(*) FILTER (WHERE fv.est_vehicule_implique_mortel) as nb_vehicules_avec_tues,
     
     -- ================================
     -- RATIOS DE RISQUE
     -- ================================
-    CASE 
-        WHEN SUM(fv.nb_occupants) > 0 
-        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / SUM(fv.nb_occupants)) * 100 
-        ELSE 0 
+    CASE
+        WHEN SUM(fv.nb_occupants) > 0
+        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / SUM(fv.nb_occupants)) * 100
+        ELSE 0
     END as taux_mortalite_occupants,
     
-    CASE 
-        WHEN COUNT(DISTINCT fv.vehicule_id) > 0 
-        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / COUNT(DISTINCT fv.vehicule_id)) 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (SUM(fv.nb_tues_vehicule)::DECIMAL / COUNT(*))
+        ELSE 0
     END as nb_tues_moyen_par_vehicule,
     
-    CASE 
-        WHEN COUNT(DISTINCT fv.vehicule_id) > 0 
-        THEN (COUNT(DISTINCT CASE WHEN fv.est_vehicule_implique_mortel THEN fv.vehicule_id END)::DECIMAL / COUNT(DISTINCT fv.vehicule_id)) * 100 
-        ELSE 0 
+    CASE
+        WHEN COUNT(*) > 0
+        THEN (COUNT(*) FILTER (WHERE fv.est_vehicule_implique_mortel)::DECIMAL / COUNT(*)) * 100
+        ELSE 0
     END as pct_vehicules_avec_tues,
     
     -- ================================
     -- OBSTACLES
     -- ================================
-    COUNT(DISTINCT CASE WHEN fv.a_heurte_obstacle_fixe THEN fv.vehicule_id END) as nb_avec_obstacle_fixe,
-    COUNT(DISTINCT CASE WHEN fv.a_heurte_pieton THEN fv.vehicule_id END) as nb_ayant_heurte_pieton,
+    COUNT(*) FILTER (WHERE fv.a_heurte_obstacle_fixe) as nb_avec_obstacle_fixe,
+    COUNT(*) FILTER (WHERE fv.a_heurte_pieton) as nb_ayant_heurte_pieton,
     
     -- ================================
     -- MANŒUVRES FRÉQUENTES
@@ -74,10 +75,10 @@ JOIN accidents_gold.dim_vehicule dv ON fv.vehicule_type_id = dv.vehicule_id
 GROUP BY 
     dv.vehicule_id, dv.categorie_code, dv.categorie_libelle,
     dv.type_vehicule, dv.est_motorise, dv.niveau_protection
-HAVING COUNT(DISTINCT fv.vehicule_id) >= 5;  -- Seuil minimum
+HAVING COUNT(*) >= 5;  -- Seuil minimum
 
 -- ================================
--- INDEX
+-- INDEX POUR PERFORMANCES
 -- ================================
 
 CREATE UNIQUE INDEX idx_mv_analyse_veh_pk 
@@ -103,4 +104,4 @@ COMMENT ON COLUMN accidents_gold.mv_analyse_vehicules.taux_mortalite_occupants I
 -- STATISTIQUES
 -- ================================
 
-ANALYZE accidents_gold.mv_analyse_vehicules;
\ No newline at end of file
+ANALYZE accidents_gold.mv_analyse_vehicules;
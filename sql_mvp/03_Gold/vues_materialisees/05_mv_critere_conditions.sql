@@ -0,0 +1,63 @@
+-- ========================================
+-- VUE MATÉRIALISÉE : Critère 1 - conditions combinées
+-- Objectif: Pré-agréger conditions météo × luminosité × route × surface (critère 1)
+-- Refresh: Après chaque chargement Silver
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
+-- ========================================
+
+DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_critere_conditions CASCADE;
+
+CREATE MATERIALIZED VIEW accidents_gold.mv_critere_conditions AS
+SELECT 
+    -- ================================
+    -- CONDITIONS
+    -- ================================
+    a.conditions_atmospheriques,
+    a.luminosite,
+    l.categorie_route,
+    l.etat_surface,
+    
+    -- ================================
+    -- COMPTAGES
+    -- ================================
+    COUNT(DISTINCT a.num_acc) as nb_accidents,
+    COUNT(*) as nb_usagers,
+    COUNT(*) FILTER (WHERE u.gravite = 2) as nb_tues,
+    COUNT(*) FILTER (WHERE u.gravite = 3) as nb_blesses_graves,
+    
+    -- ================================
+    -- TAUX
+    -- ================================
+    ROUND(100.0 * COUNT(*) FILTER (WHERE u.gravite = 2) / NULLIF(COUNT(*), 0), 3) as taux_mortalite
+
+FROM accidents a
+JOIN lieux l ON a.num_acc = l.num_acc
+JOIN usagers u ON a.num_acc = u.num_acc
+WHERE a.conditions_atmospheriques IS NOT NULL
+  AND a.luminosite IS NOT NULL
+  AND l.categorie_route IS NOT NULL
+  AND l.etat_surface IS NOT NULL
+GROUP BY a.conditions_atmospheriques, a.luminosite, l.categorie_route, l.etat_surface;
+
+-- ================================
+-- INDEX POUR PERFORMANCES
+-- ================================
+
+CREATE UNIQUE INDEX idx_mv_critere_conditions_pk 
+ON accidents_gold.mv_critere_conditions (conditions_atmospheriques, luminosite, categorie_route, etat_surface);
+
+CREATE INDEX idx_mv_critere_conditions_nb_accidents 
+ON accidents_gold.mv_critere_conditions (nb_accidents DESC);
+
+-- ================================
+-- COMMENTAIRES
+-- ================================
+
+COMMENT ON MATERIALIZED VIEW accidents_gold.mv_critere_conditions IS 
+'Critère 1 : comptages par combinaison de conditions (sans seuil, appliqué par critere_perf_SQL.py).';
+
+-- ================================
+-- STATISTIQUES
+-- ================================
+
+ANALYZE accidents_gold.mv_critere_conditions;
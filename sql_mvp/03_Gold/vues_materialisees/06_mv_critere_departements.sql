@@ -0,0 +1,53 @@
+-- ========================================
+-- VUE MATÉRIALISÉE : Critère 2 - départements
+-- Objectif: Pré-agréger accidents et usagers par département (critère 2, référence nationale du critère 1)
+-- Refresh: Après chaque chargement Silver
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
+-- ========================================
+
+DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_critere_departements CASCADE;
+
+CREATE MATERIALIZED VIEW accidents_gold.mv_critere_departements AS
+SELECT 
+    -- ================================
+    -- DÉPARTEMENT
+    -- ================================
+    a.departement_code,
+    
+    -- ================================
+    -- COMPTAGES
+    -- ================================
+    COUNT(DISTINCT a.num_acc) as nb_accidents,
+    COUNT(*) as nb_usagers,
+    COUNT(*) FILTER (WHERE u.gravite = 2) as nb_tues,
+    COUNT(*) FILTER (WHERE u.gravite = 3) as nb_blesses_graves,
+    
+    -- ================================
+    -- TAUX
+    -- ================================
+    ROUND(100.0 * COUNT(*) FILTER (WHERE u.gravite = 2) / NULLIF(COUNT(*), 0), 3) as taux_mortalite,
+    ROUND(100.0 * (COUNT(*) FILTER (WHERE u.gravite = 2) + COUNT(*) FILTER (WHERE u.gravite = 3)) / NULLIF(COUNT(*), 0), 3) as taux_gravite
+
+FROM accidents a
+JOIN usagers u ON a.num_acc = u.num_acc
+GROUP BY a.departement_code;
+
+-- ================================
+-- INDEX POUR PERFORMANCES
+-- ================================
+
+CREATE UNIQUE INDEX idx_mv_critere_departements_pk 
+ON accidents_gold.mv_critere_departements (departement_code) NULLS NOT DISTINCT;
+
+-- ================================
+-- COMMENTAIRES
+-- ================================
+
+COMMENT ON MATERIALIZED VIEW accidents_gold.mv_critere_departements IS 
+'Critère 2 : comptages par département (accidents × usagers Silver). Somme = référence nationale du critère 1.';
+
+-- ================================
+-- STATISTIQUES
+-- ================================
+
+ANALYZE accidents_gold.mv_critere_departements;
@@ -0,0 +1,53 @@
+-- ========================================
+-- VUE MATÉRIALISÉE : Critère 3 - catégories d'usagers
+-- Objectif: Pré-agréger la gravité par catégorie d'usager (critère 3)
+-- Refresh: Après chaque chargement Silver
+-- Généré par notebook/Gold/ETL/vues_gold.py (ne pas modifier à la main)
+-- ========================================
+
+DROP MATERIALIZED VIEW IF EXISTS accidents_gold.mv_critere_usagers CASCADE;
+
+CREATE MATERIALIZED VIEW accidents_gold.mv_critere_usagers AS
+SELECT 
+    -- ================================
+    -- CATÉGORIE
+    -- ================================
+    u.categorie_usager,
+    
+    -- ================================
+    -- COMPTAGES
+    -- ================================
+    COUNT(*) as nb_usagers,
+    COUNT(*) FILTER (WHERE u.gravite = 2) as nb_tues,
+    COUNT(*) FILTER (WHERE u.gravite = 3) as nb_blesses_graves,
+    COUNT(*) FILTER (WHERE u.gravite = 4) as nb_blesses_legers,
+    COUNT(*) FILTER (WHERE u.gravite = 1) as nb_indemnes,
+    
+    -- ================================
+    -- TAUX
+    -- ================================
+    ROUND(100.0 * COUNT(*) FILTER (WHERE u.gravite = 2) / NULLIF(COUNT(*), 0), 3) as taux_mortalite,
+    ROUND(100.0 * (COUNT(*) FILTER (WHERE u.gravite = 2) + COUNT(*) FILTER (WHERE u.gravite = 3)) / NULLIF(COUNT(*), 0), 3) as taux_gravite
+
+FROM usagers u
+GROUP BY u.categorie_usager;
+
+-- ================================
+-- INDEX POUR PERFORMANCES
+-- ================================
+
+CREATE UNIQUE INDEX idx_mv_critere_usagers_pk 
+ON accidents_gold.mv_critere_usagers (categorie_usager) NULLS NOT DISTINCT;
+
+-- ================================
+-- COMMENTAIRES
+-- ================================
+
+COMMENT ON MATERIALIZED VIEW accidents_gold.mv_critere_usagers IS 
+'Critère 3 : comptages par catégorie d''usager, catégorie inconnue comprise (référence globale).';
+
+-- ================================
+-- STATISTIQUES
+-- ================================
+
+ANALYZE accidents_gold.mv_critere_usagers;
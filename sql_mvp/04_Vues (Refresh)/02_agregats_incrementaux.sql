@@ -0,0 +1,614 @@
+-- ========================================
+-- MAINTENANCE INCRÉMENTALE DES AGRÉGATS GOLD
+-- Alternative au REFRESH complet des vues matérialisées : tables de
+-- synthèse (mêmes clés que les vues + annee) stockant des composantes
+-- additives (comptages, sommes, sommes des carrés, min/max partiels),
+-- recalculées uniquement pour les années rechargées.
+-- Les ratios, moyennes et écarts-types sont dérivés de ces composantes
+-- par les vues v_* (mêmes colonnes que les vues matérialisées mv_*).
+-- Usage: SELECT * FROM accidents_gold.maj_agregats_incrementaux(ARRAY[2019, 2020]);
+-- ========================================
+
+-- ================================
+-- TABLES DE SYNTHÈSE
+-- Grain : clé de la vue × année (une année = une partition de fait_accidents)
+-- ================================
+
+DROP TABLE IF EXISTS accidents_gold.agg_stats_hebdomadaires CASCADE;
+CREATE TABLE accidents_gold.agg_stats_hebdomadaires (
+    annee INTEGER NOT NULL,
+    semaine_annee INTEGER NOT NULL,
+    date_debut_semaine DATE,
+    date_fin_semaine DATE,
+    nb_accidents BIGINT NOT NULL,
+    nb_accidents_mortels BIGINT NOT NULL,
+    nb_accidents_graves BIGINT NOT NULL,
+    nb_tues BIGINT,
+    nb_blesses_hospitalises BIGINT,
+    nb_blesses_legers BIGINT,
+    nb_victimes_total BIGINT,
+    nb_indemnes BIGINT,
+    nb_scores BIGINT NOT NULL,                  -- scores non NULL (dénominateur AVG/STDDEV)
+    somme_score NUMERIC,
+    somme_score_carre NUMERIC,
+    gravite_min INTEGER,
+    gravite_max INTEGER,
+    nb_accidents_weekend BIGINT NOT NULL,
+    nb_accidents_nuit BIGINT NOT NULL,
+    nb_accidents_agglomeration BIGINT NOT NULL,
+    nb_accidents_hors_agglomeration BIGINT NOT NULL,
+    nb_vehicules_renseignes BIGINT NOT NULL,
+    somme_vehicules BIGINT,
+    nb_victimes_renseignees BIGINT NOT NULL,
+    PRIMARY KEY (annee, semaine_annee)
+);
+
+DROP TABLE IF EXISTS accidents_gold.agg_zones_a_risque CASCADE;
+CREATE TABLE accidents_gold.agg_zones_a_risque (
+    geo_id INTEGER NOT NULL,
+    annee INTEGER NOT NULL,
+    nb_accidents BIGINT NOT NULL,
+    nb_accidents_mortels BIGINT NOT NULL,
+    nb_accidents_graves BIGINT NOT NULL,
+    nb_tues BIGINT,
+    nb_blesses_hosp BIGINT,
+    nb_blesses_legers BIGINT,
+    nb_victimes BIGINT,
+    nb_scores BIGINT NOT NULL,
+    somme_score NUMERIC,
+    gravite_max INTEGER,
+    nb_accidents_weekend BIGINT NOT NULL,
+    nb_accidents_nuit BIGINT NOT NULL,
+    nb_accidents_agglomeration BIGINT NOT NULL,
+    nb_accidents_hors_agglomeration BIGINT NOT NULL,
+    premiere_date DATE,
+    derniere_date DATE,
+    PRIMARY KEY (geo_id, annee)
+);
+
+DROP TABLE IF EXISTS accidents_gold.agg_profil_risque_conditions CASCADE;
+CREATE TABLE accidents_gold.agg_profil_risque_conditions (
+    condition_id INTEGER NOT NULL,
+    route_id INTEGER NOT NULL,
+    annee INTEGER NOT NULL,
+    nb_accidents BIGINT NOT NULL,
+    nb_accidents_mortels BIGINT NOT NULL,
+    nb_accidents_graves BIGINT NOT NULL,
+    nb_tues BIGINT,
+    nb_blesses_hosp BIGINT,
+    nb_blesses_legers BIGINT,
+    nb_victimes BIGINT,
+    nb_scores BIGINT NOT NULL,
+    somme_score NUMERIC,
+    somme_score_carre NUMERIC,
+    gravite_max INTEGER,
+    nb_accidents_weekend BIGINT NOT NULL,
+    nb_accidents_agglomeration BIGINT NOT NULL,
+    PRIMARY KEY (condition_id, route_id, annee)
+);
+
+DROP TABLE IF EXISTS accidents_gold.agg_analyse_vehicules CASCADE;
+CREATE TABLE accidents_gold.agg_analyse_vehicules (
+    vehicule_type_id INTEGER NOT NULL,
+    annee INTEGER NOT NULL,
+    nb_vehicules_impliques BIGINT NOT NULL,
+    nb_accidents_impliques BIGINT NOT NULL,     -- un accident n'appartient qu'à une année : additif
+    nb_occupants_total BIGINT,
+    nb_tues_total BIGINT,
+    nb_blesses_total BIGINT,
+    nb_indemnes_total BIGINT,
+    nb_vehicules_avec_tues BIGINT NOT NULL,
+    nb_avec_obstacle_fixe BIGINT NOT NULL,
+    nb_ayant_heurte_pieton BIGINT NOT NULL,
+    PRIMARY KEY (vehicule_type_id, annee)
+);
+
+-- MODE() n'est pas décomposable : fréquence de chaque manœuvre
+DROP TABLE IF EXISTS accidents_gold.agg_manoeuvres_vehicules CASCADE;
+CREATE TABLE accidents_gold.agg_manoeuvres_vehicules (
+    vehicule_type_id INTEGER NOT NULL,
+    annee INTEGER NOT NULL,
+    manoeuvre INTEGER NOT NULL,
+    nb BIGINT NOT NULL,
+    PRIMARY KEY (vehicule_type_id, annee, manoeuvre)
+);
+
+COMMENT ON TABLE accidents_gold.agg_stats_hebdomadaires IS
+'Composantes additives de mv_stats_hebdomadaires par (annee, semaine). Maintenue par maj_agregats_incrementaux().';
+COMMENT ON TABLE accidents_gold.agg_zones_a_risque IS
+'Composantes additives de mv_zones_a_risque par (geo_id, annee). Maintenue par maj_agregats_incrementaux().';
+COMMENT ON TABLE accidents_gold.agg_profil_risque_conditions IS
+'Composantes additives de mv_profil_risque_conditions par (condition_id, route_id, annee). Maintenue par maj_agregats_incrementaux().';
+COMMENT ON TABLE accidents_gold.agg_analyse_vehicules IS
+'Composantes additives de mv_analyse_vehicules par (vehicule_type_id, annee). Maintenue par maj_agregats_incrementaux().';
+
+-- ================================
+-- FONCTION DE MAINTENANCE
+-- ================================
+
+CREATE OR REPLACE FUNCTION accidents_gold.maj_agregats_incrementaux(p_annees INTEGER[])
+RETURNS TABLE (
+    agregat TEXT,
+    lignes_supprimees BIGINT,
+    lignes_inserees BIGINT,
+    duree_secondes NUMERIC
+) AS $$
+DECLARE
+    v_annee INTEGER;
+    v_debut INTEGER;
+    v_fin INTEGER;
+    start_time TIMESTAMP;
+    nb_supprimees BIGINT;
+    nb_inserees BIGINT;
+    nb BIGINT;
+BEGIN
+    -- Recalcul année par année : les bornes sur date_id ciblent une seule
+    -- partition de fait_accidents (élagage à l'exécution)
+
+    -- Stats hebdomadaires
+    start_time := clock_timestamp();
+    DELETE FROM accidents_gold.agg_stats_hebdomadaires WHERE annee = ANY(p_annees);
+    GET DIAGNOSTICS nb_supprimees = ROW_COUNT;
+    nb_inserees := 0;
+    FOREACH v_annee IN ARRAY p_annees LOOP
+        v_debut := v_annee * 10000 + 101;
+        v_fin := (v_annee + 1) * 10000 + 101;
+        INSERT INTO accidents_gold.agg_stats_hebdomadaires
+        SELECT
+            d.annee, d.semaine_annee,
+            MIN(d.date_complete), MAX(d.date_complete),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE f.est_accident_mortel),
+            COUNT(*) FILTER (WHERE f.est_accident_grave),
+            SUM(f.nb_tues_total), SUM(f.nb_blesses_hosp_total), SUM(f.nb_blesses_legers_total),
+            SUM(f.nb_victimes_total), SUM(f.nb_indemnes_total),
+            COUNT(f.score_gravite_total),
+            SUM(f.score_gravite_total),
+            SUM(f.score_gravite_total::NUMERIC * f.score_gravite_total),
+            MIN(f.score_gravite_total), MAX(f.score_gravite_total),
+            COUNT(*) FILTER (WHERE f.est_weekend),
+            COUNT(*) FILTER (WHERE f.est_nuit),
+            COUNT(*) FILTER (WHERE f.en_agglomeration),
+            COUNT(*) FILTER (WHERE NOT f.en_agglomeration),
+            COUNT(f.nb_vehicules), SUM(f.nb_vehicules),
+            COUNT(f.nb_victimes_total)
+        FROM accidents_gold.fait_accidents f
+        JOIN accidents_gold.dim_date d ON f.date_id = d.date_id
+        WHERE f.date_id >= v_debut AND f.date_id < v_fin
+        GROUP BY d.annee, d.semaine_annee;
+        GET DIAGNOSTICS nb = ROW_COUNT;
+        nb_inserees := nb_inserees + nb;
+    END LOOP;
+    agregat := 'agg_stats_hebdomadaires';
+    lignes_supprimees := nb_supprimees;
+    lignes_inserees := nb_inserees;
+    duree_secondes := EXTRACT(EPOCH FROM (clock_timestamp() - start_time));
+    RETURN NEXT;
+
+    -- Zones à risque
+    start_time := clock_timestamp();
+    DELETE FROM accidents_gold.agg_zones_a_risque WHERE annee = ANY(p_annees);
+    GET DIAGNOSTICS nb_supprimees = ROW_COUNT;
+    nb_inserees := 0;
+    FOREACH v_annee IN ARRAY p_annees LOOP
+        v_debut := v_annee * 10000 + 101;
+        v_fin := (v_annee + 1) * 10000 + 101;
+        INSERT INTO accidents_gold.agg_zones_a_risque
+        SELECT
+            f.geo_id, v_annee,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE f.est_accident_mortel),
+            COUNT(*) FILTER (WHERE f.est_accident_grave),
+            SUM(f.nb_tues_total), SUM(f.nb_blesses_hosp_total), SUM(f.nb_blesses_legers_total),
+            SUM(f.nb_victimes_total),
+            COUNT(f.score_gravite_total), SUM(f.score_gravite_total), MAX(f.score_gravite_total),
+            COUNT(*) FILTER (WHERE f.est_weekend),
+            COUNT(*) FILTER (WHERE f.est_nuit),
+            COUNT(*) FILTER (WHERE f.en_agglomeration),
+            COUNT(*) FILTER (WHERE NOT f.en_agglomeration),
+            MIN(d.date_complete), MAX(d.date_complete)
+        FROM accidents_gold.fait_accidents f
+        JOIN accidents_gold.dim_date d ON f.date_id = d.date_id
+        WHERE f.date_id >= v_debut AND f.date_id < v_fin
+          AND f.geo_id IS NOT NULL
+        GROUP BY f.geo_id;
+        GET DIAGNOSTICS nb = ROW_COUNT;
+        nb_inserees := nb_inserees + nb;
+    END LOOP;
+    agregat := 'agg_zones_a_risque';
+    lignes_supprimees := nb_supprimees;
+    lignes_inserees := nb_inserees;
+    duree_secondes := EXTRACT(EPOCH FROM (clock_timestamp() - start_time));
+    RETURN NEXT;
+
+    -- Profil de risque conditions × route
+    start_time := clock_timestamp();
+    DELETE FROM accidents_gold.agg_profil_risque_conditions WHERE annee = ANY(p_annees);
+    GET DIAGNOSTICS nb_supprimees = ROW_COUNT;
+    nb_inserees := 0;
+    FOREACH v_annee IN ARRAY p_annees LOOP
+        v_debut := v_annee * 10000 + 101;
+        v_fin := (v_annee + 1) * 10000 + 101;
+        INSERT INTO accidents_gold.agg_profil_risque_conditions
+        SELECT
+            f.condition_id, f.route_id, v_annee,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE f.est_accident_mortel),
+            COUNT(*) FILTER (WHERE f.est_accident_grave),
+            SUM(f.nb_tues_total), SUM(f.nb_blesses_hosp_total), SUM(f.nb_blesses_legers_total),
+            SUM(f.nb_victimes_total),
+            COUNT(f.score_gravite_total),
+            SUM(f.score_gravite_total),
+            SUM(f.score_gravite_total::NUMERIC * f.score_gravite_total),
+            MAX(f.score_gravite_total),
+            COUNT(*) FILTER (WHERE f.est_weekend),
+            COUNT(*) FILTER (WHERE f.en_agglomeration)
+        FROM accidents_gold.fait_accidents f
+        WHERE f.date_id >= v_debut AND f.date_id < v_fin
+          AND f.condition_id IS NOT NULL
+          AND f.route_id IS NOT NULL
+        GROUP BY f.condition_id, f.route_id;
+        GET DIAGNOSTICS nb = ROW_COUNT;
+        nb_inserees := nb_inserees + nb;
+    END LOOP;
+    agregat := 'agg_profil_risque_conditions';
+    lignes_supprimees := nb_supprimees;
+    lignes_inserees := nb_inserees;
+    duree_secondes := EXTRACT(EPOCH FROM (clock_timestamp() - start_time));
+    RETURN NEXT;
+
+    -- Analyse véhicules (année portée par l'accident du véhicule)
+    start_time := clock_timestamp();
+    DELETE FROM accidents_gold.agg_analyse_vehicules WHERE annee = ANY(p_annees);
+    GET DIAGNOSTICS nb_supprimees = ROW_COUNT;
+    DELETE FROM accidents_gold.agg_manoeuvres_vehicules WHERE annee = ANY(p_annees);
+    nb_inserees := 0;
+    FOREACH v_annee IN ARRAY p_annees LOOP
+        v_debut := v_annee * 10000 + 101;
+        v_fin := (v_annee + 1) * 10000 + 101;
+        INSERT INTO accidents_gold.agg_analyse_vehicules
+        SELECT
+            fv.vehicule_type_id, v_annee,
+            COUNT(*),
+            COUNT(DISTINCT fv.accident_fk),
+            SUM(fv.nb_occupants), SUM(fv.nb_tues_vehicule),
+            SUM(fv.nb_blesses_vehicule), SUM(fv.nb_indemnes_vehicule),
+            COUNT(*) FILTER (WHERE fv.est_vehicule_implique_mortel),
+            COUNT(*) FILTER (WHERE fv.a_heurte_obstacle_fixe),
+            COUNT(*) FILTER (WHERE fv.a_heurte_pieton)
+        FROM accidents_gold.fait_vehicules fv
+        JOIN accidents_gold.fait_accidents f ON f.accident_id = fv.accident_fk
+        WHERE f.date_id >= v_debut AND f.date_id < v_fin
+          AND fv.vehicule_type_id IS NOT NULL
+        GROUP BY fv.vehicule_type_id;
+        GET DIAGNOSTICS nb = ROW_COUNT;
+        nb_inserees := nb_inserees + nb;
+
+        INSERT INTO accidents_gold.agg_manoeuvres_vehicules
+        SELECT fv.vehicule_type_id, v_annee, fv.manoeuvre, COUNT(*)
+        FROM accidents_gold.fait_vehicules fv
+        JOIN accidents_gold.fait_accidents f ON f.accident_id = fv.accident_fk
+        WHERE f.date_id >= v_debut AND f.date_id < v_fin
+          AND fv.vehicule_type_id IS NOT NULL
+          AND fv.manoeuvre IS NOT NULL
+        GROUP BY fv.vehicule_type_id, fv.manoeuvre;
+    END LOOP;
+    agregat := 'agg_analyse_vehicules';
+    lignes_supprimees := nb_supprimees;
+    lignes_inserees := nb_inserees;
+    duree_secondes := EXTRACT(EPOCH FROM (clock_timestamp() - start_time));
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION accidents_gold.maj_agregats_incrementaux(INTEGER[]) IS
+'Recalcule les composantes agg_* des seules années passées en paramètre (coût proportionnel au delta chargé)';
+
+-- ================================
+-- VUES DÉRIVÉES
+-- (mêmes colonnes, seuils et formules que les vues matérialisées)
+-- ================================
+
+CREATE OR REPLACE VIEW accidents_gold.v_stats_hebdomadaires AS
+SELECT
+    a.annee,
+    a.semaine_annee,
+    a.date_debut_semaine,
+    a.date_fin_semaine,
+    a.nb_accidents,
+    a.nb_accidents_mortels,
+    a.nb_accidents_graves,
+    a.nb_tues,
+    a.nb_blesses_hospitalises,
+    a.nb_blesses_legers,
+    a.nb_victimes_total,
+    a.nb_indemnes,
+    a.somme_score / NULLIF(a.nb_scores, 0) as gravite_moyenne,
+    CASE WHEN a.nb_scores > 1
+        THEN SQRT(GREATEST(a.nb_scores * a.somme_score_carre - a.somme_score * a.somme_score, 0)
+                  / (a.nb_scores * (a.nb_scores - 1)))
+    END as ecart_type_gravite,
+    a.gravite_min,
+    a.gravite_max,
+    a.nb_accidents_weekend,
+    a.nb_accidents_nuit,
+    a.nb_accidents_agglomeration,
+    a.nb_accidents_hors_agglomeration,
+    a.somme_vehicules::NUMERIC / NULLIF(a.nb_vehicules_renseignes, 0) as nb_vehicules_moyen_par_accident,
+    a.nb_victimes_total::NUMERIC / NULLIF(a.nb_victimes_renseignees, 0) as nb_victimes_moyen_par_accident,
+    CASE
+        WHEN a.nb_accidents > 0
+        THEN (a.nb_tues::DECIMAL / a.nb_accidents) * 100
+        ELSE 0
+    END as taux_mortalite_par_accident,
+    CASE
+        WHEN a.nb_victimes_total > 0
+        THEN (a.nb_tues::DECIMAL / a.nb_victimes_total) * 100
+        ELSE 0
+    END as taux_mortalite_par_victime
+FROM accidents_gold.agg_stats_hebdomadaires a;
+
+CREATE OR REPLACE VIEW accidents_gold.v_zones_a_risque AS
+WITH z AS (
+    SELECT
+        geo_id,
+        SUM(nb_accidents)::BIGINT as nb_accidents,
+        SUM(nb_accidents_mortels)::BIGINT as nb_accidents_mortels,
+        SUM(nb_accidents_graves)::BIGINT as nb_accidents_graves,
+        SUM(nb_tues)::BIGINT as nb_tues,
+        SUM(nb_blesses_hosp)::BIGINT as nb_blesses_hosp,
+        SUM(nb_blesses_legers)::BIGINT as nb_blesses_legers,
+        SUM(nb_victimes)::BIGINT as nb_victimes,
+        SUM(nb_scores) as nb_scores,
+        SUM(somme_score) as somme_score,
+        MAX(gravite_max) as gravite_max,
+        SUM(nb_accidents_weekend)::BIGINT as nb_accidents_weekend,
+        SUM(nb_accidents_nuit)::BIGINT as nb_accidents_nuit,
+        SUM(nb_accidents_agglomeration)::BIGINT as nb_accidents_agglomeration,
+        SUM(nb_accidents_hors_agglomeration)::BIGINT as nb_accidents_hors_agglomeration,
+        MIN(premiere_date) as premiere_date,
+        MAX(derniere_date) as derniere_date,
+        COUNT(*) as nb_annees_observees
+    FROM accidents_gold.agg_zones_a_risque
+    GROUP BY geo_id
+    HAVING SUM(nb_accidents) >= 3  -- Seuil minimum pour significativité statistique
+)
+SELECT
+    g.geo_id,
+    g.com_code,
+    g.com_name,
+    g.com_arm_name,
+    g.departement_code,
+    g.departement_name,
+    g.region_code,
+    g.region_name,
+    g.type_zone,
+    g.population,
+    g.densite_population,
+    z.nb_accidents as nb_accidents_total,
+    z.nb_accidents_mortels,
+    z.nb_accidents_graves,
+    z.nb_tues as nb_tues_total,
+    z.nb_blesses_hosp as nb_blesses_hosp_total,
+    z.nb_blesses_legers as nb_blesses_legers_total,
+    z.nb_victimes as nb_victimes_total,
+    z.somme_score / NULLIF(z.nb_scores, 0) as gravite_moyenne,
+    z.gravite_max,
+    z.nb_accidents_weekend,
+    z.nb_accidents_nuit,
+    z.nb_accidents_agglomeration,
+    z.nb_accidents_hors_agglomeration,
+    CASE
+        WHEN g.population > 0
+        THEN (z.nb_accidents::DECIMAL / g.population) * 10000
+        ELSE NULL
+    END as taux_accidents_pour_10k_hab,
+    CASE
+        WHEN g.population > 0
+        THEN (z.nb_tues::DECIMAL / g.population) * 100000
+        ELSE NULL
+    END as taux_tues_pour_100k_hab,
+    CASE
+        WHEN g.population > 0
+        THEN (z.nb_victimes::DECIMAL / g.population) * 10000
+        ELSE NULL
+    END as taux_victimes_pour_10k_hab,
+    CASE
+        WHEN z.nb_accidents > 0
+        THEN (z.nb_accidents_graves::DECIMAL / z.nb_accidents) * 100
+        ELSE 0
+    END as pct_accidents_graves,
+    CASE
+        WHEN z.nb_accidents > 0
+        THEN (z.nb_tues::DECIMAL / z.nb_accidents)
+        ELSE 0
+    END as nb_tues_moyen_par_accident,
+    z.premiere_date,
+    z.derniere_date,
+    z.nb_annees_observees
+FROM z
+JOIN accidents_gold.dim_geographie g ON g.geo_id = z.geo_id;
+
+CREATE OR REPLACE VIEW accidents_gold.v_profil_risque_conditions AS
+WITH p AS (
+    SELECT
+        condition_id,
+        route_id,
+        SUM(nb_accidents)::BIGINT as nb_accidents,
+        SUM(nb_accidents_mortels)::BIGINT as nb_accidents_mortels,
+        SUM(nb_accidents_graves)::BIGINT as nb_accidents_graves,
+        SUM(nb_tues)::BIGINT as nb_tues,
+        SUM(nb_blesses_hosp)::BIGINT as nb_blesses_hosp,
+        SUM(nb_blesses_legers)::BIGINT as nb_blesses_legers,
+        SUM(nb_victimes)::BIGINT as nb_victimes,
+        SUM(nb_scores) as nb_scores,
+        SUM(somme_score) as somme_score,
+        SUM(somme_score_carre) as somme_score_carre,
+        MAX(gravite_max) as gravite_max,
+        SUM(nb_accidents_weekend)::BIGINT as nb_accidents_weekend,
+        SUM(nb_accidents_agglomeration)::BIGINT as nb_accidents_agglomeration
+    FROM accidents_gold.agg_profil_risque_conditions
+    GROUP BY condition_id, route_id
+    HAVING SUM(nb_accidents) >= 10  -- Seuil minimum pour significativité
+)
+SELECT
+    c.condition_id,
+    c.luminosite_code,
+    c.luminosite_libelle,
+    c.est_nuit,
+    c.atm_code,
+    c.atm_libelle,
+    c.est_intemperie,
+    c.niveau_risque as niveau_risque_conditions,
+    r.route_id,
+    r.categorie_route_code,
+    r.categorie_route_libelle,
+    r.profil_route_code,
+    r.profil_route_libelle,
+    r.trace_plan_code,
+    r.trace_plan_libelle,
+    r.etat_surface_code,
+    r.etat_surface_libelle,
+    r.niveau_risque_route,
+    p.nb_accidents,
+    p.nb_accidents_mortels,
+    p.nb_accidents_graves,
+    p.nb_tues,
+    p.nb_blesses_hosp,
+    p.nb_blesses_legers,
+    p.nb_victimes,
+    p.somme_score / NULLIF(p.nb_scores, 0) as gravite_moyenne,
+    CASE WHEN p.nb_scores > 1
+        THEN SQRT(GREATEST(p.nb_scores * p.somme_score_carre - p.somme_score * p.somme_score, 0)
+                  / (p.nb_scores * (p.nb_scores - 1)))
+    END as ecart_type_gravite,
+    p.gravite_max,
+    CASE
+        WHEN p.nb_accidents > 0
+        THEN (p.nb_accidents_graves::DECIMAL / p.nb_accidents) * 100
+        ELSE 0
+    END as pct_accidents_graves,
+    CASE
+        WHEN p.nb_accidents > 0
+        THEN (p.nb_accidents_mortels::DECIMAL / p.nb_accidents) * 100
+        ELSE 0
+    END as pct_accidents_mortels,
+    CASE
+        WHEN p.nb_victimes > 0
+        THEN (p.nb_tues::DECIMAL / p.nb_victimes) * 100
+        ELSE 0
+    END as taux_mortalite_par_victime,
+    CASE
+        WHEN p.nb_accidents > 0
+        THEN (p.nb_tues::DECIMAL / p.nb_accidents)
+        ELSE 0
+    END as nb_tues_moyen_par_accident,
+    CASE
+        WHEN p.nb_accidents >= 10 THEN
+            -- Pondération: 50% gravité moyenne + 30% % accidents graves + 20% taux mortalité
+            ((p.somme_score / NULLIF(p.nb_scores, 0)) / 100.0) * 0.5 +
+            (p.nb_accidents_graves::DECIMAL / p.nb_accidents) * 0.3 +
+            (p.nb_tues::DECIMAL / NULLIF(p.nb_victimes, 0)) * 0.2
+        ELSE NULL
+    END as score_risque_composite,
+    p.nb_accidents_weekend,
+    p.nb_accidents_agglomeration
+FROM p
+JOIN accidents_gold.dim_conditions c ON c.condition_id = p.condition_id
+JOIN accidents_gold.dim_route r ON r.route_id = p.route_id;
+
+CREATE OR REPLACE VIEW accidents_gold.v_analyse_vehicules AS
+WITH v AS (
+    SELECT
+        vehicule_type_id,
+        SUM(nb_vehicules_impliques)::BIGINT as nb_vehicules_impliques,
+        SUM(nb_accidents_impliques)::BIGINT as nb_accidents_impliques,
+        SUM(nb_occupants_total)::BIGINT as nb_occupants_total,
+        SUM(nb_tues_total)::BIGINT as nb_tues_total,
+        SUM(nb_blesses_total)::BIGINT as nb_blesses_total,
+        SUM(nb_indemnes_total)::BIGINT as nb_indemnes_total,
+        SUM(nb_vehicules_avec_tues)::BIGINT as nb_vehicules_avec_tues,
+        SUM(nb_avec_obstacle_fixe)::BIGINT as nb_avec_obstacle_fixe,
+        SUM(nb_ayant_heurte_pieton)::BIGINT as nb_ayant_heurte_pieton
+    FROM accidents_gold.agg_analyse_vehicules
+    GROUP BY vehicule_type_id
+    HAVING SUM(nb_vehicules_impliques) >= 5  -- Seuil minimum
+),
+-- Manœuvre la plus fréquente (MODE() : à égalité, la plus petite)
+m AS (
+    SELECT DISTINCT ON (vehicule_type_id) vehicule_type_id, manoeuvre
+    FROM (
+        SELECT vehicule_type_id, manoeuvre, SUM(nb) as nb
+        FROM accidents_gold.agg_manoeuvres_vehicules
+        GROUP BY vehicule_type_id, manoeuvre
+    ) t
+    ORDER BY vehicule_type_id, nb DESC, manoeuvre
+)
+SELECT
+    dv.vehicule_id,
+    dv.categorie_code,
+    dv.categorie_libelle,
+    dv.type_vehicule,
+    dv.est_motorise,
+    dv.niveau_protection,
+    v.nb_vehicules_impliques,
+    v.nb_accidents_impliques,
+    v.nb_occupants_total,
+    v.nb_tues_total,
+    v.nb_blesses_total,
+    v.nb_indemnes_total,
+    v.nb_vehicules_avec_tues,
+    CASE
+        WHEN v.nb_occupants_total > 0
+        THEN (v.nb_tues_total::DECIMAL / v.nb_occupants_total) * 100
+        ELSE 0
+    END as taux_mortalite_occupants,
+    CASE
+        WHEN v.nb_vehicules_impliques > 0
+        THEN (v.nb_tues_total::DECIMAL / v.nb_vehicules_impliques)
+        ELSE 0
+    END as nb_tues_moyen_par_vehicule,
+    CASE
+        WHEN v.nb_vehicules_impliques > 0
+        THEN (v.nb_vehicules_avec_tues::DECIMAL / v.nb_vehicules_impliques) * 100
+        ELSE 0
+    END as pct_vehicules_avec_tues,
+    v.nb_avec_obstacle_fixe,
+    v.nb_ayant_heurte_pieton,
+    m.manoeuvre as manoeuvre_la_plus_frequente
+FROM v
+JOIN accidents_gold.dim_vehicule dv ON dv.vehicule_id = v.vehicule_type_id
+LEFT JOIN m ON m.vehicule_type_id = v.vehicule_type_id;
+
+-- ================================
+-- INITIALISATION ET VALIDATION
+-- ================================
+
+SELECT * FROM accidents_gold.maj_agregats_incrementaux(
+    ARRAY(SELECT DISTINCT date_id / 10000 FROM accidents_gold.fait_accidents ORDER BY 1)
+);
+
+-- Parité avec les vues matérialisées (0 ligne d'écart attendue)
+SELECT 'mv_stats_hebdomadaires' as vue, COUNT(*) as ecarts FROM (
+    (SELECT annee, semaine_annee, nb_accidents, nb_tues, ROUND(gravite_moyenne, 6), ROUND(ecart_type_gravite, 6) FROM accidents_gold.mv_stats_hebdomadaires
+     EXCEPT
+     SELECT annee, semaine_annee, nb_accidents, nb_tues, ROUND(gravite_moyenne, 6), ROUND(ecart_type_gravite, 6) FROM accidents_gold.v_stats_hebdomadaires)
+) e
+UNION ALL
+SELECT 'mv_zones_a_risque', COUNT(*) FROM (
+    (SELECT geo_id, nb_accidents_total, nb_tues_total, ROUND(gravite_moyenne, 6), nb_annees_observees FROM accidents_gold.mv_zones_a_risque
+     EXCEPT
+     SELECT geo_id, nb_accidents_total, nb_tues_total, ROUND(gravite_moyenne, 6), nb_annees_observees FROM accidents_gold.v_zones_a_risque)
+) e
+UNION ALL
+SELECT 'mv_profil_risque_conditions', COUNT(*) FROM (
+    (SELECT condition_id, route_id, nb_accidents, ROUND(ecart_type_gravite, 6), ROUND(score_risque_composite, 6) FROM accidents_gold.mv_profil_risque_conditions
+     EXCEPT
+     SELECT condition_id, route_id, nb_accidents, ROUND(ecart_type_gravite, 6), ROUND(score_risque_composite, 6) FROM accidents_gold.v_profil_risque_conditions)
+) e
+UNION ALL
+SELECT 'mv_analyse_vehicules', COUNT(*) FROM (
+    (SELECT vehicule_id, nb_vehicules_impliques, nb_accidents_impliques, manoeuvre_la_plus_frequente FROM accidents_gold.mv_analyse_vehicules
+     EXCEPT
+     SELECT vehicule_id, nb_vehicules_impliques, nb_accidents_impliques, manoeuvre_la_plus_frequente FROM accidents_gold.v_analyse_vehicules)
+) e;
@@ -0,0 +1,32 @@
+-- ========================================
+-- HISTORIQUE DES REFRESH DE VUES MATÉRIALISÉES
+-- Une ligne par vue et par lot (notebook/Gold/ETL/refresh_vues.py) :
+-- mode (concurrently / complet), statut, nombre de tentatives,
+-- durée, nombre de lignes et message d'erreur éventuel.
+-- debut / fin : horloge du serveur au début et à la fin de la dernière
+-- tentative, comparables à etl_watermarks.mis_a_jour_le (fraîcheur).
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS accidents_gold.historique_refresh (
+    refresh_id BIGSERIAL PRIMARY KEY,
+    lot_id VARCHAR(36) NOT NULL,
+    vue_name VARCHAR(100) NOT NULL,
+    mode_refresh VARCHAR(20),
+    statut VARCHAR(10) NOT NULL CHECK (statut IN ('ok', 'echec', 'ignoree')),
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    debut TIMESTAMP,
+    fin TIMESTAMP,
+    duree_secondes NUMERIC(10, 3),
+    nb_lignes BIGINT,
+    erreur TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_historique_refresh_vue
+    ON accidents_gold.historique_refresh(vue_name, debut DESC);
+
+COMMENT ON TABLE accidents_gold.historique_refresh IS 'Historique des refresh de vues matérialisées (une ligne par vue et par lot)';
+
+-- Dernier refresh de chaque vue
+-- SELECT DISTINCT ON (vue_name) vue_name, statut, debut, duree_secondes, nb_lignes, erreur
+-- FROM accidents_gold.historique_refresh
+-- ORDER BY vue_name, debut DESC;
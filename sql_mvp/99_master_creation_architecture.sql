@@ -206,7 +206,16 @@ ORDER BY tablename;
 \echo '>>> 6.4 - Analyse Véhicules'
 \i sql/04_gold/vues_materialisees/04_mv_analyse_vehicules.sql
 
-\echo '>>> 6.5 - Fonction Refresh'
+\echo '>>> 6.5 - Critère 1 : Conditions Combinées'
+\i sql/04_gold/vues_materialisees/05_mv_critere_conditions.sql
+
+\echo '>>> 6.6 - Critère 2 : Départements'
+\i sql/04_gold/vues_materialisees/06_mv_critere_departements.sql
+
+\echo '>>> 6.7 - Critère 3 : Catégories Usagers'
+\i sql/04_gold/vues_materialisees/07_mv_critere_usagers.sql
+
+\echo '>>> 6.8 - Fonction Refresh'
 \i sql/04_gold/vues_materialisees/05_refresh_all_views.sql
 
 \echo ''